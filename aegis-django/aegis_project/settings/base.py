@@ -375,6 +375,32 @@ LOGGING = {
     },
 }
 
+# Shared FHIR resource cache (apps.core.fhir.cache): Patient/Encounter/Location
+# reads are cached per resource type; set SHARED_CACHE_ALIAS (e.g. 'default')
+# to share entries between workers through Redis
+FHIR_RESOURCE_CACHE = {
+    'ENABLED': config('FHIR_RESOURCE_CACHE_ENABLED', default=True, cast=bool),
+    'MAX_ENTRIES': config('FHIR_RESOURCE_CACHE_MAX_ENTRIES', default=5000, cast=int),
+    'SHARED_CACHE_ALIAS': config('FHIR_RESOURCE_CACHE_SHARED_ALIAS', default='') or None,
+    'TTL': {
+        'Patient': 3600,
+        'Encounter': 300,
+        'Location': 86400,
+        'Organization': 86400,
+        'Practitioner': 86400,
+        'Medication': 86400,
+    },
+}
+
+# Bulk reference resolution (apps.core.fhir.resolver): 'search' uses
+# <Type>?_id=a,b,c searches, 'batch' POSTs a FHIR batch Bundle
+FHIR_BULK_RESOLVE_MODE = config('FHIR_BULK_RESOLVE_MODE', default='search')
+FHIR_BULK_RESOLVE_CHUNK_SIZE = config('FHIR_BULK_RESOLVE_CHUNK_SIZE', default=50, cast=int)
+
+# Incremental monitor polling (apps.core.models.MonitorCursor): each cycle
+# queries _lastUpdated=gt<watermark - overlap> instead of the full lookback
+MONITOR_CURSOR_OVERLAP_SECONDS = config('MONITOR_CURSOR_OVERLAP_SECONDS', default=300, cast=int)
+
 # HAI Detection Configuration
 HAI_DETECTION = {
     'LLM_BACKEND': 'ollama',
@@ -485,6 +511,13 @@ NHSN_REPORTING = {
     'AU_INCLUDE_ORAL': config('NHSN_AU_INCLUDE_ORAL', default=True, cast=bool),
     'AR_SPECIMEN_TYPES': config('NHSN_AR_SPECIMEN_TYPES', default='Blood,Urine,Respiratory,CSF', cast=lambda v: [s.strip() for s in v.split(',')]),
     'AR_FIRST_ISOLATE_ONLY': config('NHSN_AR_FIRST_ISOLATE_ONLY', default=True, cast=bool),
+    # Nightly extract: days before the last run to recompute (late documentation)
+    'EXTRACT_REOPEN_DAYS': config('NHSN_EXTRACT_REOPEN_DAYS', default=45, cast=int),
+    # Months to backfill when no extraction watermark exists yet
+    'EXTRACT_BACKFILL_MONTHS': config('NHSN_EXTRACT_BACKFILL_MONTHS', default=12, cast=int),
+    # Clarity concurrency budget: shared connection pool size (no overflow)
+    'CLARITY_MAX_CONNECTIONS': config('NHSN_CLARITY_MAX_CONNECTIONS', default=3, cast=int),
+    'CLARITY_POOL_TIMEOUT': config('NHSN_CLARITY_POOL_TIMEOUT', default=300, cast=int),
     'DIRECT_HISP_SERVER': config('NHSN_HISP_SMTP_SERVER', default=None),
     'DIRECT_HISP_PORT': config('NHSN_HISP_SMTP_PORT', default=587, cast=int),
     'DIRECT_HISP_USERNAME': config('NHSN_HISP_USERNAME', default=None),
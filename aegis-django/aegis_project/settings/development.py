@@ -20,6 +20,15 @@ DATABASES = {
     }
 }
 
+# Cache - file-based stand-in for Redis so local worker processes share
+# cached data (e.g. Epic OAuth tokens)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': config('DJANGO_CACHE_DIR', default='/tmp/aegis-django-cache'),
+    }
+}
+
 # Disable HTTPS requirements for local development
 SESSION_COOKIE_SECURE = False
 CSRF_COOKIE_SECURE = False
@@ -83,6 +83,9 @@ CACHES = {
     }
 }
 
+# Share cached FHIR resources between workers through Redis
+FHIR_RESOURCE_CACHE['SHARED_CACHE_ALIAS'] = 'default'
+
 # Session backend - use cache
 SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
 SESSION_CACHE_ALIAS = 'default'
@@ -12,6 +12,8 @@ from datetime import datetime, timedelta
 import requests
 from django.conf import settings
 
+from apps.core.fhir.cache import read_resource
+
 from .logic.config import Config
 
 logger = logging.getLogger(__name__)
@@ -410,7 +412,7 @@ class FHIRClient:
 
         # Patient demographics
         try:
-            patient = self.get(f"Patient/{patient_id}")
+            patient = read_resource(self, "Patient", patient_id)
             info.update(self._parse_patient(patient))
         except requests.RequestException as e:
             logger.error(f"Failed to fetch patient {patient_id}: {e}")
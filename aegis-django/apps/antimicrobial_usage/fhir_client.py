@@ -5,13 +5,15 @@ antibiotic usage duration. Adapted from Flask fhir_client.py for Django.
 """
 
 import logging
-import time
 from abc import ABC, abstractmethod
-from datetime import datetime, timedelta
+from datetime import datetime
 
 import requests
 from django.conf import settings
 
+from apps.core.fhir.cache import read_resource
+from apps.core.fhir.tokens import get_epic_token_provider, send_with_token
+
 from .data_models import Patient, MedicationOrder
 
 logger = logging.getLogger(__name__)
@@ -44,7 +46,7 @@ class FHIRClient(ABC):
     def get_patient(self, patient_id: str) -> Patient | None:
         """Get a patient by ID and convert to model."""
         try:
-            resource = self.get(f"Patient/{patient_id}")
+            resource = read_resource(self, "Patient", patient_id)
             return self._resource_to_patient(resource)
         except requests.HTTPError as e:
             if e.response.status_code == 404:
@@ -214,9 +216,6 @@ class EpicFHIRClient(FHIRClient):
         self.client_id = client_id or getattr(settings, 'EPIC_CLIENT_ID', '')
         self.private_key_path = private_key_path or getattr(settings, 'EPIC_PRIVATE_KEY_PATH', '')
 
-        self.access_token: str | None = None
-        self.token_expires_at: datetime | None = None
-
         self.session = requests.Session()
         self.session.headers.update({
             "Accept": "application/fhir+json",
@@ -235,55 +234,19 @@ class EpicFHIRClient(FHIRClient):
         return f"{base}/oauth2/token"
 
     def _get_access_token(self) -> str:
-        """OAuth 2.0 JWT bearer flow for backend apps."""
-        import jwt
-
-        if self.access_token and self.token_expires_at:
-            if self.token_expires_at > datetime.now():
-                return self.access_token
-
-        if not self.private_key:
-            raise ValueError("Private key not loaded - cannot authenticate to Epic")
-
-        token_url = self._get_token_url()
-        now = int(time.time())
-
-        claims = {
-            "iss": self.client_id,
-            "sub": self.client_id,
-            "aud": token_url,
-            "jti": f"{now}-{self.client_id}",
-            "exp": now + 300,
-        }
-
-        assertion = jwt.encode(claims, self.private_key, algorithm="RS384")
-
-        response = requests.post(
-            token_url,
-            data={
-                "grant_type": "client_credentials",
-                "client_assertion_type": "urn:ietf:params:oauth:client-assertion-type:jwt-bearer",
-                "client_assertion": assertion,
-            },
-        )
-        response.raise_for_status()
+        """OAuth 2.0 JWT bearer flow for backend apps (shared token cache)."""
+        return self._token_provider().get_token()
 
-        token_data = response.json()
-        self.access_token = token_data["access_token"]
-        expires_in = token_data.get("expires_in", 3600)
-        self.token_expires_at = datetime.now() + timedelta(seconds=expires_in - 60)
-
-        return self.access_token
+    def _token_provider(self):
+        return get_epic_token_provider(self.client_id, self.private_key, self._get_token_url())
 
     def get(self, resource_path: str, params: dict | None = None) -> dict:
         """GET request with OAuth authentication."""
-        token = self._get_access_token()
-
-        response = self.session.get(
+        response = send_with_token(self._token_provider(), lambda token: self.session.get(
             f"{self.base_url}/{resource_path}",
             params=params,
             headers={"Authorization": f"Bearer {token}"},
-        )
+        ))
         response.raise_for_status()
         return response.json()
 
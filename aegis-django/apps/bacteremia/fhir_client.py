@@ -142,8 +142,16 @@ class BacteremiaFHIRClient:
             status=med_request.get("status", "active"),
         )
 
-    def get_recent_blood_cultures(self, hours_back: int = 24) -> list[CultureResult]:
-        """Get recent blood culture reports."""
+    def get_recent_blood_cultures(
+        self,
+        hours_back: int = 24,
+        updated_since: datetime | None = None,
+    ) -> list[CultureResult]:
+        """Get recent blood culture reports.
+
+        If updated_since is given, only cultures that changed, or whose
+        patient's medication orders changed, are returned.
+        """
         date_from = datetime.now() - timedelta(hours=hours_back)
         params = {
             "code": "http://loinc.org|600-7",  # Blood culture LOINC
@@ -151,8 +159,11 @@ class BacteremiaFHIRClient:
             "date": f"ge{date_from.strftime('%Y-%m-%dT%H:%M:%S')}",
             "_count": "500",
         }
-        response = self.fhir.get("DiagnosticReport", params)
-        entries = self.fhir._extract_entries(response)
+        if updated_since is not None:
+            entries = self.fhir.search_changed("DiagnosticReport", params, updated_since)
+        else:
+            response = self.fhir.get("DiagnosticReport", params)
+            entries = self.fhir._extract_entries(response)
 
         cultures = []
         for entry in entries:
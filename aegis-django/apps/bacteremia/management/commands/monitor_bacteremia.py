@@ -4,6 +4,7 @@ Management command to monitor blood cultures for inadequate coverage.
 Usage:
     python manage.py monitor_bacteremia --once --hours 24
     python manage.py monitor_bacteremia --continuous --interval 300
+    python manage.py monitor_bacteremia --once --reset-cursor
 """
 
 import logging
@@ -11,6 +12,7 @@ import time
 
 from django.core.management.base import BaseCommand
 
+from apps.core.cursors import add_cursor_arguments, apply_cursor_options
 from apps.bacteremia.services import BacteremiaMonitorService
 from apps.bacteremia.fhir_client import BacteremiaFHIRClient, HAPIFHIRClient
 
@@ -48,6 +50,7 @@ class Command(BaseCommand):
             type=str,
             help='Override FHIR server URL',
         )
+        add_cursor_arguments(parser)
 
     def handle(self, *args, **options):
         lookback_hours = options['hours']
@@ -61,20 +64,26 @@ class Command(BaseCommand):
             )
 
         service = BacteremiaMonitorService()
+        use_cursor = apply_cursor_options(self, [service.CURSOR_NAME], options)
 
         if options.get('continuous'):
-            self._run_continuous(service, fhir_client, lookback_hours, interval)
+            self._run_continuous(
+                service, fhir_client, lookback_hours, interval, use_cursor,
+            )
         else:
             result = service.run_detection(
                 hours_back=lookback_hours,
                 fhir_client=fhir_client,
+                use_cursor=use_cursor,
             )
             self.stdout.write(self.style.SUCCESS(
                 f"Check complete: {result['cultures_checked']} cultures checked, "
                 f"{result['alerts_created']} alerts created"
             ))
 
-    def _run_continuous(self, service, fhir_client, lookback_hours, interval):
+    def _run_continuous(
+        self, service, fhir_client, lookback_hours, interval, use_cursor=True,
+    ):
         """Run continuous monitoring loop."""
         self.stdout.write('=' * 60)
         self.stdout.write('Bacteremia Monitor - Starting')
@@ -87,6 +96,7 @@ class Command(BaseCommand):
                 result = service.run_detection(
                     hours_back=lookback_hours,
                     fhir_client=fhir_client,
+                    use_cursor=use_cursor,
                 )
                 self.stdout.write(
                     f"Cycle complete: {result['alerts_created']} alerts created"
@@ -7,7 +7,10 @@ called from both the management command (CLI) and Celery tasks.
 
 import logging
 
+from django.utils import timezone
+
 from apps.alerts.models import Alert, AlertAudit, AlertType, AlertStatus, AlertSeverity
+from apps.core.models import MonitorCursor
 from .fhir_client import BacteremiaFHIRClient
 from .matcher import assess_coverage, should_alert
 
@@ -17,13 +20,17 @@ logger = logging.getLogger(__name__)
 class BacteremiaMonitorService:
     """Service for bacteremia coverage monitoring."""
 
-    def run_detection(self, hours_back=24, fhir_client=None):
+    CURSOR_NAME = 'bacteremia'
+
+    def run_detection(self, hours_back=24, fhir_client=None, use_cursor=True):
         """
         Run a single bacteremia coverage detection cycle.
 
         Args:
             hours_back: Hours to look back for blood cultures.
             fhir_client: Optional pre-configured FHIR client.
+            use_cursor: Only fetch cultures changed since the last
+                successful cycle (MonitorCursor), then advance it.
 
         Returns:
             Dict with keys: cultures_checked, alerts_created, errors.
@@ -39,9 +46,14 @@ class BacteremiaMonitorService:
 
         processed_cultures = set()
 
+        cursor = MonitorCursor.for_monitor(self.CURSOR_NAME) if use_cursor else None
+        updated_since = cursor.since() if cursor else None
+        cycle_started = timezone.now()
+
         try:
             cultures = fhir_client.get_recent_blood_cultures(
-                hours_back=hours_back
+                hours_back=hours_back,
+                updated_since=updated_since,
             )
             result['cultures_checked'] = len(cultures)
             logger.info(
@@ -70,6 +82,9 @@ class BacteremiaMonitorService:
                 'error': str(e),
             })
 
+        if cursor and not result['errors']:
+            cursor.advance(cycle_started)
+
         logger.info(
             f"Bacteremia check complete: {result['cultures_checked']} cultures, "
             f"{result['alerts_created']} alerts created"
@@ -0,0 +1,82 @@
+"""
+Management command helpers for monitor polling cursors.
+
+Monitors that poll FHIR on a schedule keep a MonitorCursor per monitor so
+each cycle only fetches resources changed since the last one. These helpers
+give every ``monitor_*`` command the same options for resetting or
+backfilling the cursor.
+"""
+
+from datetime import datetime, time
+
+from django.core.management.base import CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import MonitorCursor
+
+
+def add_cursor_arguments(parser):
+    """Add --reset-cursor, --cursor-since and --no-cursor to a command parser."""
+    parser.add_argument(
+        '--reset-cursor',
+        action='store_true',
+        help='Clear the polling watermark so the next run re-scans the full lookback window',
+    )
+    parser.add_argument(
+        '--cursor-since',
+        type=str,
+        default=None,
+        help=(
+            'Backfill: set the polling watermark to this ISO date/datetime before '
+            'running (combine with a lookback that reaches back that far)'
+        ),
+    )
+    parser.add_argument(
+        '--no-cursor',
+        action='store_true',
+        help='Ignore the polling watermark for this run (full lookback, watermark untouched)',
+    )
+
+
+def parse_cursor_since(value):
+    """Parse a --cursor-since value into an aware datetime."""
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise CommandError(f"Invalid --cursor-since value: {value!r}")
+        parsed = datetime.combine(day, time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def apply_cursor_options(command, cursor_names, options):
+    """
+    Apply cursor options for the given monitor cursors.
+
+    Args:
+        command: The running BaseCommand (used for output).
+        cursor_names: Cursor names the command's monitor uses.
+        options: Parsed command options.
+
+    Returns:
+        True if the run should use the cursor, False for --no-cursor.
+    """
+    if options.get('reset_cursor') and options.get('cursor_since'):
+        raise CommandError("Use either --reset-cursor or --cursor-since, not both")
+
+    since = None
+    if options.get('cursor_since'):
+        since = parse_cursor_since(options['cursor_since'])
+
+    if options.get('reset_cursor') or since is not None:
+        for name in cursor_names:
+            MonitorCursor.for_monitor(name).reset(since)
+        if since is not None:
+            command.stdout.write(f"Polling cursor set to {since.isoformat()}")
+        else:
+            command.stdout.write("Polling cursor reset (full lookback on next run)")
+
+    return not options.get('no_cursor')
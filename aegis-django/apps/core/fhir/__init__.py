@@ -10,16 +10,23 @@ Usage::
     client = get_fhir_client()
     bundle = client.get("Patient", {"_count": "10"})
     entries = client.extract_entries(bundle)
+
+    # Patient/Encounter/Location reads through the shared resource cache
+    patient = read_resource(client, "Patient", patient_id)
 """
 
 from .base import BaseFHIRClient, HAPIFHIRClient
+from .cache import FHIRResourceCache, get_resource_cache, read_resource
 from .factory import get_fhir_client
 from .oauth import EpicFHIRClient
+from .tokens import EpicTokenProvider, get_epic_token_provider
+from .resolver import parse_reference, resolve_references
 from .parsers import (
     extract_bundle_entries,
     extract_encounter_location,
     extract_patient_mrn,
     extract_patient_name,
+    format_last_updated,
     parse_fhir_datetime,
     parse_susceptibility_observation,
 )
@@ -28,11 +35,19 @@ __all__ = [
     "BaseFHIRClient",
     "HAPIFHIRClient",
     "EpicFHIRClient",
+    "EpicTokenProvider",
+    "FHIRResourceCache",
+    "get_epic_token_provider",
     "get_fhir_client",
+    "get_resource_cache",
+    "read_resource",
+    "parse_reference",
+    "resolve_references",
     "extract_bundle_entries",
     "extract_encounter_location",
     "extract_patient_mrn",
     "extract_patient_name",
+    "format_last_updated",
     "parse_fhir_datetime",
     "parse_susceptibility_observation",
 ]
@@ -9,6 +9,8 @@ from abc import ABC, abstractmethod
 import requests
 from django.conf import settings
 
+from .resolver import resolve_references as _resolve_references
+
 
 class BaseFHIRClient(ABC):
     """Abstract FHIR client interface.
@@ -26,6 +28,23 @@ class BaseFHIRClient(ABC):
         """POST a FHIR resource. Override in subclasses that need writes."""
         raise NotImplementedError("This FHIR client does not support POST")
 
+    def resolve_references(
+        self,
+        references: list[str],
+        resource_type: str | None = None,
+        mode: str | None = None,
+        chunk_size: int | None = None,
+        raise_errors: bool = False,
+    ) -> dict[str, dict]:
+        """Fetch many referenced resources in a few requests.
+
+        See apps.core.fhir.resolver.resolve_references().
+
+        Returns:
+            Dict of "Type/id" to resource for every reference found.
+        """
+        return _resolve_references(self, references, resource_type, mode, chunk_size, raise_errors)
+
     @staticmethod
     def extract_entries(bundle: dict) -> list[dict]:
         """Extract resource entries from a FHIR Bundle.
@@ -79,6 +98,26 @@ class HAPIFHIRClient(BaseFHIRClient):
         response.raise_for_status()
         return response.json()
 
+    def get_conditional(
+        self, resource_path: str, etag: str | None = None,
+    ) -> tuple[dict | None, str | None]:
+        """GET with If-None-Match.
+
+        Returns:
+            (resource, etag), or (None, etag) if the server answered
+            304 Not Modified.
+        """
+        headers = {"If-None-Match": etag} if etag else {}
+        response = self.session.get(
+            f"{self.base_url}/{resource_path}",
+            headers=headers,
+            timeout=self.timeout,
+        )
+        if response.status_code == 304:
+            return None, response.headers.get("ETag", etag)
+        response.raise_for_status()
+        return response.json(), response.headers.get("ETag")
+
     def post(self, resource_path: str, resource: dict) -> dict:
         """POST request to FHIR server."""
         response = self.session.post(
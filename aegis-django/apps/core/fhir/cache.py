@@ -0,0 +1,322 @@
+"""Shared read-through cache for slowly changing FHIR resources.
+
+Polling tasks look up the same Patient, Encounter and Location resources
+many times per cycle (one lookup per culture, order or alert). The
+resource cache keeps those reads in memory for a per-type TTL:
+
+- Only resource types with a configured TTL are cached; everything else
+  is fetched every time.
+- Memory use is bounded (LRU eviction beyond MAX_ENTRIES).
+- When an entry expires it is revalidated with a conditional GET
+  (If-None-Match on the ETag, or W/"<meta.versionId>"), so an unchanged
+  resource costs a 304 instead of a full read. Clients without
+  get_conditional() simply re-read.
+- An optional shared tier (a Django cache alias, e.g. Redis) lets workers
+  and processes reuse each other's reads.
+
+Configured by settings.FHIR_RESOURCE_CACHE::
+
+    FHIR_RESOURCE_CACHE = {
+        'ENABLED': True,
+        'MAX_ENTRIES': 5000,
+        'SHARED_CACHE_ALIAS': None,   # e.g. 'default' to share via Redis
+        'TTL': {'Patient': 3600, 'Encounter': 300, 'Location': 86400},
+    }
+
+Usage::
+
+    from apps.core.fhir import read_resource
+
+    patient = read_resource(client, "Patient", patient_id)
+"""
+
+import copy
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTLS = {
+    "Patient": 3600,
+    "Encounter": 300,
+    "Location": 86400,
+    "Organization": 86400,
+    "Practitioner": 86400,
+    "Medication": 86400,
+}
+DEFAULT_MAX_ENTRIES = 5000
+
+# get_conditional(resource_path, etag) -> (resource or None if not modified, etag)
+ConditionalGet = Callable[[str, str | None], tuple[dict | None, str | None]]
+
+
+def resource_etag(resource: dict, etag: str | None = None) -> str | None:
+    """ETag to revalidate a resource with: the server's, else from meta.versionId."""
+    if etag:
+        return etag
+    version_id = resource.get("meta", {}).get("versionId")
+    return f'W/"{version_id}"' if version_id else None
+
+
+@dataclass
+class _Entry:
+    resource: dict
+    etag: str | None
+    expires_at: float
+
+
+class FHIRResourceCache:
+    """Bounded, per-type TTL cache of FHIR resources keyed by server and id.
+
+    Thread-safe; one instance is shared by every client in the process
+    (see get_resource_cache()).
+
+    Args:
+        ttls: Seconds to cache each resource type. Types not listed are
+            not cached. Defaults to DEFAULT_TTLS.
+        max_entries: In-memory size limit.
+        shared_cache_alias: Optional Django cache alias for a shared tier.
+        enabled: If False, read() always fetches.
+    """
+
+    def __init__(
+        self,
+        ttls: dict[str, int] | None = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        shared_cache_alias: str | None = None,
+        enabled: bool = True,
+    ):
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.max_entries = max_entries
+        self.shared_cache_alias = shared_cache_alias
+        self.enabled = enabled
+
+        self._entries: OrderedDict[tuple[str, str, str], _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "shared_hits": 0,
+            "misses": 0,
+            "revalidated": 0,
+            "evictions": 0,
+            "uncached": 0,
+        }
+
+    def read(
+        self,
+        resource_type: str,
+        resource_id: str,
+        get: Callable[[str], dict],
+        source: str = "",
+        get_conditional: ConditionalGet | None = None,
+    ) -> dict:
+        """Return a resource, from the cache when possible.
+
+        Args:
+            resource_type: FHIR resource type, e.g. "Patient".
+            resource_id: Resource id (without the type prefix).
+            get: Fetches a resource path, e.g. client.get.
+            source: Identifies the FHIR server (usually its base URL), so
+                ids from different servers never collide.
+            get_conditional: Optional conditional GET used to revalidate
+                expired entries.
+
+        Returns:
+            The resource dict (a copy; callers may modify it).
+
+        Raises:
+            Whatever get() raises (e.g. requests.HTTPError); errors are
+            never cached.
+        """
+        path = f"{resource_type}/{resource_id}"
+        ttl = self.ttls.get(resource_type)
+        if not self.enabled or not ttl:
+            self._count("uncached")
+            return get(path)
+
+        key = (source, resource_type, resource_id)
+        now = time.time()
+
+        entry = self._get_local(key)
+        if entry and entry.expires_at > now:
+            self._count("hits")
+            return copy.deepcopy(entry.resource)
+
+        shared = self._get_shared(key)
+        if shared and shared.expires_at > now:
+            self._put_local(key, shared)
+            self._count("shared_hits")
+            return copy.deepcopy(shared.resource)
+        entry = entry or shared
+
+        if entry and entry.etag and get_conditional:
+            resource, etag = get_conditional(path, entry.etag)
+            if resource is None:
+                # 304 Not Modified: keep the cached body for another TTL
+                self._count("revalidated")
+                entry = _Entry(entry.resource, etag or entry.etag, now + ttl)
+                self._store(key, entry, ttl)
+                return copy.deepcopy(entry.resource)
+        else:
+            resource, etag = get(path), None
+
+        self._count("misses")
+        self._store(key, _Entry(resource, resource_etag(resource, etag), now + ttl), ttl)
+        return copy.deepcopy(resource)
+
+    def peek(self, resource_type: str, resource_id: str, source: str = "") -> dict | None:
+        """Return a cached resource if it is still fresh, without fetching."""
+        if not self.enabled or not self.ttls.get(resource_type):
+            return None
+
+        key = (source, resource_type, resource_id)
+        now = time.time()
+        entry = self._get_local(key)
+        if entry and entry.expires_at > now:
+            self._count("hits")
+            return copy.deepcopy(entry.resource)
+
+        shared = self._get_shared(key)
+        if shared and shared.expires_at > now:
+            self._put_local(key, shared)
+            self._count("shared_hits")
+            return copy.deepcopy(shared.resource)
+
+        self._count("misses")
+        return None
+
+    def put(self, resource_type: str, resource_id: str, resource: dict, source: str = "") -> None:
+        """Add a resource fetched some other way (e.g. a search or batch)."""
+        ttl = self.ttls.get(resource_type)
+        if not self.enabled or not ttl:
+            return
+        entry = _Entry(copy.deepcopy(resource), resource_etag(resource), time.time() + ttl)
+        self._store((source, resource_type, resource_id), entry, ttl)
+
+    def invalidate(self, resource_type: str, resource_id: str, source: str = "") -> None:
+        """Drop one resource, e.g. after writing it."""
+        key = (source, resource_type, resource_id)
+        with self._lock:
+            self._entries.pop(key, None)
+        shared = self._shared_cache()
+        if shared is not None:
+            try:
+                shared.delete(self._shared_key(key))
+            except Exception as e:
+                logger.warning(f"FHIR resource cache delete failed: {e}")
+
+    def clear(self) -> None:
+        """Empty the in-memory tier (the shared tier expires on its own)."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Hit/miss counters for this process and the current entry count."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        lookups = stats["hits"] + stats["shared_hits"] + stats["revalidated"] + stats["misses"]
+        stats["hit_rate"] = (
+            round((stats["hits"] + stats["shared_hits"]) / lookups, 3) if lookups else 0.0
+        )
+        stats["enabled"] = self.enabled
+        stats["max_entries"] = self.max_entries
+        return stats
+
+    def _get_local(self, key: tuple) -> _Entry | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _put_local(self, key: tuple, entry: _Entry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def _store(self, key: tuple, entry: _Entry, ttl: int) -> None:
+        self._put_local(key, entry)
+        shared = self._shared_cache()
+        if shared is not None:
+            try:
+                # Keep it past expiry so other processes can still revalidate it
+                shared.set(
+                    self._shared_key(key),
+                    {"resource": entry.resource, "etag": entry.etag, "expires_at": entry.expires_at},
+                    timeout=ttl * 2,
+                )
+            except Exception as e:
+                logger.warning(f"FHIR resource cache write failed: {e}")
+
+    def _get_shared(self, key: tuple) -> _Entry | None:
+        shared = self._shared_cache()
+        if shared is None:
+            return None
+        try:
+            data = shared.get(self._shared_key(key))
+        except Exception as e:
+            logger.warning(f"FHIR resource cache read failed: {e}")
+            return None
+        return _Entry(data["resource"], data["etag"], data["expires_at"]) if data else None
+
+    def _shared_cache(self):
+        return caches[self.shared_cache_alias] if self.shared_cache_alias else None
+
+    @staticmethod
+    def _shared_key(key: tuple) -> str:
+        source, resource_type, resource_id = key
+        digest = hashlib.sha256(source.encode()).hexdigest()[:12]
+        return f"fhir_resource:{digest}:{resource_type}/{resource_id}"
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self._stats[counter] += 1
+
+
+# Global instance for easy access
+_resource_cache: FHIRResourceCache | None = None
+_resource_cache_lock = threading.Lock()
+
+
+def get_resource_cache() -> FHIRResourceCache:
+    """Get the process-wide resource cache, configured from settings."""
+    global _resource_cache
+    with _resource_cache_lock:
+        if _resource_cache is None:
+            config = getattr(settings, 'FHIR_RESOURCE_CACHE', {})
+            _resource_cache = FHIRResourceCache(
+                ttls={**DEFAULT_TTLS, **config.get('TTL', {})},
+                max_entries=config.get('MAX_ENTRIES', DEFAULT_MAX_ENTRIES),
+                shared_cache_alias=config.get('SHARED_CACHE_ALIAS'),
+                enabled=config.get('ENABLED', True),
+            )
+    return _resource_cache
+
+
+def read_resource(client: Any, resource_type: str, resource_id: str) -> dict:
+    """Read a resource through the shared cache.
+
+    Works with any FHIR client that has get(resource_path); clients that
+    also provide get_conditional() (the core clients do) revalidate expired
+    entries with conditional GETs.
+    """
+    return get_resource_cache().read(
+        resource_type,
+        resource_id,
+        client.get,
+        source=getattr(client, "base_url", "") or "",
+        get_conditional=getattr(client, "get_conditional", None),
+    )
@@ -1,23 +1,24 @@
 """Epic FHIR client with OAuth 2.0 JWT bearer token flow.
 
 Implements the backend-services authorization profile used by Epic's
-FHIR API. Uses RS384 signed JWT assertions to obtain access tokens.
+FHIR API. Uses RS384 signed JWT assertions to obtain access tokens,
+which are cached by apps.core.fhir.tokens.
 """
 
-import time
-from datetime import datetime, timedelta
-
 import requests
 from django.conf import settings
 
 from .base import BaseFHIRClient
+from .tokens import get_epic_token_provider, send_with_token
 
 
 class EpicFHIRClient(BaseFHIRClient):
     """Client for Epic FHIR API with OAuth 2.0 backend auth.
 
     Uses JWT bearer token flow (RS384) for service-to-service auth.
-    Tokens are cached and refreshed automatically.
+    Tokens are shared across clients and processes through the Django
+    cache and refreshed automatically (see tokens.py). A request answered
+    with 401 is retried once with a new token.
 
     Args:
         base_url: Epic FHIR base URL. Defaults to settings.EPIC_FHIR_BASE_URL.
@@ -46,9 +47,6 @@ class EpicFHIRClient(BaseFHIRClient):
         self._token_url = token_url or getattr(settings, 'EPIC_TOKEN_URL', '')
         self.timeout = timeout
 
-        self.access_token: str | None = None
-        self.token_expires_at: datetime | None = None
-
         self.session = requests.Session()
         self.session.headers.update({
             "Accept": "application/fhir+json",
@@ -70,10 +68,10 @@ class EpicFHIRClient(BaseFHIRClient):
         return f"{base}/oauth2/token"
 
     def _get_access_token(self) -> str:
-        """Obtain or return cached OAuth 2.0 access token.
+        """Return a valid OAuth 2.0 access token.
 
-        Uses JWT bearer flow for backend service authentication.
-        Caches token and refreshes 60 seconds before expiry.
+        Tokens come from the shared EpicTokenProvider, so clients in every
+        worker and process reuse one token until it is close to expiry.
 
         Returns:
             Valid access token string.
@@ -82,77 +80,57 @@ class EpicFHIRClient(BaseFHIRClient):
             ValueError: If private key is not loaded.
             ImportError: If PyJWT is not installed.
         """
-        # Return cached token if still valid
-        if self.access_token and self.token_expires_at:
-            if self.token_expires_at > datetime.now():
-                return self.access_token
-
-        if not self.private_key:
-            raise ValueError("Private key not loaded - cannot authenticate to Epic")
-
-        try:
-            import jwt
-        except ImportError:
-            raise ImportError(
-                "PyJWT is required for Epic OAuth. Install it with: "
-                "pip install PyJWT[crypto]"
-            )
+        return self._token_provider().get_token()
 
-        token_url = self._get_token_url()
-        now = int(time.time())
-
-        # Build JWT assertion
-        claims = {
-            "iss": self.client_id,
-            "sub": self.client_id,
-            "aud": token_url,
-            "jti": f"{now}-{self.client_id}",
-            "exp": now + 300,  # 5 minute expiry
-        }
-
-        assertion = jwt.encode(claims, self.private_key, algorithm="RS384")
-
-        # Request access token
-        response = requests.post(
-            token_url,
-            data={
-                "grant_type": "client_credentials",
-                "client_assertion_type": (
-                    "urn:ietf:params:oauth:client-assertion-type:jwt-bearer"
-                ),
-                "client_assertion": assertion,
-            },
-            timeout=self.timeout,
+    def _token_provider(self):
+        return get_epic_token_provider(
+            self.client_id, self.private_key, self._get_token_url(), timeout=self.timeout,
         )
-        response.raise_for_status()
-
-        token_data = response.json()
-        self.access_token = token_data["access_token"]
-        expires_in = token_data.get("expires_in", 3600)
-        self.token_expires_at = datetime.now() + timedelta(seconds=expires_in - 60)
-
-        return self.access_token
 
     def get(self, resource_path: str, params: dict | None = None) -> dict:
         """GET request with OAuth authentication."""
-        token = self._get_access_token()
-        response = self.session.get(
+        response = send_with_token(self._token_provider(), lambda token: self.session.get(
             f"{self.base_url}/{resource_path}",
             params=params,
             headers={"Authorization": f"Bearer {token}"},
             timeout=self.timeout,
-        )
+        ))
         response.raise_for_status()
         return response.json()
 
+    def get_conditional(
+        self, resource_path: str, etag: str | None = None,
+    ) -> tuple[dict | None, str | None]:
+        """GET with If-None-Match and OAuth authentication.
+
+        Returns:
+            (resource, etag), or (None, etag) if the server answered
+            304 Not Modified.
+        """
+
+        def send(token):
+            headers = {"Authorization": f"Bearer {token}"}
+            if etag:
+                headers["If-None-Match"] = etag
+            return self.session.get(
+                f"{self.base_url}/{resource_path}",
+                headers=headers,
+                timeout=self.timeout,
+            )
+
+        response = send_with_token(self._token_provider(), send)
+        if response.status_code == 304:
+            return None, response.headers.get("ETag", etag)
+        response.raise_for_status()
+        return response.json(), response.headers.get("ETag")
+
     def post(self, resource_path: str, resource: dict) -> dict:
         """POST request with OAuth authentication."""
-        token = self._get_access_token()
-        response = self.session.post(
+        response = send_with_token(self._token_provider(), lambda token: self.session.post(
             f"{self.base_url}/{resource_path}",
             json=resource,
             headers={"Authorization": f"Bearer {token}"},
             timeout=self.timeout,
-        )
+        ))
         response.raise_for_status()
         return response.json()
@@ -0,0 +1,74 @@
+"""Reading every page of a FHIR search.
+
+A search Bundle holds one page of matches; the rest sit behind its
+``link[rel=next]`` URL. Incremental polls have to read every page, or
+changes past the first page are skipped while the cursor moves beyond them.
+
+search_all() follows next links with the client's get_page(url). A client
+without get_page cannot follow them, so a multi-page result raises instead
+of being silently truncated.
+
+Usage::
+
+    from apps.core.fhir.paging import search_all
+
+    reports = search_all(client, "DiagnosticReport", params)
+"""
+
+import logging
+from typing import Any
+
+from .parsers import extract_bundle_entries
+
+logger = logging.getLogger(__name__)
+
+
+class IncompleteSearchError(Exception):
+    """A search had more pages than could be read."""
+
+
+def next_page_url(bundle: dict) -> str | None:
+    """Get the URL of a search Bundle's next page, if there is one."""
+    for link in bundle.get("link", []):
+        if link.get("relation") == "next" and link.get("url"):
+            return link["url"]
+    return None
+
+
+def search_all(client: Any, resource_path: str, params: dict | None = None) -> list[dict]:
+    """Run a search and return the resources from every page.
+
+    Args:
+        client: FHIR client with get(resource_path, params) and, to follow
+            next links, get_page(url) and base_url.
+        resource_path: Resource type to search.
+        params: Search parameters for the first page.
+
+    Returns:
+        Resources from all pages, in server order.
+
+    Raises:
+        IncompleteSearchError: If a next link cannot be followed (client
+            without get_page, or a link off the client's server).
+    """
+    bundle = client.get(resource_path, params)
+    resources = extract_bundle_entries(bundle)
+    seen: set[str] = set()
+
+    while (url := next_page_url(bundle)) is not None:
+        if url in seen:
+            logger.warning(f"FHIR {resource_path} search returned a repeated next link, stopping")
+            break
+        seen.add(url)
+
+        base_url = getattr(client, "base_url", None) or ""
+        if not hasattr(client, "get_page") or not base_url or not url.startswith(base_url):
+            raise IncompleteSearchError(
+                f"{resource_path} search has more than one page and the next link "
+                f"cannot be followed ({len(resources)} results read)"
+            )
+        bundle = client.get_page(url)
+        resources.extend(extract_bundle_entries(bundle))
+
+    return resources
+
@@ -4,7 +4,7 @@ These functions extract common data elements from FHIR resource dicts.
 They have no dependency on any FHIR client class and can be used anywhere.
 """
 
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 
 
@@ -52,6 +52,24 @@ def parse_fhir_datetime(dt_string: str | None) -> Optional[datetime]:
             return None
 
 
+def format_last_updated(since: datetime) -> str:
+    """Format a ``_lastUpdated`` search value for resources changed after ``since``.
+
+    Aware datetimes are converted to UTC with a Z suffix; naive datetimes
+    are sent as-is (server local time).
+
+    Args:
+        since: Lower bound (exclusive) for resource meta.lastUpdated.
+
+    Returns:
+        Search parameter value, e.g. ``gt2024-01-15T10:30:00Z``.
+    """
+    if since.tzinfo is not None:
+        since = since.astimezone(timezone.utc).replace(tzinfo=None)
+        return f"gt{since.strftime('%Y-%m-%dT%H:%M:%S')}Z"
+    return f"gt{since.strftime('%Y-%m-%dT%H:%M:%S')}"
+
+
 def extract_patient_name(patient_resource: dict) -> str:
     """Extract formatted patient name from a FHIR Patient resource.
 
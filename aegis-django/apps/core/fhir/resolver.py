@@ -0,0 +1,161 @@
+"""Bulk resolution of FHIR references.
+
+Polling code often holds a list of resources (MedicationRequests,
+DiagnosticReports) whose subject/encounter references all need resolving.
+Reading them one at a time costs one round-trip per reference.
+resolve_references() deduplicates the references and fetches them in a
+handful of requests instead, either:
+
+- "search": one ``<Type>?_id=a,b,c`` search per chunk of ids, or
+- "batch": one ``batch`` Bundle POST per chunk of references.
+
+Resources that are fresh in the shared resource cache are not fetched
+again, and everything fetched is added to it, so later read_resource()
+calls for the same ids are cache hits.
+
+Usage::
+
+    from apps.core.fhir import resolve_references
+
+    refs = [r["subject"]["reference"] for r in med_requests]
+    patients = resolve_references(client, refs)   # {"Patient/123": {...}}
+"""
+
+import logging
+from collections import defaultdict
+from typing import Any
+
+from django.conf import settings
+
+from .cache import get_resource_cache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 50
+
+
+def parse_reference(reference: str, resource_type: str | None = None) -> tuple[str, str] | None:
+    """Split a reference into (type, id).
+
+    Accepts relative ("Patient/123"), absolute ("https://.../Patient/123")
+    and versioned (".../_history/2") references. A bare id needs
+    resource_type. Returns None for contained ("#...") or unusable references.
+    """
+    if not reference or reference.startswith("#"):
+        return None
+    parts = reference.rstrip("/").split("/")
+    if len(parts) >= 4 and parts[-2] == "_history":
+        parts = parts[:-2]
+    if len(parts) >= 2:
+        return parts[-2], parts[-1]
+    if resource_type:
+        return resource_type, parts[0]
+    return None
+
+
+def resolve_references(
+    client: Any,
+    references: list[str],
+    resource_type: str | None = None,
+    mode: str | None = None,
+    chunk_size: int | None = None,
+    raise_errors: bool = False,
+) -> dict[str, dict]:
+    """Fetch every referenced resource in as few requests as possible.
+
+    Args:
+        client: FHIR client with get(resource_path, params); "batch" mode
+            also needs post(resource_path, resource) and falls back to
+            "search" without it.
+        references: References to resolve; duplicates are fetched once.
+        resource_type: Type for bare ids in references.
+        mode: "search" or "batch". Defaults to settings.FHIR_BULK_RESOLVE_MODE
+            ("search").
+        chunk_size: Ids per request. Defaults to
+            settings.FHIR_BULK_RESOLVE_CHUNK_SIZE (50).
+        raise_errors: Raise the first failed request instead of logging it
+            and leaving its references out. Incremental polls use this so a
+            partial lookup never advances their cursor.
+
+    Returns:
+        Dict of "Type/id" to resource. References that could not be
+        resolved (not found, failed request) are left out; failed requests
+        are logged.
+    """
+    mode = mode or getattr(settings, 'FHIR_BULK_RESOLVE_MODE', 'search')
+    chunk_size = chunk_size or getattr(settings, 'FHIR_BULK_RESOLVE_CHUNK_SIZE', DEFAULT_CHUNK_SIZE)
+    if mode == "batch" and not hasattr(client, "post"):
+        mode = "search"
+
+    resource_cache = get_resource_cache()
+    source = getattr(client, "base_url", "") or ""
+
+    resolved: dict[str, dict] = {}
+    # Ids still to fetch per type (dicts as insertion-ordered sets)
+    wanted: dict[str, dict[str, None]] = defaultdict(dict)
+    for reference in references:
+        parsed = parse_reference(reference, resource_type)
+        if parsed is None:
+            continue
+        type_name, resource_id = parsed
+        if f"{type_name}/{resource_id}" in resolved or resource_id in wanted[type_name]:
+            continue
+        cached = resource_cache.peek(type_name, resource_id, source=source)
+        if cached is not None:
+            resolved[f"{type_name}/{resource_id}"] = cached
+        else:
+            wanted[type_name][resource_id] = None
+
+    for type_name, id_set in wanted.items():
+        ids = list(id_set)
+        for start in range(0, len(ids), chunk_size):
+            chunk = ids[start:start + chunk_size]
+            try:
+                if mode == "batch":
+                    resources = _fetch_batch(client, type_name, chunk)
+                else:
+                    resources = _fetch_search(client, type_name, chunk)
+            except Exception as e:
+                if raise_errors:
+                    raise
+                logger.warning(f"Bulk {type_name} lookup of {len(chunk)} ids failed: {e}")
+                continue
+
+            for resource in resources:
+                resource_id = resource.get("id")
+                if resource.get("resourceType") == type_name and resource_id in chunk:
+                    resolved[f"{type_name}/{resource_id}"] = resource
+                    resource_cache.put(type_name, resource_id, resource, source=source)
+
+    logger.debug(
+        f"Resolved {len(resolved)} references with "
+        f"{sum((len(ids) + chunk_size - 1) // chunk_size for ids in wanted.values())} requests"
+    )
+    return resolved
+
+
+def _fetch_search(client: Any, resource_type: str, ids: list[str]) -> list[dict]:
+    bundle = client.get(resource_type, {"_id": ",".join(ids), "_count": str(len(ids))})
+    return [
+        entry["resource"]
+        for entry in bundle.get("entry", [])
+        if "resource" in entry
+    ]
+
+
+def _fetch_batch(client: Any, resource_type: str, ids: list[str]) -> list[dict]:
+    bundle = {
+        "resourceType": "Bundle",
+        "type": "batch",
+        "entry": [
+            {"request": {"method": "GET", "url": f"{resource_type}/{resource_id}"}}
+            for resource_id in ids
+        ],
+    }
+    response = client.post("", bundle)
+    return [
+        entry["resource"]
+        for entry in response.get("entry", [])
+        if "resource" in entry
+        and str(entry.get("response", {}).get("status", "200")).startswith("200")
+    ]
@@ -1,21 +1,29 @@
 """Tests for shared FHIR client infrastructure."""
 
-from datetime import datetime, timezone
+import time
+from datetime import datetime, timedelta, timezone
 from unittest.mock import MagicMock, patch
 
+from django.core.cache import cache
 from django.test import TestCase, override_settings
 
 from apps.core.fhir import (
     BaseFHIRClient,
     EpicFHIRClient,
+    EpicTokenProvider,
+    FHIRResourceCache,
     HAPIFHIRClient,
     get_fhir_client,
+    parse_reference,
 )
+from apps.core.fhir import tokens
+from apps.core.fhir.paging import IncompleteSearchError, search_all
 from apps.core.fhir.parsers import (
     extract_bundle_entries,
     extract_encounter_location,
     extract_patient_mrn,
     extract_patient_name,
+    format_last_updated,
     parse_fhir_datetime,
     parse_susceptibility_observation,
 )
@@ -111,6 +119,24 @@ class ParseFHIRDatetimeTest(TestCase):
         self.assertIsNone(result)
 
 
+# ---------------------------------------------------------------
+# format_last_updated
+# ---------------------------------------------------------------
+
+class FormatLastUpdatedTest(TestCase):
+    """Tests for format_last_updated()."""
+
+    def test_aware_datetime_converted_to_utc(self):
+        since = datetime(2024, 1, 15, 5, 30, tzinfo=timezone(timedelta(hours=-5)))
+        self.assertEqual(format_last_updated(since), "gt2024-01-15T10:30:00Z")
+
+    def test_naive_datetime_sent_as_is(self):
+        self.assertEqual(
+            format_last_updated(datetime(2024, 1, 15, 10, 30)),
+            "gt2024-01-15T10:30:00",
+        )
+
+
 # ---------------------------------------------------------------
 # extract_patient_name
 # ---------------------------------------------------------------
@@ -382,7 +408,19 @@ class GetFHIRClientTest(TestCase):
 # EpicFHIRClient
 # ---------------------------------------------------------------
 
-class EpicFHIRClientTest(TestCase):
+LOCMEM_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+class TokenCacheTestCase(TestCase):
+    """Starts each test with empty token caches."""
+
+    def setUp(self):
+        cache.clear()
+        tokens._providers.clear()
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class EpicFHIRClientTest(TokenCacheTestCase):
     """Tests for EpicFHIRClient."""
 
     def test_is_base_fhir_client(self):
@@ -419,8 +457,10 @@ class EpicFHIRClientTest(TestCase):
             base_url="https://epic.example.com/FHIR/R4",
             client_id="test",
         )
-        client.access_token = "cached-token"
-        client.token_expires_at = datetime.now() + __import__("datetime").timedelta(hours=1)
+        cache.set(
+            EpicTokenProvider("test", None, client._get_token_url()).cache_key,
+            {"access_token": "cached-token", "expires_at": time.time() + 3600},
+        )
 
         # _get_access_token should return cached value without calling jwt
         token = client._get_access_token()
@@ -431,7 +471,331 @@ class EpicFHIRClientTest(TestCase):
             base_url="https://epic.example.com/FHIR/R4",
             client_id="test",
         )
-        client.access_token = None
-        client.token_expires_at = None
         with self.assertRaises(ValueError):
             client._get_access_token()
+
+
+# ---------------------------------------------------------------
+# EpicTokenProvider
+# ---------------------------------------------------------------
+
+TOKEN_URL = "https://epic.example.com/oauth2/token"
+
+
+def _token_response(token="new-token", expires_in=3600):
+    response = MagicMock()
+    response.json.return_value = {"access_token": token, "expires_in": expires_in}
+    return response
+
+
+@patch.dict("sys.modules", {"jwt": MagicMock()})
+@patch("apps.core.fhir.tokens.requests.post", return_value=_token_response())
+@override_settings(CACHES=LOCMEM_CACHES)
+class EpicTokenProviderTest(TokenCacheTestCase):
+    """Tests for the shared Epic token cache."""
+
+    def test_token_shared_across_clients(self, mock_post):
+        """Clients built per task reuse one token."""
+        for _ in range(3):
+            client = EpicFHIRClient(
+                base_url="https://epic.example.com/FHIR/R4",
+                client_id="test",
+            )
+            client.private_key = "key"
+            self.assertEqual(client._get_access_token(), "new-token")
+        self.assertEqual(mock_post.call_count, 1)
+
+    def test_token_shared_across_processes(self, mock_post):
+        """A provider with an empty memory (another process) reads the cache."""
+        EpicTokenProvider("test", "key", TOKEN_URL).get_token()
+        other = EpicTokenProvider("test", "key", TOKEN_URL)
+
+        self.assertEqual(other.get_token(), "new-token")
+        self.assertEqual(mock_post.call_count, 1)
+
+    def test_refreshes_before_expiry(self, mock_post):
+        """A token inside the refresh margin is replaced."""
+        provider = EpicTokenProvider("test", "key", TOKEN_URL, refresh_margin=300)
+        cache.set(provider.cache_key, {"access_token": "old-token", "expires_at": time.time() + 120})
+
+        self.assertEqual(provider.get_token(), "new-token")
+        self.assertEqual(cache.get(provider.cache_key)["access_token"], "new-token")
+
+    def test_uses_current_token_while_another_worker_refreshes(self, mock_post):
+        """Workers that lose the refresh lock keep using the valid token."""
+        provider = EpicTokenProvider("test", "key", TOKEN_URL, refresh_margin=300)
+        cache.set(provider.cache_key, {"access_token": "old-token", "expires_at": time.time() + 120})
+        cache.add(provider.lock_key, 1)
+
+        self.assertEqual(provider.get_token(), "old-token")
+        mock_post.assert_not_called()
+
+    def test_invalidate(self, mock_post):
+        provider = EpicTokenProvider("test", "key", TOKEN_URL)
+        provider.get_token()
+        provider.invalidate()
+        provider.get_token()
+        self.assertEqual(mock_post.call_count, 2)
+
+    def test_cache_unavailable_refreshes_locally(self, mock_post):
+        """A failing cache lock or delete does not stop a token refresh."""
+        provider = EpicTokenProvider("test", "key", TOKEN_URL)
+        broken = MagicMock()
+        broken.get.return_value = None
+        broken.add.side_effect = ConnectionError("redis down")
+        broken.delete.side_effect = ConnectionError("redis down")
+
+        with patch.object(EpicTokenProvider, "cache", broken):
+            self.assertEqual(provider.get_token(), "new-token")
+            provider.invalidate()
+
+        self.assertEqual(mock_post.call_count, 1)
+
+    def test_retries_once_on_401(self, mock_post):
+        """A rejected token is invalidated and the request retried with a new one."""
+        mock_post.side_effect = [_token_response("revoked"), _token_response("fresh")]
+        client = EpicFHIRClient(base_url="https://epic.example.com/FHIR/R4", client_id="test")
+        client.private_key = "key"
+        rejected = MagicMock(status_code=401)
+        accepted = MagicMock(status_code=200)
+        accepted.json.return_value = {"resourceType": "Patient", "id": "p1"}
+
+        with patch.object(client.session, "get", side_effect=[rejected, accepted]) as mock_get:
+            self.assertEqual(client.get("Patient/p1")["id"], "p1")
+
+        self.assertEqual(
+            [c.kwargs["headers"]["Authorization"] for c in mock_get.call_args_list],
+            ["Bearer revoked", "Bearer fresh"],
+        )
+
+
+# ---------------------------------------------------------------
+# FHIRResourceCache
+# ---------------------------------------------------------------
+
+class FHIRResourceCacheTest(TestCase):
+    """Tests for the shared FHIR resource cache."""
+
+    def setUp(self):
+        self.resource_cache = FHIRResourceCache(ttls={"Patient": 60}, max_entries=2)
+        self.get = MagicMock(side_effect=lambda path: {
+            "resourceType": path.split("/")[0],
+            "id": path.split("/")[1],
+            "meta": {"versionId": "1"},
+        })
+
+    def test_repeat_reads_served_from_cache(self):
+        for _ in range(3):
+            patient = self.resource_cache.read("Patient", "p1", self.get, source="fhir")
+        self.assertEqual(patient["id"], "p1")
+        self.assertEqual(self.get.call_count, 1)
+        stats = self.resource_cache.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (2, 1))
+        self.assertEqual(stats["hit_rate"], 0.667)
+
+    def test_uncached_types_always_fetched(self):
+        self.resource_cache.read("Observation", "o1", self.get)
+        self.resource_cache.read("Observation", "o1", self.get)
+        self.assertEqual(self.get.call_count, 2)
+        self.assertEqual(self.resource_cache.get_stats()["uncached"], 2)
+
+    def test_returns_copies(self):
+        self.resource_cache.read("Patient", "p1", self.get)["id"] = "changed"
+        self.assertEqual(self.resource_cache.read("Patient", "p1", self.get)["id"], "p1")
+
+    def test_lru_eviction(self):
+        for patient_id in ("p1", "p2", "p1", "p3"):
+            self.resource_cache.read("Patient", patient_id, self.get)
+        self.resource_cache.read("Patient", "p1", self.get)
+        self.resource_cache.read("Patient", "p2", self.get)
+
+        # p2 was least recently used when p3 arrived
+        self.assertEqual(self.get.call_count, 4)
+        self.assertEqual(self.resource_cache.get_stats()["evictions"], 2)
+
+    def test_expired_entry_revalidated_with_version_etag(self):
+        get_conditional = MagicMock(return_value=(None, None))
+        self.resource_cache.read("Patient", "p1", self.get, get_conditional=get_conditional)
+        with patch("apps.core.fhir.cache.time.time", return_value=time.time() + 120):
+            patient = self.resource_cache.read(
+                "Patient", "p1", self.get, get_conditional=get_conditional,
+            )
+
+        get_conditional.assert_called_once_with("Patient/p1", 'W/"1"')
+        self.assertEqual(patient["id"], "p1")
+        self.assertEqual(self.get.call_count, 1)
+        self.assertEqual(self.resource_cache.get_stats()["revalidated"], 1)
+
+    @override_settings(CACHES=LOCMEM_CACHES)
+    def test_shared_tier(self):
+        cache.clear()
+        first = FHIRResourceCache(ttls={"Patient": 60}, shared_cache_alias="default")
+        second = FHIRResourceCache(ttls={"Patient": 60}, shared_cache_alias="default")
+
+        first.read("Patient", "p1", self.get, source="fhir")
+        second.read("Patient", "p1", self.get, source="fhir")
+
+        self.assertEqual(self.get.call_count, 1)
+        self.assertEqual(second.get_stats()["shared_hits"], 1)
+
+    def test_errors_not_cached(self):
+        self.get.side_effect = [RuntimeError("timeout"), {"id": "p1"}]
+        with self.assertRaises(RuntimeError):
+            self.resource_cache.read("Patient", "p1", self.get)
+        self.assertEqual(self.resource_cache.read("Patient", "p1", self.get), {"id": "p1"})
+
+
+class HAPIConditionalGetTest(TestCase):
+    """Tests for HAPIFHIRClient.get_conditional()."""
+
+    def test_not_modified(self):
+        client = HAPIFHIRClient(base_url="http://fhir.test/fhir")
+        response = MagicMock(status_code=304, headers={})
+        with patch.object(client.session, "get", return_value=response) as mock_get:
+            resource, etag = client.get_conditional("Patient/p1", 'W/"3"')
+
+        self.assertIsNone(resource)
+        self.assertEqual(etag, 'W/"3"')
+        self.assertEqual(mock_get.call_args.kwargs["headers"], {"If-None-Match": 'W/"3"'})
+
+
+# ---------------------------------------------------------------
+# resolve_references
+# ---------------------------------------------------------------
+
+def _search_bundle(resource_type, params):
+    ids = params["_id"].split(",")
+    return {
+        "resourceType": "Bundle",
+        "entry": [
+            {"resource": {"resourceType": resource_type, "id": i}}
+            for i in ids if i != "missing"
+        ],
+    }
+
+
+@patch("apps.core.fhir.resolver.get_resource_cache")
+class ResolveReferencesTest(TestCase):
+    """Tests for bulk reference resolution."""
+
+    def setUp(self):
+        self.client = HAPIFHIRClient(base_url="http://fhir.test/fhir")
+        self.client.get = MagicMock(side_effect=_search_bundle)
+        self.client.post = MagicMock()
+
+    def test_parse_reference(self, mock_cache):
+        self.assertEqual(parse_reference("Patient/1"), ("Patient", "1"))
+        self.assertEqual(parse_reference("http://x/fhir/Encounter/9"), ("Encounter", "9"))
+        self.assertEqual(parse_reference("Patient/1/_history/3"), ("Patient", "1"))
+        self.assertEqual(parse_reference("7", "Patient"), ("Patient", "7"))
+        self.assertIsNone(parse_reference("#contained"))
+        self.assertIsNone(parse_reference("7"))
+
+    def test_search_dedupes_and_chunks(self, mock_cache):
+        mock_cache.return_value = FHIRResourceCache()
+        refs = [f"Patient/{i % 120}" for i in range(300)] + ["Encounter/e1", "Patient/missing"]
+
+        resolved = self.client.resolve_references(refs, chunk_size=50)
+
+        # 121 unique patient ids -> 3 searches, plus 1 encounter search
+        self.assertEqual(self.client.get.call_count, 4)
+        self.assertEqual(len(resolved), 121)
+        self.assertEqual(resolved["Encounter/e1"]["id"], "e1")
+        self.assertNotIn("Patient/missing", resolved)
+
+    def test_batch_mode(self, mock_cache):
+        mock_cache.return_value = FHIRResourceCache()
+        self.client.post.return_value = {
+            "resourceType": "Bundle",
+            "type": "batch-response",
+            "entry": [
+                {"resource": {"resourceType": "Patient", "id": "1"}, "response": {"status": "200 OK"}},
+                {"resource": {"resourceType": "OperationOutcome"}, "response": {"status": "404 Not Found"}},
+            ],
+        }
+
+        resolved = self.client.resolve_references(["Patient/1", "Patient/2"], mode="batch")
+
+        self.assertEqual(list(resolved), ["Patient/1"])
+        path, bundle = self.client.post.call_args.args
+        self.assertEqual(bundle["type"], "batch")
+        self.assertEqual(
+            [e["request"]["url"] for e in bundle["entry"]], ["Patient/1", "Patient/2"],
+        )
+        self.client.get.assert_not_called()
+
+    def test_uses_and_fills_resource_cache(self, mock_cache):
+        resource_cache = FHIRResourceCache()
+        mock_cache.return_value = resource_cache
+
+        self.client.resolve_references(["Patient/1", "Patient/2"])
+        self.client.resolve_references(["Patient/1", "Patient/2", "Patient/3"])
+
+        self.assertEqual(self.client.get.call_args.args[1]["_id"], "3")
+        self.assertEqual(self.client.get.call_count, 2)
+
+    def test_failed_chunk_skipped(self, mock_cache):
+        mock_cache.return_value = FHIRResourceCache()
+        self.client.get.side_effect = [RuntimeError("timeout"), _search_bundle("Patient", {"_id": "3"})]
+
+        resolved = self.client.resolve_references(["Patient/1", "Patient/2", "Patient/3"], chunk_size=2)
+
+        self.assertEqual(list(resolved), ["Patient/3"])
+
+    def test_failed_chunk_raised(self, mock_cache):
+        mock_cache.return_value = FHIRResourceCache()
+        self.client.get.side_effect = [RuntimeError("timeout"), _search_bundle("Patient", {"_id": "3"})]
+
+        with self.assertRaises(RuntimeError):
+            self.client.resolve_references(
+                ["Patient/1", "Patient/2", "Patient/3"], chunk_size=2, raise_errors=True,
+            )
+
+
+# ---------------------------------------------------------------
+# search_all
+# ---------------------------------------------------------------
+
+def _page(ids, next_url=None):
+    bundle = {
+        "resourceType": "Bundle",
+        "entry": [{"resource": {"resourceType": "Observation", "id": i}} for i in ids],
+    }
+    if next_url:
+        bundle["link"] = [{"relation": "next", "url": next_url}]
+    return bundle
+
+
+class SearchAllTest(TestCase):
+    """Tests for search_all()."""
+
+    def setUp(self):
+        self.client = MagicMock(spec=["base_url", "get", "get_page"])
+        self.client.base_url = "http://fhir.test/fhir"
+
+    def test_follows_next_links(self):
+        self.client.get.return_value = _page(["o1", "o2"], "http://fhir.test/fhir?page=2")
+        self.client.get_page.side_effect = [
+            _page(["o3"], "http://fhir.test/fhir?page=3"),
+            _page(["o4"]),
+        ]
+
+        resources = search_all(self.client, "Observation", {"_count": "2"})
+
+        self.assertEqual([r["id"] for r in resources], ["o1", "o2", "o3", "o4"])
+        self.assertEqual(self.client.get_page.call_count, 2)
+
+    def test_unfollowable_next_link_raises(self):
+        client = MagicMock(spec=["base_url", "get"])
+        client.base_url = "http://fhir.test/fhir"
+        client.get.return_value = _page(["o1"], "http://fhir.test/fhir?page=2")
+
+        with self.assertRaises(IncompleteSearchError):
+            search_all(client, "Observation")
+
+    def test_next_link_to_other_server_raises(self):
+        self.client.get.return_value = _page(["o1"], "http://elsewhere.test/fhir?page=2")
+
+        with self.assertRaises(IncompleteSearchError):
+            search_all(self.client, "Observation")
+        self.client.get_page.assert_not_called()
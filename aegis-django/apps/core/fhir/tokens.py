@@ -0,0 +1,255 @@
+"""Shared Epic OAuth 2.0 access tokens.
+
+Every Celery task builds a new Epic FHIR client, so a per-instance token
+meant a fresh RS384 JWT and a token round-trip before the first FHIR call
+of every task. EpicTokenProvider keeps the token in the Django cache
+instead (Redis in staging/production, a file cache in development), so all
+workers and processes reuse it until it is close to expiry.
+
+- Tokens are refreshed EPIC_TOKEN_REFRESH_MARGIN seconds (default 300)
+  before they expire.
+- A cache lock (cache.add) lets one worker refresh at a time. Others keep
+  using the still-valid token, or wait briefly for the refresh if there is
+  no usable token at all.
+- Each process also keeps the last token in memory to skip the cache
+  lookup on the hot path.
+- If the cache is unavailable, each process refreshes its own token.
+- send_with_token() retries a request once with a new token when the
+  server answers 401 (e.g. a token revoked before its expiry).
+
+Usage::
+
+    provider = get_epic_token_provider(client_id, private_key, token_url)
+    headers = {"Authorization": f"Bearer {provider.get_token()}"}
+"""
+
+import hashlib
+import logging
+import threading
+import time
+import uuid
+
+import requests
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+# Lifetime of the JWT client assertion
+ASSERTION_LIFETIME = 300
+# Longest a worker holds the refresh lock / waits for another worker's refresh
+REFRESH_LOCK_TIMEOUT = 30
+# Never hand out a token with less than this many seconds left
+MIN_TOKEN_LIFETIME = 10
+
+
+class EpicTokenProvider:
+    """Cross-process cache of the access token for one Epic client.
+
+    Args:
+        client_id: OAuth client ID.
+        private_key: PEM private key used to sign the JWT assertion.
+        token_url: Token endpoint URL.
+        timeout: Token request timeout in seconds.
+        refresh_margin: Refresh this many seconds before expiry.
+            Defaults to settings.EPIC_TOKEN_REFRESH_MARGIN (300).
+        cache_alias: Django cache to store tokens in.
+            Defaults to settings.EPIC_TOKEN_CACHE_ALIAS ('default').
+    """
+
+    def __init__(
+        self,
+        client_id: str,
+        private_key: str | None,
+        token_url: str,
+        timeout: int = 30,
+        refresh_margin: int | None = None,
+        cache_alias: str | None = None,
+    ):
+        self.client_id = client_id
+        self.private_key = private_key
+        self.token_url = token_url
+        self.timeout = timeout
+        self.refresh_margin = (
+            refresh_margin if refresh_margin is not None
+            else getattr(settings, 'EPIC_TOKEN_REFRESH_MARGIN', 300)
+        )
+        self.cache_alias = cache_alias or getattr(settings, 'EPIC_TOKEN_CACHE_ALIAS', 'default')
+
+        digest = hashlib.sha256(f"{client_id}|{token_url}".encode()).hexdigest()[:16]
+        self.cache_key = f"epic_oauth_token:{digest}"
+        self.lock_key = f"{self.cache_key}:lock"
+
+        self._entry: dict | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def get_token(self) -> str:
+        """Return a valid access token, refreshing it if it is close to expiry.
+
+        Raises:
+            ValueError: If the private key is not loaded.
+            ImportError: If PyJWT is not installed.
+            requests.HTTPError: If the token request fails.
+        """
+        entry = self._entry
+        if self._is_fresh(entry):
+            return entry["access_token"]
+
+        with self._lock:
+            entry = self._read_cache()
+            if self._is_fresh(entry):
+                self._entry = entry
+                return entry["access_token"]
+
+            try:
+                locked = self.cache.add(self.lock_key, 1, timeout=REFRESH_LOCK_TIMEOUT)
+            except Exception as e:
+                logger.warning(f"Epic token cache lock failed, refreshing locally: {e}")
+                entry = self._refresh()
+            else:
+                if locked:
+                    try:
+                        # Another worker may have refreshed between our read and the lock
+                        entry = self._read_cache()
+                        if not self._is_fresh(entry):
+                            entry = self._refresh()
+                    finally:
+                        self._delete(self.lock_key)
+                elif not self._is_usable(entry):
+                    entry = self._wait_for_refresh()
+
+            self._entry = entry
+            return entry["access_token"]
+
+    def invalidate(self) -> None:
+        """Drop the cached token, e.g. after the FHIR server rejects it."""
+        self._entry = None
+        self._delete(self.cache_key)
+
+    def _is_fresh(self, entry: dict | None) -> bool:
+        return bool(entry) and entry["expires_at"] - time.time() > self.refresh_margin
+
+    @staticmethod
+    def _is_usable(entry: dict | None) -> bool:
+        return bool(entry) and entry["expires_at"] - time.time() > MIN_TOKEN_LIFETIME
+
+    def _read_cache(self) -> dict | None:
+        try:
+            return self.cache.get(self.cache_key)
+        except Exception as e:
+            logger.warning(f"Epic token cache read failed: {e}")
+            return None
+
+    def _delete(self, key: str) -> None:
+        try:
+            self.cache.delete(key)
+        except Exception as e:
+            logger.warning(f"Epic token cache delete failed: {e}")
+
+    def _wait_for_refresh(self) -> dict:
+        """Wait for the worker holding the lock, or refresh ourselves on timeout."""
+        deadline = time.time() + REFRESH_LOCK_TIMEOUT
+        while time.time() < deadline:
+            time.sleep(0.2)
+            entry = self._read_cache()
+            if self._is_usable(entry):
+                return entry
+        logger.warning("Timed out waiting for Epic token refresh; requesting a token directly")
+        return self._refresh()
+
+    def _refresh(self) -> dict:
+        """Request a new token with the JWT bearer flow and store it in the cache."""
+        if not self.private_key:
+            raise ValueError("Private key not loaded - cannot authenticate to Epic")
+
+        try:
+            import jwt
+        except ImportError:
+            raise ImportError(
+                "PyJWT is required for Epic OAuth. Install it with: "
+                "pip install PyJWT[crypto]"
+            )
+
+        now = int(time.time())
+        claims = {
+            "iss": self.client_id,
+            "sub": self.client_id,
+            "aud": self.token_url,
+            "jti": str(uuid.uuid4()),
+            "exp": now + ASSERTION_LIFETIME,
+        }
+        assertion = jwt.encode(claims, self.private_key, algorithm="RS384")
+
+        response = requests.post(
+            self.token_url,
+            data={
+                "grant_type": "client_credentials",
+                "client_assertion_type": (
+                    "urn:ietf:params:oauth:client-assertion-type:jwt-bearer"
+                ),
+                "client_assertion": assertion,
+            },
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+
+        token_data = response.json()
+        expires_in = int(token_data.get("expires_in", 3600))
+        entry = {
+            "access_token": token_data["access_token"],
+            "expires_at": now + expires_in,
+        }
+
+        try:
+            self.cache.set(self.cache_key, entry, timeout=expires_in)
+        except Exception as e:
+            logger.warning(f"Epic token cache write failed: {e}")
+
+        logger.info(f"Obtained Epic access token for client {self.client_id} (expires in {expires_in}s)")
+        return entry
+
+
+def send_with_token(provider: EpicTokenProvider, send) -> requests.Response:
+    """Send a request with the provider's token, retrying once on 401.
+
+    Args:
+        provider: Token provider for the Epic client.
+        send: Callable taking an access token and returning the
+            requests.Response for the request.
+
+    Returns:
+        The response (the retry's, if the first was a 401).
+    """
+    response = send(provider.get_token())
+    if response.status_code == 401:
+        logger.warning("Epic rejected the access token; retrying once with a new token")
+        provider.invalidate()
+        response = send(provider.get_token())
+    return response
+
+
+# One provider per (client, token endpoint) in each process
+_providers: dict[tuple[str, str], EpicTokenProvider] = {}
+_providers_lock = threading.Lock()
+
+
+def get_epic_token_provider(
+    client_id: str,
+    private_key: str | None,
+    token_url: str,
+    timeout: int = 30,
+) -> EpicTokenProvider:
+    """Get the shared token provider for an Epic client."""
+    key = (client_id, token_url)
+    with _providers_lock:
+        provider = _providers.get(key)
+        if provider is None:
+            provider = EpicTokenProvider(client_id, private_key, token_url, timeout=timeout)
+            _providers[key] = provider
+        elif private_key and not provider.private_key:
+            provider.private_key = private_key
+        return provider
@@ -0,0 +1,58 @@
+# Generated by Django 5.1.5 on 2026-10-16 21:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="MonitorCursor",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, help_text="When this record was created"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, help_text="When this record was last updated"
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        help_text="Monitor identifier, e.g. 'mdro' or 'hai_detection.clabsi'",
+                        max_length=100,
+                        unique=True,
+                    ),
+                ),
+                (
+                    "watermark",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="Start time of the last fully processed polling cycle",
+                        null=True,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["name"],
+            },
+        ),
+    ]
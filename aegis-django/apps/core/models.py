@@ -4,6 +4,8 @@ Core base models and mixins for AEGIS Django apps.
 These models provide common functionality that all AEGIS apps can inherit.
 """
 
+from datetime import timedelta
+
 from django.db import models
 from django.conf import settings
 from django.utils import timezone
@@ -122,3 +124,70 @@ class PatientRelatedModel(models.Model):
             models.Index(fields=['patient_mrn']),
             models.Index(fields=['patient_id']),
         ]
+
+
+class MonitorCursor(TimeStampedModel):
+    """
+    Persisted polling watermark for a FHIR monitor.
+
+    Each monitor cycle only asks the FHIR server for resources with
+    ``_lastUpdated`` after the stored watermark (minus a small overlap to
+    absorb clock skew and late commits). The watermark is only advanced
+    once a cycle has processed everything it fetched; a missing watermark
+    means the next cycle falls back to the monitor's full lookback window.
+    """
+    name = models.CharField(
+        max_length=100,
+        unique=True,
+        help_text="Monitor identifier, e.g. 'mdro' or 'hai_detection.clabsi'"
+    )
+    watermark = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Start time of the last fully processed polling cycle"
+    )
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self):
+        return f"{self.name} @ {self.watermark or 'unset'}"
+
+    @classmethod
+    def for_monitor(cls, name):
+        """Get (or create) the cursor for a monitor."""
+        cursor, _ = cls.objects.get_or_create(name=name)
+        return cursor
+
+    def since(self, overlap=None):
+        """
+        Lower bound for the next ``_lastUpdated`` query, or None.
+
+        Args:
+            overlap: timedelta subtracted from the watermark. Defaults to
+                settings.MONITOR_CURSOR_OVERLAP_SECONDS.
+        """
+        if self.watermark is None:
+            return None
+        if overlap is None:
+            overlap = timedelta(
+                seconds=getattr(settings, 'MONITOR_CURSOR_OVERLAP_SECONDS', 300)
+            )
+        return self.watermark - overlap
+
+    def advance(self, to):
+        """Move the watermark forward to ``to`` (never backwards)."""
+        if self.watermark is not None and to <= self.watermark:
+            return
+        self.watermark = to
+        self.save(update_fields=['watermark', 'updated_at'])
+
+    def reset(self, to=None):
+        """
+        Set the watermark to ``to``, or clear it.
+
+        Clearing makes the next cycle re-scan the full lookback window;
+        setting an earlier time backfills from that point.
+        """
+        self.watermark = to
+        self.save(update_fields=['watermark', 'updated_at'])
@@ -247,6 +247,52 @@ class PatientRelatedModelTests(TestCase):
         self.assertEqual(alert.patient_location, 'G3NE - PICU')
 
 
+# =============================================================================
+# MonitorCursor Tests
+# =============================================================================
+
+from apps.core.models import MonitorCursor
+
+
+class MonitorCursorTests(TestCase):
+    """Test the persisted polling watermark used by the FHIR monitors."""
+
+    def test_for_monitor_creates_unset_cursor(self):
+        cursor = MonitorCursor.for_monitor('test_monitor')
+        self.assertIsNone(cursor.watermark)
+        self.assertIsNone(cursor.since())
+        self.assertEqual(MonitorCursor.for_monitor('test_monitor').pk, cursor.pk)
+
+    @override_settings(MONITOR_CURSOR_OVERLAP_SECONDS=120)
+    def test_since_subtracts_overlap(self):
+        now = timezone.now()
+        cursor = MonitorCursor.for_monitor('test_monitor')
+        cursor.advance(now)
+        self.assertEqual(cursor.since(), now - timedelta(seconds=120))
+        self.assertEqual(cursor.since(overlap=timedelta(0)), now)
+
+    def test_advance_never_moves_backwards(self):
+        now = timezone.now()
+        cursor = MonitorCursor.for_monitor('test_monitor')
+        cursor.advance(now)
+        cursor.advance(now - timedelta(hours=1))
+        cursor.refresh_from_db()
+        self.assertEqual(cursor.watermark, now)
+
+    def test_reset_clears_or_backfills(self):
+        now = timezone.now()
+        cursor = MonitorCursor.for_monitor('test_monitor')
+        cursor.advance(now)
+        cursor.reset()
+        cursor.refresh_from_db()
+        self.assertIsNone(cursor.watermark)
+
+        backfill = now - timedelta(days=7)
+        cursor.reset(backfill)
+        cursor.refresh_from_db()
+        self.assertEqual(cursor.watermark, backfill)
+
+
 class CeleryAppTests(TestCase):
     """Verify the Celery app initializes and discovers tasks."""
 
@@ -6,6 +6,8 @@ from django.http import JsonResponse
 import redis
 import requests
 
+from apps.core.fhir.cache import get_resource_cache
+
 
 def health_check(request):
     """Health check endpoint for monitoring and load balancers."""
@@ -56,6 +58,9 @@ def health_check(request):
         checks['ollama'] = {'status': False}
         healthy = False
 
+    # FHIR resource cache hit rates (informational, never unhealthy)
+    checks['fhir_resource_cache'] = get_resource_cache().get_stats()
+
     status_code = 200 if healthy else 503
     return JsonResponse({
         'status': 'healthy' if healthy else 'unhealthy',
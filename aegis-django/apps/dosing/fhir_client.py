@@ -11,6 +11,10 @@ from typing import Any
 import requests
 from django.conf import settings
 
+from apps.core.fhir.paging import search_all
+from apps.core.fhir.parsers import format_last_updated
+from apps.core.fhir.resolver import resolve_references
+
 from .data_models import PatientContext, MedicationOrder
 
 logger = logging.getLogger(__name__)
@@ -68,6 +72,14 @@ class DosingFHIRClient:
         self.fhir_url = fhir_url or getattr(settings, 'FHIR_BASE_URL', 'http://localhost:8081/fhir')
         logger.info(f"Initialized FHIR client: {self.fhir_url}")
 
+    @property
+    def base_url(self) -> str:
+        return self.fhir_url
+
+    def get(self, resource_path: str, params: dict | None = None) -> dict:
+        """GET a FHIR resource or search (client interface used by apps.core.fhir)."""
+        return self._get(resource_path, params)
+
     def _get(self, resource_type: str, params: dict | None = None) -> dict:
         """Execute FHIR GET request."""
         url = f"{self.fhir_url}/{resource_type}"
@@ -79,42 +91,105 @@ class DosingFHIRClient:
             logger.error(f"FHIR request failed: {e}")
             raise
 
-    def get_patients_with_active_antimicrobials(self, lookback_hours: int = 24) -> list[str]:
-        """Get list of patient MRNs with active antimicrobial orders."""
+    # Weight, height, serum creatinine and eGFR: a new result can change a dose assessment
+    DOSING_OBSERVATION_CODES = ["29463-7", "8302-2", "2160-0", "33914-3"]
+
+    def get_patients_with_active_antimicrobials(
+        self,
+        lookback_hours: int = 24,
+        updated_since: datetime | None = None,
+    ) -> list[str]:
+        """Get list of patient MRNs with active antimicrobial orders.
+
+        If updated_since is given, only patients whose orders changed or who
+        have new dosing-relevant observations after it are returned, and
+        FHIR errors (including failed patient lookups) are raised instead of
+        returning an empty or partial list.
+        """
         try:
             lookback_date = datetime.now() - timedelta(hours=lookback_hours)
-            result = self._get("MedicationRequest", {
+            params = {
                 "status": "active",
                 "authored": f"ge{lookback_date.isoformat()}",
                 "_count": "1000"
-            })
+            }
+            if updated_since is None:
+                med_requests = self._search_entries("MedicationRequest", params)
+            else:
+                med_requests = self._get_changed_medication_requests(params, updated_since)
+
+            patient_refs = []
+            for med_req in med_requests:
+                med_concept = med_req.get("medicationCodeableConcept", {})
+                drug_name = med_concept.get("text", "")
+
+                if is_antimicrobial(drug_name):
+                    patient_ref = med_req.get("subject", {}).get("reference", "")
+                    if patient_ref:
+                        patient_refs.append(patient_ref)
+
+            # Resolve all patients in a few bulk requests instead of one per order
+            patients = resolve_references(
+                self, patient_refs, resource_type="Patient",
+                raise_errors=updated_since is not None,
+            )
 
             patient_mrns = set()
-            if result.get("total", 0) > 0:
-                for entry in result.get("entry", []):
-                    med_req = entry["resource"]
-                    med_concept = med_req.get("medicationCodeableConcept", {})
-                    drug_name = med_concept.get("text", "")
-
-                    if is_antimicrobial(drug_name):
-                        patient_ref = med_req.get("subject", {}).get("reference", "")
-                        if patient_ref:
-                            patient_id = patient_ref.split("/")[-1]
-                            try:
-                                patient_result = self._get(f"Patient/{patient_id}", {})
-                                identifiers = patient_result.get("identifier", [])
-                                for identifier in identifiers:
-                                    if identifier.get("type", {}).get("text") == "MRN":
-                                        patient_mrns.add(identifier.get("value"))
-                            except Exception:
-                                pass
+            for patient_result in patients.values():
+                for identifier in patient_result.get("identifier", []):
+                    if identifier.get("type", {}).get("text") == "MRN":
+                        patient_mrns.add(identifier.get("value"))
 
             return list(patient_mrns)
 
         except Exception as e:
             logger.error(f"Failed to get patients with active antimicrobials: {e}")
+            if updated_since is not None:
+                raise
             return []
 
+    def get_page(self, url: str) -> dict:
+        """GET a search result page by its full (next link) URL."""
+        try:
+            response = requests.get(url, timeout=30)
+            response.raise_for_status()
+            return response.json()
+        except requests.RequestException as e:
+            logger.error(f"FHIR request failed: {e}")
+            raise
+
+    def _search_entries(self, resource_type: str, params: dict) -> list[dict]:
+        """Run a search and return the resources from every result page."""
+        return search_all(self, resource_type, params)
+
+    def _get_changed_medication_requests(
+        self, params: dict, updated_since: datetime,
+    ) -> list[dict]:
+        """Orders matching params that changed, plus those of patients with new dosing labs."""
+        since = format_last_updated(updated_since)
+        med_requests = self._search_entries(
+            "MedicationRequest", {**params, "_lastUpdated": since},
+        )
+
+        observations = self._search_entries("Observation", {
+            "code": ",".join(self.DOSING_OBSERVATION_CODES),
+            "_lastUpdated": since,
+            "_elements": "subject",
+            "_count": "1000",
+        })
+        patient_ids = sorted({
+            obs.get("subject", {}).get("reference", "").replace("Patient/", "")
+            for obs in observations
+        } - {""})
+
+        chunk_size = getattr(settings, 'FHIR_BULK_RESOLVE_CHUNK_SIZE', 50)
+        for start in range(0, len(patient_ids), chunk_size):
+            chunk = patient_ids[start:start + chunk_size]
+            med_requests.extend(self._search_entries(
+                "MedicationRequest", {**params, "patient": ",".join(chunk)},
+            ))
+        return med_requests
+
     def get_patient_weight(self, patient_id: str) -> float | None:
         """Get most recent patient weight in kg."""
         try:
@@ -9,6 +9,7 @@ Usage:
     python manage.py monitor_dosing --once --hours 24    # Check last 24h
     python manage.py monitor_dosing --continuous          # Run continuously
     python manage.py monitor_dosing --continuous --interval 900  # Every 15 min
+    python manage.py monitor_dosing --once --reset-cursor # Re-check full window
 """
 
 import logging
@@ -16,6 +17,7 @@ import time
 
 from django.core.management.base import BaseCommand
 
+from apps.core.cursors import add_cursor_arguments, apply_cursor_options
 from apps.dosing.services import DosingMonitorService
 
 logger = logging.getLogger(__name__)
@@ -47,9 +49,11 @@ class Command(BaseCommand):
             default=24,
             help='Look back window in hours (default: 24)',
         )
+        add_cursor_arguments(parser)
 
     def handle(self, *args, **options):
         service = DosingMonitorService()
+        use_cursor = apply_cursor_options(self, [service.CURSOR_NAME], options)
 
         if options['continuous']:
             self.stdout.write(self.style.SUCCESS(
@@ -57,7 +61,7 @@ class Command(BaseCommand):
             ))
             while True:
                 try:
-                    result = service.run_check(options['hours'])
+                    result = service.run_check(options['hours'], use_cursor=use_cursor)
                     self.stdout.write(
                         f'Check complete: {result["total_flags"]} flags, '
                         f'{result["alerts_created"]} alerts created'
@@ -67,7 +71,7 @@ class Command(BaseCommand):
                     logger.exception('Error during dosing monitoring check')
                 time.sleep(options['interval'])
         else:
-            result = service.run_check(options['hours'])
+            result = service.run_check(options['hours'], use_cursor=use_cursor)
             self.stdout.write(self.style.SUCCESS(
                 f'Check complete: {result["total_flags"]} flags found, '
                 f'{result["alerts_created"]} alerts created, '
@@ -7,7 +7,10 @@ both the management command (CLI) and Celery tasks.
 
 import logging
 
+from django.utils import timezone
+
 from apps.alerts.models import Alert, AlertAudit, AlertType, AlertStatus, AlertSeverity
+from apps.core.models import MonitorCursor
 from .fhir_client import DosingFHIRClient
 from .rules_engine import DosingRulesEngine
 from .alert_models import DoseAlertSeverity, DoseFlagType
@@ -27,12 +30,17 @@ SEVERITY_MAP = {
 class DosingMonitorService:
     """Service for dosing verification checks."""
 
-    def run_check(self, hours=24):
+    CURSOR_NAME = 'dosing'
+
+    def run_check(self, hours=24, use_cursor=True):
         """
         Run a single dosing verification check.
 
         Args:
             hours: Look back window in hours.
+            use_cursor: Only check patients whose orders or dosing labs
+                changed since the last successful check (MonitorCursor),
+                then advance it.
 
         Returns:
             Dict with keys: total_flags, alerts_created, alerts_skipped, errors.
@@ -53,8 +61,14 @@ class DosingMonitorService:
 
         engine = DosingRulesEngine()
 
+        cursor = MonitorCursor.for_monitor(self.CURSOR_NAME) if use_cursor else None
+        updated_since = cursor.since() if cursor else None
+        cycle_started = timezone.now()
+
         try:
-            patients = client.get_patients_with_active_antimicrobials(hours=hours)
+            patients = client.get_patients_with_active_antimicrobials(
+                lookback_hours=hours, updated_since=updated_since,
+            )
         except Exception as e:
             logger.error(f"Failed to fetch patients from FHIR: {e}")
             result['errors'].append({'stage': 'fetch_patients', 'error': str(e)})
@@ -167,6 +181,9 @@ class DosingMonitorService:
                 })
                 continue
 
+        if cursor and not result['errors']:
+            cursor.advance(cycle_started)
+
         logger.info(
             f"Dosing check complete: {result['total_flags']} flags, "
             f"{result['alerts_created']} alerts created, "
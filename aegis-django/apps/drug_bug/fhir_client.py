@@ -3,7 +3,6 @@
 Provides methods to query cultures with susceptibilities and current medications.
 """
 
-import time
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
 from typing import Optional
@@ -11,6 +10,11 @@ from typing import Optional
 import requests
 from django.conf import settings
 
+from apps.core.fhir.cache import read_resource
+from apps.core.fhir.paging import search_all
+from apps.core.fhir.parsers import format_last_updated
+from apps.core.fhir.tokens import get_epic_token_provider, send_with_token
+
 from .data_models import (
     Antibiotic,
     CultureWithSusceptibilities,
@@ -35,7 +39,7 @@ class FHIRClient(ABC):
     def get_patient(self, patient_id: str) -> Optional[dict]:
         """Get a single patient by ID."""
         try:
-            return self.get(f"Patient/{patient_id}")
+            return read_resource(self, "Patient", patient_id)
         except requests.HTTPError as e:
             if e.response.status_code == 404:
                 return None
@@ -53,8 +57,13 @@ class FHIRClient(ABC):
         self,
         hours_back: int = 24,
         status: str = "final",
+        updated_since: datetime | None = None,
     ) -> list[dict]:
-        """Get recent microbiology culture reports."""
+        """Get recent microbiology culture reports.
+
+        If updated_since is given, only reports that need re-checking are
+        returned (see search_changed).
+        """
         date_from = datetime.now() - timedelta(hours=hours_back)
         params = {
             "category": "MB",
@@ -62,9 +71,55 @@ class FHIRClient(ABC):
             "date": f"ge{date_from.strftime('%Y-%m-%dT%H:%M:%S')}",
             "_count": "500",
         }
+        if updated_since is not None:
+            return self.search_changed("DiagnosticReport", params, updated_since)
         response = self.get("DiagnosticReport", params)
         return self._extract_entries(response)
 
+    def get_patients_with_medication_changes(self, updated_since: datetime) -> set[str]:
+        """Get IDs of patients whose MedicationRequests changed after updated_since."""
+        med_requests = search_all(self, "MedicationRequest", {
+            "_lastUpdated": format_last_updated(updated_since),
+            "_elements": "subject",
+            "_count": "1000",
+        })
+        patient_ids = set()
+        for med_request in med_requests:
+            ref = med_request.get("subject", {}).get("reference", "")
+            if ref:
+                patient_ids.add(ref.replace("Patient/", ""))
+        return patient_ids
+
+    def search_changed(
+        self,
+        resource_type: str,
+        params: dict,
+        updated_since: datetime,
+    ) -> list[dict]:
+        """Search for results that changed, or whose patient's orders changed.
+
+        Coverage is assessed against the patient's current antibiotics, so a
+        result that is itself unchanged still needs re-checking when the
+        patient's medication orders change. Returns the union of results
+        updated after updated_since and the results matching params for
+        patients with medication changes, de-duplicated by resource id.
+        Every page of each search is read.
+        """
+        results = {}
+        for resource in search_all(self, resource_type, {
+            **params, "_lastUpdated": format_last_updated(updated_since),
+        }):
+            results[resource.get("id")] = resource
+
+        patient_ids = sorted(self.get_patients_with_medication_changes(updated_since))
+        chunk_size = getattr(settings, 'FHIR_BULK_RESOLVE_CHUNK_SIZE', 50)
+        for start in range(0, len(patient_ids), chunk_size):
+            chunk = patient_ids[start:start + chunk_size]
+            for resource in search_all(self, resource_type, {**params, "patient": ",".join(chunk)}):
+                results.setdefault(resource.get("id"), resource)
+
+        return list(results.values())
+
     def get_observations_for_report(self, report_id: str) -> list[dict]:
         """Get Observation resources linked to a DiagnosticReport."""
         response = self.get("Observation", {
@@ -125,6 +180,12 @@ class HAPIFHIRClient(FHIRClient):
         response.raise_for_status()
         return response.json()
 
+    def get_page(self, url: str) -> dict:
+        """GET a search result page by its full (next link) URL."""
+        response = self.session.get(url)
+        response.raise_for_status()
+        return response.json()
+
     def post(self, resource_path: str, resource: dict) -> dict:
         """POST request to FHIR server."""
         response = self.session.post(
@@ -150,9 +211,6 @@ class EpicFHIRClient(FHIRClient):
             settings, 'EPIC_PRIVATE_KEY_PATH', None
         )
 
-        self.access_token: str | None = None
-        self.token_expires_at: datetime | None = None
-
         self.session = requests.Session()
         self.session.headers.update({
             "Accept": "application/fhir+json",
@@ -171,70 +229,38 @@ class EpicFHIRClient(FHIRClient):
         return f"{base}/oauth2/token"
 
     def _get_access_token(self) -> str:
-        """OAuth 2.0 JWT bearer flow for backend apps."""
-        import jwt
-
-        # Return cached token if still valid
-        if self.access_token and self.token_expires_at:
-            if self.token_expires_at > datetime.now():
-                return self.access_token
-
-        if not self.private_key:
-            raise ValueError("Private key not loaded - cannot authenticate to Epic")
-
-        token_url = self._get_token_url()
-        now = int(time.time())
-
-        # Build JWT assertion
-        claims = {
-            "iss": self.client_id,
-            "sub": self.client_id,
-            "aud": token_url,
-            "jti": f"{now}-{self.client_id}",
-            "exp": now + 300,  # 5 minute expiry
-        }
+        """OAuth 2.0 JWT bearer flow for backend apps (shared token cache)."""
+        return self._token_provider().get_token()
 
-        assertion = jwt.encode(claims, self.private_key, algorithm="RS384")
-
-        # Request access token
-        response = requests.post(
-            token_url,
-            data={
-                "grant_type": "client_credentials",
-                "client_assertion_type": "urn:ietf:params:oauth:client-assertion-type:jwt-bearer",
-                "client_assertion": assertion,
-            },
-        )
-        response.raise_for_status()
-
-        token_data = response.json()
-        self.access_token = token_data["access_token"]
-        expires_in = token_data.get("expires_in", 3600)
-        self.token_expires_at = datetime.now() + timedelta(seconds=expires_in - 60)
-
-        return self.access_token
+    def _token_provider(self):
+        return get_epic_token_provider(self.client_id, self.private_key, self._get_token_url())
 
     def get(self, resource_path: str, params: dict | None = None) -> dict:
         """GET request with OAuth authentication."""
-        token = self._get_access_token()
-
-        response = self.session.get(
+        response = send_with_token(self._token_provider(), lambda token: self.session.get(
             f"{self.base_url}/{resource_path}",
             params=params,
             headers={"Authorization": f"Bearer {token}"},
+        ))
+        response.raise_for_status()
+        return response.json()
+
+    def get_page(self, url: str) -> dict:
+        """GET a search result page by its full (next link) URL."""
+        response = send_with_token(
+            self._token_provider(),
+            lambda token: self.session.get(url, headers={"Authorization": f"Bearer {token}"}),
         )
         response.raise_for_status()
         return response.json()
 
     def post(self, resource_path: str, resource: dict) -> dict:
         """POST request with OAuth authentication."""
-        token = self._get_access_token()
-
-        response = self.session.post(
+        response = send_with_token(self._token_provider(), lambda token: self.session.post(
             f"{self.base_url}/{resource_path}",
             json=resource,
             headers={"Authorization": f"Bearer {token}"},
-        )
+        ))
         response.raise_for_status()
         return response.json()
 
@@ -387,12 +413,15 @@ class DrugBugFHIRClient:
     def get_cultures_with_susceptibilities(
         self,
         hours_back: int = 24,
+        updated_since: datetime | None = None,
     ) -> list[CultureWithSusceptibilities]:
         """Get recent cultures with their susceptibility results."""
         cultures = []
 
         # Get recent microbiology reports
-        reports = self.fhir.get_recent_microbiology_reports(hours_back=hours_back)
+        reports = self.fhir.get_recent_microbiology_reports(
+            hours_back=hours_back, updated_since=updated_since,
+        )
 
         for report in reports:
             culture = self._parse_culture_report(report)
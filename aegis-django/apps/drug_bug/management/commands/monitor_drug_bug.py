@@ -6,6 +6,7 @@ Replaces drugbug_src/monitor.py and runner.py.
 Usage:
     python manage.py monitor_drug_bug --once --hours 24
     python manage.py monitor_drug_bug --continuous --interval 300
+    python manage.py monitor_drug_bug --once --reset-cursor
 """
 
 import logging
@@ -13,6 +14,7 @@ import time
 
 from django.core.management.base import BaseCommand
 
+from apps.core.cursors import add_cursor_arguments, apply_cursor_options
 from apps.drug_bug.services import DrugBugMonitorService
 from apps.drug_bug.fhir_client import DrugBugFHIRClient, HAPIFHIRClient
 
@@ -50,6 +52,7 @@ class Command(BaseCommand):
             type=str,
             help='Override FHIR server URL',
         )
+        add_cursor_arguments(parser)
 
     def handle(self, *args, **options):
         lookback_hours = options['hours']
@@ -63,20 +66,26 @@ class Command(BaseCommand):
             )
 
         service = DrugBugMonitorService()
+        use_cursor = apply_cursor_options(self, [service.CURSOR_NAME], options)
 
         if options.get('continuous'):
-            self._run_continuous(service, fhir_client, lookback_hours, interval)
+            self._run_continuous(
+                service, fhir_client, lookback_hours, interval, use_cursor,
+            )
         else:
             result = service.run_detection(
                 hours_back=lookback_hours,
                 fhir_client=fhir_client,
+                use_cursor=use_cursor,
             )
             self.stdout.write(self.style.SUCCESS(
                 f"Check complete: {result['cultures_checked']} cultures checked, "
                 f"{result['alerts_created']} alerts created"
             ))
 
-    def _run_continuous(self, service, fhir_client, lookback_hours, interval):
+    def _run_continuous(
+        self, service, fhir_client, lookback_hours, interval, use_cursor=True,
+    ):
         """Run continuous monitoring loop."""
         self.stdout.write('=' * 60)
         self.stdout.write('Drug-Bug Mismatch Monitor - Starting')
@@ -89,6 +98,7 @@ class Command(BaseCommand):
                 result = service.run_detection(
                     hours_back=lookback_hours,
                     fhir_client=fhir_client,
+                    use_cursor=use_cursor,
                 )
                 self.stdout.write(
                     f"Cycle complete: {result['alerts_created']} alerts created"
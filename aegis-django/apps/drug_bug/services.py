@@ -7,7 +7,10 @@ called from both the management command (CLI) and Celery tasks.
 
 import logging
 
+from django.utils import timezone
+
 from apps.alerts.models import Alert, AlertAudit, AlertType, AlertStatus, AlertSeverity
+from apps.core.models import MonitorCursor
 from .data_models import AlertSeverity as LocalAlertSeverity
 from .fhir_client import DrugBugFHIRClient
 from .matcher import assess_mismatch, should_alert
@@ -25,13 +28,17 @@ SEVERITY_MAP = {
 class DrugBugMonitorService:
     """Service for drug-bug mismatch detection."""
 
-    def run_detection(self, hours_back=24, fhir_client=None):
+    CURSOR_NAME = 'drug_bug'
+
+    def run_detection(self, hours_back=24, fhir_client=None, use_cursor=True):
         """
         Run a single drug-bug mismatch detection cycle.
 
         Args:
             hours_back: Hours to look back for cultures.
             fhir_client: Optional pre-configured FHIR client.
+            use_cursor: Only fetch cultures changed since the last
+                successful cycle (MonitorCursor), then advance it.
 
         Returns:
             Dict with keys: cultures_checked, alerts_created, errors.
@@ -47,9 +54,14 @@ class DrugBugMonitorService:
 
         processed_cultures = set()
 
+        cursor = MonitorCursor.for_monitor(self.CURSOR_NAME) if use_cursor else None
+        updated_since = cursor.since() if cursor else None
+        cycle_started = timezone.now()
+
         try:
             cultures = fhir_client.get_cultures_with_susceptibilities(
-                hours_back=hours_back
+                hours_back=hours_back,
+                updated_since=updated_since,
             )
             result['cultures_checked'] = len(cultures)
             logger.info(
@@ -78,6 +90,9 @@ class DrugBugMonitorService:
                 'error': str(e),
             })
 
+        if cursor and not result['errors']:
+            cursor.advance(cycle_started)
+
         logger.info(
             f"Drug-bug check complete: {result['cultures_checked']} cultures, "
             f"{result['alerts_created']} alerts created"
@@ -17,6 +17,8 @@ from typing import Optional
 import requests
 from django.conf import settings
 
+from apps.core.fhir.cache import get_resource_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -90,7 +92,7 @@ class GuidelineAdherenceFHIRClient:
             or None if not found.
         """
         try:
-            resource = self._get(f"Patient/{patient_id}")
+            resource = get_resource_cache().read("Patient", patient_id, self._get, source=self.base_url)
             return self._resource_to_patient(resource)
         except requests.HTTPError as e:
             if e.response is not None and e.response.status_code == 404:
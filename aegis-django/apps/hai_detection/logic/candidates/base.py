@@ -13,6 +13,9 @@ class BaseCandidateDetector(ABC):
     (CLABSI, CAUTI, SSI, VAE).
     """
 
+    # Whether detect_candidates() honours updated_since
+    supports_incremental: bool = False
+
     @property
     @abstractmethod
     def hai_type(self) -> HAIType:
@@ -24,6 +27,7 @@ class BaseCandidateDetector(ABC):
         self,
         start_date: datetime,
         end_date: datetime,
+        updated_since: datetime | None = None,
     ) -> list[HAICandidate]:
         """Detect potential HAI candidates within a date range.
 
@@ -34,6 +38,11 @@ class BaseCandidateDetector(ABC):
         Args:
             start_date: Start of date range to search
             end_date: End of date range to search
+            updated_since: If given, detectors triggered by a single result
+                (culture or test) only screen results that changed after
+                it; query errors are then raised so the caller's polling
+                cursor is not advanced. Detectors whose windows depend on
+                ongoing data (SSI, VAE) ignore it.
 
         Returns:
             List of HAI candidates identified
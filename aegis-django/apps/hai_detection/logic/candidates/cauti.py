@@ -76,6 +76,8 @@ class CAUTICandidateDetector(BaseCandidateDetector):
         self.min_cfu_ml = CAUTI_MIN_CFU_ML
         self.max_organisms = CAUTI_MAX_ORGANISMS
 
+    supports_incremental = True
+
     @property
     def hai_type(self) -> HAIType:
         return HAIType.CAUTI
@@ -84,6 +86,7 @@ class CAUTICandidateDetector(BaseCandidateDetector):
         self,
         start_date: datetime,
         end_date: datetime,
+        updated_since: datetime | None = None,
     ) -> list[HAICandidate]:
         """Detect potential CAUTI candidates.
 
@@ -109,7 +112,8 @@ class CAUTICandidateDetector(BaseCandidateDetector):
 
         # Get positive urine cultures meeting CFU threshold
         positive_cultures = self.culture_source.get_positive_urine_cultures(
-            start_date, end_date, min_cfu_ml=self.min_cfu_ml
+            start_date, end_date, min_cfu_ml=self.min_cfu_ml,
+            updated_since=updated_since,
         )
 
         logger.info(f"Found {len(positive_cultures)} positive urine cultures >= {self.min_cfu_ml} CFU/mL")
@@ -83,6 +83,8 @@ class CDICandidateDetector(BaseCandidateDetector):
         self.cdi_source = cdi_source or FHIRCDITestSource()
         self.db = db
 
+    supports_incremental = True
+
     @property
     def hai_type(self) -> HAIType:
         """The type of HAI this detector identifies."""
@@ -92,6 +94,7 @@ class CDICandidateDetector(BaseCandidateDetector):
         self,
         start_date: datetime,
         end_date: datetime,
+        updated_since: datetime | None = None,
     ) -> list[HAICandidate]:
         """Detect potential CDI candidates within a date range.
 
@@ -107,11 +110,13 @@ class CDICandidateDetector(BaseCandidateDetector):
         # Get positive CDI tests from FHIR
         try:
             positive_tests = self.cdi_source.get_positive_cdi_tests(
-                start_date, end_date
+                start_date, end_date, updated_since=updated_since
             )
             logger.info(f"Found {len(positive_tests)} positive CDI tests")
         except Exception as e:
             logger.error(f"Failed to query CDI tests: {e}")
+            if updated_since is not None:
+                raise
             return []
 
         for patient, cdi_test in positive_tests:
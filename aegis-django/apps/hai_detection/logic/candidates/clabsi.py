@@ -68,6 +68,8 @@ class CLABSICandidateDetector(BaseCandidateDetector):
         self.min_device_days = Config.MIN_DEVICE_DAYS
         self.post_removal_window = Config.POST_REMOVAL_WINDOW_DAYS
 
+    supports_incremental = True
+
     @property
     def hai_type(self) -> HAIType:
         return HAIType.CLABSI
@@ -76,6 +78,7 @@ class CLABSICandidateDetector(BaseCandidateDetector):
         self,
         start_date: datetime,
         end_date: datetime,
+        updated_since: datetime | None = None,
     ) -> list[HAICandidate]:
         """Detect potential CLABSI candidates.
 
@@ -100,7 +103,7 @@ class CLABSICandidateDetector(BaseCandidateDetector):
 
         # Get positive blood cultures
         cultures_with_patients = self.culture_source.get_positive_blood_cultures(
-            start_date, end_date
+            start_date, end_date, updated_since=updated_since
         )
 
         logger.info(f"Found {len(cultures_with_patients)} positive blood cultures")
@@ -78,6 +78,7 @@ class SSICandidateDetector(BaseCandidateDetector):
         self,
         start_date: datetime,
         end_date: datetime,
+        updated_since: datetime | None = None,
     ) -> list[HAICandidate]:
         """Detect potential SSI candidates.
 
@@ -90,6 +91,8 @@ class SSICandidateDetector(BaseCandidateDetector):
         Args:
             start_date: Start of date range for infection signals
             end_date: End of date range for infection signals
+            updated_since: Ignored; infection signals can appear any time in
+                the surveillance period, so every open procedure is re-screened
 
         Returns:
             List of SSI candidates
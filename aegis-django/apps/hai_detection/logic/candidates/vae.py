@@ -79,6 +79,7 @@ class VAECandidateDetector(BaseCandidateDetector):
         self,
         start_date: datetime,
         end_date: datetime,
+        updated_since: datetime | None = None,
     ) -> list[HAICandidate]:
         """Detect potential VAC candidates.
 
@@ -91,6 +92,8 @@ class VAECandidateDetector(BaseCandidateDetector):
         Args:
             start_date: Start of date range
             end_date: End of date range
+            updated_since: Ignored; VAC depends on each day's vent
+                parameters, so every ventilated patient is re-screened
 
         Returns:
             List of VAC candidates
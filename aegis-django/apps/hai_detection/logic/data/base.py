@@ -82,12 +82,15 @@ class BaseCultureSource(ABC):
         self,
         start_date: datetime,
         end_date: datetime,
+        updated_since: datetime | None = None,
     ) -> list[tuple[Patient, CultureResult]]:
         """Get positive blood cultures within a date range.
 
         Args:
             start_date: Start of date range
             end_date: End of date range
+            updated_since: If given, sources that track changes return only
+                cultures that need re-screening since this time
 
         Returns:
             List of (Patient, CultureResult) tuples
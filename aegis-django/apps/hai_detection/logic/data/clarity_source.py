@@ -323,8 +323,13 @@ class ClarityCultureSource(BaseCultureSource):
         self,
         start_date: datetime,
         end_date: datetime,
+        updated_since: datetime | None = None,
     ) -> list[tuple[Patient, CultureResult]]:
-        """Get positive blood cultures from Clarity ORDER_RESULTS."""
+        """Get positive blood cultures from Clarity ORDER_RESULTS.
+
+        Clarity has no change tracking, so updated_since is ignored and the
+        full date range is always returned.
+        """
         results = []
 
         # Example query - adjust for your institution
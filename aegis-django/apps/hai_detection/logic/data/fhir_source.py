@@ -4,6 +4,10 @@ import logging
 from datetime import datetime, timedelta, date
 
 import requests
+from django.conf import settings
+
+from apps.core.fhir.cache import get_resource_cache
+from apps.core.fhir.parsers import format_last_updated
 
 from ..config import Config
 from ..data_models import (
@@ -416,12 +420,68 @@ class FHIRCultureSource(BaseCultureSource):
         self.base_url = base_url or Config.get_fhir_base_url()
         self.session = requests.Session()
 
+    def _get_entries(self, resource_type: str, params: dict) -> list[dict]:
+        """Run a search and return the raw Bundle entries."""
+        response = self.session.get(
+            f"{self.base_url}/{resource_type}",
+            params=params,
+            timeout=30,
+        )
+        response.raise_for_status()
+        return response.json().get("entry", [])
+
+    def _search_report_entries(
+        self,
+        params: dict,
+        updated_since: datetime | None = None,
+    ) -> list[dict]:
+        """Search DiagnosticReport, returning entries including _include'd patients.
+
+        With updated_since, only entries that need re-screening are returned:
+        reports changed after it, plus all reports matching params for
+        patients whose DeviceUseStatements changed (a line or catheter
+        documented late can turn an older culture into a candidate).
+        """
+        if updated_since is None:
+            return self._get_entries("DiagnosticReport", params)
+
+        since = format_last_updated(updated_since)
+        entries = self._get_entries("DiagnosticReport", {**params, "_lastUpdated": since})
+
+        device_entries = self._get_entries("DeviceUseStatement", {
+            "_lastUpdated": since,
+            "_elements": "subject",
+            "_count": "1000",
+        })
+        patient_ids = sorted({
+            entry.get("resource", {}).get("subject", {}).get("reference", "").split("/")[-1]
+            for entry in device_entries
+        } - {""})
+
+        chunk_size = getattr(settings, 'FHIR_BULK_RESOLVE_CHUNK_SIZE', 50)
+        for start in range(0, len(patient_ids), chunk_size):
+            chunk = patient_ids[start:start + chunk_size]
+            entries.extend(self._get_entries(
+                "DiagnosticReport", {**params, "patient": ",".join(chunk)},
+            ))
+
+        unique = {}
+        for entry in entries:
+            resource = entry.get("resource", {})
+            unique.setdefault((resource.get("resourceType"), resource.get("id")), entry)
+        return list(unique.values())
+
     def get_positive_blood_cultures(
         self,
         start_date: datetime,
         end_date: datetime,
+        updated_since: datetime | None = None,
     ) -> list[tuple[Patient, CultureResult]]:
-        """Get positive blood cultures within a date range."""
+        """Get positive blood cultures within a date range.
+
+        If updated_since is given, only cultures needing re-screening are
+        returned and FHIR errors are raised instead of logged.
+        """
         results = []
 
         # Query DiagnosticReport for blood cultures
@@ -437,17 +497,11 @@ class FHIRCultureSource(BaseCultureSource):
         }
 
         try:
-            response = self.session.get(
-                f"{self.base_url}/DiagnosticReport",
-                params=params,
-                timeout=30,
-            )
-            response.raise_for_status()
-            bundle = response.json()
+            entries = self._search_report_entries(params, updated_since)
 
             # Build patient lookup from included resources
             patients = {}
-            for entry in bundle.get("entry", []):
+            for entry in entries:
                 resource = entry.get("resource", {})
                 if resource.get("resourceType") == "Patient":
                     patient = self._parse_patient(resource)
@@ -455,7 +509,7 @@ class FHIRCultureSource(BaseCultureSource):
                         patients[patient.fhir_id] = patient
 
             # Parse DiagnosticReports and filter for positive results
-            for entry in bundle.get("entry", []):
+            for entry in entries:
                 resource = entry.get("resource", {})
                 if resource.get("resourceType") == "DiagnosticReport":
                     culture = self._parse_diagnostic_report(resource)
@@ -472,10 +526,12 @@ class FHIRCultureSource(BaseCultureSource):
                             if patient:
                                 results.append((patient, culture))
 
-            logger.info(f"Found {len(results)} positive blood cultures from {len(bundle.get('entry', []))} total reports")
+            logger.info(f"Found {len(results)} positive blood cultures from {len(entries)} total reports")
 
         except requests.RequestException as e:
             logger.error(f"FHIR culture query failed: {e}")
+            if updated_since is not None:
+                raise
 
         return results
 
@@ -1118,13 +1174,15 @@ class FHIRVentilatorSource(BaseVentilatorSource):
 
     def _get_encounter_location(self, encounter_id: str) -> str | None:
         """Get location code from an encounter."""
+        def fetch(resource_path: str) -> dict:
+            response = self.session.get(f"{self.base_url}/{resource_path}", timeout=10)
+            response.raise_for_status()
+            return response.json()
+
         try:
-            response = self.session.get(
-                f"{self.base_url}/Encounter/{encounter_id}",
-                timeout=10,
+            encounter = get_resource_cache().read(
+                "Encounter", encounter_id, fetch, source=self.base_url,
             )
-            response.raise_for_status()
-            encounter = response.json()
 
             # Get location from encounter.location[]
             for loc in encounter.get("location", []):
@@ -1446,6 +1504,7 @@ class FHIRUrineCultureSource(FHIRCultureSource):
         start_date: datetime,
         end_date: datetime,
         min_cfu_ml: int = 100000,
+        updated_since: datetime | None = None,
     ) -> list[tuple[Patient, CultureResult]]:
         """Get positive urine cultures meeting CFU threshold.
 
@@ -1453,6 +1512,8 @@ class FHIRUrineCultureSource(FHIRCultureSource):
             start_date: Start of date range
             end_date: End of date range
             min_cfu_ml: Minimum CFU/mL threshold (default 10^5 for CAUTI)
+            updated_since: Only return cultures needing re-screening since
+                this time; FHIR errors are then raised instead of logged
 
         Returns:
             List of (Patient, CultureResult) tuples for qualifying cultures
@@ -1470,17 +1531,11 @@ class FHIRUrineCultureSource(FHIRCultureSource):
         }
 
         try:
-            response = self.session.get(
-                f"{self.base_url}/DiagnosticReport",
-                params=params,
-                timeout=30,
-            )
-            response.raise_for_status()
-            bundle = response.json()
+            entries = self._search_report_entries(params, updated_since)
 
             # Build patient lookup from included resources
             patients = {}
-            for entry in bundle.get("entry", []):
+            for entry in entries:
                 resource = entry.get("resource", {})
                 if resource.get("resourceType") == "Patient":
                     patient = self._parse_patient(resource)
@@ -1488,7 +1543,7 @@ class FHIRUrineCultureSource(FHIRCultureSource):
                         patients[patient.fhir_id] = patient
 
             # Parse urine culture DiagnosticReports
-            for entry in bundle.get("entry", []):
+            for entry in entries:
                 resource = entry.get("resource", {})
                 if resource.get("resourceType") == "DiagnosticReport":
                     culture = self._parse_urine_culture(resource)
@@ -1515,6 +1570,8 @@ class FHIRUrineCultureSource(FHIRCultureSource):
 
         except requests.RequestException as e:
             logger.error(f"FHIR urine culture query failed: {e}")
+            if updated_since is not None:
+                raise
 
         return results
 
@@ -1733,6 +1790,7 @@ class FHIRCDITestSource:
         self,
         start_date: datetime,
         end_date: datetime,
+        updated_since: datetime | None = None,
     ) -> list[tuple["Patient", "CDITestResult"]]:
         """Get positive C. diff toxin/PCR tests within a date range.
 
@@ -1742,6 +1800,8 @@ class FHIRCDITestSource:
         Args:
             start_date: Start of date range to search
             end_date: End of date range to search
+            updated_since: Only return tests changed after this time
+                (``_lastUpdated``); FHIR errors are then raised instead of logged
 
         Returns:
             List of (Patient, CDITestResult) tuples for positive qualifying tests
@@ -1762,6 +1822,8 @@ class FHIRCDITestSource:
             "_include": "Observation:subject",
             "_count": "100",
         }
+        if updated_since is not None:
+            params["_lastUpdated"] = format_last_updated(updated_since)
 
         try:
             response = self.session.get(
@@ -1803,6 +1865,8 @@ class FHIRCDITestSource:
 
         except requests.RequestException as e:
             logger.error(f"FHIR CDI test query failed: {e}")
+            if updated_since is not None:
+                raise
 
         return results
 
@@ -9,6 +9,7 @@ Usage:
     python manage.py monitor_hai --once --dry-run    # Preview without saving
     python manage.py monitor_hai --continuous         # Continuous monitoring
     python manage.py monitor_hai --stats              # Show statistics
+    python manage.py monitor_hai --once --reset-cursor # Re-screen full lookback
 """
 
 import time
@@ -17,6 +18,7 @@ import logging
 from django.core.management.base import BaseCommand
 from django.conf import settings
 
+from apps.core.cursors import add_cursor_arguments, apply_cursor_options
 from apps.hai_detection.services import HAIDetectionService
 from apps.hai_detection.models import (
     HAICandidate, HAIClassification, HAIReview,
@@ -60,6 +62,7 @@ class Command(BaseCommand):
             '--interval', type=int, default=None,
             help='Polling interval in seconds (with --continuous)',
         )
+        add_cursor_arguments(parser)
 
     def handle(self, *args, **options):
         if options['stats']:
@@ -67,13 +70,20 @@ class Command(BaseCommand):
             return
 
         service = HAIDetectionService()
+        use_cursor = apply_cursor_options(
+            self, [service.cursor_name(hai_type) for hai_type in HAIType], options,
+        )
 
         if options['once']:
             if options['classify']:
-                results = service.run_full_pipeline(dry_run=options['dry_run'])
+                results = service.run_full_pipeline(
+                    dry_run=options['dry_run'], use_cursor=use_cursor,
+                )
                 self._show_pipeline_results(results)
             else:
-                results = service.run_detection(dry_run=options['dry_run'])
+                results = service.run_detection(
+                    dry_run=options['dry_run'], use_cursor=use_cursor,
+                )
                 self._show_detection_results(results)
 
         elif options['continuous']:
@@ -83,7 +93,7 @@ class Command(BaseCommand):
 
             while True:
                 try:
-                    results = service.run_detection()
+                    results = service.run_detection(use_cursor=use_cursor)
                     self._show_detection_results(results)
                 except Exception as e:
                     self.stderr.write(self.style.ERROR(f"Error in monitoring cycle: {e}"))
@@ -17,6 +17,7 @@ from django.conf import settings
 from django.utils import timezone
 
 from apps.alerts.models import Alert, AlertType, AlertSeverity, AlertStatus
+from apps.core.models import MonitorCursor
 
 from .models import (
     HAICandidate, HAIClassification, HAIReview, LLMAuditLog,
@@ -99,22 +100,44 @@ class HAIDetectionService:
                 return None
         return self._classifiers.get(hai_type)
 
-    def run_detection(self, dry_run=False):
+    @staticmethod
+    def cursor_name(hai_type):
+        """MonitorCursor name for an HAI type's detector."""
+        return f"hai_detection.{hai_type.value}"
+
+    def run_detection(self, dry_run=False, use_cursor=True):
         """
         Run all 5 HAI candidate detectors.
 
+        Args:
+            dry_run: Preview without saving (cursors are not advanced).
+            use_cursor: For detectors that support it, only screen results
+                changed since the type's last successful cycle (MonitorCursor).
+
         Returns:
             Dict with detection results.
         """
         results = {'new_candidates': 0, 'by_type': {}, 'errors': []}
 
+        hai_settings = getattr(settings, 'HAI_DETECTION', {})
+        end_date = datetime.now()
+        start_date = end_date - timedelta(hours=hai_settings.get('LOOKBACK_HOURS', 24))
+
         for hai_type in HAIType:
             detector = self._get_detector(hai_type)
             if not detector:
                 continue
 
+            cursor = None
+            if use_cursor and detector.supports_incremental:
+                cursor = MonitorCursor.for_monitor(self.cursor_name(hai_type))
+            cycle_started = timezone.now()
+
             try:
-                candidates = detector.detect_candidates()
+                candidates = detector.detect_candidates(
+                    start_date, end_date,
+                    updated_since=cursor.since() if cursor else None,
+                )
                 type_count = 0
 
                 for candidate in candidates:
@@ -157,6 +180,9 @@ class HAIDetectionService:
                 results['by_type'][hai_type.value] = type_count
                 results['new_candidates'] += type_count
 
+                if cursor and not dry_run:
+                    cursor.advance(cycle_started)
+
             except Exception as e:
                 logger.error(f"Error in {hai_type.value} detection: {e}", exc_info=True)
                 results['errors'].append(f"{hai_type.value}: {str(e)}")
@@ -251,12 +277,12 @@ class HAIDetectionService:
         logger.info(f"Classification complete: {results['classified']} classified, {results['errors']} errors")
         return results
 
-    def run_full_pipeline(self, dry_run=False):
+    def run_full_pipeline(self, dry_run=False, use_cursor=True):
         """Run full pipeline: detection + classification."""
         results = {'detection': {}, 'classification': {}}
 
         logger.info("=== Step 1: Detection ===")
-        results['detection'] = self.run_detection(dry_run=dry_run)
+        results['detection'] = self.run_detection(dry_run=dry_run, use_cursor=use_cursor)
 
         if not dry_run:
             logger.info("=== Step 2: Classification ===")
@@ -3,7 +3,6 @@
 Queries microbiology cultures with susceptibility results to identify MDROs.
 """
 
-import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from datetime import datetime, timedelta
@@ -12,6 +11,12 @@ from typing import Optional
 import requests
 from django.conf import settings
 
+from apps.core.fhir.cache import read_resource
+from apps.core.fhir.paging import search_all
+from apps.core.fhir.parsers import format_last_updated
+from apps.core.fhir.resolver import resolve_references
+from apps.core.fhir.tokens import get_epic_token_provider, send_with_token
+
 
 @dataclass
 class CultureResult:
@@ -72,6 +77,12 @@ class HAPIFHIRClient(FHIRClient):
         response.raise_for_status()
         return response.json()
 
+    def get_page(self, url: str) -> dict:
+        """GET a search result page by its full (next link) URL."""
+        response = self.session.get(url)
+        response.raise_for_status()
+        return response.json()
+
 
 class EpicFHIRClient(FHIRClient):
     """Client for Epic FHIR API with OAuth 2.0."""
@@ -86,9 +97,6 @@ class EpicFHIRClient(FHIRClient):
         self.client_id = client_id or getattr(settings, 'EPIC_CLIENT_ID', '')
         self.private_key_path = private_key_path or getattr(settings, 'EPIC_PRIVATE_KEY_PATH', '')
 
-        self.access_token: str | None = None
-        self.token_expires_at: datetime | None = None
-
         self.session = requests.Session()
         self.session.headers.update({
             "Accept": "application/fhir+json",
@@ -106,54 +114,27 @@ class EpicFHIRClient(FHIRClient):
         return f"{base}/oauth2/token"
 
     def _get_access_token(self) -> str:
-        """OAuth 2.0 JWT bearer flow for backend apps."""
-        import jwt
-
-        if self.access_token and self.token_expires_at:
-            if self.token_expires_at > datetime.now():
-                return self.access_token
+        """OAuth 2.0 JWT bearer flow for backend apps (shared token cache)."""
+        return self._token_provider().get_token()
 
-        if not self.private_key:
-            raise ValueError("Private key not loaded")
-
-        token_url = self._get_token_url()
-        now = int(time.time())
-
-        claims = {
-            "iss": self.client_id,
-            "sub": self.client_id,
-            "aud": token_url,
-            "jti": f"{now}-{self.client_id}",
-            "exp": now + 300,
-        }
-
-        assertion = jwt.encode(claims, self.private_key, algorithm="RS384")
-
-        response = requests.post(
-            token_url,
-            data={
-                "grant_type": "client_credentials",
-                "client_assertion_type": "urn:ietf:params:oauth:client-assertion-type:jwt-bearer",
-                "client_assertion": assertion,
-            },
-        )
-        response.raise_for_status()
-
-        token_data = response.json()
-        self.access_token = token_data["access_token"]
-        expires_in = token_data.get("expires_in", 3600)
-        self.token_expires_at = datetime.now() + timedelta(seconds=expires_in - 60)
-
-        return self.access_token
+    def _token_provider(self):
+        return get_epic_token_provider(self.client_id, self.private_key, self._get_token_url())
 
     def get(self, resource_path: str, params: dict | None = None) -> dict:
         """GET request with OAuth authentication."""
-        token = self._get_access_token()
-
-        response = self.session.get(
+        response = send_with_token(self._token_provider(), lambda token: self.session.get(
             f"{self.base_url}/{resource_path}",
             params=params,
             headers={"Authorization": f"Bearer {token}"},
+        ))
+        response.raise_for_status()
+        return response.json()
+
+    def get_page(self, url: str) -> dict:
+        """GET a search result page by its full (next link) URL."""
+        response = send_with_token(
+            self._token_provider(),
+            lambda token: self.session.get(url, headers={"Authorization": f"Bearer {token}"}),
         )
         response.raise_for_status()
         return response.json()
@@ -177,8 +158,18 @@ class MDROFHIRClient:
         self._patient_cache: dict[str, dict] = {}
         self._encounter_cache: dict[str, dict] = {}
 
-    def get_recent_cultures(self, hours_back: int = 24) -> list[CultureResult]:
-        """Get recent finalized microbiology cultures with susceptibilities."""
+    def get_recent_cultures(
+        self,
+        hours_back: int = 24,
+        updated_since: datetime | None = None,
+    ) -> list[CultureResult]:
+        """Get recent finalized microbiology cultures with susceptibilities.
+
+        If updated_since is given, only reports changed after it are fetched
+        (``_lastUpdated``); the hours_back collection window still applies.
+        Every result page is then read and failed patient/encounter lookups
+        raise, so a partial fetch never advances the cursor.
+        """
         cultures = []
         date_from = datetime.now() - timedelta(hours=hours_back)
 
@@ -188,8 +179,13 @@ class MDROFHIRClient:
             "date": f"ge{date_from.strftime('%Y-%m-%dT%H:%M:%S')}",
             "_count": "500",
         }
-        response = self.fhir.get("DiagnosticReport", params)
-        reports = self.fhir._extract_entries(response)
+        if updated_since is not None:
+            params["_lastUpdated"] = format_last_updated(updated_since)
+            reports = search_all(self.fhir, "DiagnosticReport", params)
+        else:
+            response = self.fhir.get("DiagnosticReport", params)
+            reports = self.fhir._extract_entries(response)
+        self._prefetch_references(reports, raise_errors=updated_since is not None)
 
         for report in reports:
             culture = self._parse_culture_report(report)
@@ -198,6 +194,22 @@ class MDROFHIRClient:
 
         return cultures
 
+    def _prefetch_references(self, reports: list[dict], raise_errors: bool = False) -> None:
+        """Resolve every report's patient and encounter in a few bulk requests."""
+        refs = []
+        for report in reports:
+            for field in ("subject", "encounter"):
+                ref = report.get(field, {}).get("reference", "")
+                if ref:
+                    refs.append(ref)
+
+        for key, resource in resolve_references(self.fhir, refs, raise_errors=raise_errors).items():
+            resource_type, resource_id = key.split("/", 1)
+            if resource_type == "Patient":
+                self._patient_cache[resource_id] = self._summarize_patient(resource)
+            elif resource_type == "Encounter":
+                self._encounter_cache[resource_id] = self._summarize_encounter(resource)
+
     def _parse_culture_report(self, report: dict) -> Optional[CultureResult]:
         """Parse a DiagnosticReport into CultureResult with susceptibilities."""
         organism = None
@@ -398,65 +410,73 @@ class MDROFHIRClient:
             return self._patient_cache[patient_id]
 
         try:
-            patient = self.fhir.get(f"Patient/{patient_id}")
-
-            mrn = "Unknown"
-            for identifier in patient.get("identifier", []):
-                if "mrn" in identifier.get("system", "").lower():
-                    mrn = identifier.get("value", mrn)
-                    break
-                mrn = identifier.get("value", mrn)
-
-            name = "Unknown"
-            for name_entry in patient.get("name", []):
-                given = " ".join(name_entry.get("given", []))
-                family = name_entry.get("family", "")
-                name = f"{given} {family}".strip() or name
-                break
-
-            result = {"mrn": mrn, "name": name}
+            patient = read_resource(self.fhir, "Patient", patient_id)
+            result = self._summarize_patient(patient)
             self._patient_cache[patient_id] = result
             return result
         except requests.HTTPError:
             return {"mrn": "Unknown", "name": "Unknown"}
 
+    @staticmethod
+    def _summarize_patient(patient: dict) -> dict:
+        """Extract MRN and display name from a Patient resource."""
+        mrn = "Unknown"
+        for identifier in patient.get("identifier", []):
+            if "mrn" in identifier.get("system", "").lower():
+                mrn = identifier.get("value", mrn)
+                break
+            mrn = identifier.get("value", mrn)
+
+        name = "Unknown"
+        for name_entry in patient.get("name", []):
+            given = " ".join(name_entry.get("given", []))
+            family = name_entry.get("family", "")
+            name = f"{given} {family}".strip() or name
+            break
+
+        return {"mrn": mrn, "name": name}
+
     def _get_encounter(self, encounter_id: str) -> dict:
         """Get encounter details for location (cached)."""
         if encounter_id in self._encounter_cache:
             return self._encounter_cache[encounter_id]
 
         try:
-            encounter = self.fhir.get(f"Encounter/{encounter_id}")
-
-            facility = None
-            unit = None
-
-            for loc in encounter.get("location", []):
-                loc_ref = loc.get("location", {})
-                display = loc_ref.get("display")
-                if display:
-                    if unit is None:
-                        unit = display
-                    if facility is None:
-                        facility = display
-
-            service_provider = encounter.get("serviceProvider", {})
-            if service_provider.get("display"):
-                facility = service_provider["display"]
-
-            result = {"facility": facility, "unit": unit}
+            encounter = read_resource(self.fhir, "Encounter", encounter_id)
+            result = self._summarize_encounter(encounter)
             self._encounter_cache[encounter_id] = result
             return result
         except requests.HTTPError:
             return {"facility": None, "unit": None}
 
+    @staticmethod
+    def _summarize_encounter(encounter: dict) -> dict:
+        """Extract facility and unit from an Encounter resource."""
+        facility = None
+        unit = None
+
+        for loc in encounter.get("location", []):
+            loc_ref = loc.get("location", {})
+            display = loc_ref.get("display")
+            if display:
+                if unit is None:
+                    unit = display
+                if facility is None:
+                    facility = display
+
+        service_provider = encounter.get("serviceProvider", {})
+        if service_provider.get("display"):
+            facility = service_provider["display"]
+
+        return {"facility": facility, "unit": unit}
+
     def get_patient_admission_date(self, patient_id: str, encounter_id: str | None) -> Optional[datetime]:
         """Get admission date for the patient's current encounter."""
         if not encounter_id:
             return None
 
         try:
-            encounter = self.fhir.get(f"Encounter/{encounter_id}")
+            encounter = read_resource(self.fhir, "Encounter", encounter_id)
             period = encounter.get("period", {})
             start = period.get("start")
             if start:
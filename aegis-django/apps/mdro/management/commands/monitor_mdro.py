@@ -8,6 +8,8 @@ Usage:
     python manage.py monitor_mdro --once
     python manage.py monitor_mdro --once --hours 72
     python manage.py monitor_mdro --continuous --interval 15
+    python manage.py monitor_mdro --once --reset-cursor
+    python manage.py monitor_mdro --once --hours 168 --cursor-since 2026-01-01
 """
 
 import logging
@@ -15,6 +17,7 @@ import time
 
 from django.core.management.base import BaseCommand
 
+from apps.core.cursors import add_cursor_arguments, apply_cursor_options
 from apps.mdro.services import MDROMonitorService
 
 logger = logging.getLogger(__name__)
@@ -46,15 +49,23 @@ class Command(BaseCommand):
             default=15,
             help='Minutes between polls in continuous mode (default: 15)',
         )
+        add_cursor_arguments(parser)
 
     def handle(self, *args, **options):
         service = MDROMonitorService()
+        use_cursor = apply_cursor_options(
+            self, [MDROMonitorService.CURSOR_NAME], options,
+        )
 
         if options['continuous']:
-            self._run_continuous(service, options['hours'], options['interval'])
+            self._run_continuous(
+                service, options['hours'], options['interval'], use_cursor,
+            )
         else:
             # Default to --once behavior
-            result = service.run_detection(hours_back=options['hours'])
+            result = service.run_detection(
+                hours_back=options['hours'], use_cursor=use_cursor,
+            )
             self.stdout.write(self.style.SUCCESS(
                 f"Monitor complete: {result['new_mdro_cases']} new cases, "
                 f"{result['cultures_checked']} cultures checked, "
@@ -66,7 +77,7 @@ class Command(BaseCommand):
                     f"  Errors: {len(result['errors'])}"
                 ))
 
-    def _run_continuous(self, service, hours_back, interval_minutes):
+    def _run_continuous(self, service, hours_back, interval_minutes, use_cursor=True):
         """Run continuous monitoring loop."""
         self.stdout.write(
             f"Starting MDRO monitor (polling every {interval_minutes} minutes)"
@@ -74,7 +85,9 @@ class Command(BaseCommand):
 
         while True:
             try:
-                result = service.run_detection(hours_back=hours_back)
+                result = service.run_detection(
+                    hours_back=hours_back, use_cursor=use_cursor,
+                )
                 self.stdout.write(
                     f"Polling complete: {result['new_mdro_cases']} new cases"
                 )
@@ -10,6 +10,7 @@ import logging
 from django.utils import timezone
 
 from apps.alerts.models import Alert, AlertType, AlertSeverity
+from apps.core.models import MonitorCursor
 from .classifier import MDROClassifier
 from .fhir_client import MDROFHIRClient
 from .models import (
@@ -33,12 +34,16 @@ MDRO_SEVERITY_MAP = {
 class MDROMonitorService:
     """Service for MDRO surveillance detection."""
 
-    def run_detection(self, hours_back=24):
+    CURSOR_NAME = 'mdro'
+
+    def run_detection(self, hours_back=24, use_cursor=True):
         """
         Run a single MDRO detection cycle.
 
         Args:
             hours_back: Hours to look back for cultures.
+            use_cursor: Only fetch cultures updated since the last
+                successful cycle (MonitorCursor), then advance it.
 
         Returns:
             Dict with keys: cultures_checked, new_mdro_cases,
@@ -47,6 +52,10 @@ class MDROMonitorService:
         classifier = MDROClassifier()
         fhir = MDROFHIRClient()
 
+        cursor = MonitorCursor.for_monitor(self.CURSOR_NAME) if use_cursor else None
+        updated_since = cursor.since() if cursor else None
+        cycle_started = timezone.now()
+
         result = {
             'cultures_checked': 0,
             'new_mdro_cases': 0,
@@ -56,7 +65,9 @@ class MDROMonitorService:
         }
 
         try:
-            cultures = fhir.get_recent_cultures(hours_back=hours_back)
+            cultures = fhir.get_recent_cultures(
+                hours_back=hours_back, updated_since=updated_since,
+            )
             result['cultures_checked'] = len(cultures)
             logger.info(f"Found {len(cultures)} cultures in last {hours_back} hours")
 
@@ -186,4 +197,9 @@ class MDROMonitorService:
                 'error': str(e),
             })
 
+        # Failed cultures are retried next cycle (already-processed ones
+        # are still skipped via MDROProcessingLog)
+        if cursor and not result['errors']:
+            cursor.advance(cycle_started)
+
         return result
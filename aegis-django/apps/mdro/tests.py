@@ -7,7 +7,7 @@ Tests cover:
 - MDROCase model CRUD, custom manager, properties, methods
 - MDROReview model
 - MDROProcessingLog model
-- MDROMonitorService (mocked)
+- MDROMonitorService (mocked), including polling cursor handling
 - Model __str__ methods
 - Alert integration
 """
@@ -21,6 +21,7 @@ from django.utils import timezone
 
 from apps.alerts.models import Alert, AlertType, AlertSeverity, AlertStatus
 from apps.authentication.models import User, UserRole
+from apps.core.models import MonitorCursor
 
 from .classifier import MDROClassifier, MDROType, MDROClassification
 from .models import (
@@ -481,6 +482,52 @@ class MDROMonitorServiceTests(TestCase):
         self.assertTrue(len(result['errors']) > 0)
         self.assertEqual(result['new_mdro_cases'], 0)
 
+    @patch('apps.mdro.services.MDROFHIRClient')
+    def test_run_detection_advances_cursor(self, mock_fhir_cls):
+        mock_fhir = MagicMock()
+        mock_fhir.get_recent_cultures.return_value = []
+        mock_fhir_cls.return_value = mock_fhir
+
+        service = MDROMonitorService()
+        service.run_detection()
+        # First cycle has no watermark: full lookback window
+        self.assertIsNone(
+            mock_fhir.get_recent_cultures.call_args.kwargs['updated_since']
+        )
+
+        cursor = MonitorCursor.for_monitor(MDROMonitorService.CURSOR_NAME)
+        self.assertIsNotNone(cursor.watermark)
+
+        service.run_detection()
+        self.assertEqual(
+            mock_fhir.get_recent_cultures.call_args.kwargs['updated_since'],
+            cursor.since(),
+        )
+
+    @patch('apps.mdro.services.MDROFHIRClient')
+    def test_run_detection_error_keeps_cursor(self, mock_fhir_cls):
+        mock_fhir = MagicMock()
+        mock_fhir.get_recent_cultures.side_effect = Exception('FHIR server down')
+        mock_fhir_cls.return_value = mock_fhir
+
+        MDROMonitorService().run_detection()
+
+        cursor = MonitorCursor.for_monitor(MDROMonitorService.CURSOR_NAME)
+        self.assertIsNone(cursor.watermark)
+
+    @patch('apps.mdro.services.MDROFHIRClient')
+    def test_run_detection_without_cursor(self, mock_fhir_cls):
+        mock_fhir = MagicMock()
+        mock_fhir.get_recent_cultures.return_value = []
+        mock_fhir_cls.return_value = mock_fhir
+
+        MDROMonitorService().run_detection(use_cursor=False)
+
+        self.assertIsNone(
+            mock_fhir.get_recent_cultures.call_args.kwargs['updated_since']
+        )
+        self.assertFalse(MonitorCursor.objects.exists())
+
 
 # ============================================================================
 # MDRO Full Names Tests
@@ -11,6 +11,7 @@ from datetime import date
 from typing import Any
 
 from . import config as cfg
+from .clarity import get_clarity_engine
 
 logger = logging.getLogger(__name__)
 
@@ -24,13 +25,7 @@ class ARDataExtractor:
 
     def _get_engine(self):
         if self._engine is None:
-            if not self.connection_string:
-                raise ValueError(
-                    "No Clarity connection configured. Set CLARITY_CONNECTION_STRING "
-                    "or MOCK_CLARITY_DB_PATH in environment."
-                )
-            from sqlalchemy import create_engine
-            self._engine = create_engine(self.connection_string)
+            self._engine = get_clarity_engine(self.connection_string)
         return self._engine
 
     def _is_sqlite(self) -> bool:
@@ -47,6 +42,20 @@ class ARDataExtractor:
         end_date = date(year, end_month, last_day)
         return start_date, end_date
 
+    def _culture_filters(self, locations, specimen_types) -> tuple[str, str]:
+        """Location and specimen type filters for the positive-culture query."""
+        location_filter = ""
+        if locations:
+            location_list = ", ".join(f"'{loc}'" for loc in locations)
+            location_filter = f"AND loc.NHSN_LOCATION_CODE IN ({location_list})"
+
+        specimen_filter = ""
+        if specimen_types:
+            specimen_list = ", ".join(f"'{s}'" for s in specimen_types)
+            specimen_filter = f"AND cr.SPECIMEN_TYPE IN ({specimen_list})"
+
+        return location_filter, specimen_filter
+
     def get_culture_results(
         self,
         locations: list[str] | None = None,
@@ -67,15 +76,7 @@ class ARDataExtractor:
         if specimen_types is None:
             specimen_types = cfg.get_ar_specimen_types()
 
-        location_filter = ""
-        if locations:
-            location_list = ", ".join(f"'{loc}'" for loc in locations)
-            location_filter = f"AND loc.NHSN_LOCATION_CODE IN ({location_list})"
-
-        specimen_filter = ""
-        if specimen_types:
-            specimen_list = ", ".join(f"'{s}'" for s in specimen_types)
-            specimen_filter = f"AND cr.SPECIMEN_TYPE IN ({specimen_list})"
+        location_filter, specimen_filter = self._culture_filters(locations, specimen_types)
 
         if self._is_sqlite():
             quarter_expr = (
@@ -162,6 +163,121 @@ class ARDataExtractor:
             logger.error(f"Susceptibility results query failed: {e}")
             return pd.DataFrame()
 
+    def get_culture_susceptibilities(
+        self,
+        locations: list[str] | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        specimen_types: list[str] | None = None,
+    ):
+        """Get susceptibility results for every isolate get_culture_results returns.
+
+        Filters on the culture criteria in SQL, so there is no isolate ID
+        list to send back to Clarity.
+        """
+        import pandas as pd
+        from sqlalchemy import text
+
+        if specimen_types is None:
+            specimen_types = cfg.get_ar_specimen_types()
+
+        location_filter, specimen_filter = self._culture_filters(locations, specimen_types)
+
+        query = f"""
+        SELECT
+            sr.SUSCEPTIBILITY_ID,
+            sr.CULTURE_ORGANISM_ID as isolate_id,
+            sr.ANTIBIOTIC,
+            sr.ANTIBIOTIC_CODE,
+            sr.MIC,
+            sr.MIC_UNITS,
+            sr.INTERPRETATION,
+            sr.METHOD
+        FROM SUSCEPTIBILITY_RESULTS sr
+        JOIN CULTURE_ORGANISM co ON sr.CULTURE_ORGANISM_ID = co.CULTURE_ORGANISM_ID
+        JOIN CULTURE_RESULTS cr ON co.CULTURE_ID = cr.CULTURE_ID
+        JOIN PATIENT pat ON cr.PAT_ID = pat.PAT_ID
+        LEFT JOIN PAT_ENC pe ON cr.PAT_ENC_CSN_ID = pe.PAT_ENC_CSN_ID
+        LEFT JOIN NHSN_LOCATION_MAP loc ON pe.DEPARTMENT_ID = loc.EPIC_DEPT_ID
+        WHERE cr.CULTURE_STATUS = 'Positive'
+            AND cr.SPECIMEN_TAKEN_TIME >= :start_date
+            AND cr.SPECIMEN_TAKEN_TIME <= :end_date
+            {location_filter}
+            {specimen_filter}
+        ORDER BY sr.CULTURE_ORGANISM_ID, sr.ANTIBIOTIC
+        """
+
+        try:
+            engine = self._get_engine()
+            with engine.connect() as conn:
+                df = pd.read_sql(
+                    text(query), conn,
+                    params={'start_date': start_date, 'end_date': end_date},
+                )
+                df.columns = df.columns.str.lower()
+                return df
+        except Exception as e:
+            logger.error(f"Culture susceptibility query failed: {e}")
+            return pd.DataFrame()
+
+    def get_phenotype_definitions(self):
+        """Get resistance phenotype definitions from NHSN_PHENOTYPE_MAP."""
+        import pandas as pd
+        from sqlalchemy import text
+
+        query = """
+        SELECT PHENOTYPE_CODE, PHENOTYPE_NAME, ORGANISM_PATTERN, RESISTANCE_PATTERN
+        FROM NHSN_PHENOTYPE_MAP
+        """
+
+        try:
+            engine = self._get_engine()
+            with engine.connect() as conn:
+                phenotypes = pd.read_sql(text(query), conn)
+                phenotypes.columns = phenotypes.columns.str.lower()
+                return phenotypes
+        except Exception as e:
+            logger.error(f"Phenotype query failed: {e}")
+            return pd.DataFrame()
+
+    def get_quarter_extract(
+        self,
+        year: int,
+        quarter: int,
+        locations: list[str] | None = None,
+        specimen_types: list[str] | None = None,
+    ):
+        """
+        Get first isolates, their susceptibilities and phenotype prevalence for a quarter.
+
+        Cultures and susceptibilities are each read once and phenotypes are
+        calculated from the same frames, rather than calculate_phenotypes
+        reading both again.
+
+        Returns:
+            (first_isolates, susceptibilities, phenotypes) DataFrames, all
+            empty when the quarter has no positive cultures.
+        """
+        import pandas as pd
+
+        start_date, end_date = self._get_quarter_dates(year, quarter)
+        cultures_df = self.get_culture_results(locations, start_date, end_date, specimen_types)
+        first_isolates = self.apply_first_isolate_rule(cultures_df)
+        if first_isolates.empty:
+            return first_isolates, pd.DataFrame(), pd.DataFrame()
+
+        suscept_df = self.get_culture_susceptibilities(locations, start_date, end_date, specimen_types)
+        if not suscept_df.empty:
+            suscept_df = suscept_df[suscept_df['isolate_id'].isin(first_isolates['isolate_id'])]
+
+        phenotypes = self.get_phenotype_definitions()
+        if phenotypes.empty:
+            return first_isolates, suscept_df, pd.DataFrame()
+
+        return first_isolates, suscept_df, self._match_phenotypes(
+            first_isolates, suscept_df, phenotypes, f"{year}-Q{quarter}",
+        )
+
     def apply_first_isolate_rule(self, cultures_df):
         """Apply NHSN first-isolate deduplication rule."""
         if cultures_df.empty:
@@ -278,7 +394,6 @@ class ARDataExtractor:
     ):
         """Calculate resistance phenotype prevalence (MRSA, VRE, ESBL, CRE, etc.)."""
         import pandas as pd
-        from sqlalchemy import text
 
         if year is None:
             year = date.today().year
@@ -297,24 +412,19 @@ class ARDataExtractor:
         isolate_ids = first_isolates['isolate_id'].tolist()
         suscept_df = self.get_susceptibility_results(isolate_ids)
 
-        phenotype_query = """
-        SELECT PHENOTYPE_CODE, PHENOTYPE_NAME, ORGANISM_PATTERN, RESISTANCE_PATTERN
-        FROM NHSN_PHENOTYPE_MAP
-        """
-
-        try:
-            engine = self._get_engine()
-            with engine.connect() as conn:
-                phenotypes = pd.read_sql(text(phenotype_query), conn)
-                phenotypes.columns = phenotypes.columns.str.lower()
-        except Exception as e:
-            logger.error(f"Phenotype query failed: {e}")
+        phenotypes = self.get_phenotype_definitions()
+        if phenotypes.empty:
             return pd.DataFrame()
 
+        return self._match_phenotypes(first_isolates, suscept_df, phenotypes, f"{year}-Q{quarter}")
+
+    def _match_phenotypes(self, first_isolates, suscept_df, phenotypes, quarter_str):
+        """Count eligible and matching isolates per location and phenotype."""
+        import pandas as pd
+
         results = []
         for loc in first_isolates['nhsn_location_code'].unique():
             loc_isolates = first_isolates[first_isolates['nhsn_location_code'] == loc]
-            quarter_str = f"{year}-Q{quarter}"
 
             for _, pheno in phenotypes.iterrows():
                 phenotype_matches = 0
@@ -10,6 +10,7 @@ from typing import Any
 
 from ..models import AUMonthlySummary, AUAntimicrobialUsage, AUPatientLevel
 from . import config as cfg
+from .clarity import get_clarity_engine
 
 logger = logging.getLogger(__name__)
 
@@ -23,13 +24,7 @@ class AUDataExtractor:
 
     def _get_engine(self):
         if self._engine is None:
-            if not self.connection_string:
-                raise ValueError(
-                    "No Clarity connection configured. Set CLARITY_CONNECTION_STRING "
-                    "or MOCK_CLARITY_DB_PATH in environment."
-                )
-            from sqlalchemy import create_engine
-            self._engine = create_engine(self.connection_string)
+            self._engine = get_clarity_engine(self.connection_string)
         return self._engine
 
     def _is_sqlite(self) -> bool:
@@ -263,116 +258,135 @@ class AUDataExtractor:
             logger.error(f"DDD calculation query failed: {e}")
             return pd.DataFrame()
 
-    def get_monthly_summary(
+    def calculate_usage(
         self,
         locations: list[str] | None = None,
         start_date: date | None = None,
         end_date: date | None = None,
         include_oral: bool | None = None,
-    ) -> dict[str, Any]:
-        """Get comprehensive monthly AU summary for NHSN reporting."""
+    ):
+        """Calculate DOT and DDD together in one query.
+
+        DOT rows match calculate_dot. DDD is per location, month and NHSN
+        code over all routes and medications, as calculate_ddd ignores
+        include_oral.
+        """
         import pandas as pd
-        from .denominator import DenominatorCalculator
+        from sqlalchemy import text
 
-        dot_df = self.calculate_dot(locations, start_date, end_date, include_oral)
-        ddd_df = self.calculate_ddd(locations, start_date, end_date)
-        denom_calc = DenominatorCalculator(self.connection_string)
-        patient_days_df = denom_calc.get_patient_days(locations, start_date, end_date)
+        if start_date is None:
+            start_date = date.today().replace(day=1)
+        if end_date is None:
+            end_date = date.today()
+        if include_oral is None:
+            include_oral = cfg.get_au_include_oral()
 
-        if dot_df.empty:
-            return {
-                'date_range': {
-                    'start': str(start_date) if start_date else None,
-                    'end': str(end_date) if end_date else None,
-                },
-                'locations': [],
-                'overall_totals': {'total_dot': 0, 'total_patient_days': 0, 'dot_per_1000_pd': 0},
-            }
+        location_filter = ""
+        if locations:
+            location_list = ", ".join(f"'{loc}'" for loc in locations)
+            location_filter = f"AND loc.NHSN_LOCATION_CODE IN ({location_list})"
 
-        merged = pd.merge(
-            dot_df,
-            patient_days_df[['nhsn_location_code', 'month', 'patient_days']],
-            on=['nhsn_location_code', 'month'],
-            how='left',
-        )
-        merged['patient_days'] = merged['patient_days'].fillna(0).astype(int)
-        merged['dot_per_1000_pd'] = merged.apply(
-            lambda row: round(row['days_of_therapy'] / row['patient_days'] * 1000, 2)
-            if row['patient_days'] > 0 else 0,
-            axis=1,
-        )
+        route_ok = "1 = 1" if include_oral else "om.ADMIN_ROUTE NOT IN ('PO', 'ORAL')"
 
-        if not ddd_df.empty:
-            merged = pd.merge(
-                merged,
-                ddd_df[['nhsn_location_code', 'month', 'nhsn_code', 'defined_daily_doses']],
-                on=['nhsn_location_code', 'month', 'nhsn_code'],
-                how='left',
-            )
-
-        result = {
-            'date_range': {
-                'start': str(start_date) if start_date else None,
-                'end': str(end_date) if end_date else None,
-            },
-            'locations': [],
-            'overall_totals': {
-                'total_dot': int(merged['days_of_therapy'].sum()),
-                'total_patient_days': int(patient_days_df['patient_days'].sum()) if not patient_days_df.empty else 0,
-            },
-        }
+        if self._is_sqlite():
+            date_expr = "date(mar.TAKEN_TIME)"
+            month_expr = "strftime('%Y-%m', mar.TAKEN_TIME)"
+        else:
+            date_expr = "CONVERT(DATE, mar.TAKEN_TIME)"
+            month_expr = "FORMAT(mar.TAKEN_TIME, 'yyyy-MM')"
 
-        total_pd = result['overall_totals']['total_patient_days']
-        result['overall_totals']['dot_per_1000_pd'] = (
-            round(result['overall_totals']['total_dot'] / total_pd * 1000, 2)
-            if total_pd > 0 else 0
+        # PATIENT is a LEFT JOIN so DDD keeps rows without a patient, as
+        # calculate_ddd does; DOT only counts rows with one
+        query = f"""
+        WITH admin AS (
+            SELECT
+                loc.NHSN_LOCATION_CODE as nhsn_location_code,
+                {month_expr} as month,
+                nm.NHSN_CODE as nhsn_code,
+                nm.NHSN_CATEGORY as nhsn_category,
+                rx.GENERIC_NAME as medication_name,
+                om.ADMIN_ROUTE as route,
+                nm.DDD as ddd,
+                nm.DDD_UNIT as ddd_unit,
+                CASE WHEN {route_ok} AND pat.PAT_MRN_ID IS NOT NULL
+                     THEN pat.PAT_MRN_ID || '-' || nm.NHSN_CODE || '-' || {date_expr} END as therapy_day,
+                CASE
+                    WHEN mar.DOSE_UNIT IN ('g', 'gram', 'grams') THEN mar.DOSE_GIVEN
+                    WHEN mar.DOSE_UNIT IN ('mg', 'milligram', 'milligrams') THEN mar.DOSE_GIVEN / 1000.0
+                    WHEN mar.DOSE_UNIT IN ('mcg', 'microgram', 'micrograms') THEN mar.DOSE_GIVEN / 1000000.0
+                    ELSE 0
+                END as grams
+            FROM MAR_ADMIN_INFO mar
+            JOIN ORDER_MED om ON mar.ORDER_MED_ID = om.ORDER_MED_ID
+            JOIN RX_MED_ONE rx ON om.MEDICATION_ID = rx.MEDICATION_ID
+            JOIN NHSN_ANTIMICROBIAL_MAP nm ON rx.MEDICATION_ID = nm.MEDICATION_ID
+            JOIN PAT_ENC pe ON om.PAT_ENC_CSN_ID = pe.PAT_ENC_CSN_ID
+            LEFT JOIN PATIENT pat ON pe.PAT_ID = pat.PAT_ID
+            JOIN NHSN_LOCATION_MAP loc ON pe.DEPARTMENT_ID = loc.EPIC_DEPT_ID
+            WHERE mar.ACTION_NAME = 'Given'
+                AND mar.TAKEN_TIME >= :start_date
+                AND mar.TAKEN_TIME <= :end_date
+                {location_filter}
+        ),
+        dot AS (
+            SELECT
+                nhsn_location_code, month, nhsn_code, nhsn_category, medication_name, route,
+                COUNT(DISTINCT therapy_day) as days_of_therapy
+            FROM admin
+            GROUP BY nhsn_location_code, month, nhsn_code, nhsn_category, medication_name, route
+        ),
+        medication_ddd AS (
+            SELECT
+                nhsn_location_code, month, nhsn_code,
+                CASE WHEN ddd > 0 THEN SUM(grams) / ddd END as defined_daily_doses
+            FROM admin
+            GROUP BY nhsn_location_code, month, nhsn_code, nhsn_category, medication_name, ddd, ddd_unit
+        ),
+        ddd AS (
+            SELECT nhsn_location_code, month, nhsn_code, SUM(defined_daily_doses) as defined_daily_doses
+            FROM medication_ddd
+            GROUP BY nhsn_location_code, month, nhsn_code
         )
+        SELECT
+            dot.nhsn_location_code, dot.month, dot.nhsn_code, dot.nhsn_category,
+            dot.medication_name, dot.route, dot.days_of_therapy, ddd.defined_daily_doses
+        FROM dot
+        LEFT JOIN ddd
+            ON ddd.nhsn_location_code = dot.nhsn_location_code
+            AND ddd.month = dot.month
+            AND ddd.nhsn_code = dot.nhsn_code
+        WHERE dot.days_of_therapy > 0
+        ORDER BY dot.month, dot.nhsn_location_code, dot.nhsn_category, dot.nhsn_code
+        """
 
-        for loc_code in sorted(merged['nhsn_location_code'].unique()):
-            loc_data = merged[merged['nhsn_location_code'] == loc_code]
-            loc_summary = {
-                'nhsn_location_code': loc_code,
-                'months': [],
-                'totals': {
-                    'total_dot': int(loc_data['days_of_therapy'].sum()),
-                    'patient_days': int(loc_data['patient_days'].sum()),
-                },
-            }
-            loc_pd = loc_summary['totals']['patient_days']
-            loc_summary['totals']['dot_per_1000_pd'] = (
-                round(loc_summary['totals']['total_dot'] / loc_pd * 1000, 2)
-                if loc_pd > 0 else 0
-            )
-
-            for month in sorted(loc_data['month'].unique()):
-                month_data = loc_data[loc_data['month'] == month]
-                month_patient_days = int(month_data['patient_days'].iloc[0]) if len(month_data) > 0 else 0
-                month_summary = {
-                    'month': month,
-                    'patient_days': month_patient_days,
-                    'total_dot': int(month_data['days_of_therapy'].sum()),
-                    'antimicrobials': [],
-                }
-                month_summary['dot_per_1000_pd'] = (
-                    round(month_summary['total_dot'] / month_patient_days * 1000, 2)
-                    if month_patient_days > 0 else 0
+        try:
+            engine = self._get_engine()
+            with engine.connect() as conn:
+                df = pd.read_sql(
+                    text(query), conn,
+                    params={'start_date': start_date, 'end_date': end_date},
                 )
-                for _, row in month_data.iterrows():
-                    antimicrobial = {
-                        'nhsn_code': row['nhsn_code'],
-                        'nhsn_category': row['nhsn_category'],
-                        'medication_name': row['medication_name'],
-                        'route': row['route'],
-                        'days_of_therapy': int(row['days_of_therapy']),
-                        'dot_per_1000_pd': row['dot_per_1000_pd'],
-                    }
-                    if 'defined_daily_doses' in row and pd.notna(row.get('defined_daily_doses')):
-                        antimicrobial['defined_daily_doses'] = round(row['defined_daily_doses'], 2)
-                    month_summary['antimicrobials'].append(antimicrobial)
-                loc_summary['months'].append(month_summary)
-            result['locations'].append(loc_summary)
+                df.columns = df.columns.str.lower()
+                return df
+        except Exception as e:
+            logger.error(f"Usage calculation query failed: {e}")
+            return pd.DataFrame()
 
-        return result
+    def get_monthly_summary(
+        self,
+        locations: list[str] | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        include_oral: bool | None = None,
+    ) -> dict[str, Any]:
+        """Get comprehensive monthly AU summary for NHSN reporting."""
+        from .denominator import DenominatorCalculator
+
+        usage_df = self.calculate_usage(locations, start_date, end_date, include_oral)
+        denom_calc = DenominatorCalculator(self.connection_string)
+        patient_days_df = denom_calc.get_patient_days(locations, start_date, end_date)
+
+        return build_monthly_summary(usage_df, patient_days_df, start_date, end_date)
 
     def export_for_nhsn(
         self,
@@ -409,3 +423,133 @@ class AUDataExtractor:
             'daysOfTherapy': merged['days_of_therapy'],
             'patientDays': merged['patient_days'].fillna(0).astype(int),
         })
+
+
+def _rate_per_1000(count: int, patient_days: int) -> float:
+    return round(count / patient_days * 1000, 2) if patient_days > 0 else 0
+
+
+def build_monthly_summary(
+    usage_df,
+    patient_days_df,
+    start_date: date | None = None,
+    end_date: date | None = None,
+) -> dict[str, Any]:
+    """Build the nested monthly summary from calculate_usage output.
+
+    Location and month totals come from one groupby each and the nested
+    structure is filled in one pass over rows sorted by location and
+    month, so cost is linear in rows.
+    """
+    import pandas as pd
+
+    result = {
+        'date_range': {
+            'start': str(start_date) if start_date else None,
+            'end': str(end_date) if end_date else None,
+        },
+        'locations': [],
+    }
+
+    if usage_df.empty:
+        result['overall_totals'] = {'total_dot': 0, 'total_patient_days': 0, 'dot_per_1000_pd': 0}
+        return result
+
+    merged = pd.merge(
+        usage_df,
+        patient_days_df[['nhsn_location_code', 'month', 'patient_days']],
+        on=['nhsn_location_code', 'month'],
+        how='left',
+    )
+    merged['patient_days'] = merged['patient_days'].fillna(0).astype('int64')
+    # Stable, so antimicrobials keep their category/code order within a month
+    merged = merged.sort_values(['nhsn_location_code', 'month'], kind='stable')
+
+    total_dot = int(merged['days_of_therapy'].sum())
+    total_pd = int(patient_days_df['patient_days'].sum()) if not patient_days_df.empty else 0
+    result['overall_totals'] = {
+        'total_dot': total_dot,
+        'total_patient_days': total_pd,
+        'dot_per_1000_pd': _rate_per_1000(total_dot, total_pd),
+    }
+
+    # Usage whose location mapping has no NHSN code still counts in the
+    # overall totals but has no location to be listed under
+    unmapped = merged['nhsn_location_code'].isna()
+    if unmapped.any():
+        logger.warning(
+            f'Leaving {int(unmapped.sum())} usage rows with no NHSN location code '
+            f'out of the location breakdown'
+        )
+        merged = merged[~unmapped]
+
+    loc_totals = merged.groupby('nhsn_location_code').agg(
+        total_dot=('days_of_therapy', 'sum'),
+        patient_days=('patient_days', 'sum'),
+    )
+    loc_totals = dict(zip(
+        loc_totals.index.tolist(),
+        zip(loc_totals['total_dot'].tolist(), loc_totals['patient_days'].tolist()),
+    ))
+    month_totals = merged.groupby(['nhsn_location_code', 'month']).agg(
+        total_dot=('days_of_therapy', 'sum'),
+        patient_days=('patient_days', 'first'),
+    )
+    month_totals = dict(zip(
+        month_totals.index.tolist(),
+        zip(month_totals['total_dot'].tolist(), month_totals['patient_days'].tolist()),
+    ))
+
+    has_ddd = 'defined_daily_doses' in merged.columns
+    rows = zip(
+        merged['nhsn_location_code'].tolist(),
+        merged['month'].tolist(),
+        merged['nhsn_code'].tolist(),
+        merged['nhsn_category'].tolist(),
+        merged['medication_name'].tolist(),
+        merged['route'].tolist(),
+        merged['days_of_therapy'].tolist(),
+        merged['patient_days'].tolist(),
+        merged['defined_daily_doses'].tolist() if has_ddd else [None] * len(merged),
+    )
+
+    loc_summary = month_summary = None
+    for loc_code, month, nhsn_code, category, medication, route, dot, patient_days, ddd in rows:
+        if loc_summary is None or loc_code != loc_summary['nhsn_location_code']:
+            loc_dot, loc_pd = loc_totals[loc_code]
+            loc_summary = {
+                'nhsn_location_code': loc_code,
+                'months': [],
+                'totals': {
+                    'total_dot': loc_dot,
+                    'patient_days': loc_pd,
+                    'dot_per_1000_pd': _rate_per_1000(loc_dot, loc_pd),
+                },
+            }
+            result['locations'].append(loc_summary)
+            month_summary = None
+
+        if month_summary is None or month != month_summary['month']:
+            month_dot, month_pd = month_totals[(loc_code, month)]
+            month_summary = {
+                'month': month,
+                'patient_days': month_pd,
+                'total_dot': month_dot,
+                'antimicrobials': [],
+                'dot_per_1000_pd': _rate_per_1000(month_dot, month_pd),
+            }
+            loc_summary['months'].append(month_summary)
+
+        antimicrobial = {
+            'nhsn_code': nhsn_code,
+            'nhsn_category': category,
+            'medication_name': medication,
+            'route': route,
+            'days_of_therapy': dot,
+            'dot_per_1000_pd': _rate_per_1000(dot, patient_days),
+        }
+        if ddd is not None and pd.notna(ddd):
+            antimicrobial['defined_daily_doses'] = round(ddd, 2)
+        month_summary['antimicrobials'].append(antimicrobial)
+
+    return result
@@ -0,0 +1,85 @@
+"""Shared Clarity connection pool for NHSN extraction.
+
+Extractors built for the same connection string share one SQLAlchemy
+engine, so the module holds at most CLARITY_MAX_CONNECTIONS connections to
+the reporting server (no overflow) however many extractions run at once.
+A query that cannot get a connection waits up to CLARITY_POOL_TIMEOUT
+seconds.
+
+run_concurrently() runs independent Clarity reads in worker threads within
+the same budget. Workers must not touch the Django ORM: results are handed
+back to the calling thread, which does the database writes.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from . import config as cfg
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def get_clarity_engine(connection_string: str | None):
+    """Get the shared, size-limited engine for a Clarity connection string."""
+    if not connection_string:
+        raise ValueError(
+            "No Clarity connection configured. Set CLARITY_CONNECTION_STRING "
+            "or MOCK_CLARITY_DB_PATH in environment."
+        )
+
+    with _engines_lock:
+        engine = _engines.get(connection_string)
+        if engine is None:
+            from sqlalchemy import create_engine
+            engine = create_engine(
+                connection_string,
+                pool_size=cfg.get_clarity_max_connections(),
+                max_overflow=0,
+                pool_timeout=cfg.get_clarity_pool_timeout(),
+                pool_pre_ping=True,
+            )
+            _engines[connection_string] = engine
+        return engine
+
+
+def dispose_clarity_engines():
+    """Close pooled Clarity connections and forget the shared engines."""
+    with _engines_lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+
+
+def _timed(func):
+    started = time.perf_counter()
+    try:
+        return func(), None, time.perf_counter() - started
+    except Exception as e:
+        return None, e, time.perf_counter() - started
+
+
+def run_concurrently(stages, max_workers: int | None = None):
+    """
+    Run independent Clarity reads in parallel within the concurrency budget.
+
+    Args:
+        stages: Dict of stage name to a zero-argument callable.
+        max_workers: Most stages running at once. Defaults to
+            CLARITY_MAX_CONNECTIONS.
+
+    Yields:
+        (name, value, error, seconds) in the calling thread as each stage
+        finishes. error is the exception the stage raised, or None.
+    """
+    if not stages:
+        return
+
+    budget = max_workers or cfg.get_clarity_max_connections()
+    workers = max(1, min(budget, len(stages)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='clarity') as pool:
+        futures = {pool.submit(_timed, func): name for name, func in stages.items()}
+        for future in as_completed(futures):
+            value, error, seconds = future.result()
+            yield futures[future], value, error, seconds
@@ -66,6 +66,26 @@ def get_ar_first_isolate_only():
     return get_config().get('AR_FIRST_ISOLATE_ONLY', True)
 
 
+def get_extract_reopen_days():
+    """Days before the last extraction run that the nightly extract recomputes."""
+    return get_config().get('EXTRACT_REOPEN_DAYS', 45)
+
+
+def get_extract_backfill_months():
+    """Months the nightly extract backfills when it has no watermark."""
+    return get_config().get('EXTRACT_BACKFILL_MONTHS', 12)
+
+
+def get_clarity_max_connections():
+    """Most Clarity connections (and so concurrent queries) the module may hold."""
+    return get_config().get('CLARITY_MAX_CONNECTIONS', 3)
+
+
+def get_clarity_pool_timeout():
+    """Seconds to wait for a free Clarity connection before failing."""
+    return get_config().get('CLARITY_POOL_TIMEOUT', 300)
+
+
 def is_direct_configured():
     """Check if DIRECT protocol submission is configured."""
     cfg = get_config()
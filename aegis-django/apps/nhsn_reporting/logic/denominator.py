@@ -1,7 +1,9 @@
 """Denominator data aggregation for NHSN reporting.
 
 Calculates device-days and patient-days from Clarity data
-for NHSN monthly summary reporting.
+for NHSN monthly summary reporting. By default stays and device-use runs
+are pulled as day intervals, split at month boundaries and summed rather
+than expanded into one row per day in SQL.
 """
 
 import logging
@@ -9,26 +11,141 @@ from datetime import date
 from typing import Any
 
 from . import config as cfg
+from .clarity import get_clarity_engine
 
 logger = logging.getLogger(__name__)
 
+# Flowsheet rows that document each device as present
+DEVICE_DAY_FILTERS = {
+    'central_line': """(fd.DISP_NAME LIKE '%central%line%' OR fd.DISP_NAME LIKE '%PICC%')
+            AND fm.MEAS_VALUE NOT LIKE '%removed%'""",
+    'urinary_catheter': """(fd.DISP_NAME LIKE '%foley%'
+               OR fd.DISP_NAME LIKE '%urinary%catheter%'
+               OR fd.DISP_NAME LIKE '%indwelling%catheter%')
+            AND fm.MEAS_VALUE NOT LIKE '%removed%'
+            AND fm.MEAS_VALUE NOT LIKE '%discontinued%'""",
+    'ventilator': """(fd.DISP_NAME LIKE '%ventilator%'
+               OR fd.DISP_NAME LIKE '%mechanical%vent%'
+               OR fd.DISP_NAME LIKE '%vent%mode%'
+               OR fd.DISP_NAME LIKE '%intubat%')
+            AND fm.MEAS_VALUE NOT LIKE '%removed%'
+            AND fm.MEAS_VALUE NOT LIKE '%extubat%'
+            AND fm.MEAS_VALUE NOT LIKE '%discontinued%'""",
+}
+
+DENOMINATOR_COLUMNS = ['patient_days', 'central_line_days', 'urinary_catheter_days', 'ventilator_days']
+
+
+def split_intervals_by_month(intervals):
+    """Split inclusive [start_day, end_day] intervals at month boundaries.
+
+    Returns one row per interval-month with nhsn_location_code, month
+    (YYYY-MM) and days. An interval ending before it starts counts one day.
+    """
+    import numpy as np
+    import pandas as pd
+
+    if intervals.empty:
+        return pd.DataFrame({
+            'nhsn_location_code': pd.Series(dtype=object),
+            'month': pd.Series(dtype=object),
+            'days': pd.Series(dtype='int64'),
+        })
+
+    start = pd.to_datetime(intervals['start_day']).to_numpy().astype('datetime64[D]')
+    end = pd.to_datetime(intervals['end_day']).to_numpy().astype('datetime64[D]')
+    end = np.maximum(end, start)
+
+    first_month = start.astype('datetime64[M]')
+    n_months = (end.astype('datetime64[M]') - first_month).astype('int64') + 1
+
+    row = np.repeat(np.arange(len(start)), n_months)
+    offset = np.arange(len(row)) - np.repeat(np.cumsum(n_months) - n_months, n_months)
+    month = first_month[row] + offset
+
+    piece_start = np.maximum(start[row], month.astype('datetime64[D]'))
+    piece_end = np.minimum(end[row], (month + 1).astype('datetime64[D]') - 1)
+
+    return pd.DataFrame({
+        'nhsn_location_code': intervals['nhsn_location_code'].to_numpy()[row],
+        'month': np.datetime_as_string(month, unit='M'),
+        'days': (piece_end - piece_start).astype('int64') + 1,
+    })
+
+
+def count_intervals_by_day(intervals):
+    """Count the inclusive [start_day, end_day] intervals covering each location-day.
+
+    Returns one row per location and calendar day with a non-zero count:
+    nhsn_location_code, date (datetime.date) and days. Counted with a
+    difference array (+1 on the start day, -1 after the end day, then a
+    running sum per location), so memory grows with locations x days in
+    range rather than with the days the intervals cover. An interval
+    ending before it starts counts one day; rows with no location are
+    ignored.
+    """
+    import numpy as np
+    import pandas as pd
+
+    location_codes, locations = pd.factorize(intervals['nhsn_location_code'])
+    has_location = location_codes >= 0
+    if not has_location.any():
+        return pd.DataFrame({
+            'nhsn_location_code': pd.Series(dtype=object),
+            'date': pd.Series(dtype=object),
+            'days': pd.Series(dtype='int64'),
+        })
+
+    location_codes = location_codes[has_location]
+    start = pd.to_datetime(intervals['start_day']).to_numpy().astype('datetime64[D]')[has_location]
+    end = pd.to_datetime(intervals['end_day']).to_numpy().astype('datetime64[D]')[has_location]
+    end = np.maximum(end, start)
+
+    first_day = start.min()
+    n_days = int((end.max() - first_day).astype('int64')) + 1
+
+    diff = np.zeros((len(locations), n_days + 1), dtype='int64')
+    np.add.at(diff, (location_codes, (start - first_day).astype('int64')), 1)
+    np.add.at(diff, (location_codes, (end - first_day).astype('int64') + 1), -1)
+    counts = np.cumsum(diff[:, :n_days], axis=1)
+
+    location_index, day_index = np.nonzero(counts)
+    return pd.DataFrame({
+        'nhsn_location_code': np.asarray(locations, dtype=object)[location_index],
+        'date': (first_day + day_index).astype(object),
+        'days': counts[location_index, day_index],
+    })
+
+
+def sum_interval_days(intervals, column: str, by: str = 'month'):
+    """Sum interval days by location and ``by`` ('month' or 'date') into ``column``."""
+    if by == 'date':
+        summed = count_intervals_by_day(intervals).rename(columns={'days': column})
+    else:
+        summed = (
+            split_intervals_by_month(intervals)
+            .groupby(['nhsn_location_code', by], as_index=False)['days']
+            .sum()
+            .rename(columns={'days': column})
+        )
+    return summed.sort_values([by, 'nhsn_location_code']).reset_index(drop=True)
+
 
 class DenominatorCalculator:
-    """Calculate device-days and patient-days from Clarity data."""
+    """Calculate device-days and patient-days from Clarity data.
+
+    With use_intervals (the default), patient days and the summary come from
+    the interval engine (get_denominator_days) instead of the recursive CTE.
+    """
 
-    def __init__(self, connection_string: str | None = None):
+    def __init__(self, connection_string: str | None = None, use_intervals: bool = True):
         self.connection_string = connection_string or cfg.get_clarity_connection_string()
+        self.use_intervals = use_intervals
         self._engine = None
 
     def _get_engine(self):
         if self._engine is None:
-            if not self.connection_string:
-                raise ValueError(
-                    "No Clarity connection configured. Set CLARITY_CONNECTION_STRING "
-                    "or MOCK_CLARITY_DB_PATH in environment."
-                )
-            from sqlalchemy import create_engine
-            self._engine = create_engine(self.connection_string)
+            self._engine = get_clarity_engine(self.connection_string)
         return self._engine
 
     def _is_sqlite(self) -> bool:
@@ -71,8 +188,7 @@ class DenominatorCalculator:
         JOIN PAT_ENC pe ON rec.INPATIENT_DATA_ID = pe.INPATIENT_DATA_ID
         JOIN NHSN_LOCATION_MAP loc ON pe.DEPARTMENT_ID = loc.EPIC_DEPT_ID
         JOIN IP_FLO_GP_DATA fd ON fm.FLO_MEAS_ID = fd.FLO_MEAS_ID
-        WHERE (fd.DISP_NAME LIKE '%central%line%' OR fd.DISP_NAME LIKE '%PICC%')
-            AND fm.MEAS_VALUE NOT LIKE '%removed%'
+        WHERE {DEVICE_DAY_FILTERS['central_line']}
             AND fm.RECORDED_TIME >= :start_date
             AND fm.RECORDED_TIME <= :end_date
             {location_filter}
@@ -130,11 +246,7 @@ class DenominatorCalculator:
         JOIN PAT_ENC pe ON rec.INPATIENT_DATA_ID = pe.INPATIENT_DATA_ID
         JOIN NHSN_LOCATION_MAP loc ON pe.DEPARTMENT_ID = loc.EPIC_DEPT_ID
         JOIN IP_FLO_GP_DATA fd ON fm.FLO_MEAS_ID = fd.FLO_MEAS_ID
-        WHERE (fd.DISP_NAME LIKE '%foley%'
-               OR fd.DISP_NAME LIKE '%urinary%catheter%'
-               OR fd.DISP_NAME LIKE '%indwelling%catheter%')
-            AND fm.MEAS_VALUE NOT LIKE '%removed%'
-            AND fm.MEAS_VALUE NOT LIKE '%discontinued%'
+        WHERE {DEVICE_DAY_FILTERS['urinary_catheter']}
             AND fm.RECORDED_TIME >= :start_date
             AND fm.RECORDED_TIME <= :end_date
             {location_filter}
@@ -192,13 +304,7 @@ class DenominatorCalculator:
         JOIN PAT_ENC pe ON rec.INPATIENT_DATA_ID = pe.INPATIENT_DATA_ID
         JOIN NHSN_LOCATION_MAP loc ON pe.DEPARTMENT_ID = loc.EPIC_DEPT_ID
         JOIN IP_FLO_GP_DATA fd ON fm.FLO_MEAS_ID = fd.FLO_MEAS_ID
-        WHERE (fd.DISP_NAME LIKE '%ventilator%'
-               OR fd.DISP_NAME LIKE '%mechanical%vent%'
-               OR fd.DISP_NAME LIKE '%vent%mode%'
-               OR fd.DISP_NAME LIKE '%intubat%')
-            AND fm.MEAS_VALUE NOT LIKE '%removed%'
-            AND fm.MEAS_VALUE NOT LIKE '%extubat%'
-            AND fm.MEAS_VALUE NOT LIKE '%discontinued%'
+        WHERE {DEVICE_DAY_FILTERS['ventilator']}
             AND fm.RECORDED_TIME >= :start_date
             AND fm.RECORDED_TIME <= :end_date
             {location_filter}
@@ -225,7 +331,19 @@ class DenominatorCalculator:
         start_date: date | None = None,
         end_date: date | None = None,
     ):
-        """Calculate patient days by location and month using recursive CTE."""
+        """Calculate patient days by location and month."""
+        if self.use_intervals:
+            df = self.get_denominator_days(locations, start_date, end_date, include_devices=False)
+            return df[['nhsn_location_code', 'month', 'patient_days']]
+        return self._get_patient_days_cte(locations, start_date, end_date)
+
+    def _get_patient_days_cte(
+        self,
+        locations: list[str] | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ):
+        """Calculate patient days using a recursive CTE (SQL Server caps at MAXRECURSION 366)."""
         import pandas as pd
         from sqlalchemy import text
 
@@ -308,6 +426,141 @@ class DenominatorCalculator:
             logger.error(f"Patient days query failed: {e}")
             return pd.DataFrame(columns=['nhsn_location_code', 'month', 'patient_days'])
 
+    def _stay_intervals_query(self, location_filter: str) -> str:
+        """Query each stay's census days in range as [start_day, end_day], clipped like the CTE."""
+        if self._is_sqlite():
+            return f"""
+            SELECT
+                loc.NHSN_LOCATION_CODE,
+                MAX(date(pe.HOSP_ADMIT_DTTM), date(:start_date)) AS start_day,
+                MIN(date(COALESCE(pe.HOSP_DISCH_DTTM, :end_date)), date(:end_date)) AS end_day
+            FROM PAT_ENC pe
+            JOIN NHSN_LOCATION_MAP loc ON pe.DEPARTMENT_ID = loc.EPIC_DEPT_ID
+            WHERE pe.HOSP_ADMIT_DTTM <= :end_date
+                AND (pe.HOSP_DISCH_DTTM IS NULL OR pe.HOSP_DISCH_DTTM >= :start_date)
+                {location_filter}
+            """
+        return f"""
+        SELECT
+            loc.NHSN_LOCATION_CODE,
+            CAST(CASE WHEN pe.HOSP_ADMIT_DTTM > :start_date
+                 THEN pe.HOSP_ADMIT_DTTM ELSE :start_date END AS DATE) AS start_day,
+            CAST(CASE WHEN pe.HOSP_DISCH_DTTM IS NULL OR pe.HOSP_DISCH_DTTM > :end_date
+                 THEN :end_date ELSE pe.HOSP_DISCH_DTTM END AS DATE) AS end_day
+        FROM PAT_ENC pe
+        JOIN NHSN_LOCATION_MAP loc ON pe.DEPARTMENT_ID = loc.EPIC_DEPT_ID
+        WHERE pe.HOSP_ADMIT_DTTM <= :end_date
+            AND (pe.HOSP_DISCH_DTTM IS NULL OR pe.HOSP_DISCH_DTTM >= :start_date)
+            {location_filter}
+        """
+
+    def _device_intervals_query(self, location_filter: str) -> str:
+        """Query device-use intervals: runs of consecutive documented days (gaps and islands)."""
+        if self._is_sqlite():
+            day_expr = "date(fm.RECORDED_TIME)"
+            day_number = "julianday(day)"
+        else:
+            day_expr = "CONVERT(DATE, fm.RECORDED_TIME)"
+            day_number = "DATEDIFF(DAY, '19000101', day)"
+
+        device_days = "\n            UNION ALL\n".join(
+            f"""
+            SELECT DISTINCT
+                pe.PAT_ID,
+                loc.NHSN_LOCATION_CODE,
+                '{device}' AS device,
+                {day_expr} AS day
+            FROM IP_FLWSHT_MEAS fm
+            JOIN IP_FLWSHT_REC rec ON fm.FSD_ID = rec.FSD_ID
+            JOIN PAT_ENC pe ON rec.INPATIENT_DATA_ID = pe.INPATIENT_DATA_ID
+            JOIN NHSN_LOCATION_MAP loc ON pe.DEPARTMENT_ID = loc.EPIC_DEPT_ID
+            JOIN IP_FLO_GP_DATA fd ON fm.FLO_MEAS_ID = fd.FLO_MEAS_ID
+            WHERE {device_filter}
+                AND fm.RECORDED_TIME >= :start_date
+                AND fm.RECORDED_TIME <= :end_date
+                {location_filter}"""
+            for device, device_filter in DEVICE_DAY_FILTERS.items()
+        )
+
+        return f"""
+        WITH device_days AS ({device_days}
+        ),
+        islands AS (
+            SELECT
+                PAT_ID,
+                NHSN_LOCATION_CODE,
+                device,
+                day,
+                {day_number} - ROW_NUMBER() OVER (
+                    PARTITION BY PAT_ID, NHSN_LOCATION_CODE, device ORDER BY day
+                ) AS island
+            FROM device_days
+        )
+        SELECT NHSN_LOCATION_CODE, device, MIN(day) AS start_day, MAX(day) AS end_day
+        FROM islands
+        GROUP BY PAT_ID, NHSN_LOCATION_CODE, device, island
+        """
+
+    def get_denominator_days(
+        self,
+        locations: list[str] | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        include_devices: bool = True,
+        by: str = 'month',
+    ):
+        """Calculate patient days and device days by location and month in one pass.
+
+        Stay and device-use intervals are each pulled with one query, split at
+        month boundaries and summed. Returns nhsn_location_code, month and the
+        DENOMINATOR_COLUMNS, ordered by month then location. With by='date'
+        the counts are per calendar day instead (column ``date``).
+        """
+        import pandas as pd
+        from sqlalchemy import text
+
+        if start_date is None:
+            start_date = date.today().replace(year=date.today().year - 1)
+        if end_date is None:
+            end_date = date.today()
+
+        location_filter = ""
+        if locations:
+            location_list = ", ".join(f"'{loc}'" for loc in locations)
+            location_filter = f"AND loc.NHSN_LOCATION_CODE IN ({location_list})"
+
+        params = {'start_date': start_date, 'end_date': end_date}
+        columns = ['nhsn_location_code', by] + DENOMINATOR_COLUMNS
+
+        try:
+            engine = self._get_engine()
+            with engine.connect() as conn:
+                stays = pd.read_sql(text(self._stay_intervals_query(location_filter)), conn, params=params)
+                stays.columns = stays.columns.str.lower()
+                devices = None
+                if include_devices:
+                    devices = pd.read_sql(
+                        text(self._device_intervals_query(location_filter)), conn, params=params,
+                    )
+                    devices.columns = devices.columns.str.lower()
+        except Exception as e:
+            logger.error(f"Denominator interval query failed: {e}")
+            return pd.DataFrame(columns=columns)
+
+        result = sum_interval_days(stays, 'patient_days', by)
+        if devices is not None:
+            for device, device_intervals in devices.groupby('device'):
+                result = pd.merge(
+                    result, sum_interval_days(device_intervals, f'{device}_days', by),
+                    on=['nhsn_location_code', by], how='outer',
+                )
+
+        for col in DENOMINATOR_COLUMNS:
+            if col not in result.columns:
+                result[col] = 0
+        result[DENOMINATOR_COLUMNS] = result[DENOMINATOR_COLUMNS].fillna(0).astype('int64')
+        return result[columns].sort_values([by, 'nhsn_location_code']).reset_index(drop=True)
+
     def get_denominator_summary(
         self,
         locations: list[str] | None = None,
@@ -317,6 +570,11 @@ class DenominatorCalculator:
         """Get combined denominator summary for NHSN submission."""
         import pandas as pd
 
+        if self.use_intervals:
+            return self._build_denominator_summary(
+                self.get_denominator_days(locations, start_date, end_date), start_date, end_date,
+            )
+
         line_days_df = self.get_central_line_days(locations, start_date, end_date)
         catheter_days_df = self.get_urinary_catheter_days(locations, start_date, end_date)
         vent_days_df = self.get_ventilator_days(locations, start_date, end_date)
@@ -349,6 +607,10 @@ class DenominatorCalculator:
             if col not in merged.columns:
                 merged[col] = 0
 
+        return self._build_denominator_summary(merged, start_date, end_date)
+
+    def _build_denominator_summary(self, merged, start_date, end_date) -> dict[str, Any]:
+        """Build the summary structure from merged location-month denominators."""
         result = {
             'date_range': {
                 'start': str(start_date) if start_date else None,
@@ -2,9 +2,10 @@
 
 from datetime import date
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 
-from apps.nhsn_reporting.services import NHSNReportingService
+from apps.core.cursors import add_cursor_arguments, apply_cursor_options
+from apps.nhsn_reporting.services import EXTRACT_CURSORS, NHSNReportingService
 from apps.nhsn_reporting.logic import config as cfg
 
 
@@ -22,6 +23,12 @@ class Command(BaseCommand):
         parser.add_argument('--stats', action='store_true', help='Show reporting status')
         parser.add_argument('--dry-run', action='store_true', help='Extract without saving')
         parser.add_argument('--create-events', action='store_true', help='Create NHSN events from confirmed HAI candidates')
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Recompute the re-opened window since the last run and save it to the summary tables',
+        )
+        add_cursor_arguments(parser)
 
     def handle(self, *args, **options):
         if options['stats']:
@@ -44,6 +51,10 @@ class Command(BaseCommand):
             ))
             return
 
+        if options['incremental']:
+            self._run_incremental(options)
+            return
+
         if extract_all or options['au']:
             self._extract_au(options)
         if extract_all or options['ar']:
@@ -51,6 +62,34 @@ class Command(BaseCommand):
         if extract_all or options['denominators']:
             self._extract_denominators(options)
 
+    def _run_incremental(self, options):
+        """Run the nightly incremental extract for the selected data types."""
+        if options['dry_run']:
+            raise CommandError("--dry-run cannot be combined with --incremental")
+
+        kinds = [
+            kind for kind in ('denominators', 'au', 'ar')
+            if options['all'] or options[kind]
+        ]
+        use_cursor = apply_cursor_options(self, [EXTRACT_CURSORS[k] for k in kinds], options)
+
+        self.stdout.write(f"Running incremental extract: {', '.join(kinds)}")
+        results = NHSNReportingService().run_incremental_extract(kinds, use_cursor=use_cursor)
+
+        for kind in kinds:
+            if f'{kind}_error' in results:
+                self.stdout.write(self.style.ERROR(f"  {kind}: failed: {results[f'{kind}_error']}"))
+                continue
+            result = dict(results[kind])
+            since = result.pop('since')
+            if result.pop('skipped', False):
+                self.stdout.write(self.style.WARNING(f"  {kind}: no rows since {since}, watermark unchanged"))
+                continue
+            counts = ', '.join(f"{count} {name}" for name, count in result.items())
+            stage = results['stages'][kind]
+            timing = f"read {stage['rows_read']} rows in {stage['fetch_seconds']}s, saved in {stage['store_seconds']}s"
+            self.stdout.write(self.style.SUCCESS(f"  {kind}: {counts} (since {since}; {timing})"))
+
     def _extract_au(self, options):
         """Extract AU data."""
         self.stdout.write("Extracting AU data...")
@@ -165,6 +204,10 @@ class Command(BaseCommand):
         self.stdout.write(f"AR Summaries:   {stats['ar_summaries']}")
         self.stdout.write(f"Denominators:   {stats['denominator_months']} months")
 
+        self.stdout.write("\nLast incremental extract:")
+        for kind, watermark in stats.get('extract_watermarks', {}).items():
+            self.stdout.write(f"  {kind}: {watermark.isoformat() if watermark else 'never'}")
+
         if stats.get('events_by_type'):
             self.stdout.write("\nEvents by type:")
             for hai_type, count in stats['events_by_type'].items():
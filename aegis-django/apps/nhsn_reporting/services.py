@@ -1,25 +1,89 @@
 """NHSN Reporting Service — orchestrator for all NHSN reporting operations."""
 
 import logging
+import time
 from datetime import date, timedelta
 
 from django.db import transaction
 from django.utils import timezone
 
 from apps.alerts.models import Alert, AlertType, AlertStatus, AlertSeverity
+from apps.core.models import MonitorCursor
 from apps.hai_detection.models import HAICandidate, CandidateStatus
 
 from .models import (
     NHSNEvent, HAIEventType,
-    DenominatorMonthly,
-    AUMonthlySummary, AUAntimicrobialUsage,
+    DenominatorDaily, DenominatorMonthly,
+    AUMonthlySummary, AUAntimicrobialUsage, AntimicrobialRoute,
     ARQuarterlySummary, ARIsolate, ARSusceptibility, ARPhenotypeSummary,
+    SusceptibilityResult, ResistancePhenotype,
     SubmissionAudit,
 )
 from .logic import config as cfg
 
 logger = logging.getLogger(__name__)
 
+# MonitorCursor names holding the nightly extract watermarks
+EXTRACT_CURSORS = {
+    'denominators': 'nhsn_reporting.denominators',
+    'au': 'nhsn_reporting.au',
+    'ar': 'nhsn_reporting.ar',
+}
+
+# Clarity ADMIN_ROUTE values that differ from AntimicrobialRoute
+ROUTE_ALIASES = {
+    'ORAL': AntimicrobialRoute.PO,
+    'INTRAVENOUS': AntimicrobialRoute.IV,
+    'INTRAMUSCULAR': AntimicrobialRoute.IM,
+    'INH': AntimicrobialRoute.INHALED,
+    'INHALATION': AntimicrobialRoute.INHALED,
+    'NEB': AntimicrobialRoute.INHALED,
+    'TOP': AntimicrobialRoute.TOPICAL,
+}
+
+
+def _add_months(day, months):
+    """First day of the month ``months`` after (or before) ``day``'s month."""
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _months_between(start, end):
+    """YYYY-MM strings for every month from ``start`` through ``end``."""
+    months = []
+    month = start.replace(day=1)
+    while month <= end:
+        months.append(month.strftime('%Y-%m'))
+        month = _add_months(month, 1)
+    return months
+
+
+def _quarters_between(start, end):
+    """(year, quarter) pairs for every quarter from ``start`` through ``end``."""
+    quarters = []
+    month = date(start.year, (start.month - 1) // 3 * 3 + 1, 1)
+    while month <= end:
+        quarters.append((month.year, (month.month - 1) // 3 + 1))
+        month = _add_months(month, 3)
+    return quarters
+
+
+def _submitted(model, period_field, periods):
+    """(period, location_code) pairs among ``periods`` already submitted to NHSN."""
+    return set(
+        model.objects.filter(
+            **{f'{period_field}__in': periods}, submitted_at__isnull=False,
+        ).values_list(period_field, 'location_code')
+    )
+
+
+def _au_route(route):
+    """Map a Clarity administration route onto AntimicrobialRoute."""
+    route = (route or '').strip().upper()
+    if route in AntimicrobialRoute.values:
+        return route
+    return ROUTE_ALIASES.get(route, AntimicrobialRoute.IV)
+
 
 class NHSNReportingService:
     """Orchestrator for NHSN reporting operations."""
@@ -284,6 +348,385 @@ class NHSNReportingService:
 
         return output.getvalue()
 
+    # ---- Incremental Extraction ----
+
+    def get_extract_start(self, kind, today=None):
+        """
+        First day the next extract of ``kind`` recomputes.
+
+        That is the last successful run (the watermark) minus the re-open
+        window, which absorbs late MAR, flowsheet and culture documentation.
+        Without a watermark the extract backfills EXTRACT_BACKFILL_MONTHS.
+        """
+        today = today or timezone.localdate()
+        cursor = MonitorCursor.for_monitor(EXTRACT_CURSORS[kind])
+        if cursor.watermark is None:
+            return _add_months(today, -(cfg.get_extract_backfill_months() - 1))
+        last_run = min(timezone.localdate(cursor.watermark), today)
+        return last_run - timedelta(days=cfg.get_extract_reopen_days())
+
+    def run_incremental_extract(self, kinds=None, use_cursor=True):
+        """
+        Recompute re-opened periods from Clarity and upsert the summary tables.
+
+        Only days, months and quarters on or after get_extract_start() are
+        recomputed; older rows are left as stored. Location periods already
+        submitted to NHSN are never rewritten; each kind's result counts them
+        as 'submitted_kept'. Dashboards and CSV export read the stored rows,
+        so they never query Clarity.
+
+        The Clarity reads for each kind run concurrently over the shared
+        connection pool, at most CLARITY_MAX_CONNECTIONS at a time. Each
+        kind is saved in this thread as soon as its read finishes.
+
+        Args:
+            kinds: Any of 'denominators', 'au', 'ar'. Defaults to all three.
+            use_cursor: If False, backfill the full window and leave the
+                watermarks untouched.
+
+        Returns:
+            Dict of per-kind results, with '<kind>_error' entries for failures,
+            and 'stages' holding each kind's rows read and read/save seconds.
+            A kind's watermark only advances when its extract wrote rows, so an
+            empty (possibly failed) Clarity read never skips a period.
+        """
+        from .logic.clarity import run_concurrently
+
+        started = timezone.now()
+        today = timezone.localdate(started)
+        extractors = {
+            'denominators': (self._get_denom_calculator, self._fetch_denominators, self._store_denominators),
+            'au': (self._get_au_extractor, self._fetch_au, self._store_au),
+            'ar': (self._get_ar_extractor, self._fetch_ar, self._store_ar),
+        }
+
+        windows = {}
+        fetches = {}
+        for kind in kinds or list(extractors):
+            if use_cursor:
+                since = self.get_extract_start(kind, today)
+            else:
+                since = _add_months(today, -(cfg.get_extract_backfill_months() - 1))
+            windows[kind] = since
+
+            get_extractor, fetch, _ = extractors[kind]
+            # Create extractors here so worker threads never race to build them
+            get_extractor()
+            fetches[kind] = lambda fetch=fetch, since=since: fetch(since, today)
+
+        results = {'stages': {}}
+        for kind, fetched, error, fetch_seconds in run_concurrently(fetches):
+            since = windows[kind]
+            stage = results['stages'][kind] = {'fetch_seconds': round(fetch_seconds, 2)}
+            if error is not None:
+                logger.error("NHSN %s extraction failed: %s", kind, error)
+                results[f'{kind}_error'] = str(error)
+                continue
+
+            data, stage['rows_read'] = fetched
+            store_started = time.perf_counter()
+            try:
+                result = extractors[kind][2](data, since, today)
+            except Exception as e:
+                logger.error("NHSN %s extraction failed: %s", kind, e)
+                results[f'{kind}_error'] = str(e)
+                continue
+            finally:
+                stage['store_seconds'] = round(time.perf_counter() - store_started, 2)
+
+            if result is None:
+                logger.warning("NHSN %s extraction found no rows since %s", kind, since)
+                results[kind] = {'since': since.isoformat(), 'skipped': True}
+                continue
+
+            if use_cursor:
+                MonitorCursor.for_monitor(EXTRACT_CURSORS[kind]).advance(started)
+            results[kind] = {'since': since.isoformat(), **result}
+            logger.info("NHSN %s extraction complete: %s (%s)", kind, results[kind], stage)
+
+        return results
+
+    def _fetch_denominators(self, since, today):
+        """Read daily denominators from Clarity."""
+        daily = self._get_denom_calculator().get_denominator_days(
+            start_date=since, end_date=today, by='date',
+        )
+        return daily, len(daily)
+
+    def _fetch_au(self, since, today):
+        """Read the AU monthly summary from Clarity."""
+        summary = self._get_au_extractor().get_monthly_summary(
+            None, since.replace(day=1), today,
+        )
+        rows = sum(
+            len(month['antimicrobials'])
+            for loc in summary.get('locations', [])
+            for month in loc['months']
+        )
+        return summary, rows
+
+    def _fetch_ar(self, since, today):
+        """Read first isolates, susceptibilities and phenotypes per quarter from Clarity."""
+        extractor = self._get_ar_extractor()
+        quarters = []
+        rows = 0
+        for year, quarter in _quarters_between(since, today):
+            first_isolates, suscept_df, phenotype_df = extractor.get_quarter_extract(year, quarter)
+            quarters.append((f"{year}-Q{quarter}", first_isolates, suscept_df, phenotype_df))
+            rows += len(first_isolates) + len(suscept_df)
+        return quarters, rows
+
+    def _store_denominators(self, daily, since, today):
+        """Upsert daily denominators from ``since`` and roll touched months up.
+
+        Days in a location month that has been submitted are left as stored,
+        along with the month itself.
+        """
+        if daily.empty:
+            return None
+
+        counts = ['patient_days', 'central_line_days', 'urinary_catheter_days', 'ventilator_days']
+        months = _months_between(since, today)
+        submitted = _submitted(DenominatorMonthly, 'month', months)
+        rows = [
+            DenominatorDaily(
+                date=row['date'],
+                location_code=row['nhsn_location_code'],
+                **{col: int(row[col]) for col in counts},
+            )
+            for row in daily.to_dict('records')
+            if (row['date'].strftime('%Y-%m'), row['nhsn_location_code']) not in submitted
+        ]
+        keys = {(row.date, row.location_code) for row in rows}
+
+        with transaction.atomic():
+            DenominatorDaily.objects.bulk_create(
+                rows,
+                batch_size=1000,
+                update_conflicts=True,
+                unique_fields=['date', 'location_code'],
+                update_fields=counts + ['updated_at'],
+            )
+            stale_daily = [
+                pk for pk, day, loc in DenominatorDaily.objects.filter(
+                    date__gte=since, date__lte=today,
+                ).values_list('pk', 'date', 'location_code')
+                if (day, loc) not in keys and (day.strftime('%Y-%m'), loc) not in submitted
+            ]
+            DenominatorDaily.objects.filter(pk__in=stale_daily).delete()
+
+            # Roll whole months up from the stored daily rows (earlier days of
+            # the first month come from previous runs)
+            monthly = {}
+            for day, loc, *values in DenominatorDaily.objects.filter(
+                date__gte=since.replace(day=1), date__lte=today,
+            ).values_list('date', 'location_code', *counts):
+                if (day.strftime('%Y-%m'), loc) in submitted:
+                    continue
+                totals = monthly.setdefault((day.strftime('%Y-%m'), loc), [0] * len(counts))
+                for i, value in enumerate(values):
+                    totals[i] += value
+
+            monthly_rows = []
+            for (month, loc), totals in monthly.items():
+                row = DenominatorMonthly(month=month, location_code=loc, **dict(zip(counts, totals)))
+                row.calculate_utilization()
+                monthly_rows.append(row)
+
+            DenominatorMonthly.objects.bulk_create(
+                monthly_rows,
+                update_conflicts=True,
+                unique_fields=['month', 'location_code'],
+                update_fields=counts + [
+                    'central_line_utilization', 'urinary_catheter_utilization',
+                    'ventilator_utilization', 'updated_at',
+                ],
+            )
+            stale_monthly = [
+                pk for pk, month, loc in DenominatorMonthly.objects.filter(
+                    month__in=months, submitted_at__isnull=True,
+                ).values_list('pk', 'month', 'location_code')
+                if (month, loc) not in monthly
+            ]
+            DenominatorMonthly.objects.filter(pk__in=stale_monthly).delete()
+
+        return {'days': len(rows), 'months': len(monthly_rows), 'submitted_kept': len(submitted)}
+
+    def _store_au(self, summary, since, today):
+        """Replace AU monthly summaries and usage for months touched since ``since``.
+
+        Submitted location months keep their stored summary and usage.
+        """
+        if not summary.get('locations'):
+            return None
+
+        months = _months_between(since, today)
+        submitted = _submitted(AUMonthlySummary, 'reporting_month', months)
+        summaries = []
+        usage_by_key = {}
+        for loc in summary['locations']:
+            for month in loc['months']:
+                key = (month['month'], loc['nhsn_location_code'])
+                if key in submitted:
+                    continue
+                summaries.append(AUMonthlySummary(
+                    reporting_month=key[0],
+                    location_code=key[1],
+                    patient_days=month['patient_days'],
+                ))
+                usage_by_key[key] = month['antimicrobials']
+
+        with transaction.atomic():
+            AUMonthlySummary.objects.bulk_create(
+                summaries,
+                update_conflicts=True,
+                unique_fields=['reporting_month', 'location_code'],
+                update_fields=['patient_days', 'updated_at'],
+            )
+            stored = {
+                (s.reporting_month, s.location_code): s
+                for s in AUMonthlySummary.objects.filter(reporting_month__in=months)
+            }
+
+            AUAntimicrobialUsage.objects.filter(
+                summary__reporting_month__in=months, summary__submitted_at__isnull=True,
+            ).delete()
+            usage = [
+                AUAntimicrobialUsage(
+                    summary=stored[key],
+                    antimicrobial_code=abx['nhsn_code'] or '',
+                    antimicrobial_name=abx['medication_name'] or '',
+                    antimicrobial_class=abx['nhsn_category'] or '',
+                    route=_au_route(abx['route']),
+                    days_of_therapy=abx['days_of_therapy'],
+                    defined_daily_doses=abx.get('defined_daily_doses'),
+                )
+                for key, antimicrobials in usage_by_key.items()
+                for abx in antimicrobials
+            ]
+            AUAntimicrobialUsage.objects.bulk_create(usage, batch_size=1000)
+
+            stale = [
+                s.pk for key, s in stored.items()
+                if key not in usage_by_key and s.submitted_at is None
+            ]
+            AUMonthlySummary.objects.filter(pk__in=stale).delete()
+
+        return {'summaries': len(summaries), 'usage_records': len(usage), 'submitted_kept': len(submitted)}
+
+    def _store_ar(self, quarters, since, today):
+        """Replace AR quarterly summaries, isolates and phenotypes for quarters touched since ``since``.
+
+        Submitted location quarters keep their stored isolates and phenotypes.
+        """
+        import pandas as pd
+
+        written = {'quarters': 0, 'isolates': 0, 'susceptibilities': 0, 'submitted_kept': 0}
+
+        for quarter_str, first_isolates, suscept_df, phenotype_df in quarters:
+            if first_isolates.empty:
+                continue
+            submitted = {
+                loc for _, loc in _submitted(ARQuarterlySummary, 'reporting_quarter', [quarter_str])
+            }
+            written['submitted_kept'] += len(submitted)
+            first_isolates = first_isolates[
+                first_isolates['nhsn_location_code'].notna()
+                & ~first_isolates['nhsn_location_code'].isin(submitted)
+            ]
+            if first_isolates.empty:
+                continue
+
+            locations = sorted(first_isolates['nhsn_location_code'].unique())
+
+            with transaction.atomic():
+                ARQuarterlySummary.objects.bulk_create(
+                    [ARQuarterlySummary(reporting_quarter=quarter_str, location_code=loc) for loc in locations],
+                    update_conflicts=True,
+                    unique_fields=['reporting_quarter', 'location_code'],
+                    update_fields=['updated_at'],
+                )
+                stored = {
+                    s.location_code: s
+                    for s in ARQuarterlySummary.objects.filter(reporting_quarter=quarter_str)
+                }
+
+                # Isolate deletion cascades to their susceptibilities
+                ARIsolate.objects.filter(
+                    summary__reporting_quarter=quarter_str, summary__submitted_at__isnull=True,
+                ).delete()
+                ARPhenotypeSummary.objects.filter(
+                    summary__reporting_quarter=quarter_str, summary__submitted_at__isnull=True,
+                ).delete()
+
+                isolates = {}
+                for row in first_isolates.to_dict('records'):
+                    isolates[row['isolate_id']] = ARIsolate(
+                        summary=stored[row['nhsn_location_code']],
+                        patient_id=str(row['patient_id']),
+                        patient_mrn=str(row['patient_id']),
+                        encounter_id=str(row['encounter_id']) if pd.notna(row['encounter_id']) else '',
+                        specimen_date=pd.to_datetime(row['specimen_date']).date(),
+                        specimen_type=row['specimen_type'] or '',
+                        organism_code=(row['organism_name'] or '')[:100],
+                        organism_name=row['organism_name'] or '',
+                        specimen_source=row['specimen_source'] or '',
+                        location_code=row['nhsn_location_code'],
+                    )
+                ARIsolate.objects.bulk_create(list(isolates.values()), batch_size=1000)
+
+                susceptibilities = []
+                for row in suscept_df.to_dict('records') if not suscept_df.empty else []:
+                    interpretation = str(row['interpretation'] or '').strip().upper()
+                    if row['isolate_id'] not in isolates or interpretation not in SusceptibilityResult.values:
+                        continue
+                    mic = pd.to_numeric(row['mic'], errors='coerce')
+                    susceptibilities.append(ARSusceptibility(
+                        isolate=isolates[row['isolate_id']],
+                        antimicrobial_code=row['antibiotic_code'] or '',
+                        antimicrobial_name=row['antibiotic'] or '',
+                        interpretation=interpretation,
+                        mic_value='' if pd.isna(row['mic']) else str(row['mic']),
+                        mic_numeric=None if pd.isna(mic) else float(mic),
+                        testing_method=row['method'] or '',
+                    ))
+                ARSusceptibility.objects.bulk_create(susceptibilities, batch_size=1000)
+
+                phenotypes = [
+                    ARPhenotypeSummary(
+                        summary=stored[row['nhsn_location_code']],
+                        organism_code=row['phenotype_code'],
+                        organism_name=row['phenotype_name'] or row['phenotype_code'],
+                        phenotype=row['phenotype_code'],
+                        total_isolates=row['eligible_isolates'],
+                        resistant_isolates=row['phenotype_isolates'],
+                        percent_resistant=row['percent_positive'],
+                    )
+                    for row in (phenotype_df.to_dict('records') if not phenotype_df.empty else [])
+                    if row['phenotype_code'] in ResistancePhenotype.values
+                    and row['nhsn_location_code'] in locations
+                ]
+                ARPhenotypeSummary.objects.bulk_create(phenotypes)
+
+                ARQuarterlySummary.objects.filter(
+                    reporting_quarter=quarter_str, submitted_at__isnull=True,
+                ).exclude(location_code__in=locations).delete()
+
+            written['quarters'] += 1
+            written['isolates'] += len(isolates)
+            written['susceptibilities'] += len(susceptibilities)
+
+        return written if written['quarters'] or written['submitted_kept'] else None
+
+    def get_extract_watermarks(self):
+        """Last successful nightly extract time per kind (None if never run)."""
+        watermarks = dict(
+            MonitorCursor.objects.filter(
+                name__in=EXTRACT_CURSORS.values(),
+            ).values_list('name', 'watermark')
+        )
+        return {kind: watermarks.get(name) for kind, name in EXTRACT_CURSORS.items()}
+
     # ---- Statistics ----
 
     def get_stats(self):
@@ -312,6 +755,7 @@ class NHSNReportingService:
             'ar_summaries': ar_summaries,
             'denominator_months': denom_months,
             'events_by_type': events_by_type,
+            'extract_watermarks': self.get_extract_watermarks(),
             'latest_submission': {
                 'action': latest_submission.action,
                 'date': latest_submission.created_at.strftime('%Y-%m-%d %H:%M'),
@@ -15,57 +15,20 @@ logger = logging.getLogger(__name__)
     default_retry_delay=300,
 )
 def nhsn_nightly_extract(self):
-    """Nightly batch extraction of AU/AR/denominator data from Clarity."""
+    """
+    Nightly incremental extraction of AU/AR/denominator data from Clarity.
+
+    Recomputes the re-opened window since each kind's last watermark and
+    upserts DenominatorDaily/Monthly, AU and AR summary rows.
+    """
     from .logic import config as cfg
+    from .services import NHSNReportingService
 
     if not cfg.is_clarity_configured():
         logger.warning("NHSN nightly extract skipped: Clarity not configured")
         return {'skipped': True, 'reason': 'clarity_not_configured'}
 
-    results = {}
-
-    try:
-        from .logic.au_extractor import AUDataExtractor
-        extractor = AUDataExtractor()
-        au_summary = extractor.get_monthly_summary()
-        results['au'] = {
-            'total_dot': au_summary.get('overall_totals', {}).get('total_dot', 0),
-            'locations': len(au_summary.get('locations', [])),
-        }
-        logger.info("NHSN AU extraction complete: %s", results['au'])
-    except Exception as e:
-        logger.error("NHSN AU extraction failed: %s", e)
-        results['au_error'] = str(e)
-
-    try:
-        from .logic.ar_extractor import ARDataExtractor
-        extractor = ARDataExtractor()
-        from datetime import date
-        year = date.today().year
-        quarter = (date.today().month - 1) // 3 + 1
-        ar_summary = extractor.get_quarterly_summary(None, year, quarter)
-        results['ar'] = {
-            'total_cultures': ar_summary.get('overall_totals', {}).get('total_cultures', 0),
-            'first_isolates': ar_summary.get('overall_totals', {}).get('first_isolates', 0),
-        }
-        logger.info("NHSN AR extraction complete: %s", results['ar'])
-    except Exception as e:
-        logger.error("NHSN AR extraction failed: %s", e)
-        results['ar_error'] = str(e)
-
-    try:
-        from .logic.denominator import DenominatorCalculator
-        calc = DenominatorCalculator()
-        denom_summary = calc.get_denominator_summary()
-        results['denominators'] = {
-            'locations': len(denom_summary.get('locations', [])),
-        }
-        logger.info("NHSN denominator extraction complete: %s", results['denominators'])
-    except Exception as e:
-        logger.error("NHSN denominator extraction failed: %s", e)
-        results['denominator_error'] = str(e)
-
-    return results
+    return NHSNReportingService().run_incremental_extract()
 
 
 @shared_task(
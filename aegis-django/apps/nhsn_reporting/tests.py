@@ -7,7 +7,9 @@ Tests cover:
 - Config helpers
 - CDA document generation (XML structure)
 - DIRECT client (config validation)
-- Service layer (stats, event creation, CSV export, submission audit)
+- Service layer (stats, event creation, CSV export, submission audit,
+  incremental extraction)
+- Shared Clarity engine pool
 - Template rendering
 - URL resolution
 - Alert type integration
@@ -22,6 +24,7 @@ from django.utils import timezone
 from django.template.loader import render_to_string
 
 from apps.alerts.models import Alert, AlertType, AlertStatus, AlertSeverity
+from apps.core.models import MonitorCursor
 
 from .models import (
     NHSNEvent, DenominatorDaily, DenominatorMonthly,
@@ -30,7 +33,7 @@ from .models import (
     SubmissionAudit,
     HAIEventType, AntimicrobialRoute, SusceptibilityResult, ResistancePhenotype,
 )
-from .services import NHSNReportingService
+from .services import EXTRACT_CURSORS, NHSNReportingService
 from .cda.generator import BSICDADocument, CDAGenerator, create_bsi_document_from_candidate
 from .direct.client import DirectConfig, DirectSubmissionResult
 
@@ -626,6 +629,10 @@ class ConfigTests(TestCase):
         result = cfg.get_ar_first_isolate_only()
         self.assertTrue(result)
 
+    def test_get_clarity_max_connections(self):
+        from .logic import config as cfg
+        self.assertEqual(cfg.get_clarity_max_connections(), 3)
+
     def test_is_direct_configured_default(self):
         from .logic import config as cfg
         # Default is not configured
@@ -918,6 +925,357 @@ class NHSNServiceLogSubmissionTests(TestCase):
         self.assertEqual(audit.event_count, 10)
 
 
+class NHSNServiceIncrementalExtractTests(TestCase):
+    """Test NHSNReportingService.run_incremental_extract() with mocked Clarity extractors."""
+
+    TODAY = date(2026, 2, 10)
+
+    def setUp(self):
+        import pandas as pd
+        self.pd = pd
+
+        self.service = NHSNReportingService()
+        self.denom = MagicMock()
+        self.au = MagicMock()
+        self.ar = MagicMock()
+        self.service._denom_calculator = self.denom
+        self.service._au_extractor = self.au
+        self.service._ar_extractor = self.ar
+
+        self.denom.get_denominator_days.return_value = pd.DataFrame([
+            {'nhsn_location_code': 'G3-PICU', 'date': date(2026, 2, 9), 'patient_days': 10,
+             'central_line_days': 4, 'urinary_catheter_days': 1, 'ventilator_days': 2},
+            {'nhsn_location_code': 'G3-PICU', 'date': date(2026, 2, 10), 'patient_days': 12,
+             'central_line_days': 6, 'urinary_catheter_days': 0, 'ventilator_days': 2},
+        ])
+        self.au.get_monthly_summary.return_value = {'locations': [{
+            'nhsn_location_code': 'G3-PICU',
+            'months': [{
+                'month': '2026-02', 'patient_days': 22, 'total_dot': 7,
+                'antimicrobials': [{
+                    'nhsn_code': 'VAN', 'nhsn_category': 'Glycopeptides',
+                    'medication_name': 'Vancomycin', 'route': 'ORAL',
+                    'days_of_therapy': 7, 'dot_per_1000_pd': 318.2,
+                }],
+            }],
+        }]}
+        cultures = pd.DataFrame([{
+            'isolate_id': 1, 'culture_id': 1, 'patient_id': 'MRN1', 'encounter_id': 'E1',
+            'nhsn_location_code': 'G3-PICU', 'specimen_date': '2026-02-01', 'specimen_type': 'Blood',
+            'specimen_source': 'Peripheral', 'organism_name': 'Staphylococcus aureus',
+            'organism_group': 'SA', 'quarter': '2026-Q1',
+        }])
+        susceptibilities = pd.DataFrame([
+            {'susceptibility_id': 1, 'isolate_id': 1, 'antibiotic': 'Oxacillin', 'antibiotic_code': 'OXA',
+             'mic': '>=4', 'mic_units': 'mcg/mL', 'interpretation': 'R', 'method': 'MIC'},
+            {'susceptibility_id': 2, 'isolate_id': 1, 'antibiotic': 'Vancomycin', 'antibiotic_code': 'VAN',
+             'mic': '1', 'mic_units': 'mcg/mL', 'interpretation': 'X', 'method': 'MIC'},
+        ])
+        phenotypes = pd.DataFrame([{
+            'nhsn_location_code': 'G3-PICU', 'quarter': '2026-Q1',
+            'phenotype_code': ResistancePhenotype.MRSA, 'phenotype_name': 'MRSA',
+            'eligible_isolates': 1, 'phenotype_isolates': 1, 'percent_positive': 100.0,
+        }])
+        # Only the current quarter has cultures
+        self.ar.get_quarter_extract.side_effect = lambda year, quarter: (
+            (cultures, susceptibilities, phenotypes) if (year, quarter) == (2026, 1)
+            else (pd.DataFrame(), pd.DataFrame(), pd.DataFrame())
+        )
+
+    def _run(self, **kwargs):
+        now = timezone.make_aware(datetime.combine(self.TODAY, datetime.min.time()))
+        with patch('apps.nhsn_reporting.services.timezone.now', return_value=now), \
+                patch('apps.nhsn_reporting.services.timezone.localdate', side_effect=lambda value=None: self.TODAY):
+            return self.service.run_incremental_extract(**kwargs)
+
+    @patch('apps.nhsn_reporting.services.cfg.get_extract_reopen_days', return_value=5)
+    def test_upserts_denominators_and_rolls_up_month(self, mock_reopen):
+        MonitorCursor.for_monitor(EXTRACT_CURSORS['denominators']).reset(timezone.now())
+        DenominatorDaily.objects.create(date=date(2026, 2, 1), location_code='G3-PICU', patient_days=8)
+        DenominatorDaily.objects.create(date=date(2026, 2, 10), location_code='G3-PICU', patient_days=99)
+        DenominatorDaily.objects.create(date=date(2026, 2, 10), location_code='GONE', patient_days=5)
+
+        results = self._run(kinds=['denominators'])
+
+        self.assertEqual(results['denominators']['days'], 2)
+        self.assertEqual(DenominatorDaily.objects.get(date=date(2026, 2, 10), location_code='G3-PICU').patient_days, 12)
+        self.assertFalse(DenominatorDaily.objects.filter(location_code='GONE').exists())
+        monthly = DenominatorMonthly.objects.get(month='2026-02', location_code='G3-PICU')
+        # Feb 1 was stored by an earlier run and still counts towards the month
+        self.assertEqual(monthly.patient_days, 8 + 10 + 12)
+        self.assertEqual(monthly.central_line_days, 10)
+        self.assertAlmostEqual(monthly.central_line_utilization, 10 / 30)
+
+    def test_watermark_narrows_next_window(self):
+        self._run(kinds=['denominators'])
+        first_since = self.denom.get_denominator_days.call_args.kwargs['start_date']
+        self._run(kinds=['denominators'])
+        second_since = self.denom.get_denominator_days.call_args.kwargs['start_date']
+
+        self.assertEqual(first_since, date(2025, 3, 1))
+        self.assertEqual(second_since, self.TODAY - timedelta(days=45))
+        self.assertIsNotNone(MonitorCursor.for_monitor(EXTRACT_CURSORS['denominators']).watermark)
+
+    def test_empty_extract_keeps_rows_and_watermark(self):
+        DenominatorDaily.objects.create(date=date(2026, 2, 10), location_code='G3-PICU', patient_days=12)
+        self.denom.get_denominator_days.return_value = self.pd.DataFrame()
+
+        results = self._run(kinds=['denominators'])
+
+        self.assertTrue(results['denominators']['skipped'])
+        self.assertEqual(DenominatorDaily.objects.count(), 1)
+        self.assertIsNone(MonitorCursor.for_monitor(EXTRACT_CURSORS['denominators']).watermark)
+
+    def test_au_replaces_usage(self):
+        summary = AUMonthlySummary.objects.create(
+            reporting_month='2026-02', location_code='G3-PICU', patient_days=1,
+        )
+        AUAntimicrobialUsage.objects.create(
+            summary=summary, antimicrobial_code='OLD', antimicrobial_name='Old', days_of_therapy=1,
+        )
+
+        self._run(kinds=['au'])
+
+        summary.refresh_from_db()
+        self.assertEqual(summary.patient_days, 22)
+        usage = summary.usage_records.get()
+        self.assertEqual(usage.antimicrobial_code, 'VAN')
+        self.assertEqual(usage.route, AntimicrobialRoute.PO)
+
+    def test_au_leaves_submitted_month_unchanged(self):
+        submitted = timezone.now()
+        summary = AUMonthlySummary.objects.create(
+            reporting_month='2026-02', location_code='G3-PICU', patient_days=1, submitted_at=submitted,
+        )
+        AUAntimicrobialUsage.objects.create(
+            summary=summary, antimicrobial_code='OLD', antimicrobial_name='Old', days_of_therapy=1,
+        )
+
+        results = self._run(kinds=['au'])
+
+        summary.refresh_from_db()
+        self.assertEqual(results['au']['submitted_kept'], 1)
+        self.assertEqual(summary.patient_days, 1)
+        self.assertEqual(summary.submitted_at, submitted)
+        self.assertEqual(summary.usage_records.get().antimicrobial_code, 'OLD')
+
+    @patch('apps.nhsn_reporting.services.cfg.get_extract_reopen_days', return_value=5)
+    def test_denominators_leave_submitted_month_unchanged(self, mock_reopen):
+        MonitorCursor.for_monitor(EXTRACT_CURSORS['denominators']).reset(timezone.now())
+        DenominatorDaily.objects.create(date=date(2026, 2, 10), location_code='G3-PICU', patient_days=99)
+        DenominatorMonthly.objects.create(
+            month='2026-02', location_code='G3-PICU', patient_days=99, submitted_at=timezone.now(),
+        )
+
+        results = self._run(kinds=['denominators'])
+
+        self.assertEqual(results['denominators']['submitted_kept'], 1)
+        self.assertEqual(DenominatorDaily.objects.get().patient_days, 99)
+        self.assertEqual(DenominatorMonthly.objects.get().patient_days, 99)
+
+    def test_ar_leaves_submitted_quarter_unchanged(self):
+        ARQuarterlySummary.objects.create(
+            reporting_quarter='2026-Q1', location_code='G3-PICU', submitted_at=timezone.now(),
+        )
+
+        results = self._run(kinds=['ar'])
+
+        self.assertEqual(results['ar']['quarters'], 0)
+        self.assertEqual(results['ar']['submitted_kept'], 1)
+        self.assertFalse(ARIsolate.objects.exists())
+
+    def test_ar_writes_isolates_susceptibilities_and_phenotypes(self):
+        results = self._run(kinds=['ar'])
+
+        self.assertEqual(results['ar']['quarters'], 1)
+        summary = ARQuarterlySummary.objects.get(reporting_quarter='2026-Q1', location_code='G3-PICU')
+        isolate = summary.isolates.get()
+        self.assertEqual(isolate.patient_mrn, 'MRN1')
+        # Unknown interpretations are dropped
+        self.assertEqual(list(isolate.susceptibilities.values_list('antimicrobial_code', flat=True)), ['OXA'])
+        self.assertEqual(summary.phenotypes.get().phenotype, ResistancePhenotype.MRSA)
+
+        # Re-running the quarter replaces rather than duplicates
+        self._run(kinds=['ar'])
+        self.assertEqual(ARIsolate.objects.count(), 1)
+
+    def test_extractor_error_is_reported(self):
+        self.au.get_monthly_summary.side_effect = RuntimeError('boom')
+
+        results = self._run()
+
+        self.assertEqual(results['au_error'], 'boom')
+        self.assertIn('denominators', results)
+        self.assertIn('ar', results)
+
+    def test_reports_stage_rows_and_durations(self):
+        results = self._run()
+
+        stages = results['stages']
+        self.assertEqual(set(stages), {'denominators', 'au', 'ar'})
+        self.assertEqual(stages['denominators']['rows_read'], 2)
+        self.assertEqual(stages['au']['rows_read'], 1)
+        # One isolate and two susceptibility rows
+        self.assertEqual(stages['ar']['rows_read'], 3)
+        for stage in stages.values():
+            self.assertGreaterEqual(stage['fetch_seconds'], 0)
+            self.assertGreaterEqual(stage['store_seconds'], 0)
+
+    @patch('apps.nhsn_reporting.logic.clarity.cfg.get_clarity_max_connections', return_value=3)
+    def test_clarity_reads_run_concurrently(self, mock_budget):
+        import threading
+
+        # Each kind's first read waits for the other two, so a serial run times out
+        barrier = threading.Barrier(3, timeout=5)
+        for mock, method in [(self.denom, 'get_denominator_days'),
+                             (self.au, 'get_monthly_summary'),
+                             (self.ar, 'get_quarter_extract')]:
+            waited = []
+
+            def wait_once(waited=waited):
+                if not waited:
+                    waited.append(True)
+                    barrier.wait()
+
+            fetch = getattr(mock, method)
+            fetch.side_effect = self._after(wait_once, fetch.side_effect, fetch.return_value)
+
+        results = self._run()
+
+        self.assertFalse([key for key in results if key.endswith('_error')])
+        self.assertEqual(results['ar']['quarters'], 1)
+
+    @patch('apps.nhsn_reporting.logic.clarity.cfg.get_clarity_max_connections', return_value=2)
+    def test_clarity_reads_stay_within_budget(self, mock_budget):
+        import threading
+        import time
+
+        lock = threading.Lock()
+        running = []
+        peak = []
+
+        def track():
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.pop()
+
+        for mock, method in [(self.denom, 'get_denominator_days'),
+                             (self.au, 'get_monthly_summary'),
+                             (self.ar, 'get_quarter_extract')]:
+            fetch = getattr(mock, method)
+            fetch.side_effect = self._after(track, fetch.side_effect, fetch.return_value)
+
+        results = self._run()
+
+        self.assertIn('ar', results)
+        self.assertEqual(max(peak), 2)
+
+    @staticmethod
+    def _after(before, side_effect, return_value):
+        """Wrap a mocked extractor call so ``before`` runs first (once per call)."""
+        def call(*args, **kwargs):
+            before()
+            return side_effect(*args, **kwargs) if side_effect else return_value
+        return call
+
+
+class ClarityEngineTests(TestCase):
+    """Test the shared, size-limited Clarity engine."""
+
+    def tearDown(self):
+        from .logic.clarity import dispose_clarity_engines
+        dispose_clarity_engines()
+
+    @patch('apps.nhsn_reporting.logic.clarity.cfg.get_clarity_max_connections', return_value=2)
+    def test_extractors_share_one_bounded_pool(self, mock_budget):
+        from .logic.ar_extractor import ARDataExtractor
+        from .logic.au_extractor import AUDataExtractor
+        from .logic.denominator import DenominatorCalculator
+
+        connection_string = 'sqlite:////tmp/nhsn_shared_engine_test.db'
+        engines = {
+            id(cls(connection_string)._get_engine())
+            for cls in (AUDataExtractor, ARDataExtractor, DenominatorCalculator)
+        }
+
+        self.assertEqual(len(engines), 1)
+        engine = AUDataExtractor(connection_string)._get_engine()
+        self.assertEqual(engine.pool.size(), 2)
+        self.assertEqual(engine.pool._max_overflow, 0)
+
+    def test_missing_connection_string(self):
+        from .logic.clarity import get_clarity_engine
+
+        with self.assertRaises(ValueError):
+            get_clarity_engine(None)
+
+
+class DailyIntervalCountTests(TestCase):
+    """Test per-day denominator counts from stay and device intervals."""
+
+    def test_counts_overlapping_intervals_per_location_day(self):
+        import pandas as pd
+        from .logic.denominator import sum_interval_days
+
+        intervals = pd.DataFrame({
+            'nhsn_location_code': ['ICU', 'ICU', 'WARD', None],
+            'start_day': ['2024-01-30', '2024-01-31', '2024-01-31', '2024-01-30'],
+            'end_day': ['2024-02-01', '2024-01-30', '2024-01-31', '2024-02-01'],
+        })
+
+        result = sum_interval_days(intervals, 'patient_days', by='date')
+
+        self.assertEqual(
+            list(result.itertuples(index=False, name=None)),
+            [
+                ('ICU', date(2024, 1, 30), 1),
+                ('ICU', date(2024, 1, 31), 2),
+                ('WARD', date(2024, 1, 31), 1),
+                ('ICU', date(2024, 2, 1), 1),
+            ],
+        )
+
+    def test_empty_intervals(self):
+        import pandas as pd
+        from .logic.denominator import sum_interval_days
+
+        intervals = pd.DataFrame(columns=['nhsn_location_code', 'start_day', 'end_day'])
+
+        result = sum_interval_days(intervals, 'patient_days', by='date')
+
+        self.assertEqual(list(result.columns), ['nhsn_location_code', 'date', 'patient_days'])
+        self.assertTrue(result.empty)
+
+
+class AUMonthlySummaryBuildTests(TestCase):
+    """Test building the nested AU monthly summary."""
+
+    def test_null_location_left_out_of_breakdown(self):
+        import pandas as pd
+        from .logic.au_extractor import build_monthly_summary
+
+        usage = pd.DataFrame([
+            (None, '2026-01', 'VAN', 'Glycopeptides', 'vancomycin', 'IV', 2),
+            ('ICU-A', '2026-01', 'VAN', 'Glycopeptides', 'vancomycin', 'IV', 4),
+        ], columns=[
+            'nhsn_location_code', 'month', 'nhsn_code', 'nhsn_category',
+            'medication_name', 'route', 'days_of_therapy',
+        ])
+        patient_days = pd.DataFrame({
+            'nhsn_location_code': ['ICU-A'], 'month': ['2026-01'], 'patient_days': [400],
+        })
+
+        with self.assertLogs('apps.nhsn_reporting.logic.au_extractor', level='WARNING'):
+            summary = build_monthly_summary(usage, patient_days)
+
+        self.assertEqual([loc['nhsn_location_code'] for loc in summary['locations']], ['ICU-A'])
+        self.assertEqual(summary['locations'][0]['totals']['total_dot'], 4)
+        self.assertEqual(summary['overall_totals']['total_dot'], 6)
+
+
 # ============================================================================
 # Template Tests
 # ============================================================================
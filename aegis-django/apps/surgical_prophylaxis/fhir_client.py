@@ -14,6 +14,8 @@ from urllib.parse import urljoin
 
 import requests
 
+from apps.core.fhir.cache import get_resource_cache
+
 from .logic.config import Config
 from .logic.guidelines import CPT_CATEGORY_HINTS
 from .models import ProcedureCategory, SurgicalCase, ProphylaxisMedication
@@ -103,7 +105,7 @@ class FHIRClient:
 
     def get_patient(self, patient_id: str) -> Optional[dict]:
         try:
-            return self._get(f"Patient/{patient_id}")
+            return get_resource_cache().read("Patient", patient_id, self._get, source=self.base_url)
         except requests.HTTPError:
             return None
 
@@ -42,6 +42,11 @@ CREATE INDEX IF NOT EXISTS idx_alerts_type ON alerts(alert_type);
 CREATE INDEX IF NOT EXISTS idx_alerts_patient_mrn ON alerts(patient_mrn);
 CREATE INDEX IF NOT EXISTS idx_alerts_created_at ON alerts(created_at);
 CREATE INDEX IF NOT EXISTS idx_alerts_type_source ON alerts(alert_type, source_id);
+-- Covering index for get_analytics(): one range scan over the period
+CREATE INDEX IF NOT EXISTS idx_alerts_analytics ON alerts(
+    created_at, alert_type, status, severity,
+    resolution_reason, acknowledged_at, resolved_at
+);
 
 -- Audit trail for compliance
 CREATE TABLE IF NOT EXISTS alert_audit (
@@ -1,14 +1,21 @@
 """SQLite-backed alert storage for persistent alert tracking."""
 
+import copy
 import json
 import logging
 import os
-import sqlite3
+import threading
+import time
 import uuid
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from pathlib import Path
 from typing import Any
 
+try:
+    from ..sqlite_pool import PooledConnection, get_connection
+except ImportError:  # imported as a top-level package with common/ on sys.path
+    from sqlite_pool import PooledConnection, get_connection
+
 from .models import (
     AlertType,
     AlertStatus,
@@ -20,6 +27,30 @@ from .models import (
 
 logger = logging.getLogger(__name__)
 
+# Seconds get_analytics() results are reused (0 disables memoization)
+ANALYTICS_CACHE_TTL = float(os.environ.get("ALERT_ANALYTICS_CACHE_TTL", "30"))
+
+# (db_path, alert_type, days) -> (monotonic time computed, analytics)
+_analytics_cache: dict[tuple, tuple[float, dict]] = {}
+_analytics_lock = threading.Lock()
+
+WEEKDAY_NAMES = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
+
+
+def _format_duration(minutes: int | None) -> str | None:
+    """Format a duration in minutes as e.g. "45 min", "2h 5m" or "1d 3h"."""
+    if minutes is None:
+        return None
+    if minutes < 60:
+        return f"{minutes} min"
+    hours = minutes // 60
+    mins = minutes % 60
+    if hours < 24:
+        return f"{hours}h {mins}m" if mins else f"{hours}h"
+    days = hours // 24
+    hours = hours % 24
+    return f"{days}d {hours}h" if hours else f"{days}d"
+
 
 def _log_asp_activity(
     activity_type: str,
@@ -94,11 +125,9 @@ class AlertStore:
         with self._connect() as conn:
             conn.executescript(schema)
 
-    def _connect(self) -> sqlite3.Connection:
-        """Get database connection with row factory."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+    def _connect(self) -> PooledConnection:
+        """Get this thread's pooled database connection."""
+        return get_connection(self.db_path)
 
     def _generate_id(self) -> str:
         """Generate a unique alert ID."""
@@ -167,6 +196,7 @@ class AlertStore:
             )
 
             conn.commit()
+            self._invalidate_analytics()
 
         logger.info(f"Created alert {alert_id} for {alert_type.value}/{source_id}")
 
@@ -313,6 +343,7 @@ class AlertStore:
                     (alert_id, AuditAction.ACKNOWLEDGED.value, acknowledged_by, now.isoformat())
                 )
                 conn.commit()
+                self._invalidate_analytics()
                 logger.info(f"Alert {alert_id} acknowledged by {acknowledged_by}")
 
                 # Log to unified metrics store
@@ -373,6 +404,7 @@ class AlertStore:
                     )
                 )
                 conn.commit()
+                self._invalidate_analytics()
                 logger.info(f"Alert {alert_id} snoozed for {hours}h by {snoozed_by}")
                 return True
 
@@ -448,6 +480,7 @@ class AlertStore:
                     (alert_id, AuditAction.RESOLVED.value, resolved_by, now.isoformat(), details)
                 )
                 conn.commit()
+                self._invalidate_analytics()
                 logger.info(f"Alert {alert_id} resolved by {resolved_by} (reason: {reason_value})")
 
                 # Log to unified metrics store
@@ -503,6 +536,7 @@ class AlertStore:
                     (alert_id, AuditAction.NOTE_ADDED.value, added_by, now.isoformat(), note[:200])
                 )
                 conn.commit()
+                self._invalidate_analytics()
                 return True
 
             return False
@@ -545,6 +579,7 @@ class AlertStore:
                     (alert_id, audit_action.value, now.isoformat())
                 )
                 conn.commit()
+                self._invalidate_analytics()
                 return True
 
             return False
@@ -733,16 +768,38 @@ class AlertStore:
         self,
         alert_type: AlertType | None = None,
         days: int = 30,
+        use_cache: bool = True,
     ) -> dict:
         """Get comprehensive analytics for reporting.
 
+        All breakdowns come from a single grouped scan of the period, and
+        results are memoized for ALERT_ANALYTICS_CACHE_TTL seconds because
+        the dashboard polls this. Writes through this store clear the memo.
+
         Args:
             alert_type: Filter by alert type (None for all)
             days: Number of days to include in analysis
+            use_cache: If False, always query the database
 
         Returns:
             Dictionary with analytics data
         """
+        cache_key = (self.db_path, alert_type.value if alert_type else None, days)
+        if use_cache and ANALYTICS_CACHE_TTL > 0:
+            with _analytics_lock:
+                cached = _analytics_cache.get(cache_key)
+            if cached and time.monotonic() - cached[0] < ANALYTICS_CACHE_TTL:
+                return copy.deepcopy(cached[1])
+
+        analytics = self._compute_analytics(alert_type, days)
+
+        if ANALYTICS_CACHE_TTL > 0:
+            with _analytics_lock:
+                _analytics_cache[cache_key] = (time.monotonic(), copy.deepcopy(analytics))
+        return analytics
+
+    def _compute_analytics(self, alert_type: AlertType | None, days: int) -> dict:
+        """Build get_analytics() results from one grouped query."""
         cutoff = (datetime.now() - timedelta(days=days)).isoformat()
         type_filter = ""
         params: list = [cutoff]
@@ -751,169 +808,146 @@ class AlertStore:
             type_filter = " AND alert_type = ?"
             params.append(alert_type.value)
 
+        # One row per (day, severity, status, resolution reason) with the
+        # response-time sums needed for averages over resolved alerts.
+        # Response times are only computed for resolved alerts.
         with self._connect() as conn:
-            analytics = {
-                "period_days": days,
-                "alert_type": alert_type.value if alert_type else "all",
-            }
-
-            # Total alerts in period
-            cursor = conn.execute(
-                f"SELECT COUNT(*) FROM alerts WHERE created_at >= ?{type_filter}",
-                params
-            )
-            analytics["total_alerts"] = cursor.fetchone()[0]
-
-            # Alerts by day
-            cursor = conn.execute(
-                f"""
-                SELECT date(created_at) as day, COUNT(*) as count
-                FROM alerts
-                WHERE created_at >= ?{type_filter}
-                GROUP BY date(created_at)
-                ORDER BY day DESC
-                """,
-                params
-            )
-            analytics["alerts_by_day"] = [
-                {"date": row[0], "count": row[1]} for row in cursor.fetchall()
-            ]
-
-            # Average alerts per day
-            if analytics["alerts_by_day"]:
-                analytics["avg_alerts_per_day"] = round(
-                    analytics["total_alerts"] / len(analytics["alerts_by_day"]), 1
-                )
-            else:
-                analytics["avg_alerts_per_day"] = 0
-
-            # Alerts by severity
-            cursor = conn.execute(
-                f"""
-                SELECT severity, COUNT(*) as count
-                FROM alerts
-                WHERE created_at >= ?{type_filter}
-                GROUP BY severity
-                ORDER BY count DESC
-                """,
-                params
-            )
-            analytics["by_severity"] = {row[0]: row[1] for row in cursor.fetchall()}
-
-            # Alerts by status
-            cursor = conn.execute(
-                f"""
-                SELECT status, COUNT(*) as count
-                FROM alerts
-                WHERE created_at >= ?{type_filter}
-                GROUP BY status
-                """,
-                params
-            )
-            analytics["by_status"] = {row[0]: row[1] for row in cursor.fetchall()}
-
-            # Resolution reason breakdown (for resolved alerts)
-            cursor = conn.execute(
-                f"""
-                SELECT resolution_reason, COUNT(*) as count
-                FROM alerts
-                WHERE created_at >= ?{type_filter}
-                  AND status = 'resolved'
-                  AND resolution_reason IS NOT NULL
-                GROUP BY resolution_reason
-                ORDER BY count DESC
-                """,
-                params
-            )
-            resolution_data = cursor.fetchall()
-            total_resolved = sum(row[1] for row in resolution_data)
-            analytics["resolution_breakdown"] = [
-                {
-                    "reason": row[0],
-                    "count": row[1],
-                    "percentage": round(row[1] / total_resolved * 100, 1) if total_resolved > 0 else 0
-                }
-                for row in resolution_data
-            ]
-            analytics["total_resolved"] = total_resolved
-
-            # Response time metrics (for resolved alerts)
-            cursor = conn.execute(
+            rows = conn.execute(
                 f"""
                 SELECT
-                    AVG(CAST((julianday(acknowledged_at) - julianday(created_at)) * 24 * 60 AS INTEGER)) as avg_time_to_ack_min,
-                    AVG(CAST((julianday(resolved_at) - julianday(created_at)) * 24 * 60 AS INTEGER)) as avg_time_to_resolve_min,
-                    MIN(CAST((julianday(resolved_at) - julianday(created_at)) * 24 * 60 AS INTEGER)) as min_time_to_resolve_min,
-                    MAX(CAST((julianday(resolved_at) - julianday(created_at)) * 24 * 60 AS INTEGER)) as max_time_to_resolve_min
-                FROM alerts
-                WHERE created_at >= ?{type_filter}
-                  AND status = 'resolved'
-                  AND resolved_at IS NOT NULL
+                    day, severity, status, resolution_reason,
+                    COUNT(*) AS count,
+                    SUM(ack_min) AS ack_sum,
+                    COUNT(ack_min) AS ack_count,
+                    SUM(resolve_min) AS resolve_sum,
+                    COUNT(resolve_min) AS resolve_count,
+                    MIN(resolve_min) AS resolve_min,
+                    MAX(resolve_min) AS resolve_max
+                FROM (
+                    SELECT
+                        date(created_at) AS day,
+                        severity,
+                        status,
+                        resolution_reason,
+                        CASE WHEN status = 'resolved' AND resolved_at IS NOT NULL
+                            THEN CAST((julianday(acknowledged_at) - julianday(created_at)) * 24 * 60 AS INTEGER)
+                        END AS ack_min,
+                        CASE WHEN status = 'resolved' AND resolved_at IS NOT NULL
+                            THEN CAST((julianday(resolved_at) - julianday(created_at)) * 24 * 60 AS INTEGER)
+                        END AS resolve_min
+                    FROM alerts
+                    WHERE created_at >= ?{type_filter}
+                )
+                GROUP BY day, severity, status, resolution_reason
                 """,
                 params
+            ).fetchall()
+
+        by_day: dict[str, int] = {}
+        by_severity: dict[str, int] = {}
+        by_status: dict[str, int] = {}
+        by_reason: dict[str, int] = {}
+        ack_sum = ack_count = resolve_sum = resolve_count = 0
+        resolve_min = resolve_max = None
+
+        for row in rows:
+            count = row["count"]
+            by_day[row["day"]] = by_day.get(row["day"], 0) + count
+            by_severity[row["severity"]] = by_severity.get(row["severity"], 0) + count
+            by_status[row["status"]] = by_status.get(row["status"], 0) + count
+            if row["status"] == AlertStatus.RESOLVED.value and row["resolution_reason"] is not None:
+                reason = row["resolution_reason"]
+                by_reason[reason] = by_reason.get(reason, 0) + count
+
+            ack_sum += row["ack_sum"] or 0
+            ack_count += row["ack_count"]
+            resolve_sum += row["resolve_sum"] or 0
+            resolve_count += row["resolve_count"]
+            if row["resolve_min"] is not None:
+                resolve_min = row["resolve_min"] if resolve_min is None else min(resolve_min, row["resolve_min"])
+                resolve_max = row["resolve_max"] if resolve_max is None else max(resolve_max, row["resolve_max"])
+
+        analytics = {
+            "period_days": days,
+            "alert_type": alert_type.value if alert_type else "all",
+        }
+
+        # Total alerts in period
+        analytics["total_alerts"] = sum(by_day.values())
+
+        # Alerts by day
+        analytics["alerts_by_day"] = [
+            {"date": day, "count": count}
+            for day, count in sorted(by_day.items(), key=lambda item: item[0] or "", reverse=True)
+        ]
+
+        # Average alerts per day
+        if analytics["alerts_by_day"]:
+            analytics["avg_alerts_per_day"] = round(
+                analytics["total_alerts"] / len(analytics["alerts_by_day"]), 1
             )
-            row = cursor.fetchone()
-            analytics["response_times"] = {
-                "avg_time_to_ack_minutes": round(row[0]) if row[0] else None,
-                "avg_time_to_resolve_minutes": round(row[1]) if row[1] else None,
-                "min_time_to_resolve_minutes": round(row[2]) if row[2] else None,
-                "max_time_to_resolve_minutes": round(row[3]) if row[3] else None,
-            }
-
-            # Convert minutes to human-readable format
-            def format_duration(minutes):
-                if minutes is None:
-                    return None
-                if minutes < 60:
-                    return f"{minutes} min"
-                hours = minutes // 60
-                mins = minutes % 60
-                if hours < 24:
-                    return f"{hours}h {mins}m" if mins else f"{hours}h"
-                days = hours // 24
-                hours = hours % 24
-                return f"{days}d {hours}h" if hours else f"{days}d"
-
-            analytics["response_times_formatted"] = {
-                "avg_time_to_ack": format_duration(analytics["response_times"]["avg_time_to_ack_minutes"]),
-                "avg_time_to_resolve": format_duration(analytics["response_times"]["avg_time_to_resolve_minutes"]),
-                "min_time_to_resolve": format_duration(analytics["response_times"]["min_time_to_resolve_minutes"]),
-                "max_time_to_resolve": format_duration(analytics["response_times"]["max_time_to_resolve_minutes"]),
+        else:
+            analytics["avg_alerts_per_day"] = 0
+
+        # Alerts by severity and status
+        analytics["by_severity"] = dict(sorted(by_severity.items(), key=lambda item: (-item[1], item[0] or "")))
+        analytics["by_status"] = by_status
+
+        # Resolution reason breakdown (for resolved alerts)
+        total_resolved = sum(by_reason.values())
+        analytics["resolution_breakdown"] = [
+            {
+                "reason": reason,
+                "count": count,
+                "percentage": round(count / total_resolved * 100, 1) if total_resolved > 0 else 0
             }
-
-            # Resolution rate
-            total_in_period = analytics["total_alerts"]
-            if total_in_period > 0:
-                analytics["resolution_rate"] = round(total_resolved / total_in_period * 100, 1)
-            else:
-                analytics["resolution_rate"] = 0
-
-            # Alerts by day of week
-            cursor = conn.execute(
-                f"""
-                SELECT
-                    CASE CAST(strftime('%w', created_at) AS INTEGER)
-                        WHEN 0 THEN 'Sunday'
-                        WHEN 1 THEN 'Monday'
-                        WHEN 2 THEN 'Tuesday'
-                        WHEN 3 THEN 'Wednesday'
-                        WHEN 4 THEN 'Thursday'
-                        WHEN 5 THEN 'Friday'
-                        WHEN 6 THEN 'Saturday'
-                    END as day_name,
-                    COUNT(*) as count
-                FROM alerts
-                WHERE created_at >= ?{type_filter}
-                GROUP BY strftime('%w', created_at)
-                ORDER BY CAST(strftime('%w', created_at) AS INTEGER)
-                """,
-                params
-            )
-            analytics["by_day_of_week"] = [
-                {"day": row[0], "count": row[1]} for row in cursor.fetchall()
-            ]
-
-            return analytics
+            for reason, count in sorted(by_reason.items(), key=lambda item: (-item[1], item[0]))
+        ]
+        analytics["total_resolved"] = total_resolved
+
+        # Response time metrics (for resolved alerts)
+        avg_ack = ack_sum / ack_count if ack_count else None
+        avg_resolve = resolve_sum / resolve_count if resolve_count else None
+        analytics["response_times"] = {
+            "avg_time_to_ack_minutes": round(avg_ack) if avg_ack else None,
+            "avg_time_to_resolve_minutes": round(avg_resolve) if avg_resolve else None,
+            "min_time_to_resolve_minutes": round(resolve_min) if resolve_min else None,
+            "max_time_to_resolve_minutes": round(resolve_max) if resolve_max else None,
+        }
+
+        # Convert minutes to human-readable format
+        analytics["response_times_formatted"] = {
+            "avg_time_to_ack": _format_duration(analytics["response_times"]["avg_time_to_ack_minutes"]),
+            "avg_time_to_resolve": _format_duration(analytics["response_times"]["avg_time_to_resolve_minutes"]),
+            "min_time_to_resolve": _format_duration(analytics["response_times"]["min_time_to_resolve_minutes"]),
+            "max_time_to_resolve": _format_duration(analytics["response_times"]["max_time_to_resolve_minutes"]),
+        }
+
+        # Resolution rate
+        total_in_period = analytics["total_alerts"]
+        if total_in_period > 0:
+            analytics["resolution_rate"] = round(total_resolved / total_in_period * 100, 1)
+        else:
+            analytics["resolution_rate"] = 0
+
+        # Alerts by day of week (Sunday first)
+        by_weekday: dict[int, int] = {}
+        for day, count in by_day.items():
+            if day:
+                weekday = (date.fromisoformat(day).weekday() + 1) % 7
+                by_weekday[weekday] = by_weekday.get(weekday, 0) + count
+        analytics["by_day_of_week"] = [
+            {"day": WEEKDAY_NAMES[weekday], "count": count}
+            for weekday, count in sorted(by_weekday.items())
+        ]
+
+        return analytics
+
+    def _invalidate_analytics(self) -> None:
+        """Drop memoized analytics for this database after a write."""
+        with _analytics_lock:
+            for key in [k for k in _analytics_cache if k[0] == self.db_path]:
+                del _analytics_cache[key]
 
     # Cleanup
 
@@ -944,6 +978,7 @@ class AlertStore:
             )
 
             conn.commit()
+            self._invalidate_analytics()
             count = cursor.rowcount
 
             if count > 0:
@@ -1027,6 +1062,7 @@ class AlertStore:
                 auto_accepted += 1
 
             conn.commit()
+            self._invalidate_analytics()
 
         if auto_accepted > 0:
             logger.info(f"Auto-accepted {auto_accepted} {alert_type.value} alerts older than {hours} hours")
@@ -8,12 +8,13 @@ delivery analytics.
 import json
 import logging
 import os
-import sqlite3
 from datetime import datetime, date, timedelta
 from enum import Enum
 from pathlib import Path
 from typing import Any
 
+from ..sqlite_pool import PooledConnection, get_connection
+
 logger = logging.getLogger(__name__)
 
 DEFAULT_DB_PATH = os.path.expanduser("~/.aegis/notification_receipts.db")
@@ -97,14 +98,12 @@ class ReceiptTracker:
     def _ensure_db(self):
         """Create database and tables if they don't exist."""
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.executescript(RECEIPT_SCHEMA)
 
-    def _connect(self):
-        """Get database connection."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+    def _connect(self) -> PooledConnection:
+        """Get this thread's pooled database connection."""
+        return get_connection(self.db_path)
 
     def record_send(
         self,
@@ -8,6 +8,7 @@ from datetime import datetime, date, timedelta
 from pathlib import Path
 from typing import Any
 
+from ..sqlite_pool import PooledConnection, get_connection
 from .models import LLMDecisionRecord, DecisionOutcome, LLMOverrideReason
 
 logger = logging.getLogger(__name__)
@@ -26,15 +27,13 @@ class LLMDecisionTracker:
         """Create database and tables if they don't exist."""
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
         schema_path = Path(__file__).parent / "schema.sql"
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             with open(schema_path) as f:
                 conn.executescript(f.read())
 
-    def _connect(self):
-        """Get database connection."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+    def _connect(self) -> PooledConnection:
+        """Get this thread's pooled database connection."""
+        return get_connection(self.db_path)
 
     def record_extraction(
         self,
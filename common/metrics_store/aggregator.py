@@ -7,6 +7,10 @@ and trending analysis across all monitoring modules.
 import json
 import logging
 import os
+import sqlite3
+from collections import defaultdict
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, date, timedelta
 from typing import Any
@@ -22,6 +26,53 @@ from .store import MetricsStore
 
 logger = logging.getLogger(__name__)
 
+# Threads used to collect per-module metrics concurrently (1 = serial)
+COLLECTOR_WORKERS = int(os.environ.get("METRICS_COLLECTOR_WORKERS", "4"))
+
+
+def _days(start_date: date, end_date: date) -> list[date]:
+    """Every date from start_date to end_date inclusive."""
+    return [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+
+
+def _current_state_days(start_date: date, end_date: date) -> list[date]:
+    """Dates in a range that a current-state count may be recorded on.
+
+    Counts such as active bundle episodes can only be read as of now, which
+    the nightly snapshot records against yesterday. Earlier dates are left
+    unset so a backfill does not stamp today's count on history.
+    """
+    return _days(max(start_date, date.today() - timedelta(days=1)), end_date)
+
+
+def _rows_by_day(conn: sqlite3.Connection, sql: str, start_date: date, end_date: date) -> Iterator[tuple]:
+    """Run a GROUP BY day query over a date range.
+
+    The query's first column must be the day (YYYY-MM-DD) and it must take
+    the start and end dates as its two parameters. Yields each row with the
+    day converted to a date.
+    """
+    for row in conn.execute(sql, (start_date.isoformat(), end_date.isoformat())):
+        yield (date.fromisoformat(row[0]), *row[1:])
+
+
+def _derive_rates(snapshot: DailySnapshot) -> None:
+    """Fill in the percentage fields computed from a snapshot's counts."""
+    total = snapshot.appropriate_count + snapshot.inappropriate_count
+    if total > 0:
+        snapshot.inappropriate_rate = round(snapshot.inappropriate_count / total * 100, 1)
+
+    if snapshot.surgical_prophylaxis_cases > 0:
+        snapshot.surgical_prophylaxis_compliance_rate = round(
+            snapshot.surgical_prophylaxis_compliant / snapshot.surgical_prophylaxis_cases * 100, 1
+        )
+
+    total = snapshot.llm_extractions_total
+    if total > 0:
+        accepted = snapshot.llm_accepted_count + snapshot.llm_modified_count
+        snapshot.llm_acceptance_rate = round(accepted / total * 100, 1)
+        snapshot.llm_override_rate = round(snapshot.llm_overridden_count / total * 100, 1)
+
 
 @dataclass
 class LocationScore:
@@ -193,19 +244,7 @@ class MetricsAggregator:
         if snapshot_date is None:
             snapshot_date = date.today() - timedelta(days=1)
 
-        snapshot = DailySnapshot(snapshot_date=snapshot_date)
-
-        # Aggregate from each module
-        self._aggregate_alert_metrics(snapshot, snapshot_date)
-        self._aggregate_hai_metrics(snapshot, snapshot_date)
-        self._aggregate_adherence_metrics(snapshot, snapshot_date)
-        self._aggregate_indication_metrics(snapshot, snapshot_date)
-        self._aggregate_drug_bug_metrics(snapshot, snapshot_date)
-        self._aggregate_mdro_metrics(snapshot, snapshot_date)
-        self._aggregate_outbreak_metrics(snapshot, snapshot_date)
-        self._aggregate_surgical_metrics(snapshot, snapshot_date)
-        self._aggregate_llm_metrics(snapshot, snapshot_date)
-        self._aggregate_activity_metrics(snapshot, snapshot_date)
+        snapshot = self.collect_snapshots(snapshot_date, snapshot_date)[0]
 
         # Save the snapshot
         self.metrics_store.save_daily_snapshot(snapshot)
@@ -213,435 +252,497 @@ class MetricsAggregator:
         logger.info(f"Created daily snapshot for {snapshot_date}")
         return snapshot
 
-    def _aggregate_alert_metrics(self, snapshot: DailySnapshot, snapshot_date: date) -> None:
-        """Aggregate metrics from the alert store."""
-        alert_store = self._get_alert_store()
-        if not alert_store:
-            return
+    def backfill_snapshots(
+        self,
+        start_date: date,
+        end_date: date | None = None,
+        parallel: bool = True,
+    ) -> list[DailySnapshot]:
+        """Create and save daily snapshots for every date in a range.
+
+        Each module database is read once for the whole range rather than
+        once per day, and all snapshots are written in a single transaction.
+        Current-state counts (active bundle episodes, active outbreak
+        clusters) are only recorded from yesterday on; earlier dates keep
+        any values already stored.
 
-        try:
-            import sqlite3
-            with sqlite3.connect(alert_store.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
+        Args:
+            start_date: First date to snapshot
+            end_date: Last date to snapshot (defaults to yesterday)
+            parallel: Collect from the module databases concurrently
+
+        Returns:
+            List of DailySnapshot, oldest first
+        """
+        if end_date is None:
+            end_date = date.today() - timedelta(days=1)
 
-                date_str = snapshot_date.isoformat()
+        snapshots = self.collect_snapshots(start_date, end_date, parallel=parallel)
+        self.metrics_store.save_daily_snapshots(snapshots)
 
-                # Alerts created on this date
-                cursor.execute(
-                    "SELECT COUNT(*) FROM alerts WHERE date(created_at) = ?",
-                    (date_str,)
-                )
-                snapshot.alerts_created = cursor.fetchone()[0]
+        logger.info(f"Backfilled {len(snapshots)} daily snapshots for {start_date} to {end_date}")
+        return snapshots
 
-                # Alerts resolved on this date
-                cursor.execute(
-                    "SELECT COUNT(*) FROM alerts WHERE date(resolved_at) = ?",
-                    (date_str,)
-                )
-                snapshot.alerts_resolved = cursor.fetchone()[0]
+    def collect_snapshots(
+        self,
+        start_date: date,
+        end_date: date,
+        parallel: bool = True,
+    ) -> list[DailySnapshot]:
+        """Build (but do not save) daily snapshots for a date range.
 
-                # Alerts acknowledged on this date
-                cursor.execute(
-                    "SELECT COUNT(*) FROM alerts WHERE date(acknowledged_at) = ?",
-                    (date_str,)
-                )
-                snapshot.alerts_acknowledged = cursor.fetchone()[0]
+        Args:
+            start_date: First date
+            end_date: Last date (inclusive)
+            parallel: Run the per-module collectors in a thread pool
+
+        Returns:
+            List of DailySnapshot, oldest first (empty if end_date < start_date)
+        """
+        days = _days(start_date, end_date)
+        if not days:
+            return []
+
+        collectors = [
+            self._collect_alert_metrics,
+            self._collect_hai_metrics,
+            self._collect_adherence_metrics,
+            self._collect_indication_metrics,
+            self._collect_mdro_metrics,
+            self._collect_outbreak_metrics,
+            self._collect_surgical_metrics,
+            self._collect_llm_metrics,
+            self._collect_activity_metrics,
+        ]
+
+        if parallel and COLLECTOR_WORKERS > 1:
+            with ThreadPoolExecutor(
+                max_workers=min(COLLECTOR_WORKERS, len(collectors)),
+                thread_name_prefix="metrics-collect",
+            ) as pool:
+                futures = [pool.submit(collect, start_date, end_date) for collect in collectors]
+                results = [future.result() for future in futures]
+        else:
+            results = [collect(start_date, end_date) for collect in collectors]
+
+        snapshots = []
+        for day in days:
+            snapshot = DailySnapshot(snapshot_date=day)
+            for by_day in results:
+                for name, value in by_day.get(day, {}).items():
+                    setattr(snapshot, name, value)
+            _derive_rates(snapshot)
+            snapshots.append(snapshot)
+        return snapshots
+
+    # Per-module collectors. Each reads its module database once for the
+    # whole range and returns {date: {snapshot field: value}}; dates with
+    # no activity are left out and keep the DailySnapshot defaults.
+    # Collectors log and return {} on error so one unavailable module does
+    # not block the others.
+
+    def _collect_alert_metrics(self, start_date: date, end_date: date) -> dict[date, dict[str, Any]]:
+        """Collect alert and drug-bug mismatch metrics from the alert store."""
+        alert_store = self._get_alert_store()
+        if not alert_store:
+            return {}
 
-                # Average time to acknowledge (for alerts acknowledged on this date)
-                cursor.execute(
+        by_day: dict[date, dict[str, Any]] = defaultdict(dict)
+        try:
+            with sqlite3.connect(alert_store.db_path) as conn:
+                # Alerts created per day
+                for day, created, drug_bug in _rows_by_day(
+                    conn,
                     """
-                    SELECT AVG(
-                        CAST((julianday(acknowledged_at) - julianday(created_at)) * 24 * 60 AS REAL)
-                    )
+                    SELECT date(created_at) AS day, COUNT(*),
+                        SUM(CASE WHEN alert_type = 'drug_bug_mismatch' THEN 1 ELSE 0 END)
                     FROM alerts
-                    WHERE date(acknowledged_at) = ? AND acknowledged_at IS NOT NULL
+                    WHERE date(created_at) BETWEEN ? AND ?
+                    GROUP BY day
                     """,
-                    (date_str,)
-                )
-                result = cursor.fetchone()[0]
-                snapshot.avg_time_to_ack_minutes = round(result, 1) if result else None
+                    start_date, end_date,
+                ):
+                    by_day[day].update(alerts_created=created, drug_bug_alerts_created=drug_bug)
 
-                # Average time to resolve (for alerts resolved on this date)
-                cursor.execute(
+                # Alerts acknowledged per day, with average time to acknowledge
+                for day, acknowledged, avg_ack in _rows_by_day(
+                    conn,
                     """
-                    SELECT AVG(
-                        CAST((julianday(resolved_at) - julianday(created_at)) * 24 * 60 AS REAL)
-                    )
+                    SELECT date(acknowledged_at) AS day, COUNT(*),
+                        AVG(CAST((julianday(acknowledged_at) - julianday(created_at)) * 24 * 60 AS REAL))
                     FROM alerts
-                    WHERE date(resolved_at) = ? AND resolved_at IS NOT NULL
+                    WHERE date(acknowledged_at) BETWEEN ? AND ?
+                    GROUP BY day
                     """,
-                    (date_str,)
-                )
-                result = cursor.fetchone()[0]
-                snapshot.avg_time_to_resolve_minutes = round(result, 1) if result else None
+                    start_date, end_date,
+                ):
+                    by_day[day].update(
+                        alerts_acknowledged=acknowledged,
+                        avg_time_to_ack_minutes=round(avg_ack, 1) if avg_ack else None,
+                    )
 
+                # Alerts resolved per day, with average time to resolve
+                for day, resolved, avg_resolve, drug_bug, therapy_changed in _rows_by_day(
+                    conn,
+                    """
+                    SELECT date(resolved_at) AS day, COUNT(*),
+                        AVG(CAST((julianday(resolved_at) - julianday(created_at)) * 24 * 60 AS REAL)),
+                        SUM(CASE WHEN alert_type = 'drug_bug_mismatch' THEN 1 ELSE 0 END),
+                        SUM(CASE WHEN alert_type = 'drug_bug_mismatch'
+                            AND resolution_reason IN ('therapy_changed', 'therapy_stopped')
+                            THEN 1 ELSE 0 END)
+                    FROM alerts
+                    WHERE date(resolved_at) BETWEEN ? AND ?
+                    GROUP BY day
+                    """,
+                    start_date, end_date,
+                ):
+                    by_day[day].update(
+                        alerts_resolved=resolved,
+                        avg_time_to_resolve_minutes=round(avg_resolve, 1) if avg_resolve else None,
+                        drug_bug_alerts_resolved=drug_bug,
+                        drug_bug_therapy_changed_count=therapy_changed,
+                    )
         except Exception as e:
             logger.error(f"Error aggregating alert metrics: {e}")
+            return {}
+        return by_day
 
-    def _aggregate_hai_metrics(self, snapshot: DailySnapshot, snapshot_date: date) -> None:
-        """Aggregate metrics from the HAI detection module."""
+    def _collect_hai_metrics(self, start_date: date, end_date: date) -> dict[date, dict[str, Any]]:
+        """Collect metrics from the HAI detection module."""
         hai_db = self._get_hai_db()
         if not hai_db:
-            return
+            return {}
 
+        by_day: dict[date, dict[str, Any]] = defaultdict(dict)
         try:
-            import sqlite3
             with sqlite3.connect(hai_db.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-
-                date_str = snapshot_date.isoformat()
-
-                # Candidates created on this date
-                cursor.execute(
-                    "SELECT COUNT(*) FROM hai_candidates WHERE date(created_at) = ?",
-                    (date_str,)
-                )
-                snapshot.hai_candidates_created = cursor.fetchone()[0]
-
-                # Candidates reviewed on this date
-                cursor.execute(
-                    "SELECT COUNT(*) FROM hai_reviews WHERE date(reviewed_at) = ?",
-                    (date_str,)
-                )
-                snapshot.hai_candidates_reviewed = cursor.fetchone()[0]
-
-                # Confirmed HAI on this date
-                cursor.execute(
+                # Candidates created (and confirmed) per day
+                for day, created, confirmed in _rows_by_day(
+                    conn,
                     """
-                    SELECT COUNT(*) FROM hai_candidates
-                    WHERE status = 'confirmed'
-                    AND date(created_at) = ?
+                    SELECT date(created_at) AS day, COUNT(*),
+                        SUM(CASE WHEN status = 'confirmed' THEN 1 ELSE 0 END)
+                    FROM hai_candidates
+                    WHERE date(created_at) BETWEEN ? AND ?
+                    GROUP BY day
                     """,
-                    (date_str,)
-                )
-                snapshot.hai_confirmed = cursor.fetchone()[0]
+                    start_date, end_date,
+                ):
+                    by_day[day].update(hai_candidates_created=created, hai_confirmed=confirmed)
 
-                # Overrides on this date
-                cursor.execute(
+                # Reviews and overrides per day
+                for day, reviewed, overrides in _rows_by_day(
+                    conn,
                     """
-                    SELECT COUNT(*) FROM hai_reviews
-                    WHERE is_override = 1 AND date(reviewed_at) = ?
+                    SELECT date(reviewed_at) AS day, COUNT(*),
+                        SUM(CASE WHEN is_override = 1 THEN 1 ELSE 0 END)
+                    FROM hai_reviews
+                    WHERE date(reviewed_at) BETWEEN ? AND ?
+                    GROUP BY day
                     """,
-                    (date_str,)
-                )
-                snapshot.hai_override_count = cursor.fetchone()[0]
-
+                    start_date, end_date,
+                ):
+                    by_day[day].update(hai_candidates_reviewed=reviewed, hai_override_count=overrides)
         except Exception as e:
             logger.error(f"Error aggregating HAI metrics: {e}")
+            return {}
+        return by_day
 
-    def _aggregate_adherence_metrics(self, snapshot: DailySnapshot, snapshot_date: date) -> None:
-        """Aggregate metrics from the guideline adherence module."""
+    def _collect_adherence_metrics(self, start_date: date, end_date: date) -> dict[date, dict[str, Any]]:
+        """Collect metrics from the guideline adherence module."""
         adherence_db = self._get_adherence_db()
         if not adherence_db:
-            return
+            return {}
 
+        by_day: dict[date, dict[str, Any]] = defaultdict(dict)
         try:
-            import sqlite3
             with sqlite3.connect(adherence_db.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-
-                date_str = snapshot_date.isoformat()
-
-                # Active bundle episodes
-                cursor.execute(
-                    "SELECT COUNT(*) FROM bundle_episodes WHERE status = 'active'"
-                )
-                snapshot.bundle_episodes_active = cursor.fetchone()[0]
-
-                # Bundle alerts created on this date
-                cursor.execute(
-                    "SELECT COUNT(*) FROM bundle_alerts WHERE date(created_at) = ?",
-                    (date_str,)
-                )
-                snapshot.bundle_alerts_created = cursor.fetchone()[0]
+                # Active bundle episodes (current count, recorded from yesterday on)
+                current_days = _current_state_days(start_date, end_date)
+                if current_days:
+                    active = conn.execute(
+                        "SELECT COUNT(*) FROM bundle_episodes WHERE status = 'active'"
+                    ).fetchone()[0]
+                    for day in current_days:
+                        by_day[day]["bundle_episodes_active"] = active
+
+                # Bundle alerts created per day
+                for day, created in _rows_by_day(
+                    conn,
+                    """
+                    SELECT date(created_at) AS day, COUNT(*)
+                    FROM bundle_alerts
+                    WHERE date(created_at) BETWEEN ? AND ?
+                    GROUP BY day
+                    """,
+                    start_date, end_date,
+                ):
+                    by_day[day]["bundle_alerts_created"] = created
 
-                # Average adherence rate for episodes completed on this date
-                cursor.execute(
+                # Average adherence rate for episodes completed per day
+                for day, rate in _rows_by_day(
+                    conn,
                     """
-                    SELECT AVG(adherence_percentage)
+                    SELECT date(completed_at) AS day, AVG(adherence_percentage)
                     FROM bundle_episodes
-                    WHERE date(completed_at) = ?
+                    WHERE date(completed_at) BETWEEN ? AND ?
                     AND adherence_percentage IS NOT NULL
+                    GROUP BY day
                     """,
-                    (date_str,)
-                )
-                result = cursor.fetchone()[0]
-                snapshot.bundle_adherence_rate = round(result, 1) if result else None
-
+                    start_date, end_date,
+                ):
+                    by_day[day]["bundle_adherence_rate"] = round(rate, 1) if rate else None
         except Exception as e:
             logger.error(f"Error aggregating adherence metrics: {e}")
+            return {}
+        return by_day
 
-    def _aggregate_indication_metrics(self, snapshot: DailySnapshot, snapshot_date: date) -> None:
-        """Aggregate metrics from the indication monitoring module."""
+    def _collect_indication_metrics(self, start_date: date, end_date: date) -> dict[date, dict[str, Any]]:
+        """Collect metrics from the indication monitoring module."""
         indication_db = self._get_indication_db()
         if not indication_db:
-            return
+            return {}
 
+        by_day: dict[date, dict[str, Any]] = defaultdict(dict)
         try:
-            import sqlite3
             with sqlite3.connect(indication_db.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-
-                date_str = snapshot_date.isoformat()
-
-                # Reviews on this date
-                cursor.execute(
-                    "SELECT COUNT(*) FROM indication_reviews WHERE date(reviewed_at) = ?",
-                    (date_str,)
-                )
-                snapshot.indication_reviews = cursor.fetchone()[0]
+                # Reviews per day
+                for day, reviews in _rows_by_day(
+                    conn,
+                    """
+                    SELECT date(reviewed_at) AS day, COUNT(*)
+                    FROM indication_reviews
+                    WHERE date(reviewed_at) BETWEEN ? AND ?
+                    GROUP BY day
+                    """,
+                    start_date, end_date,
+                ):
+                    by_day[day]["indication_reviews"] = reviews
 
-                # Classification breakdown for orders on this date
-                cursor.execute(
+                # Classification breakdown for orders per day
+                for day, appropriate, inappropriate in _rows_by_day(
+                    conn,
                     """
-                    SELECT
-                        SUM(CASE WHEN final_classification IN ('A', 'S', 'P') THEN 1 ELSE 0 END) as appropriate,
-                        SUM(CASE WHEN final_classification = 'N' THEN 1 ELSE 0 END) as inappropriate
+                    SELECT date(created_at) AS day,
+                        SUM(CASE WHEN final_classification IN ('A', 'S', 'P') THEN 1 ELSE 0 END),
+                        SUM(CASE WHEN final_classification = 'N' THEN 1 ELSE 0 END)
                     FROM indication_candidates
-                    WHERE date(created_at) = ?
+                    WHERE date(created_at) BETWEEN ? AND ?
+                    GROUP BY day
                     """,
-                    (date_str,)
-                )
-                row = cursor.fetchone()
-                snapshot.appropriate_count = row["appropriate"] or 0
-                snapshot.inappropriate_count = row["inappropriate"] or 0
-
-                total = snapshot.appropriate_count + snapshot.inappropriate_count
-                if total > 0:
-                    snapshot.inappropriate_rate = round(
-                        snapshot.inappropriate_count / total * 100, 1
+                    start_date, end_date,
+                ):
+                    by_day[day].update(
+                        appropriate_count=appropriate or 0,
+                        inappropriate_count=inappropriate or 0,
                     )
-
         except Exception as e:
             logger.error(f"Error aggregating indication metrics: {e}")
+            return {}
+        return by_day
 
-    def _aggregate_drug_bug_metrics(self, snapshot: DailySnapshot, snapshot_date: date) -> None:
-        """Aggregate drug-bug mismatch metrics from the alert store."""
-        alert_store = self._get_alert_store()
-        if not alert_store:
-            return
-        try:
-            import sqlite3
-            with sqlite3.connect(alert_store.db_path) as conn:
-                cursor = conn.cursor()
-                date_str = snapshot_date.isoformat()
-
-                # Drug-bug alerts created on this date
-                cursor.execute(
-                    "SELECT COUNT(*) FROM alerts WHERE alert_type = 'drug_bug_mismatch' AND date(created_at) = ?",
-                    (date_str,)
-                )
-                snapshot.drug_bug_alerts_created = cursor.fetchone()[0]
-
-                # Drug-bug alerts resolved on this date
-                cursor.execute(
-                    "SELECT COUNT(*) FROM alerts WHERE alert_type = 'drug_bug_mismatch' AND date(resolved_at) = ?",
-                    (date_str,)
-                )
-                snapshot.drug_bug_alerts_resolved = cursor.fetchone()[0]
-
-                # Drug-bug alerts resolved with therapy_changed reason
-                cursor.execute(
-                    """SELECT COUNT(*) FROM alerts
-                    WHERE alert_type = 'drug_bug_mismatch'
-                    AND date(resolved_at) = ?
-                    AND resolution_reason IN ('therapy_changed', 'therapy_stopped')""",
-                    (date_str,)
-                )
-                snapshot.drug_bug_therapy_changed_count = cursor.fetchone()[0]
-        except Exception as e:
-            logger.error(f"Error aggregating drug-bug metrics: {e}")
-
-    def _aggregate_mdro_metrics(self, snapshot: DailySnapshot, snapshot_date: date) -> None:
-        """Aggregate MDRO surveillance metrics."""
+    def _collect_mdro_metrics(self, start_date: date, end_date: date) -> dict[date, dict[str, Any]]:
+        """Collect MDRO surveillance metrics."""
         mdro_db = self._get_mdro_db()
         if not mdro_db:
-            return
+            return {}
+
+        by_day: dict[date, dict[str, Any]] = defaultdict(dict)
         try:
-            import sqlite3
             with sqlite3.connect(mdro_db.db_path) as conn:
-                cursor = conn.cursor()
-                date_str = snapshot_date.isoformat()
-
-                # MDRO cases identified on this date
-                cursor.execute(
-                    "SELECT COUNT(*) FROM mdro_cases WHERE date(identified_at) = ?",
-                    (date_str,)
-                )
-                snapshot.mdro_cases_identified = cursor.fetchone()[0]
-
-                # Cases reviewed on this date
-                cursor.execute(
-                    "SELECT COUNT(*) FROM mdro_reviews WHERE date(reviewed_at) = ?",
-                    (date_str,)
-                )
-                snapshot.mdro_cases_reviewed = cursor.fetchone()[0]
+                # Cases identified (and confirmed) per day
+                for day, identified, confirmed in _rows_by_day(
+                    conn,
+                    """
+                    SELECT date(identified_at) AS day, COUNT(*),
+                        SUM(CASE WHEN status = 'confirmed' THEN 1 ELSE 0 END)
+                    FROM mdro_cases
+                    WHERE date(identified_at) BETWEEN ? AND ?
+                    GROUP BY day
+                    """,
+                    start_date, end_date,
+                ):
+                    by_day[day].update(mdro_cases_identified=identified, mdro_confirmed=confirmed)
 
-                # Confirmed cases
-                cursor.execute(
-                    "SELECT COUNT(*) FROM mdro_cases WHERE status = 'confirmed' AND date(identified_at) = ?",
-                    (date_str,)
-                )
-                snapshot.mdro_confirmed = cursor.fetchone()[0]
+                # Cases reviewed per day
+                for day, reviewed in _rows_by_day(
+                    conn,
+                    """
+                    SELECT date(reviewed_at) AS day, COUNT(*)
+                    FROM mdro_reviews
+                    WHERE date(reviewed_at) BETWEEN ? AND ?
+                    GROUP BY day
+                    """,
+                    start_date, end_date,
+                ):
+                    by_day[day]["mdro_cases_reviewed"] = reviewed
         except Exception as e:
             logger.error(f"Error aggregating MDRO metrics: {e}")
+            return {}
+        return by_day
 
-    def _aggregate_outbreak_metrics(self, snapshot: DailySnapshot, snapshot_date: date) -> None:
-        """Aggregate outbreak detection metrics."""
+    def _collect_outbreak_metrics(self, start_date: date, end_date: date) -> dict[date, dict[str, Any]]:
+        """Collect outbreak detection metrics."""
         outbreak_db = self._get_outbreak_db()
         if not outbreak_db:
-            return
+            return {}
+
+        by_day: dict[date, dict[str, Any]] = defaultdict(dict)
         try:
-            import sqlite3
             with sqlite3.connect(outbreak_db.db_path) as conn:
-                cursor = conn.cursor()
-                date_str = snapshot_date.isoformat()
-
-                # Active clusters as of this date
-                cursor.execute(
-                    "SELECT COUNT(*) FROM outbreak_clusters WHERE status IN ('active', 'investigating')"
-                )
-                snapshot.outbreak_clusters_active = cursor.fetchone()[0]
-
-                # Alerts triggered on this date
-                cursor.execute(
-                    "SELECT COUNT(*) FROM outbreak_alerts WHERE date(created_at) = ?",
-                    (date_str,)
-                )
-                snapshot.outbreak_alerts_triggered = cursor.fetchone()[0]
+                # Active clusters (current count, recorded from yesterday on)
+                current_days = _current_state_days(start_date, end_date)
+                if current_days:
+                    active = conn.execute(
+                        "SELECT COUNT(*) FROM outbreak_clusters WHERE status IN ('active', 'investigating')"
+                    ).fetchone()[0]
+                    for day in current_days:
+                        by_day[day]["outbreak_clusters_active"] = active
+
+                # Alerts triggered per day
+                for day, triggered in _rows_by_day(
+                    conn,
+                    """
+                    SELECT date(created_at) AS day, COUNT(*)
+                    FROM outbreak_alerts
+                    WHERE date(created_at) BETWEEN ? AND ?
+                    GROUP BY day
+                    """,
+                    start_date, end_date,
+                ):
+                    by_day[day]["outbreak_alerts_triggered"] = triggered
         except Exception as e:
             logger.error(f"Error aggregating outbreak metrics: {e}")
+            return {}
+        return by_day
 
-    def _aggregate_surgical_metrics(self, snapshot: DailySnapshot, snapshot_date: date) -> None:
-        """Aggregate surgical prophylaxis metrics."""
+    def _collect_surgical_metrics(self, start_date: date, end_date: date) -> dict[date, dict[str, Any]]:
+        """Collect surgical prophylaxis metrics."""
         surgical_db = self._get_surgical_db()
         if not surgical_db:
-            return
+            return {}
+
+        by_day: dict[date, dict[str, Any]] = defaultdict(dict)
         try:
-            import sqlite3
             with sqlite3.connect(surgical_db.db_path) as conn:
-                cursor = conn.cursor()
-                date_str = snapshot_date.isoformat()
-
-                # Cases evaluated on this date
-                cursor.execute(
-                    "SELECT COUNT(*) FROM surgical_cases WHERE date(scheduled_or_time) = ?",
-                    (date_str,)
-                )
-                snapshot.surgical_prophylaxis_cases = cursor.fetchone()[0]
+                # Cases evaluated per day
+                for day, cases in _rows_by_day(
+                    conn,
+                    """
+                    SELECT date(scheduled_or_time) AS day, COUNT(*)
+                    FROM surgical_cases
+                    WHERE date(scheduled_or_time) BETWEEN ? AND ?
+                    GROUP BY day
+                    """,
+                    start_date, end_date,
+                ):
+                    by_day[day]["surgical_prophylaxis_cases"] = cases
 
-                # Compliant cases
-                cursor.execute(
-                    """SELECT COUNT(*) FROM compliance_evaluations ce
+                # Compliant cases per day
+                for day, compliant in _rows_by_day(
+                    conn,
+                    """
+                    SELECT date(sc.scheduled_or_time) AS day, COUNT(*)
+                    FROM compliance_evaluations ce
                     JOIN surgical_cases sc ON ce.case_id = sc.case_id
                     WHERE ce.bundle_compliant = 1
-                    AND date(sc.scheduled_or_time) = ?""",
-                    (date_str,)
-                )
-                snapshot.surgical_prophylaxis_compliant = cursor.fetchone()[0]
-
-                # Calculate compliance rate
-                if snapshot.surgical_prophylaxis_cases > 0:
-                    snapshot.surgical_prophylaxis_compliance_rate = round(
-                        snapshot.surgical_prophylaxis_compliant / snapshot.surgical_prophylaxis_cases * 100, 1
-                    )
+                    AND date(sc.scheduled_or_time) BETWEEN ? AND ?
+                    GROUP BY day
+                    """,
+                    start_date, end_date,
+                ):
+                    by_day[day]["surgical_prophylaxis_compliant"] = compliant
         except Exception as e:
             logger.error(f"Error aggregating surgical prophylaxis metrics: {e}")
+            return {}
+        return by_day
 
-    def _aggregate_llm_metrics(self, snapshot: DailySnapshot, snapshot_date: date) -> None:
-        """Aggregate LLM extraction accuracy metrics."""
+    def _collect_llm_metrics(self, start_date: date, end_date: date) -> dict[date, dict[str, Any]]:
+        """Collect LLM extraction accuracy metrics."""
         tracker = self._get_llm_tracker()
         if not tracker:
-            return
+            return {}
+
+        by_day: dict[date, dict[str, Any]] = defaultdict(dict)
         try:
-            import sqlite3
             with sqlite3.connect(tracker.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                date_str = snapshot_date.isoformat()
-
-                # Total reviewed extractions on this date
-                cursor.execute(
-                    "SELECT COUNT(*) FROM llm_decisions WHERE outcome != 'pending' AND date(reviewed_at) = ?",
-                    (date_str,)
-                )
-                snapshot.llm_extractions_total = cursor.fetchone()[0]
-
-                if snapshot.llm_extractions_total == 0:
-                    return
-
-                # Breakdown by outcome
-                cursor.execute(
-                    """SELECT
-                        SUM(CASE WHEN outcome = 'accepted' THEN 1 ELSE 0 END) as accepted,
-                        SUM(CASE WHEN outcome = 'modified' THEN 1 ELSE 0 END) as modified,
-                        SUM(CASE WHEN outcome = 'overridden' THEN 1 ELSE 0 END) as overridden,
-                        AVG(CASE WHEN llm_confidence IS NOT NULL THEN llm_confidence END) as avg_conf
+                # Reviewed extractions per day, broken down by outcome
+                for day, total, accepted, modified, overridden, avg_conf in _rows_by_day(
+                    conn,
+                    """
+                    SELECT date(reviewed_at) AS day, COUNT(*),
+                        SUM(CASE WHEN outcome = 'accepted' THEN 1 ELSE 0 END),
+                        SUM(CASE WHEN outcome = 'modified' THEN 1 ELSE 0 END),
+                        SUM(CASE WHEN outcome = 'overridden' THEN 1 ELSE 0 END),
+                        AVG(CASE WHEN llm_confidence IS NOT NULL THEN llm_confidence END)
                     FROM llm_decisions
-                    WHERE outcome != 'pending' AND date(reviewed_at) = ?""",
-                    (date_str,)
-                )
-                row = cursor.fetchone()
-                snapshot.llm_accepted_count = row["accepted"] or 0
-                snapshot.llm_modified_count = row["modified"] or 0
-                snapshot.llm_overridden_count = row["overridden"] or 0
-
-                total = snapshot.llm_extractions_total
-                accepted = snapshot.llm_accepted_count + snapshot.llm_modified_count
-                snapshot.llm_acceptance_rate = round(accepted / total * 100, 1)
-                snapshot.llm_override_rate = round(snapshot.llm_overridden_count / total * 100, 1)
-                snapshot.llm_avg_confidence = round(row["avg_conf"], 3) if row["avg_conf"] else None
+                    WHERE outcome != 'pending' AND date(reviewed_at) BETWEEN ? AND ?
+                    GROUP BY day
+                    """,
+                    start_date, end_date,
+                ):
+                    by_day[day].update(
+                        llm_extractions_total=total,
+                        llm_accepted_count=accepted or 0,
+                        llm_modified_count=modified or 0,
+                        llm_overridden_count=overridden or 0,
+                        llm_avg_confidence=round(avg_conf, 3) if avg_conf else None,
+                    )
         except Exception as e:
             logger.error(f"Error aggregating LLM metrics: {e}")
+            return {}
+        return by_day
 
-    def _aggregate_activity_metrics(self, snapshot: DailySnapshot, snapshot_date: date) -> None:
-        """Aggregate human activity metrics from the unified metrics store."""
+    def _collect_activity_metrics(self, start_date: date, end_date: date) -> dict[date, dict[str, Any]]:
+        """Collect human activity metrics from the unified metrics store."""
+        review_types = ("review", "acknowledgment", "resolution")
+        by_day: dict[date, dict[str, Any]] = {}
         try:
-            activities = self.metrics_store.list_activities(
-                start_date=snapshot_date,
-                end_date=snapshot_date,
-                limit=10000,
-            )
-
-            snapshot.total_reviews = sum(
-                1 for a in activities if a.activity_type in ("review", "acknowledgment", "resolution")
-            )
-
-            provider_ids = set(a.provider_id for a in activities if a.provider_id)
-            snapshot.unique_reviewers = len(provider_ids)
-
-            snapshot.total_interventions = sum(
-                1 for a in activities if a.activity_type == "intervention"
-            )
-
-            # Build location breakdown
-            by_location: dict[str, dict] = {}
-            for a in activities:
-                if a.location_code:
-                    if a.location_code not in by_location:
-                        by_location[a.location_code] = {"activities": 0, "reviews": 0}
-                    by_location[a.location_code]["activities"] += 1
-                    if a.activity_type in ("review", "acknowledgment", "resolution"):
-                        by_location[a.location_code]["reviews"] += 1
-            snapshot.by_location = by_location
-
-            # Build service breakdown
-            by_service: dict[str, dict] = {}
-            for a in activities:
-                if a.service:
-                    if a.service not in by_service:
-                        by_service[a.service] = {"activities": 0, "reviews": 0}
-                    by_service[a.service]["activities"] += 1
-                    if a.activity_type in ("review", "acknowledgment", "resolution"):
-                        by_service[a.service]["reviews"] += 1
-            snapshot.by_service = by_service
-
+            with sqlite3.connect(self.metrics_store.db_path) as conn:
+                rows = conn.execute(
+                    """
+                    SELECT date(performed_at), activity_type, provider_id, location_code, service
+                    FROM provider_activity
+                    WHERE date(performed_at) BETWEEN ? AND ?
+                    """,
+                    (start_date.isoformat(), end_date.isoformat()),
+                ).fetchall()
+
+            providers: dict[date, set[str]] = defaultdict(set)
+            for day_str, activity_type, provider_id, location_code, service in rows:
+                day = date.fromisoformat(day_str)
+                metrics = by_day.get(day)
+                if metrics is None:
+                    metrics = by_day[day] = {
+                        "total_reviews": 0,
+                        "total_interventions": 0,
+                        "by_location": {},
+                        "by_service": {},
+                    }
+
+                is_review = activity_type in review_types
+                if is_review:
+                    metrics["total_reviews"] += 1
+                elif activity_type == "intervention":
+                    metrics["total_interventions"] += 1
+                if provider_id:
+                    providers[day].add(provider_id)
+
+                # Location and service breakdowns
+                for key, breakdown in ((location_code, "by_location"), (service, "by_service")):
+                    if key:
+                        counts = metrics[breakdown].setdefault(key, {"activities": 0, "reviews": 0})
+                        counts["activities"] += 1
+                        if is_review:
+                            counts["reviews"] += 1
+
+            for day, metrics in by_day.items():
+                metrics["unique_reviewers"] = len(providers[day])
         except Exception as e:
             logger.error(f"Error aggregating activity metrics: {e}")
+            return {}
+        return by_day
 
     def calculate_location_scores(self, days: int = 30) -> list[LocationScore]:
         """Calculate aggregate scores by hospital location.
@@ -264,7 +264,7 @@ class DailySnapshot:
     hai_override_count: int = 0
 
     # Guideline adherence metrics
-    bundle_episodes_active: int = 0
+    bundle_episodes_active: int | None = None  # Current count; None if not measured
     bundle_alerts_created: int = 0
     bundle_adherence_rate: float | None = None
 
@@ -285,7 +285,7 @@ class DailySnapshot:
     mdro_confirmed: int = 0
 
     # Outbreak detection metrics
-    outbreak_clusters_active: int = 0
+    outbreak_clusters_active: int | None = None  # Current count; None if not measured
     outbreak_alerts_triggered: int = 0
 
     # Surgical prophylaxis metrics
@@ -413,7 +413,7 @@ class DailySnapshot:
             hai_candidates_reviewed=row["hai_candidates_reviewed"] or 0,
             hai_confirmed=row["hai_confirmed"] or 0,
             hai_override_count=row["hai_override_count"] or 0,
-            bundle_episodes_active=row["bundle_episodes_active"] or 0,
+            bundle_episodes_active=row["bundle_episodes_active"],
             bundle_alerts_created=row["bundle_alerts_created"] or 0,
             bundle_adherence_rate=row["bundle_adherence_rate"],
             indication_reviews=row["indication_reviews"] or 0,
@@ -426,7 +426,7 @@ class DailySnapshot:
             mdro_cases_identified=safe_get("mdro_cases_identified"),
             mdro_cases_reviewed=safe_get("mdro_cases_reviewed"),
             mdro_confirmed=safe_get("mdro_confirmed"),
-            outbreak_clusters_active=safe_get("outbreak_clusters_active"),
+            outbreak_clusters_active=safe_get("outbreak_clusters_active", None),
             outbreak_alerts_triggered=safe_get("outbreak_alerts_triggered"),
             surgical_prophylaxis_cases=safe_get("surgical_prophylaxis_cases"),
             surgical_prophylaxis_compliant=safe_get("surgical_prophylaxis_compliant"),
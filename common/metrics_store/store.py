@@ -3,11 +3,11 @@
 import json
 import logging
 import os
-import sqlite3
 from datetime import datetime, date, timedelta
 from pathlib import Path
 from typing import Any
 
+from ..sqlite_pool import PooledConnection, get_connection
 from .models import (
     ActivityType,
     ModuleSource,
@@ -26,6 +26,72 @@ from .models import (
 logger = logging.getLogger(__name__)
 
 
+_SNAPSHOT_COLUMNS = (
+    "snapshot_date",
+    "alerts_created", "alerts_resolved", "alerts_acknowledged",
+    "avg_time_to_ack_minutes", "avg_time_to_resolve_minutes",
+    "hai_candidates_created", "hai_candidates_reviewed", "hai_confirmed", "hai_override_count",
+    "bundle_episodes_active", "bundle_alerts_created", "bundle_adherence_rate",
+    "indication_reviews", "appropriate_count", "inappropriate_count", "inappropriate_rate",
+    "drug_bug_alerts_created", "drug_bug_alerts_resolved", "drug_bug_therapy_changed_count",
+    "mdro_cases_identified", "mdro_cases_reviewed", "mdro_confirmed",
+    "outbreak_clusters_active", "outbreak_alerts_triggered",
+    "surgical_prophylaxis_cases", "surgical_prophylaxis_compliant", "surgical_prophylaxis_compliance_rate",
+    "llm_extractions_total", "llm_accepted_count", "llm_modified_count",
+    "llm_overridden_count", "llm_acceptance_rate", "llm_override_rate", "llm_avg_confidence",
+    "total_reviews", "unique_reviewers", "total_interventions",
+    "by_location", "by_service", "created_at",
+)
+
+# Current-state counts that can only be measured as of now. A snapshot that
+# leaves one as None (a backfilled past date) keeps the stored value.
+_SNAPSHOT_GAUGES = ("bundle_episodes_active", "outbreak_clusters_active")
+
+
+def _snapshot_assignment(column: str) -> str:
+    if column in _SNAPSHOT_GAUGES:
+        return f"{column} = COALESCE(excluded.{column}, metrics_daily_snapshot.{column})"
+    return f"{column} = excluded.{column}"
+
+
+_SNAPSHOT_UPSERT = f"""
+    INSERT INTO metrics_daily_snapshot ({", ".join(_SNAPSHOT_COLUMNS)})
+    VALUES ({", ".join("?" * len(_SNAPSHOT_COLUMNS))})
+    ON CONFLICT(snapshot_date) DO UPDATE SET
+        {", ".join(_snapshot_assignment(c) for c in _SNAPSHOT_COLUMNS[1:])}
+"""
+
+
+def _snapshot_params(snapshot: DailySnapshot, now: datetime) -> tuple:
+    """Parameters for _SNAPSHOT_UPSERT."""
+    by_location_json = json.dumps(snapshot.by_location) if snapshot.by_location else None
+    by_service_json = json.dumps(snapshot.by_service) if snapshot.by_service else None
+    return (
+        snapshot.snapshot_date.isoformat(),
+        snapshot.alerts_created, snapshot.alerts_resolved, snapshot.alerts_acknowledged,
+        snapshot.avg_time_to_ack_minutes, snapshot.avg_time_to_resolve_minutes,
+        snapshot.hai_candidates_created, snapshot.hai_candidates_reviewed,
+        snapshot.hai_confirmed, snapshot.hai_override_count,
+        snapshot.bundle_episodes_active, snapshot.bundle_alerts_created,
+        snapshot.bundle_adherence_rate,
+        snapshot.indication_reviews, snapshot.appropriate_count,
+        snapshot.inappropriate_count, snapshot.inappropriate_rate,
+        snapshot.drug_bug_alerts_created, snapshot.drug_bug_alerts_resolved,
+        snapshot.drug_bug_therapy_changed_count,
+        snapshot.mdro_cases_identified, snapshot.mdro_cases_reviewed,
+        snapshot.mdro_confirmed,
+        snapshot.outbreak_clusters_active, snapshot.outbreak_alerts_triggered,
+        snapshot.surgical_prophylaxis_cases, snapshot.surgical_prophylaxis_compliant,
+        snapshot.surgical_prophylaxis_compliance_rate,
+        snapshot.llm_extractions_total, snapshot.llm_accepted_count,
+        snapshot.llm_modified_count, snapshot.llm_overridden_count,
+        snapshot.llm_acceptance_rate, snapshot.llm_override_rate,
+        snapshot.llm_avg_confidence,
+        snapshot.total_reviews, snapshot.unique_reviewers, snapshot.total_interventions,
+        by_location_json, by_service_json, now.isoformat()
+    )
+
+
 class MetricsStore:
     """SQLite-backed storage for ASP/IP metrics and activity tracking."""
 
@@ -59,11 +125,9 @@ class MetricsStore:
         with self._connect() as conn:
             conn.executescript(schema)
 
-    def _connect(self) -> sqlite3.Connection:
-        """Get database connection with row factory."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+    def _connect(self) -> PooledConnection:
+        """Get this thread's pooled database connection."""
+        return get_connection(self.db_path)
 
     # =========================================================================
     # Provider Activity Operations
@@ -490,62 +554,37 @@ class MetricsStore:
     def save_daily_snapshot(self, snapshot: DailySnapshot) -> int:
         """Save or update a daily snapshot.
 
-        Uses INSERT OR REPLACE to handle updates.
+        An existing snapshot for the date is updated in place; current-state
+        counts left as None keep their stored values.
 
         Returns:
             ID of the snapshot
         """
-        now = datetime.now()
-        by_location_json = json.dumps(snapshot.by_location) if snapshot.by_location else None
-        by_service_json = json.dumps(snapshot.by_service) if snapshot.by_service else None
+        with self._connect() as conn:
+            conn.execute(_SNAPSHOT_UPSERT, _snapshot_params(snapshot, datetime.now()))
+            conn.commit()
+            return conn.execute(
+                "SELECT id FROM metrics_daily_snapshot WHERE snapshot_date = ?",
+                (snapshot.snapshot_date.isoformat(),),
+            ).fetchone()[0]
+
+    def save_daily_snapshots(self, snapshots: list[DailySnapshot]) -> int:
+        """Save or update several daily snapshots in one transaction.
 
+        Used for backfills, where committing once per day would dominate
+        the run time.
+
+        Returns:
+            Number of snapshots written
+        """
+        if not snapshots:
+            return 0
+
+        now = datetime.now()
         with self._connect() as conn:
-            cursor = conn.execute(
-                """
-                INSERT OR REPLACE INTO metrics_daily_snapshot (
-                    snapshot_date,
-                    alerts_created, alerts_resolved, alerts_acknowledged,
-                    avg_time_to_ack_minutes, avg_time_to_resolve_minutes,
-                    hai_candidates_created, hai_candidates_reviewed, hai_confirmed, hai_override_count,
-                    bundle_episodes_active, bundle_alerts_created, bundle_adherence_rate,
-                    indication_reviews, appropriate_count, inappropriate_count, inappropriate_rate,
-                    drug_bug_alerts_created, drug_bug_alerts_resolved, drug_bug_therapy_changed_count,
-                    mdro_cases_identified, mdro_cases_reviewed, mdro_confirmed,
-                    outbreak_clusters_active, outbreak_alerts_triggered,
-                    surgical_prophylaxis_cases, surgical_prophylaxis_compliant, surgical_prophylaxis_compliance_rate,
-                    llm_extractions_total, llm_accepted_count, llm_modified_count,
-                    llm_overridden_count, llm_acceptance_rate, llm_override_rate, llm_avg_confidence,
-                    total_reviews, unique_reviewers, total_interventions,
-                    by_location, by_service, created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    snapshot.snapshot_date.isoformat(),
-                    snapshot.alerts_created, snapshot.alerts_resolved, snapshot.alerts_acknowledged,
-                    snapshot.avg_time_to_ack_minutes, snapshot.avg_time_to_resolve_minutes,
-                    snapshot.hai_candidates_created, snapshot.hai_candidates_reviewed,
-                    snapshot.hai_confirmed, snapshot.hai_override_count,
-                    snapshot.bundle_episodes_active, snapshot.bundle_alerts_created,
-                    snapshot.bundle_adherence_rate,
-                    snapshot.indication_reviews, snapshot.appropriate_count,
-                    snapshot.inappropriate_count, snapshot.inappropriate_rate,
-                    snapshot.drug_bug_alerts_created, snapshot.drug_bug_alerts_resolved,
-                    snapshot.drug_bug_therapy_changed_count,
-                    snapshot.mdro_cases_identified, snapshot.mdro_cases_reviewed,
-                    snapshot.mdro_confirmed,
-                    snapshot.outbreak_clusters_active, snapshot.outbreak_alerts_triggered,
-                    snapshot.surgical_prophylaxis_cases, snapshot.surgical_prophylaxis_compliant,
-                    snapshot.surgical_prophylaxis_compliance_rate,
-                    snapshot.llm_extractions_total, snapshot.llm_accepted_count,
-                    snapshot.llm_modified_count, snapshot.llm_overridden_count,
-                    snapshot.llm_acceptance_rate, snapshot.llm_override_rate,
-                    snapshot.llm_avg_confidence,
-                    snapshot.total_reviews, snapshot.unique_reviewers, snapshot.total_interventions,
-                    by_location_json, by_service_json, now.isoformat()
-                )
-            )
+            conn.executemany(_SNAPSHOT_UPSERT, [_snapshot_params(s, now) for s in snapshots])
             conn.commit()
-            return cursor.lastrowid
+        return len(snapshots)
 
     def get_daily_snapshot(self, snapshot_date: date) -> DailySnapshot | None:
         """Get snapshot for a specific date."""
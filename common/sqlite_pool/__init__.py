@@ -0,0 +1,28 @@
+"""Shared SQLite connection pooling for AEGIS stores.
+
+Every store used to open a fresh connection per method call, with no WAL
+mode or busy timeout, so the dashboard, monitors and cron jobs contended
+for the same files. Stores now get a per-thread pooled connection that is
+configured once (WAL, synchronous=NORMAL, busy timeout, mmap, cache size):
+
+    from common.sqlite_pool import get_connection
+
+    with get_connection(self.db_path) as conn:
+        conn.execute(...)
+"""
+
+from .pool import (
+    PooledConnection,
+    SQLitePool,
+    close_all_pools,
+    get_connection,
+    get_pool,
+)
+
+__all__ = [
+    "PooledConnection",
+    "SQLitePool",
+    "close_all_pools",
+    "get_connection",
+    "get_pool",
+]
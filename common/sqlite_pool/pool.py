@@ -0,0 +1,216 @@
+"""Per-thread pooled SQLite connections with WAL mode and tuned pragmas."""
+
+import logging
+import os
+import sqlite3
+import threading
+import weakref
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Seconds a connection waits on a locked database before raising
+BUSY_TIMEOUT = float(os.environ.get("AEGIS_SQLITE_BUSY_TIMEOUT", "30"))
+# Memory-mapped I/O size in bytes (0 disables)
+MMAP_SIZE = int(os.environ.get("AEGIS_SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+# Page cache size per connection in KiB
+CACHE_SIZE_KB = int(os.environ.get("AEGIS_SQLITE_CACHE_KB", "65536"))
+
+
+class PooledConnection:
+    """A pooled connection handed out to a store.
+
+    Behaves like sqlite3.Connection (attribute access is delegated), with
+    two differences:
+
+    - As a context manager it commits or rolls back only when the outermost
+      ``with`` block exits, so a store method that calls another store
+      method inside its own ``with`` keeps a single transaction. An explicit
+      commit() inside a nested block is deferred to the outermost exit for
+      the same reason.
+    - close() is a no-op; the connection stays open for reuse by this
+      thread. It is closed when the thread exits, or by
+      SQLitePool.close_all().
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        object.__setattr__(self, "_conn", conn)
+        object.__setattr__(self, "_depth", 0)
+
+    @property
+    def raw(self) -> sqlite3.Connection:
+        """The underlying sqlite3 connection."""
+        return self._conn
+
+    def __enter__(self) -> "PooledConnection":
+        object.__setattr__(self, "_depth", self._depth + 1)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        object.__setattr__(self, "_depth", self._depth - 1)
+        if self._depth == 0:
+            if exc_type is None:
+                self._conn.commit()
+            else:
+                self._conn.rollback()
+        return False
+
+    def commit(self) -> None:
+        """Commit, unless inside a nested ``with`` (the outermost block commits)."""
+        if self._depth <= 1:
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Keep the connection open for reuse."""
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._conn, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._conn, name, value)
+
+
+class SQLitePool:
+    """One SQLite connection per thread for a single database file.
+
+    Connections are created lazily on first use in each thread and reused
+    for every later call from that thread, so stores no longer pay
+    connection setup on each method call. A thread's connection is closed
+    when the thread exits, so short-lived worker threads do not leave
+    connections (and their page cache and mmap) behind. Each new connection
+    is configured with:
+
+    - journal_mode=WAL: readers no longer block the writer (dashboard,
+      monitors and cron jobs share the same files)
+    - synchronous=NORMAL: safe with WAL, far fewer fsyncs
+    - busy_timeout: wait for a lock instead of failing immediately
+    - mmap_size and cache_size for read-heavy dashboard queries
+    - sqlite3.Row row factory
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path,
+        timeout: float = BUSY_TIMEOUT,
+        mmap_size: int = MMAP_SIZE,
+        cache_size_kb: int = CACHE_SIZE_KB,
+    ):
+        """Initialize the pool.
+
+        Args:
+            db_path: SQLite database file.
+            timeout: Busy timeout in seconds.
+            mmap_size: Memory-mapped I/O size in bytes (0 disables).
+            cache_size_kb: Page cache size per connection in KiB.
+        """
+        self.db_path = str(db_path)
+        self.timeout = timeout
+        self.mmap_size = mmap_size
+        self.cache_size_kb = cache_size_kb
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # Open connections keyed by id() of their PooledConnection
+        self._connections: dict[int, sqlite3.Connection] = {}
+        self._pid = os.getpid()
+
+    def connection(self) -> PooledConnection:
+        """Get this thread's connection, creating it on first use."""
+        if os.getpid() != self._pid:
+            # Forked child: never reuse the parent's connections
+            self._reset_after_fork()
+
+        pooled = getattr(self._local, "conn", None)
+        if pooled is None:
+            conn = self._open()
+            pooled = PooledConnection(conn)
+            key = id(pooled)
+            with self._lock:
+                self._connections[key] = conn
+            # The thread-local is dropped when the thread exits; close then
+            weakref.finalize(pooled, self._discard, key, conn)
+            self._local.conn = pooled
+        return pooled
+
+    def _discard(self, key: int, conn: sqlite3.Connection) -> None:
+        with self._lock:
+            if self._connections.get(key) is conn:
+                del self._connections[key]
+        try:
+            conn.close()
+        except sqlite3.Error as e:
+            logger.debug(f"Error closing pooled connection: {e}")
+
+    def _open(self) -> sqlite3.Connection:
+        # Used only by the owning thread; close() may come from another
+        # thread (thread exit finalizer or close_all)
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA busy_timeout = {int(self.timeout * 1000)}")
+        try:
+            conn.execute("PRAGMA journal_mode = WAL")
+        except sqlite3.OperationalError as e:
+            # Another process may be holding the file in rollback mode
+            logger.warning(f"Could not enable WAL for {self.db_path}: {e}")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        conn.execute(f"PRAGMA cache_size = {-int(self.cache_size_kb)}")
+        return conn
+
+    def _reset_after_fork(self) -> None:
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = {}
+        self._pid = os.getpid()
+
+    def close_all(self) -> None:
+        """Close every connection in the pool (all threads).
+
+        Only call this when no thread is using the pool, e.g. at shutdown
+        or between tests.
+        """
+        with self._lock:
+            connections, self._connections = self._connections, {}
+        for conn in connections.values():
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.debug(f"Error closing pooled connection: {e}")
+        self._local = threading.local()
+
+
+# Pools shared by every store in the process, keyed by resolved file path
+_pools: dict[str, SQLitePool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path: str | Path) -> SQLitePool:
+    """Get the shared pool for a database file."""
+    key = str(db_path) if str(db_path) == ":memory:" else str(Path(db_path).expanduser().resolve())
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = SQLitePool(key)
+            _pools[key] = pool
+        return pool
+
+
+def get_connection(db_path: str | Path) -> PooledConnection:
+    """Get the calling thread's pooled connection for a database file.
+
+    Example:
+        with get_connection(self.db_path) as conn:
+            conn.execute(...)
+    """
+    return get_pool(db_path).connection()
+
+
+def close_all_pools() -> None:
+    """Close all pooled connections in the process."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close_all()
@@ -634,11 +634,24 @@ def api_snapshots():
 
 @asp_metrics_bp.route("/api/create-snapshot", methods=["POST"])
 def api_create_snapshot():
-    """API endpoint to manually create a daily snapshot."""
+    """API endpoint to manually create a daily snapshot.
+
+    Pass start_date (and optionally end_date) instead of date to backfill
+    every day in a range.
+    """
     try:
         aggregator = _get_aggregator()
         data = request.get_json() or {}
 
+        start_date_str = data.get("start_date")
+        if start_date_str:
+            end_date_str = data.get("end_date")
+            snapshots = aggregator.backfill_snapshots(
+                date.fromisoformat(start_date_str),
+                date.fromisoformat(end_date_str) if end_date_str else None,
+            )
+            return api_success(data={"snapshots": [s.to_dict() for s in snapshots]})
+
         snapshot_date_str = data.get("date")
         if snapshot_date_str:
             snapshot_date = date.fromisoformat(snapshot_date_str)
@@ -36,6 +36,16 @@ class Config:
     VENTILATOR_SOURCE: str = os.getenv("VENTILATOR_SOURCE", "fhir")  # fhir only
     FHIR_BASE_URL: str = os.getenv("FHIR_BASE_URL", "http://localhost:8081/fhir")
     CLARITY_CONNECTION_STRING: str | None = os.getenv("CLARITY_CONNECTION_STRING")
+    # FHIR search paging: results per page (_count) and worker threads used to
+    # prefetch the next page and read Patients that were not _include'd
+    FHIR_PAGE_SIZE: int = int(os.getenv("FHIR_PAGE_SIZE", "100"))
+    FHIR_SEARCH_WORKERS: int = int(os.getenv("FHIR_SEARCH_WORKERS", "4"))
+    # Concurrent DocumentReference attachment (Binary) downloads per note search
+    FHIR_NOTE_FETCH_WORKERS: int = int(os.getenv("FHIR_NOTE_FETCH_WORKERS", "8"))
+    # Bulk Data $export backfills: status poll interval when the server sends
+    # no Retry-After, and how long to wait for an export to complete
+    FHIR_BULK_EXPORT_POLL_SECONDS: int = int(os.getenv("FHIR_BULK_EXPORT_POLL_SECONDS", "10"))
+    FHIR_BULK_EXPORT_TIMEOUT_SECONDS: int = int(os.getenv("FHIR_BULK_EXPORT_TIMEOUT_SECONDS", "3600"))
 
     # --- LLM Backend ---
     LLM_BACKEND: str = os.getenv("LLM_BACKEND", "ollama")  # ollama, vllm, or claude
@@ -46,6 +56,17 @@ class Config:
     CLAUDE_API_KEY: str | None = os.getenv("CLAUDE_API_KEY")
     CLAUDE_MODEL: str = os.getenv("CLAUDE_MODEL", "claude-sonnet-4-20250514")
 
+    # --- LLM Extraction Cache ---
+    # Reuses extraction output when the same notes are re-sent with the same
+    # HAI type, prompt version and model (reruns, retriggers)
+    EXTRACTION_CACHE_ENABLED: bool = os.getenv("EXTRACTION_CACHE_ENABLED", "true").lower() == "true"
+    EXTRACTION_CACHE_PATH: str = os.getenv(
+        "EXTRACTION_CACHE_PATH",
+        str(Path.home() / ".aegis" / "hai_extraction_cache.db"),
+    )
+    EXTRACTION_CACHE_TTL_DAYS: int = int(os.getenv("EXTRACTION_CACHE_TTL_DAYS", "30"))
+    EXTRACTION_CACHE_MAX_ENTRIES: int = int(os.getenv("EXTRACTION_CACHE_MAX_ENTRIES", "10000"))
+
     # --- Classification Thresholds ---
     # Above this confidence: auto-classify as HAI (no review needed)
     AUTO_CLASSIFY_THRESHOLD: float = float(
@@ -102,6 +123,15 @@ class Config:
     # --- Monitoring ---
     POLL_INTERVAL: int = int(os.getenv("POLL_INTERVAL", "300"))  # seconds
     LOOKBACK_HOURS: int = int(os.getenv("LOOKBACK_HOURS", "24"))
+    # Classification worker pool: concurrent LLM requests (1 = serial),
+    # note retrieval threads feeding them, and results per DB commit
+    CLASSIFY_LLM_WORKERS: int = int(os.getenv("CLASSIFY_LLM_WORKERS", "1"))
+    CLASSIFY_NOTE_WORKERS: int = int(os.getenv("CLASSIFY_NOTE_WORKERS", "4"))
+    CLASSIFY_COMMIT_BATCH: int = int(os.getenv("CLASSIFY_COMMIT_BATCH", "20"))
+
+    # Classified candidates are re-queued when new or edited notes appear
+    # in their note window, checked until this many days after it closes
+    NOTE_RECHECK_DAYS: int = int(os.getenv("NOTE_RECHECK_DAYS", "14"))
 
     # --- Notifications ---
     TEAMS_WEBHOOK_URL: str | None = os.getenv("TEAMS_WEBHOOK_URL")
@@ -35,6 +35,21 @@ class BaseNoteSource(ABC):
         """Retrieve a specific note by ID."""
         pass
 
+    def has_notes_since(
+        self,
+        patient_id: str,
+        since: datetime,
+        start_date: datetime,
+        end_date: datetime,
+        note_types: list[str] | None = None,
+    ) -> bool:
+        """Check whether any note in a date range was added or edited after `since`.
+
+        Lets callers skip a full note fetch when nothing has changed. Sources
+        without a cheap way to tell return True so the caller fetches.
+        """
+        return True
+
 
 class BaseDeviceSource(ABC):
     """Abstract base class for device/procedure data retrieval."""
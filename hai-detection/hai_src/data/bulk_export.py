@@ -0,0 +1,603 @@
+"""FHIR Bulk Data ($export) ingestion for HAI backfills.
+
+Backfilling a quarter of surveillance through REST searches pages through
+results patient by patient. A Bulk Data export instead has the server write
+every matching resource to NDJSON files. BulkExportClient kicks the export
+off, polls its status endpoint until the files are ready, and streams each
+output file one line at a time. BulkExportReader parses those lines into the
+existing models (CultureResult, DeviceInfo, ClinicalNote) as they arrive, so
+history is processed without holding the export in memory.
+
+A directory of NDJSON files (LocalNDJSONExport) stands in for a completed
+export, e.g. in tests or for files downloaded separately.
+
+ExportCultureSource and ExportDeviceSource index an export by patient and
+answer the culture and device source interfaces from it, so the CLABSI
+detector can re-run over history (``runner --backfill``). For a backfill
+window, backfill_type_filters() limits what the server exports and the
+sources keep only the window's cultures, patients and devices.
+
+Example:
+    client = BulkExportClient()
+    export = client.export(
+        ["Patient", "DiagnosticReport", "DeviceUseStatement"],
+        since=datetime(2024, 1, 1),
+    )
+    reader = BulkExportReader(export)
+    for patient_id, culture in reader.iter_cultures(positive_only=True):
+        ...
+"""
+
+import json
+import logging
+import re
+import time
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Protocol
+from urllib.parse import urlencode
+
+import requests
+
+from ..config import Config
+from ..models import ClinicalNote, CultureResult, DeviceInfo, Patient
+from .base import BaseCultureSource, BaseDeviceSource
+from .fhir_source import FHIRCultureSource, FHIRDeviceSource, FHIRNoteSource
+
+logger = logging.getLogger(__name__)
+
+NDJSON_CONTENT_TYPE = "application/fhir+ndjson"
+
+# Days either side of a backfill window whose cultures are kept, for the
+# CLABSI check for a confirmatory culture within 2 days
+CULTURE_MARGIN_DAYS = 2
+
+
+class BulkExportError(Exception):
+    """A bulk export was rejected, failed, or did not finish in time."""
+
+
+class ResourceExport(Protocol):
+    """Anything that can stream the resources of one type from an export."""
+
+    base_url: str | None
+
+    def iter_resources(self, resource_type: str) -> Iterator[dict]:
+        ...
+
+
+def iter_ndjson(lines: Iterable[str | bytes], source: str = "") -> Iterator[dict]:
+    """Parse NDJSON lines into dicts, skipping blank and malformed lines.
+
+    Args:
+        lines: Text or byte lines (a file object or ``Response.iter_lines()``).
+        source: File name or URL, used in log messages.
+    """
+    for line_number, line in enumerate(lines, 1):
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            logger.warning(f"Skipping malformed NDJSON line {line_number} in {source}: {e}")
+
+
+class LocalNDJSONExport:
+    """A directory of NDJSON files standing in for a completed export.
+
+    A file belongs to a resource type when the type is one of the dot, dash
+    or underscore separated parts of its name, which matches the common
+    server naming schemes (``DiagnosticReport.ndjson``,
+    ``1.DiagnosticReport.ndjson``, ``DiagnosticReport-2.ndjson``). Only lines
+    whose ``resourceType`` matches are yielded.
+
+    Args:
+        directory: Directory holding the ``*.ndjson`` files.
+    """
+
+    base_url: str | None = None
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+        if not self.directory.is_dir():
+            raise BulkExportError(f"NDJSON export directory not found: {self.directory}")
+
+    def files_for(self, resource_type: str) -> list[Path]:
+        """Get the NDJSON files for a resource type, in name order."""
+        return [
+            path for path in sorted(self.directory.glob("*.ndjson"))
+            if resource_type in re.split(r"[.\-_]", path.stem)
+        ]
+
+    def iter_resources(self, resource_type: str) -> Iterator[dict]:
+        """Stream every resource of a type from the export's files."""
+        for path in self.files_for(resource_type):
+            with path.open(encoding="utf-8") as f:
+                for resource in iter_ndjson(f, str(path)):
+                    if resource.get("resourceType") == resource_type:
+                        yield resource
+
+
+class BulkExport:
+    """A completed server export: its manifest and streaming file access.
+
+    Args:
+        session: Session used to download output files.
+        manifest: Completion manifest from the status endpoint.
+        base_url: FHIR server base URL.
+        status_url: Status endpoint, used to delete the export's files.
+        timeout: Per-request timeout in seconds.
+    """
+
+    def __init__(
+        self,
+        session: requests.Session,
+        manifest: dict,
+        base_url: str | None = None,
+        status_url: str | None = None,
+        timeout: int = 300,
+    ):
+        self.session = session
+        self.manifest = manifest
+        self.base_url = base_url
+        self.status_url = status_url
+        self.timeout = timeout
+
+    @property
+    def transaction_time(self) -> str | None:
+        """Server time the export reflects; use as ``_since`` for the next one."""
+        return self.manifest.get("transactionTime")
+
+    def file_urls(self, resource_type: str) -> list[str]:
+        """Get the output file URLs for a resource type."""
+        return [
+            output["url"] for output in self.manifest.get("output", [])
+            if output.get("type") == resource_type and output.get("url")
+        ]
+
+    def iter_resources(self, resource_type: str) -> Iterator[dict]:
+        """Stream every resource of a type, one output file line at a time.
+
+        Raises:
+            requests.RequestException: If an output file cannot be downloaded.
+        """
+        for url in self.file_urls(resource_type):
+            with self.session.get(
+                url,
+                headers={"Accept": NDJSON_CONTENT_TYPE},
+                stream=True,
+                timeout=self.timeout,
+            ) as response:
+                response.raise_for_status()
+                yield from iter_ndjson(response.iter_lines(), url)
+
+    def delete(self) -> None:
+        """Ask the server to delete the export's files (best effort)."""
+        if not self.status_url:
+            return
+        try:
+            self.session.delete(self.status_url, timeout=self.timeout)
+        except requests.RequestException as e:
+            logger.warning(f"Failed to delete bulk export {self.status_url}: {e}")
+
+
+class BulkExportClient:
+    """Kicks off FHIR Bulk Data exports and waits for them to complete.
+
+    Args:
+        base_url: FHIR server base URL. Defaults to Config.get_fhir_base_url().
+        session: Session to use (e.g. one carrying auth headers).
+        poll_interval: Seconds between status polls when the server sends no
+            Retry-After. Defaults to Config.FHIR_BULK_EXPORT_POLL_SECONDS.
+        max_wait: Seconds to wait for an export before giving up. Defaults
+            to Config.FHIR_BULK_EXPORT_TIMEOUT_SECONDS.
+        timeout: Per-request timeout in seconds.
+    """
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        session: requests.Session | None = None,
+        poll_interval: int | None = None,
+        max_wait: int | None = None,
+        timeout: int = 60,
+    ):
+        self.base_url = (base_url or Config.get_fhir_base_url()).rstrip("/")
+        self.session = session or requests.Session()
+        self.poll_interval = poll_interval or Config.FHIR_BULK_EXPORT_POLL_SECONDS
+        self.max_wait = max_wait or Config.FHIR_BULK_EXPORT_TIMEOUT_SECONDS
+        self.timeout = timeout
+
+    def kick_off(
+        self,
+        resource_types: list[str] | None = None,
+        since: datetime | None = None,
+        type_filters: list[str] | None = None,
+        group_id: str | None = None,
+    ) -> str:
+        """Start an export and return its status URL.
+
+        Args:
+            resource_types: Resource types to export (``_type``). All types
+                if None.
+            since: Only resources changed after this time (``_since``).
+                A naive datetime is taken as local time.
+            type_filters: FHIR search queries restricting each type
+                (``_typeFilter``), e.g. ``"DiagnosticReport?category=MB"``.
+                Each is sent as its own parameter, so a query may contain
+                commas (e.g. a code list).
+            group_id: Export a Group's patients instead of all patients.
+
+        Raises:
+            BulkExportError: If the server does not accept the export.
+        """
+        path = f"Group/{group_id}/$export" if group_id else "Patient/$export"
+        params = {"_outputFormat": NDJSON_CONTENT_TYPE}
+        if resource_types:
+            params["_type"] = ",".join(resource_types)
+        if since:
+            # _since is a FHIR instant, which must carry a UTC offset
+            params["_since"] = since.astimezone(timezone.utc).isoformat(timespec="seconds")
+        if type_filters:
+            params["_typeFilter"] = list(type_filters)
+
+        response = self.session.get(
+            f"{self.base_url}/{path}",
+            params=params,
+            headers={"Accept": "application/fhir+json", "Prefer": "respond-async"},
+            timeout=self.timeout,
+        )
+        if response.status_code != 202:
+            raise BulkExportError(
+                f"Bulk export kick-off returned {response.status_code}: "
+                f"{self._error_message(response)}"
+            )
+
+        status_url = response.headers.get("Content-Location")
+        if not status_url:
+            raise BulkExportError("Bulk export kick-off returned no Content-Location")
+
+        logger.info(f"Started bulk export: {status_url}")
+        return status_url
+
+    def wait(self, status_url: str) -> BulkExport:
+        """Poll an export's status endpoint until its files are ready.
+
+        Raises:
+            BulkExportError: If the export fails or exceeds max_wait.
+        """
+        deadline = time.monotonic() + self.max_wait
+
+        while True:
+            response = self.session.get(
+                status_url,
+                headers={"Accept": "application/json"},
+                timeout=self.timeout,
+            )
+
+            if response.status_code == 200:
+                manifest = response.json()
+                for error in manifest.get("error", []):
+                    logger.warning(f"Bulk export reported an error file: {error.get('url')}")
+                logger.info(
+                    f"Bulk export complete: {len(manifest.get('output', []))} output files"
+                )
+                return BulkExport(
+                    self.session, manifest, self.base_url, status_url, self.timeout,
+                )
+
+            if response.status_code != 202:
+                raise BulkExportError(
+                    f"Bulk export failed with {response.status_code}: "
+                    f"{self._error_message(response)}"
+                )
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise BulkExportError(
+                    f"Bulk export did not complete within {self.max_wait}s: {status_url}"
+                )
+
+            progress = response.headers.get("X-Progress")
+            if progress:
+                logger.info(f"Bulk export in progress: {progress}")
+            time.sleep(min(self._retry_after(response), remaining))
+
+    def export(
+        self,
+        resource_types: list[str] | None = None,
+        since: datetime | None = None,
+        type_filters: list[str] | None = None,
+        group_id: str | None = None,
+    ) -> BulkExport:
+        """Kick off an export and wait for it (see kick_off and wait)."""
+        status_url = self.kick_off(resource_types, since, type_filters, group_id)
+        return self.wait(status_url)
+
+    def _retry_after(self, response: requests.Response) -> float:
+        """Seconds to wait before the next poll (Retry-After, if in seconds)."""
+        retry_after = response.headers.get("Retry-After", "")
+        try:
+            return max(1.0, float(retry_after))
+        except ValueError:
+            return float(self.poll_interval)
+
+    @staticmethod
+    def _error_message(response: requests.Response) -> str:
+        """Extract diagnostics from an OperationOutcome body, if any."""
+        try:
+            outcome = response.json()
+        except ValueError:
+            return response.text[:200]
+        issues = outcome.get("issue", []) if isinstance(outcome, dict) else []
+        details = [issue.get("diagnostics", "") for issue in issues if issue.get("diagnostics")]
+        return "; ".join(details) or str(outcome)[:200]
+
+
+class BulkExportReader:
+    """Streams an export's NDJSON into HAI models.
+
+    Parsing reuses the FHIR data sources' resource parsers, so exported
+    resources map to the same models as REST search results. Note
+    attachments given by URL are fetched from the export's server.
+
+    Args:
+        export: A BulkExport or LocalNDJSONExport.
+    """
+
+    # Culture LOINC codes read by default (blood plus alternate-site cultures)
+    CULTURE_CODES = (
+        set(FHIRCultureSource.BLOOD_CULTURE_CODES)
+        | set(FHIRCultureSource.OTHER_CULTURE_CODES)
+    )
+
+    def __init__(self, export: ResourceExport):
+        self.export = export
+        base_url = export.base_url
+        self._culture_parser = FHIRCultureSource(base_url)
+        self._device_parser = FHIRDeviceSource(base_url)
+        self._note_parser = FHIRNoteSource(base_url)
+
+    def iter_patients(self) -> Iterator[Patient]:
+        """Stream exported Patients."""
+        for resource in self.export.iter_resources("Patient"):
+            patient = self._culture_parser._parse_patient(resource)
+            if patient:
+                yield patient
+
+    def iter_cultures(
+        self,
+        codes: set[str] | None = None,
+        positive_only: bool = False,
+    ) -> Iterator[tuple[str, CultureResult]]:
+        """Stream exported culture reports as (patient_id, CultureResult).
+
+        Args:
+            codes: LOINC codes to keep. Defaults to CULTURE_CODES.
+            positive_only: Skip cultures without growth.
+        """
+        for patient_id, _, culture in self._iter_culture_reports(codes or self.CULTURE_CODES):
+            if positive_only and not culture.is_positive:
+                continue
+            yield patient_id, culture
+
+    def _iter_culture_reports(
+        self,
+        codes: set[str],
+    ) -> Iterator[tuple[str, set[str], CultureResult]]:
+        """Stream (patient_id, report LOINC codes, CultureResult) for matching reports."""
+        for resource in self.export.iter_resources("DiagnosticReport"):
+            report_codes = {
+                coding.get("code") for coding in resource.get("code", {}).get("coding", [])
+            }
+            if not report_codes & codes:
+                continue
+            culture = self._culture_parser._parse_diagnostic_report(resource)
+            if culture is not None:
+                yield _patient_id(resource), report_codes, culture
+
+    def iter_devices(self) -> Iterator[tuple[str, DeviceInfo]]:
+        """Stream exported DeviceUseStatements as (patient_id, DeviceInfo)."""
+        for resource in self.export.iter_resources("DeviceUseStatement"):
+            if resource.get("status") == "entered-in-error":
+                continue
+            device = self._device_parser._parse_device_use_statement(resource)
+            if device:
+                yield _patient_id(resource), device
+
+    def iter_notes(self) -> Iterator[ClinicalNote]:
+        """Stream exported DocumentReferences as ClinicalNotes."""
+        for resource in self.export.iter_resources("DocumentReference"):
+            note = self._note_parser._parse_document_reference(resource)
+            if note:
+                yield note
+
+
+class ExportCultureSource(BaseCultureSource):
+    """Culture source answering from an export's Patients and DiagnosticReports.
+
+    The export is read once, when the source is created; cultures are kept
+    per patient as CultureResults. With a window, only cultures collected
+    within it (plus CULTURE_MARGIN_DAYS either side) are kept, and only the
+    Patients they belong to. Cultures whose Patient is not in the export
+    are dropped, as in FHIRCultureSource.
+
+    Args:
+        reader: Reader over an export with Patient and DiagnosticReport.
+        start_date: Start of the window to keep. All cultures if None.
+        end_date: End of the window to keep. All cultures if None.
+    """
+
+    def __init__(
+        self,
+        reader: BulkExportReader,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+    ):
+        blood_codes = set(FHIRCultureSource.BLOOD_CULTURE_CODES)
+        margin = timedelta(days=CULTURE_MARGIN_DAYS)
+        windowed = start_date is not None and end_date is not None
+
+        self._cultures: dict[str, list[CultureResult]] = defaultdict(list)
+        self._blood_culture_ids: set[str] = set()
+        for patient_id, codes, culture in reader._iter_culture_reports(reader.CULTURE_CODES):
+            if windowed and not _within_days(
+                culture.collection_date, start_date - margin, end_date + margin
+            ):
+                continue
+            self._cultures[patient_id].append(culture)
+            if codes & blood_codes:
+                self._blood_culture_ids.add(culture.fhir_id)
+
+        # Patients are read after the cultures so only those needed are kept
+        self._patients = {
+            patient.fhir_id: patient for patient in reader.iter_patients()
+            if not windowed or patient.fhir_id in self._cultures
+        }
+
+    @property
+    def patient_ids(self) -> set[str]:
+        """IDs of the patients with cultures in this source."""
+        return set(self._cultures)
+
+    def get_positive_blood_cultures(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> list[tuple[Patient, CultureResult]]:
+        """Get exported positive blood cultures collected within a date range."""
+        results = []
+        missing_patients = 0
+
+        for patient_id, cultures in self._cultures.items():
+            for culture in cultures:
+                if not (
+                    culture.is_positive
+                    and culture.fhir_id in self._blood_culture_ids
+                    and _within_days(culture.collection_date, start_date, end_date)
+                ):
+                    continue
+                patient = self._patients.get(patient_id)
+                if patient is None:
+                    missing_patients += 1
+                    continue
+                results.append((patient, culture))
+
+        if missing_patients:
+            logger.warning(f"Skipped {missing_patients} exported cultures with no exported Patient")
+        return results
+
+    def get_cultures_for_patient(
+        self,
+        patient_id: str,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> list[CultureResult]:
+        """Get a patient's exported cultures collected within a date range."""
+        return [
+            culture for culture in self._cultures.get(patient_id, [])
+            if _within_days(culture.collection_date, start_date, end_date)
+        ]
+
+
+class ExportDeviceSource(BaseDeviceSource):
+    """Device source answering from an export's DeviceUseStatements.
+
+    The export is read once, when the source is created; devices are kept
+    per patient and checked with FHIRDeviceSource's central line rules.
+    With a window, only devices in place at some point within it are kept;
+    with patient_ids, only those patients' devices.
+
+    Args:
+        reader: Reader over an export with DeviceUseStatement.
+        start_date: Start of the window to keep. All devices if None.
+        end_date: End of the window to keep. All devices if None.
+        patient_ids: Patients whose devices to keep. All patients if None.
+    """
+
+    def __init__(
+        self,
+        reader: BulkExportReader,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        patient_ids: set[str] | None = None,
+    ):
+        self._rules = reader._device_parser
+        self._devices: dict[str, list[DeviceInfo]] = defaultdict(list)
+        windowed = start_date is not None and end_date is not None
+        grace = timedelta(days=Config.POST_REMOVAL_WINDOW_DAYS)
+
+        for patient_id, device in reader.iter_devices():
+            if patient_ids is not None and patient_id not in patient_ids:
+                continue
+            if windowed and not (
+                device.insertion_date is not None
+                and device.insertion_date.date() <= end_date.date()
+                and (
+                    device.removal_date is None
+                    or (device.removal_date + grace).date() >= start_date.date()
+                )
+            ):
+                continue
+            self._devices[patient_id].append(device)
+
+    def get_central_lines(
+        self,
+        patient_id: str,
+        as_of_date: datetime,
+    ) -> list[DeviceInfo]:
+        """Get exported central lines present at a given date."""
+        return [
+            device for device in self._devices.get(patient_id, [])
+            if self._rules._is_central_line(device)
+            and self._rules._was_present_at_date(device, as_of_date)
+        ]
+
+    def get_active_devices(
+        self,
+        patient_id: str,
+        device_types: list[str] | None = None,
+    ) -> list[DeviceInfo]:
+        """Get exported devices that had not been removed."""
+        return [
+            device for device in self._devices.get(patient_id, [])
+            if device.removal_date is None
+            and (device_types is None or device.device_type in device_types)
+        ]
+
+
+def backfill_type_filters(start_date: datetime, end_date: datetime) -> list[str]:
+    """Build ``_typeFilter`` queries limiting an export to a backfill window.
+
+    DiagnosticReports are limited to culture codes collected within the
+    window plus CULTURE_MARGIN_DAYS. DeviceUseStatement has no date search
+    parameter, so devices are only limited to those not entered in error;
+    ExportDeviceSource drops the rest while streaming.
+    """
+    margin = timedelta(days=CULTURE_MARGIN_DAYS)
+    culture_query = urlencode([
+        ("code", ",".join(sorted(BulkExportReader.CULTURE_CODES))),
+        ("date", f"ge{(start_date - margin).strftime('%Y-%m-%d')}"),
+        ("date", f"le{(end_date + margin).strftime('%Y-%m-%d')}"),
+    ])
+    device_query = urlencode([("status:not", "entered-in-error")])
+    return [
+        f"DiagnosticReport?{culture_query}",
+        f"DeviceUseStatement?{device_query}",
+    ]
+
+
+def _within_days(value: datetime, start_date: datetime, end_date: datetime) -> bool:
+    """Check a datetime falls on a day in the range, like a FHIR ge/le date search."""
+    return start_date.date() <= value.date() <= end_date.date()
+
+
+def _patient_id(resource: dict) -> str:
+    """Get the patient ID a resource's subject (or patient) refers to."""
+    ref = (resource.get("subject") or resource.get("patient") or {}).get("reference", "")
+    return ref.split("/")[-1] if ref else ""
@@ -158,6 +158,14 @@ class CompositeNoteSource(BaseNoteSource):
         notes.sort(key=lambda n: n.date, reverse=True)
         return notes
 
+    def has_notes_since(self, patient_id: str, since, start_date, end_date, note_types=None) -> bool:
+        """Check both sources for notes added or edited after `since`."""
+        if self.fhir_source.has_notes_since(patient_id, since, start_date, end_date, note_types):
+            return True
+        if self.clarity_source:
+            return self.clarity_source.has_notes_since(patient_id, since, start_date, end_date, note_types)
+        return False
+
     def get_note_by_id(self, note_id: str):
         """Try to get note from FHIR first, then Clarity."""
         note = self.fhir_source.get_note_by_id(note_id)
@@ -0,0 +1,244 @@
+"""Paginated FHIR search shared by the HAI FHIR data sources.
+
+FHIR servers return search results one Bundle page at a time. FHIRSearch
+follows each Bundle's ``link[rel=next]`` so a search returns every match
+rather than only the first ``_count`` results, and yields resources lazily
+so large lookback windows never hold more than one page in memory.
+
+Example:
+    search = FHIRSearch(session, base_url)
+    for report, patient in search.iter_with_patients(
+        "DiagnosticReport",
+        {"code": "600-7", "_include": "DiagnosticReport:subject"},
+    ):
+        ...
+"""
+
+import logging
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import Any, TypeVar
+from urllib.parse import urljoin
+
+import requests
+
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+SearchParams = dict[str, Any] | list[tuple[str, Any]]
+
+
+class FHIRSearch:
+    """Lazy, page-following FHIR search over a shared requests session.
+
+    Args:
+        session: Session used for every request (its connection pool is shared
+            by the worker threads).
+        base_url: FHIR server base URL.
+        page_size: Default ``_count`` when the caller's params don't set one.
+            Defaults to Config.FHIR_PAGE_SIZE.
+        max_workers: Concurrency for fetching the next page ahead of the
+            consumer and for fetching Patients that were not ``_include``d.
+            1 disables concurrency. Defaults to Config.FHIR_SEARCH_WORKERS.
+        timeout: Per-request timeout in seconds.
+    """
+
+    def __init__(
+        self,
+        session: requests.Session,
+        base_url: str,
+        page_size: int | None = None,
+        max_workers: int | None = None,
+        timeout: int = 30,
+    ):
+        self.session = session
+        self.base_url = base_url.rstrip("/")
+        self.page_size = page_size or Config.FHIR_PAGE_SIZE
+        self.max_workers = max(1, max_workers or Config.FHIR_SEARCH_WORKERS)
+        self.timeout = timeout
+
+    def iter_pages(
+        self,
+        resource_type: str,
+        params: SearchParams | None = None,
+        timeout: int | None = None,
+    ) -> Iterator[dict]:
+        """Yield search result Bundles, following ``next`` links.
+
+        With more than one worker the next page is requested while the
+        caller is still consuming the current one.
+
+        Raises:
+            requests.RequestException: If any page request fails. Pages
+                already yielded are unaffected.
+        """
+        timeout = timeout or self.timeout
+        bundle = self._get(f"{self.base_url}/{resource_type}", self._with_page_size(params), timeout)
+        seen_urls: set[str] = set()
+
+        prefetcher = ThreadPoolExecutor(max_workers=1) if self.max_workers > 1 else nullcontext()
+        with prefetcher as executor:
+            while bundle is not None:
+                next_url = self._next_link(bundle)
+                if next_url in seen_urls:
+                    logger.warning(f"FHIR {resource_type} search returned a repeated next link, stopping")
+                    next_url = None
+                if next_url:
+                    seen_urls.add(next_url)
+
+                prefetch = None
+                if executor and next_url:
+                    prefetch = executor.submit(self._get, next_url, None, timeout)
+
+                yield bundle
+
+                if not next_url:
+                    break
+                bundle = prefetch.result() if prefetch else self._get(next_url, None, timeout)
+
+    def iter_resources(
+        self,
+        resource_type: str,
+        params: SearchParams | None = None,
+        limit: int | None = None,
+        timeout: int | None = None,
+    ) -> Iterator[dict]:
+        """Yield matching resources across all pages.
+
+        Only search matches are yielded; ``_include``d resources are skipped.
+
+        Args:
+            resource_type: FHIR resource type to search (e.g. "Observation").
+            params: Search parameters.
+            limit: Stop after this many resources (no further pages are fetched).
+            timeout: Per-request timeout override.
+        """
+        count = 0
+        pages = self.iter_pages(resource_type, params, timeout)
+        try:
+            for bundle in pages:
+                for entry in bundle.get("entry", []):
+                    if not self._is_match(entry, resource_type):
+                        continue
+                    yield entry.get("resource", {})
+                    count += 1
+                    if limit is not None and count >= limit:
+                        return
+        finally:
+            pages.close()
+
+    def iter_with_patients(
+        self,
+        resource_type: str,
+        params: SearchParams | None = None,
+        parse: Callable[[dict], T | None] | None = None,
+        subject_field: str = "subject",
+        timeout: int | None = None,
+    ) -> Iterator[tuple[T, dict | None]]:
+        """Yield (parsed resource, Patient resource) pairs across all pages.
+
+        Patients ``_include``d on any page are remembered for later pages.
+        Subjects still unresolved after a page are fetched concurrently, and
+        only for resources that ``parse`` kept, so filtered-out results never
+        cost a Patient read.
+
+        Args:
+            resource_type: FHIR resource type to search.
+            params: Search parameters (normally including ``_include``).
+            parse: Converts a raw resource to the caller's model; returning
+                None drops the resource. Defaults to yielding the raw resource.
+            subject_field: Reference field pointing at the Patient.
+            timeout: Per-request timeout override.
+
+        Yields:
+            Tuples of (parsed resource, Patient resource or None if it could
+            not be resolved).
+        """
+        patients: dict[str, dict] = {}
+        pages = self.iter_pages(resource_type, params, timeout)
+
+        try:
+            for bundle in pages:
+                matches = []
+                for entry in bundle.get("entry", []):
+                    resource = entry.get("resource", {})
+                    if resource.get("resourceType") == "Patient" and resource.get("id"):
+                        patients[resource["id"]] = resource
+                    elif self._is_match(entry, resource_type):
+                        parsed = parse(resource) if parse else resource
+                        if parsed is not None:
+                            matches.append((parsed, self.reference_id(resource, subject_field)))
+
+                missing = {pid for _, pid in matches if pid and pid not in patients}
+                if missing:
+                    patients.update(self.fetch_patients(missing, timeout))
+
+                for parsed, patient_id in matches:
+                    yield parsed, patients.get(patient_id)
+        finally:
+            pages.close()
+
+    def fetch_patients(self, patient_ids: set[str], timeout: int | None = None) -> dict[str, dict]:
+        """Read Patient resources by ID, up to max_workers at a time.
+
+        Returns:
+            Dict of patient ID to Patient resource. Failed reads are logged
+            and omitted.
+        """
+        timeout = timeout or self.timeout
+
+        def fetch(patient_id: str) -> tuple[str, dict | None]:
+            try:
+                return patient_id, self._get(f"{self.base_url}/Patient/{patient_id}", None, timeout)
+            except requests.RequestException as e:
+                logger.error(f"Failed to fetch patient {patient_id}: {e}")
+                return patient_id, None
+
+        if self.max_workers == 1 or len(patient_ids) == 1:
+            fetched = [fetch(pid) for pid in patient_ids]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(patient_ids))) as executor:
+                fetched = list(executor.map(fetch, patient_ids))
+
+        return {pid: resource for pid, resource in fetched if resource}
+
+    @staticmethod
+    def reference_id(resource: dict, field: str = "subject") -> str:
+        """Get the logical ID from a reference field (e.g. "Patient/123" -> "123")."""
+        reference = (resource.get(field) or {}).get("reference", "")
+        return reference.split("/")[-1] if reference else ""
+
+    def _get(self, url: str, params: SearchParams | None, timeout: int) -> dict:
+        """GET a URL and return the decoded JSON body."""
+        response = self.session.get(url, params=params, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def _with_page_size(self, params: SearchParams | None) -> SearchParams:
+        """Add the default ``_count`` unless the caller set one."""
+        if params is None:
+            return {"_count": self.page_size}
+        if isinstance(params, dict):
+            return {"_count": self.page_size, **params}
+        if any(key == "_count" for key, _ in params):
+            return params
+        return [*params, ("_count", self.page_size)]
+
+    def _next_link(self, bundle: dict) -> str | None:
+        """Get the absolute URL of the next page, if any."""
+        for link in bundle.get("link", []):
+            if link.get("relation") == "next" and link.get("url"):
+                return urljoin(f"{self.base_url}/", link["url"])
+        return None
+
+    @staticmethod
+    def _is_match(entry: dict, resource_type: str) -> bool:
+        """Check whether a Bundle entry is a search match (not an include)."""
+        mode = entry.get("search", {}).get("mode")
+        if mode:
+            return mode == "match"
+        return entry.get("resource", {}).get("resourceType") == resource_type
@@ -1,9 +1,12 @@
 """FHIR-based data source implementations."""
 
+import base64
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, date
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from ..config import Config
 from ..models import (
@@ -11,6 +14,7 @@ from ..models import (
     VentilationEpisode, DailyVentParameters,
 )
 from .base import BaseNoteSource, BaseDeviceSource, BaseCultureSource, BaseVentilatorSource
+from .fhir_search import FHIRSearch
 
 logger = logging.getLogger(__name__)
 
@@ -18,9 +22,22 @@ logger = logging.getLogger(__name__)
 class FHIRNoteSource(BaseNoteSource):
     """FHIR DocumentReference-based note retrieval."""
 
-    def __init__(self, base_url: str | None = None):
+    def __init__(
+        self,
+        base_url: str | None = None,
+        page_size: int | None = None,
+        max_workers: int | None = None,
+        fetch_workers: int | None = None,
+    ):
         self.base_url = base_url or Config.get_fhir_base_url()
+        self.fetch_workers = max(1, fetch_workers or Config.FHIR_NOTE_FETCH_WORKERS)
         self.session = requests.Session()
+        # Size the connection pool so parallel attachment downloads reuse
+        # connections instead of opening (and discarding) extra ones
+        adapter = HTTPAdapter(pool_maxsize=max(self.fetch_workers, 10))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.search = FHIRSearch(self.session, self.base_url, page_size, max_workers)
 
     def get_notes_for_patient(
         self,
@@ -50,24 +67,63 @@ class FHIRNoteSource(BaseNoteSource):
                 params["type"] = ",".join(type_codes)
 
         try:
-            response = self.session.get(
-                f"{self.base_url}/DocumentReference",
-                params=params,
-            )
-            response.raise_for_status()
-            bundle = response.json()
-
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
-                note = self._parse_document_reference(resource)
-                if note:
-                    notes.append(note)
-
+            resources = list(self.search.iter_resources(
+                "DocumentReference",
+                params,
+                limit=Config.MAX_NOTES_PER_PATIENT,
+            ))
         except requests.RequestException as e:
             logger.error(f"FHIR request failed: {e}")
+            return notes
+
+        contents = self._fetch_contents(resources)
+        for resource, content in zip(resources, contents):
+            note = self._parse_document_reference(resource, content)
+            if note:
+                notes.append(note)
 
         return notes
 
+    def has_notes_since(
+        self,
+        patient_id: str,
+        since: datetime,
+        start_date: datetime,
+        end_date: datetime,
+        note_types: list[str] | None = None,
+    ) -> bool:
+        """Check for DocumentReferences in the date range updated after `since`.
+
+        Asks for a single ID-only match on _lastUpdated, which catches both
+        new notes and edits to existing ones without downloading content.
+        A failed request returns True so the caller falls back to a full fetch.
+        """
+        params = {
+            "patient": patient_id,
+            "date": [
+                f"ge{start_date.strftime('%Y-%m-%d')}",
+                f"le{end_date.strftime('%Y-%m-%d')}",
+            ],
+            "status": "current",
+            # Naive datetimes are local time; a FHIR instant needs an offset
+            "_lastUpdated": f"gt{since.astimezone().isoformat(timespec='seconds')}",
+            "_elements": "id",
+            "_count": 1,
+        }
+        if note_types:
+            type_codes = self._map_note_types_to_codes(note_types)
+            if type_codes:
+                params["type"] = ",".join(type_codes)
+
+        try:
+            # One page only: following next links would defeat the probe
+            response = self.session.get(f"{self.base_url}/DocumentReference", params=params, timeout=30)
+            response.raise_for_status()
+            return bool(response.json().get("entry"))
+        except requests.RequestException as e:
+            logger.warning(f"FHIR note probe failed, fetching notes: {e}")
+            return True
+
     def get_note_by_id(self, note_id: str) -> ClinicalNote | None:
         """Retrieve a specific DocumentReference by ID."""
         try:
@@ -79,8 +135,76 @@ class FHIRNoteSource(BaseNoteSource):
             logger.error(f"Failed to fetch note {note_id}: {e}")
             return None
 
-    def _parse_document_reference(self, resource: dict) -> ClinicalNote | None:
-        """Parse FHIR DocumentReference to ClinicalNote."""
+    def _fetch_contents(self, resources: list[dict]) -> list[str]:
+        """Resolve note text for a batch of DocumentReferences.
+
+        Attachment URLs are downloaded on a thread pool sharing this source's
+        session; inline base64 attachments are decoded while those downloads
+        are in flight.
+
+        Returns:
+            Note text per resource, in the same order ("" if none).
+        """
+        attachments = [self._select_attachment(resource) for resource in resources]
+        contents = [""] * len(resources)
+
+        url_indexes = [
+            i for i, attachment in enumerate(attachments)
+            if attachment and not attachment.get("data")
+        ]
+        workers = min(self.fetch_workers, len(url_indexes))
+
+        if workers <= 1:
+            for i, attachment in enumerate(attachments):
+                if attachment:
+                    contents[i] = self._attachment_content(attachment)
+            return contents
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                i: executor.submit(self._fetch_binary_content, attachments[i]["url"])
+                for i in url_indexes
+            }
+            for i, attachment in enumerate(attachments):
+                if attachment and i not in futures:
+                    contents[i] = self._attachment_content(attachment)
+            for i, future in futures.items():
+                contents[i] = future.result()
+
+        return contents
+
+    @staticmethod
+    def _select_attachment(resource: dict) -> dict | None:
+        """Get the attachment holding the note text (the last with data or a URL)."""
+        selected = None
+        for content_item in resource.get("content", []):
+            attachment = content_item.get("attachment", {})
+            if attachment.get("data") or attachment.get("url"):
+                selected = attachment
+        return selected
+
+    def _attachment_content(self, attachment: dict) -> str:
+        """Get text from an attachment, decoding inline data or fetching its URL."""
+        if attachment.get("data"):
+            try:
+                return base64.b64decode(attachment["data"]).decode("utf-8")
+            except (ValueError, UnicodeDecodeError) as e:
+                logger.error(f"Failed to decode attachment data: {e}")
+                return ""
+        return self._fetch_binary_content(attachment["url"])
+
+    def _parse_document_reference(
+        self,
+        resource: dict,
+        content: str | None = None,
+    ) -> ClinicalNote | None:
+        """Parse FHIR DocumentReference to ClinicalNote.
+
+        Args:
+            resource: DocumentReference resource.
+            content: Note text already resolved by _fetch_contents. If None,
+                the attachment is decoded or fetched here.
+        """
         try:
             note_id = resource.get("id")
             patient_ref = resource.get("subject", {}).get("reference", "")
@@ -105,16 +229,9 @@ class FHIRNoteSource(BaseNoteSource):
             note_date = datetime.fromisoformat(date_str.replace("Z", "+00:00")) if date_str else datetime.now()
 
             # Get content - may be inline or a URL
-            content = ""
-            for content_item in resource.get("content", []):
-                attachment = content_item.get("attachment", {})
-                if attachment.get("data"):
-                    # Base64 encoded content
-                    import base64
-                    content = base64.b64decode(attachment["data"]).decode("utf-8")
-                elif attachment.get("url"):
-                    # Fetch from URL
-                    content = self._fetch_binary_content(attachment["url"])
+            if content is None:
+                attachment = self._select_attachment(resource)
+                content = self._attachment_content(attachment) if attachment else ""
 
             if not content:
                 return None
@@ -189,9 +306,15 @@ class FHIRDeviceSource(BaseDeviceSource):
         "706687001",  # Non-tunneled central venous catheter
     }
 
-    def __init__(self, base_url: str | None = None):
+    def __init__(
+        self,
+        base_url: str | None = None,
+        page_size: int | None = None,
+        max_workers: int | None = None,
+    ):
         self.base_url = base_url or Config.get_fhir_base_url()
         self.session = requests.Session()
+        self.search = FHIRSearch(self.session, self.base_url, page_size, max_workers)
 
     def get_central_lines(
         self,
@@ -208,16 +331,7 @@ class FHIRDeviceSource(BaseDeviceSource):
         }
 
         try:
-            response = self.session.get(
-                f"{self.base_url}/DeviceUseStatement",
-                params=params,
-                timeout=10,
-            )
-            response.raise_for_status()
-            bundle = response.json()
-
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
+            for resource in self.search.iter_resources("DeviceUseStatement", params, timeout=10):
                 # Skip entered-in-error status
                 if resource.get("status") == "entered-in-error":
                     continue
@@ -248,15 +362,7 @@ class FHIRDeviceSource(BaseDeviceSource):
         }
 
         try:
-            response = self.session.get(
-                f"{self.base_url}/DeviceUseStatement",
-                params=params,
-            )
-            response.raise_for_status()
-            bundle = response.json()
-
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
+            for resource in self.search.iter_resources("DeviceUseStatement", params):
                 device = self._parse_device_use_statement(resource)
                 if device:
                     if device_types is None or device.device_type in device_types:
@@ -412,9 +518,15 @@ class FHIRCultureSource(BaseCultureSource):
         "29574-4": "stool",     # Stool culture
     }
 
-    def __init__(self, base_url: str | None = None):
+    def __init__(
+        self,
+        base_url: str | None = None,
+        page_size: int | None = None,
+        max_workers: int | None = None,
+    ):
         self.base_url = base_url or Config.get_fhir_base_url()
         self.session = requests.Session()
+        self.search = FHIRSearch(self.session, self.base_url, page_size, max_workers)
 
     def get_positive_blood_cultures(
         self,
@@ -433,46 +545,22 @@ class FHIRCultureSource(BaseCultureSource):
                 f"le{end_date.strftime('%Y-%m-%d')}",
             ],
             "_include": "DiagnosticReport:subject",
-            "_count": "100",
         }
 
-        try:
-            response = self.session.get(
-                f"{self.base_url}/DiagnosticReport",
-                params=params,
-                timeout=30,
-            )
-            response.raise_for_status()
-            bundle = response.json()
+        def parse_positive(resource: dict) -> CultureResult | None:
+            culture = self._parse_diagnostic_report(resource)
+            return culture if culture and culture.is_positive else None
 
-            # Build patient lookup from included resources
-            patients = {}
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
-                if resource.get("resourceType") == "Patient":
-                    patient = self._parse_patient(resource)
-                    if patient:
-                        patients[patient.fhir_id] = patient
+        try:
+            # Patients come from _include (on any page) or are fetched if missing
+            for culture, patient_resource in self.search.iter_with_patients(
+                "DiagnosticReport", params, parse=parse_positive
+            ):
+                patient = self._parse_patient(patient_resource) if patient_resource else None
+                if patient:
+                    results.append((patient, culture))
 
-            # Parse DiagnosticReports and filter for positive results
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
-                if resource.get("resourceType") == "DiagnosticReport":
-                    culture = self._parse_diagnostic_report(resource)
-                    if culture and culture.is_positive:
-                        patient_ref = resource.get("subject", {}).get("reference", "")
-                        patient_id = patient_ref.split("/")[-1]
-                        patient = patients.get(patient_id)
-
-                        if patient:
-                            results.append((patient, culture))
-                        else:
-                            # Fetch patient if not included
-                            patient = self._fetch_patient(patient_id)
-                            if patient:
-                                results.append((patient, culture))
-
-            logger.info(f"Found {len(results)} positive blood cultures from {len(bundle.get('entry', []))} total reports")
+            logger.info(f"Found {len(results)} positive blood cultures")
 
         except requests.RequestException as e:
             logger.error(f"FHIR culture query failed: {e}")
@@ -501,19 +589,10 @@ class FHIRCultureSource(BaseCultureSource):
         }
 
         try:
-            response = self.session.get(
-                f"{self.base_url}/DiagnosticReport",
-                params=params,
-            )
-            response.raise_for_status()
-            bundle = response.json()
-
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
-                if resource.get("resourceType") == "DiagnosticReport":
-                    culture = self._parse_diagnostic_report(resource)
-                    if culture:
-                        results.append(culture)
+            for resource in self.search.iter_resources("DiagnosticReport", params):
+                culture = self._parse_diagnostic_report(resource)
+                if culture:
+                    results.append(culture)
 
         except requests.RequestException as e:
             logger.error(f"FHIR culture query failed: {e}")
@@ -627,16 +706,6 @@ class FHIRCultureSource(BaseCultureSource):
             logger.error(f"Failed to parse Patient: {e}")
             return None
 
-    def _fetch_patient(self, patient_id: str) -> Patient | None:
-        """Fetch a patient by ID."""
-        try:
-            response = self.session.get(f"{self.base_url}/Patient/{patient_id}")
-            response.raise_for_status()
-            return self._parse_patient(response.json())
-        except requests.RequestException as e:
-            logger.error(f"Failed to fetch patient {patient_id}: {e}")
-            return None
-
     def get_other_cultures_for_patient(
         self,
         patient_id: str,
@@ -657,24 +726,13 @@ class FHIRCultureSource(BaseCultureSource):
                 f"ge{start_date.strftime('%Y-%m-%d')}",
                 f"le{end_date.strftime('%Y-%m-%d')}",
             ],
-            "_count": "50",
         }
 
         try:
-            response = self.session.get(
-                f"{self.base_url}/DiagnosticReport",
-                params=params,
-                timeout=30,
-            )
-            response.raise_for_status()
-            bundle = response.json()
-
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
-                if resource.get("resourceType") == "DiagnosticReport":
-                    culture = self._parse_other_culture(resource)
-                    if culture and culture.is_positive:
-                        results.append(culture)
+            for resource in self.search.iter_resources("DiagnosticReport", params):
+                culture = self._parse_other_culture(resource)
+                if culture and culture.is_positive:
+                    results.append(culture)
 
         except requests.RequestException as e:
             logger.error(f"FHIR other culture query failed: {e}")
@@ -818,9 +876,15 @@ class FHIRVentilatorSource(BaseVentilatorSource):
         "20077-4",    # Positive end expiratory pressure setting Ventilator
     ]
 
-    def __init__(self, base_url: str | None = None):
+    def __init__(
+        self,
+        base_url: str | None = None,
+        page_size: int | None = None,
+        max_workers: int | None = None,
+    ):
         self.base_url = base_url or Config.get_fhir_base_url()
         self.session = requests.Session()
+        self.search = FHIRSearch(self.session, self.base_url, page_size, max_workers)
 
     def get_ventilated_patients(
         self,
@@ -843,44 +907,24 @@ class FHIRVentilatorSource(BaseVentilatorSource):
                 f"le{end_date.strftime('%Y-%m-%d')}",
             ],
             "_include": "Procedure:subject",
-            "_count": "100",
         }
 
         try:
-            response = self.session.get(
-                f"{self.base_url}/Procedure",
-                params=params,
-                timeout=30,
-            )
-            response.raise_for_status()
-            bundle = response.json()
-
-            # Build patient lookup from included resources
+            # Group ventilation episodes by patient; patients come from
+            # _include (on any page) or are fetched if missing
             patients = {}
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
-                if resource.get("resourceType") == "Patient":
-                    patient = self._parse_patient(resource)
-                    if patient:
-                        patients[patient.fhir_id] = patient
-
-            # Parse Procedure resources to find ventilation episodes
             episodes_by_patient = {}
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
-                if resource.get("resourceType") == "Procedure":
-                    episode = self._parse_ventilation_procedure(resource)
-                    if episode:
-                        patient_id = episode.patient_id
-                        if patient_id not in episodes_by_patient:
-                            episodes_by_patient[patient_id] = []
-                        episodes_by_patient[patient_id].append(episode)
+            for episode, patient_resource in self.search.iter_with_patients(
+                "Procedure", params, parse=self._parse_ventilation_procedure
+            ):
+                patient_id = episode.patient_id
+                if patient_id not in patients and patient_resource:
+                    patients[patient_id] = self._parse_patient(patient_resource)
+                episodes_by_patient.setdefault(patient_id, []).append(episode)
 
             # Filter to episodes with minimum vent days and build results
             for patient_id, episodes in episodes_by_patient.items():
                 patient = patients.get(patient_id)
-                if not patient:
-                    patient = self._fetch_patient(patient_id)
 
                 if patient:
                     for episode in episodes:
@@ -975,20 +1019,10 @@ class FHIRVentilatorSource(BaseVentilatorSource):
         }
 
         try:
-            response = self.session.get(
-                f"{self.base_url}/Procedure",
-                params=params,
-                timeout=30,
-            )
-            response.raise_for_status()
-            bundle = response.json()
-
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
-                if resource.get("resourceType") == "Procedure":
-                    episode = self._parse_ventilation_procedure(resource)
-                    if episode:
-                        results.append(episode)
+            for resource in self.search.iter_resources("Procedure", params):
+                episode = self._parse_ventilation_procedure(resource)
+                if episode:
+                    results.append(episode)
 
         except requests.RequestException as e:
             logger.error(f"FHIR ventilation episodes query failed: {e}")
@@ -1080,19 +1114,7 @@ class FHIRVentilatorSource(BaseVentilatorSource):
         }
 
         try:
-            response = self.session.get(
-                f"{self.base_url}/Observation",
-                params=params,
-                timeout=30,
-            )
-            response.raise_for_status()
-            bundle = response.json()
-
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
-                if resource.get("resourceType") != "Observation":
-                    continue
-
+            for resource in self.search.iter_resources("Observation", params):
                 # Get date
                 effective = resource.get("effectiveDateTime")
                 if not effective:
@@ -1176,19 +1198,6 @@ class FHIRVentilatorSource(BaseVentilatorSource):
             logger.error(f"Failed to parse Patient: {e}")
             return None
 
-    def _fetch_patient(self, patient_id: str) -> Patient | None:
-        """Fetch a patient by ID."""
-        try:
-            response = self.session.get(
-                f"{self.base_url}/Patient/{patient_id}",
-                timeout=10,
-            )
-            response.raise_for_status()
-            return self._parse_patient(response.json())
-        except requests.RequestException as e:
-            logger.error(f"Failed to fetch patient {patient_id}: {e}")
-            return None
-
 
 # ============================================================
 # CAUTI-specific FHIR Data Sources
@@ -1239,17 +1248,7 @@ class FHIRUrinaryCatheterSource(FHIRDeviceSource):
         }
 
         try:
-            response = self.session.get(
-                f"{self.base_url}/DeviceUseStatement",
-                params=params,
-                timeout=10,
-            )
-            response.raise_for_status()
-            bundle = response.json()
-
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
-
+            for resource in self.search.iter_resources("DeviceUseStatement", params, timeout=10):
                 # Skip entered-in-error status
                 if resource.get("status") == "entered-in-error":
                     continue
@@ -1289,17 +1288,7 @@ class FHIRUrinaryCatheterSource(FHIRDeviceSource):
         }
 
         try:
-            response = self.session.get(
-                f"{self.base_url}/DeviceUseStatement",
-                params=params,
-                timeout=10,
-            )
-            response.raise_for_status()
-            bundle = response.json()
-
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
-
+            for resource in self.search.iter_resources("DeviceUseStatement", params, timeout=10):
                 if resource.get("status") == "entered-in-error":
                     continue
 
@@ -1466,50 +1455,30 @@ class FHIRUrineCultureSource(FHIRCultureSource):
                 f"le{end_date.strftime('%Y-%m-%d')}",
             ],
             "_include": "DiagnosticReport:subject",
-            "_count": "100",
         }
 
-        try:
-            response = self.session.get(
-                f"{self.base_url}/DiagnosticReport",
-                params=params,
-                timeout=30,
-            )
-            response.raise_for_status()
-            bundle = response.json()
+        def parse_qualifying(resource: dict) -> CultureResult | None:
+            culture = self._parse_urine_culture(resource)
+            if not culture or not culture.is_positive:
+                return None
 
-            # Build patient lookup from included resources
-            patients = {}
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
-                if resource.get("resourceType") == "Patient":
-                    patient = self._parse_patient(resource)
-                    if patient:
-                        patients[patient.fhir_id] = patient
+            # Check CFU threshold if available
+            cfu_ml = self._extract_cfu_ml(resource)
+            if cfu_ml is not None and cfu_ml < min_cfu_ml:
+                return None
 
-            # Parse urine culture DiagnosticReports
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
-                if resource.get("resourceType") == "DiagnosticReport":
-                    culture = self._parse_urine_culture(resource)
-
-                    if culture and culture.is_positive:
-                        # Check CFU threshold if available
-                        cfu_ml = self._extract_cfu_ml(resource)
-                        if cfu_ml is None or cfu_ml >= min_cfu_ml:
-                            patient_ref = resource.get("subject", {}).get("reference", "")
-                            patient_id = patient_ref.split("/")[-1]
-                            patient = patients.get(patient_id)
-
-                            if patient:
-                                # Store CFU in culture result for later use
-                                culture._cfu_ml = cfu_ml
-                                results.append((patient, culture))
-                            else:
-                                patient = self._fetch_patient(patient_id)
-                                if patient:
-                                    culture._cfu_ml = cfu_ml
-                                    results.append((patient, culture))
+            # Store CFU in culture result for later use
+            culture._cfu_ml = cfu_ml
+            return culture
+
+        try:
+            # Patients come from _include (on any page) or are fetched if missing
+            for culture, patient_resource in self.search.iter_with_patients(
+                "DiagnosticReport", params, parse=parse_qualifying
+            ):
+                patient = self._parse_patient(patient_resource) if patient_resource else None
+                if patient:
+                    results.append((patient, culture))
 
             logger.info(f"Found {len(results)} positive urine cultures meeting CAUTI criteria")
 
@@ -1537,21 +1506,11 @@ class FHIRUrineCultureSource(FHIRCultureSource):
         }
 
         try:
-            response = self.session.get(
-                f"{self.base_url}/DiagnosticReport",
-                params=params,
-                timeout=30,
-            )
-            response.raise_for_status()
-            bundle = response.json()
-
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
-                if resource.get("resourceType") == "DiagnosticReport":
-                    culture = self._parse_urine_culture(resource)
-                    if culture:
-                        culture._cfu_ml = self._extract_cfu_ml(resource)
-                        results.append(culture)
+            for resource in self.search.iter_resources("DiagnosticReport", params):
+                culture = self._parse_urine_culture(resource)
+                if culture:
+                    culture._cfu_ml = self._extract_cfu_ml(resource)
+                    results.append(culture)
 
         except requests.RequestException as e:
             logger.error(f"FHIR urine culture patient query failed: {e}")
@@ -1724,10 +1683,15 @@ class FHIRCDITestSource:
         "31369-5": "antigen",      # C. difficile Ag
     }
 
-    def __init__(self, base_url: str | None = None):
-        from ..config import Config
+    def __init__(
+        self,
+        base_url: str | None = None,
+        page_size: int | None = None,
+        max_workers: int | None = None,
+    ):
         self.base_url = base_url or Config.get_fhir_base_url()
         self.session = requests.Session()
+        self.search = FHIRSearch(self.session, self.base_url, page_size, max_workers)
 
     def get_positive_cdi_tests(
         self,
@@ -1760,44 +1724,20 @@ class FHIRCDITestSource:
                 f"le{end_date.strftime('%Y-%m-%d')}",
             ],
             "_include": "Observation:subject",
-            "_count": "100",
         }
 
-        try:
-            response = self.session.get(
-                f"{self.base_url}/Observation",
-                params=params,
-                timeout=30,
-            )
-            response.raise_for_status()
-            bundle = response.json()
-
-            # Build patient lookup from included resources
-            patients = {}
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
-                if resource.get("resourceType") == "Patient":
-                    patient = self._parse_patient(resource)
-                    if patient:
-                        patients[patient.fhir_id] = patient
+        def parse_positive(resource: dict) -> CDITestResult | None:
+            cdi_test = self._parse_cdi_observation(resource)
+            return cdi_test if cdi_test and cdi_test.result == "positive" else None
 
-            # Parse Observation resources for positive CDI tests
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
-                if resource.get("resourceType") == "Observation":
-                    cdi_test = self._parse_cdi_observation(resource)
-
-                    if cdi_test and cdi_test.result == "positive":
-                        patient_ref = resource.get("subject", {}).get("reference", "")
-                        patient_id = patient_ref.split("/")[-1]
-                        patient = patients.get(patient_id)
-
-                        if patient:
-                            results.append((patient, cdi_test))
-                        else:
-                            patient = self._fetch_patient(patient_id)
-                            if patient:
-                                results.append((patient, cdi_test))
+        try:
+            # Patients come from _include (on any page) or are fetched if missing
+            for cdi_test, patient_resource in self.search.iter_with_patients(
+                "Observation", params, parse=parse_positive
+            ):
+                patient = self._parse_patient(patient_resource) if patient_resource else None
+                if patient:
+                    results.append((patient, cdi_test))
 
             logger.info(f"Found {len(results)} positive CDI tests from FHIR")
 
@@ -1846,20 +1786,10 @@ class FHIRCDITestSource:
         }
 
         try:
-            response = self.session.get(
-                f"{self.base_url}/Observation",
-                params=params,
-                timeout=30,
-            )
-            response.raise_for_status()
-            bundle = response.json()
-
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
-                if resource.get("resourceType") == "Observation":
-                    cdi_test = self._parse_cdi_observation(resource)
-                    if cdi_test and cdi_test.result == "positive":
-                        results.append(cdi_test)
+            for resource in self.search.iter_resources("Observation", params):
+                cdi_test = self._parse_cdi_observation(resource)
+                if cdi_test and cdi_test.result == "positive":
+                    results.append(cdi_test)
 
         except requests.RequestException as e:
             logger.error(f"FHIR CDI history query failed: {e}")
@@ -2224,19 +2154,6 @@ class FHIRCDITestSource:
             logger.error(f"Failed to parse Patient: {e}")
             return None
 
-    def _fetch_patient(self, patient_id: str) -> "Patient | None":
-        """Fetch a patient by ID."""
-        try:
-            response = self.session.get(
-                f"{self.base_url}/Patient/{patient_id}",
-                timeout=10,
-            )
-            response.raise_for_status()
-            return self._parse_patient(response.json())
-        except requests.RequestException as e:
-            logger.error(f"Failed to fetch patient {patient_id}: {e}")
-            return None
-
     def get_stool_frequency(
         self,
         patient_id: str,
@@ -2280,19 +2197,7 @@ class FHIRCDITestSource:
                 ("_sort", "-date"),
             ]
 
-            response = self.session.get(
-                f"{self.base_url}/Observation",
-                params=params,
-                timeout=10,
-            )
-            response.raise_for_status()
-            bundle = response.json()
-
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
-                if resource.get("resourceType") != "Observation":
-                    continue
-
+            for resource in self.search.iter_resources("Observation", params, timeout=10):
                 observation = self._parse_stool_observation(resource)
                 if observation:
                     results.append(observation)
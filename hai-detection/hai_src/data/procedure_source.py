@@ -327,16 +327,25 @@ class FHIRProcedureSource(BaseProcedureSource):
         "22630": "FUS",   # Posterior fusion
     }
 
-    def __init__(self, base_url: str | None = None):
+    def __init__(
+        self,
+        base_url: str | None = None,
+        page_size: int | None = None,
+        max_workers: int | None = None,
+    ):
         """Initialize with FHIR base URL.
 
         Args:
             base_url: FHIR server base URL. Uses config default if None.
+            page_size: FHIR search page size. Uses config default if None.
+            max_workers: FHIR search concurrency. Uses config default if None.
         """
         import requests
         from ..config import Config
+        from .fhir_search import FHIRSearch
         self.base_url = base_url or Config.FHIR_BASE_URL
         self.session = requests.Session()
+        self.search = FHIRSearch(self.session, self.base_url, page_size, max_workers)
 
     def get_nhsn_procedures(
         self,
@@ -351,7 +360,6 @@ class FHIRProcedureSource(BaseProcedureSource):
         import requests
 
         results = []
-        patients_cache: dict[str, Patient] = {}
 
         params = {
             "category": "387713003",  # SNOMED: Surgical procedure
@@ -360,42 +368,20 @@ class FHIRProcedureSource(BaseProcedureSource):
                 f"le{end_date.strftime('%Y-%m-%d')}",
             ],
             "_include": "Procedure:patient",
-            "_count": "100",
         }
 
+        def parse_nhsn(resource: dict) -> SurgicalProcedure | None:
+            procedure = self._parse_procedure(resource)
+            return procedure if procedure and procedure.nhsn_category else None
+
         try:
-            response = self.session.get(
-                f"{self.base_url}/Procedure",
-                params=params,
-            )
-            response.raise_for_status()
-            bundle = response.json()
-
-            # First pass: cache all patients from _include
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
-                if resource.get("resourceType") == "Patient":
-                    patient = self._parse_patient(resource)
-                    if patient:
-                        patients_cache[patient.fhir_id] = patient
-
-            # Second pass: parse procedures
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
-                if resource.get("resourceType") == "Procedure":
-                    procedure = self._parse_procedure(resource)
-                    if procedure and procedure.nhsn_category:
-                        # Get patient
-                        patient_ref = resource.get("subject", {}).get("reference", "")
-                        patient_id = patient_ref.split("/")[-1]
-
-                        patient = patients_cache.get(patient_id)
-                        if not patient:
-                            # Fetch patient if not in bundle
-                            patient = self._fetch_patient(patient_id)
-
-                        if patient:
-                            results.append((patient, procedure))
+            # Patients come from _include (on any page) or are fetched if missing
+            for procedure, patient_resource in self.search.iter_with_patients(
+                "Procedure", params, parse=parse_nhsn
+            ):
+                patient = self._parse_patient(patient_resource) if patient_resource else None
+                if patient:
+                    results.append((patient, procedure))
 
             logger.debug(f"FHIRProcedureSource: Found {len(results)} NHSN procedures")
 
@@ -423,19 +409,10 @@ class FHIRProcedureSource(BaseProcedureSource):
         }
 
         try:
-            response = self.session.get(
-                f"{self.base_url}/Procedure",
-                params=params,
-            )
-            response.raise_for_status()
-            bundle = response.json()
-
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
-                if resource.get("resourceType") == "Procedure":
-                    procedure = self._parse_procedure(resource)
-                    if procedure:
-                        results.append(procedure)
+            for resource in self.search.iter_resources("Procedure", params):
+                procedure = self._parse_procedure(resource)
+                if procedure:
+                    results.append(procedure)
 
         except requests.RequestException as e:
             logger.error(f"FHIR procedure query failed: {e}")
@@ -571,18 +548,6 @@ class FHIRProcedureSource(BaseProcedureSource):
             logger.error(f"Failed to parse Patient: {e}")
             return None
 
-    def _fetch_patient(self, patient_id: str) -> Patient | None:
-        """Fetch patient by ID."""
-        import requests
-
-        try:
-            response = self.session.get(f"{self.base_url}/Patient/{patient_id}")
-            response.raise_for_status()
-            return self._parse_patient(response.json())
-        except requests.RequestException as e:
-            logger.error(f"Failed to fetch patient {patient_id}: {e}")
-            return None
-
 
 class ClarityProcedureSource(BaseProcedureSource):
     """Clarity-based procedure source.
@@ -7,6 +7,9 @@ from datetime import datetime, date, timedelta
 from pathlib import Path
 from typing import Any
 
+from . import config  # noqa: F401  (puts the repo root on sys.path for common/)
+from common.sqlite_pool import PooledConnection, get_connection
+
 from .models import (
     HAICandidate,
     HAIType,
@@ -21,6 +24,7 @@ from .models import (
     DeviceInfo,
     SupportingEvidence,
     LLMAuditEntry,
+    NoteWatermark,
     SSICandidate,
     SurgicalProcedure,
     VAECandidate,
@@ -29,6 +33,16 @@ from .models import (
 
 logger = logging.getLogger(__name__)
 
+# Stay well under SQLite's bound-parameter limit in IN (...) queries
+_IN_QUERY_CHUNK = 500
+
+
+def _chunks(ids: list[str], size: int = _IN_QUERY_CHUNK):
+    """Split IDs into (chunk, "?,?,...") pairs for IN (...) queries."""
+    for i in range(0, len(ids), size):
+        chunk = ids[i:i + size]
+        yield chunk, ",".join("?" * len(chunk))
+
 
 def _log_hai_activity(
     activity_type: str,
@@ -85,11 +99,9 @@ class HAIDatabase:
         with self._get_connection() as conn:
             conn.executescript(schema)
 
-    def _get_connection(self) -> sqlite3.Connection:
-        """Get a database connection with row factory."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+    def _get_connection(self) -> PooledConnection:
+        """Get this thread's pooled database connection."""
+        return get_connection(self.db_path)
 
     # --- Candidate Operations ---
 
@@ -144,7 +156,7 @@ class HAIDatabase:
                 "SELECT * FROM hai_candidates WHERE id = ?", (candidate_id,)
             ).fetchone()
             if row:
-                return self._row_to_candidate(row)
+                return self._rows_to_candidates(conn, [row])[0]
             return None
 
     def get_candidates_by_status(
@@ -162,7 +174,7 @@ class HAIDatabase:
                     "SELECT * FROM hai_candidates WHERE status = ? ORDER BY created_at DESC",
                     (status.value,),
                 ).fetchall()
-            return [self._row_to_candidate(row) for row in rows]
+            return self._rows_to_candidates(conn, rows)
 
     def get_recent_candidates(
         self, limit: int = 100, hai_type: HAIType | None = None
@@ -179,7 +191,7 @@ class HAIDatabase:
                     "SELECT * FROM hai_candidates ORDER BY created_at DESC LIMIT ?",
                     (limit,),
                 ).fetchall()
-            return [self._row_to_candidate(row) for row in rows]
+            return self._rows_to_candidates(conn, rows)
 
     def get_active_candidates(
         self, limit: int = 100, hai_type: HAIType | None = None
@@ -201,7 +213,7 @@ class HAIDatabase:
                     f"SELECT * FROM hai_candidates WHERE status IN (?, ?, ?) ORDER BY created_at DESC LIMIT ?",
                     (*active_statuses, limit),
                 ).fetchall()
-            return [self._row_to_candidate(row) for row in rows]
+            return self._rows_to_candidates(conn, rows)
 
     def get_resolved_candidates(
         self, limit: int = 100, hai_type: HAIType | None = None
@@ -222,7 +234,7 @@ class HAIDatabase:
                     f"SELECT * FROM hai_candidates WHERE status IN (?, ?) ORDER BY created_at DESC LIMIT ?",
                     (*resolved_statuses, limit),
                 ).fetchall()
-            return [self._row_to_candidate(row) for row in rows]
+            return self._rows_to_candidates(conn, rows)
 
     def check_candidate_exists(self, hai_type: HAIType, culture_id: str) -> bool:
         """Check if a candidate already exists for this culture."""
@@ -238,14 +250,38 @@ class HAIDatabase:
     ) -> None:
         """Update candidate status."""
         with self._get_connection() as conn:
-            conn.execute(
-                "UPDATE hai_candidates SET status = ? WHERE id = ?",
-                (status.value, candidate_id),
-            )
+            self._update_candidate_status(conn, candidate_id, status)
             conn.commit()
 
+    def _update_candidate_status(
+        self, conn: sqlite3.Connection, candidate_id: str, status: CandidateStatus
+    ) -> None:
+        conn.execute(
+            "UPDATE hai_candidates SET status = ? WHERE id = ?",
+            (status.value, candidate_id),
+        )
+
     def _row_to_candidate(self, row: sqlite3.Row) -> HAICandidate:
-        """Convert database row to HAICandidate."""
+        """Convert database row to HAICandidate, including type-specific data."""
+        candidate = self._build_candidate(row)
+        with self._get_connection() as conn:
+            self._attach_detail_data(conn, [candidate])
+        return candidate
+
+    def _rows_to_candidates(
+        self, conn: sqlite3.Connection, rows: list[sqlite3.Row]
+    ) -> list[HAICandidate]:
+        """Convert database rows to HAICandidates, batch-loading type-specific data.
+
+        Uses one detail query per HAI type for the whole result set instead
+        of one per candidate.
+        """
+        candidates = [self._build_candidate(row) for row in rows]
+        self._attach_detail_data(conn, candidates)
+        return candidates
+
+    def _build_candidate(self, row: sqlite3.Row) -> HAICandidate:
+        """Convert database row to HAICandidate without type-specific data."""
         device_info = None
         if row["device_info"]:
             di = json.loads(row["device_info"])
@@ -289,26 +325,31 @@ class HAIDatabase:
             created_at=datetime.fromisoformat(row["created_at"]),
         )
         candidate.nhsn_reported = nhsn_reported
+        return candidate
 
-        # Load SSI-specific data if this is an SSI candidate
-        if candidate.hai_type == HAIType.SSI:
-            ssi_data = self._load_ssi_data(candidate.id)
-            if ssi_data:
-                candidate._ssi_data = ssi_data  # type: ignore
-
-        # Load VAE-specific data if this is a VAE candidate
-        if candidate.hai_type == HAIType.VAE:
-            vae_data = self._load_vae_data(candidate.id)
-            if vae_data:
-                candidate._vae_data = vae_data  # type: ignore
-
-        # Load CDI-specific data if this is a CDI candidate
-        if candidate.hai_type == HAIType.CDI:
-            cdi_data = self.get_cdi_data(candidate.id)
-            if cdi_data:
-                candidate._cdi_data = cdi_data  # type: ignore
+    def _attach_detail_data(
+        self, conn: sqlite3.Connection, candidates: list[HAICandidate]
+    ) -> None:
+        """Attach SSI, VAE and CDI detail data to candidates.
 
-        return candidate
+        Reads each detail table once for all candidates of that type.
+        """
+        ids_by_type: dict[HAIType, list[str]] = {}
+        for candidate in candidates:
+            ids_by_type.setdefault(candidate.hai_type, []).append(candidate.id)
+
+        loaders = {
+            HAIType.SSI: ("_ssi_data", self._load_ssi_data_batch),
+            HAIType.VAE: ("_vae_data", self._load_vae_data_batch),
+            HAIType.CDI: ("_cdi_data", self._load_cdi_data_batch),
+        }
+        for hai_type, (attr, load_batch) in loaders.items():
+            if hai_type not in ids_by_type:
+                continue
+            details = load_batch(conn, ids_by_type[hai_type])
+            for candidate in candidates:
+                if candidate.id in details:
+                    setattr(candidate, attr, details[candidate.id])
 
     # --- SSI Operations ---
 
@@ -391,51 +432,62 @@ class HAIDatabase:
             SSICandidate with procedure data, or None if not found
         """
         with self._get_connection() as conn:
-            # Get SSI details
-            detail_row = conn.execute(
-                """
+            return self._load_ssi_data_batch(conn, [candidate_id]).get(candidate_id)
+
+    def _load_ssi_data_batch(
+        self, conn: sqlite3.Connection, candidate_ids: list[str]
+    ) -> dict[str, SSICandidate]:
+        """Load SSI-specific data for several candidates, keyed by candidate ID."""
+        results: dict[str, SSICandidate] = {}
+        for chunk, placeholders in _chunks(candidate_ids):
+            rows = conn.execute(
+                f"""
                 SELECT d.*, p.*
                 FROM ssi_candidate_details d
                 JOIN ssi_procedures p ON d.procedure_id = p.id
-                WHERE d.candidate_id = ?
+                WHERE d.candidate_id IN ({placeholders})
+                ORDER BY d.rowid
                 """,
-                (candidate_id,),
-            ).fetchone()
-
-            if not detail_row:
-                return None
-
-            # Build SurgicalProcedure
-            procedure = SurgicalProcedure(
-                id=detail_row["procedure_id"],
-                patient_id=detail_row["patient_id"],
-                procedure_code=detail_row["procedure_code"],
-                procedure_name=detail_row["procedure_name"],
-                procedure_date=datetime.fromisoformat(detail_row["procedure_date"]),
-                nhsn_category=detail_row["nhsn_category"],
-                wound_class=detail_row["wound_class"],
-                duration_minutes=detail_row["duration_minutes"],
-                asa_score=detail_row["asa_score"],
-                primary_surgeon=detail_row["primary_surgeon"],
-                implant_used=bool(detail_row["implant_used"]) if detail_row["implant_used"] is not None else False,
-                implant_type=detail_row["implant_type"],
-                fhir_id=detail_row["fhir_id"],
-                encounter_id=detail_row["encounter_id"],
-                location_code=detail_row["location_code"],
-            )
+                chunk,
+            ).fetchall()
+            for row in rows:
+                if row["candidate_id"] not in results:
+                    results[row["candidate_id"]] = self._row_to_ssi_data(row)
+        return results
+
+    def _row_to_ssi_data(self, detail_row: sqlite3.Row) -> SSICandidate:
+        """Convert an SSI detail + procedure row to SSICandidate."""
+        # Build SurgicalProcedure
+        procedure = SurgicalProcedure(
+            id=detail_row["procedure_id"],
+            patient_id=detail_row["patient_id"],
+            procedure_code=detail_row["procedure_code"],
+            procedure_name=detail_row["procedure_name"],
+            procedure_date=datetime.fromisoformat(detail_row["procedure_date"]),
+            nhsn_category=detail_row["nhsn_category"],
+            wound_class=detail_row["wound_class"],
+            duration_minutes=detail_row["duration_minutes"],
+            asa_score=detail_row["asa_score"],
+            primary_surgeon=detail_row["primary_surgeon"],
+            implant_used=bool(detail_row["implant_used"]) if detail_row["implant_used"] is not None else False,
+            implant_type=detail_row["implant_type"],
+            fhir_id=detail_row["fhir_id"],
+            encounter_id=detail_row["encounter_id"],
+            location_code=detail_row["location_code"],
+        )
 
-            # Build SSICandidate
-            return SSICandidate(
-                candidate_id=candidate_id,
-                procedure=procedure,
-                days_post_op=detail_row["days_post_op"],
-                ssi_type=detail_row["ssi_type"],
-                infection_date=datetime.fromisoformat(detail_row["infection_date"]) if detail_row["infection_date"] else None,
-                wound_culture_organism=detail_row["wound_culture_organism"],
-                wound_culture_date=datetime.fromisoformat(detail_row["wound_culture_date"]) if detail_row["wound_culture_date"] else None,
-                readmission_for_ssi=bool(detail_row["readmission_for_ssi"]),
-                reoperation_for_ssi=bool(detail_row["reoperation_for_ssi"]),
-            )
+        # Build SSICandidate
+        return SSICandidate(
+            candidate_id=detail_row["candidate_id"],
+            procedure=procedure,
+            days_post_op=detail_row["days_post_op"],
+            ssi_type=detail_row["ssi_type"],
+            infection_date=datetime.fromisoformat(detail_row["infection_date"]) if detail_row["infection_date"] else None,
+            wound_culture_organism=detail_row["wound_culture_organism"],
+            wound_culture_date=datetime.fromisoformat(detail_row["wound_culture_date"]) if detail_row["wound_culture_date"] else None,
+            readmission_for_ssi=bool(detail_row["readmission_for_ssi"]),
+            reoperation_for_ssi=bool(detail_row["reoperation_for_ssi"]),
+        )
 
     # --- VAE Operations ---
 
@@ -528,68 +580,79 @@ class HAIDatabase:
             VAECandidate with episode data, or None if not found
         """
         with self._get_connection() as conn:
-            # Get VAE details with episode data
-            detail_row = conn.execute(
-                """
+            return self._load_vae_data_batch(conn, [candidate_id]).get(candidate_id)
+
+    def _load_vae_data_batch(
+        self, conn: sqlite3.Connection, candidate_ids: list[str]
+    ) -> dict[str, VAECandidate]:
+        """Load VAE-specific data for several candidates, keyed by candidate ID."""
+        results: dict[str, VAECandidate] = {}
+        for chunk, placeholders in _chunks(candidate_ids):
+            rows = conn.execute(
+                f"""
                 SELECT d.*, e.patient_id, e.patient_mrn, e.intubation_date, e.extubation_date,
                        e.encounter_id, e.location_code, e.fhir_device_id
                 FROM vae_candidate_details d
                 JOIN vae_ventilation_episodes e ON d.episode_id = e.id
-                WHERE d.candidate_id = ?
+                WHERE d.candidate_id IN ({placeholders})
+                ORDER BY d.rowid
                 """,
-                (candidate_id,),
-            ).fetchone()
-
-            if not detail_row:
-                return None
-
-            # Build VentilationEpisode
-            episode = VentilationEpisode(
-                id=detail_row["episode_id"],
-                patient_id=detail_row["patient_id"],
-                patient_mrn=detail_row["patient_mrn"],
-                intubation_date=datetime.fromisoformat(detail_row["intubation_date"]),
-                extubation_date=datetime.fromisoformat(detail_row["extubation_date"]) if detail_row["extubation_date"] else None,
-                encounter_id=detail_row["encounter_id"],
-                location_code=detail_row["location_code"],
-                fhir_device_id=detail_row["fhir_device_id"],
-            )
+                chunk,
+            ).fetchall()
+            for row in rows:
+                if row["candidate_id"] not in results:
+                    results[row["candidate_id"]] = self._row_to_vae_data(row)
+        return results
+
+    def _row_to_vae_data(self, detail_row: sqlite3.Row) -> VAECandidate:
+        """Convert a VAE detail + episode row to VAECandidate."""
+        # Build VentilationEpisode
+        episode = VentilationEpisode(
+            id=detail_row["episode_id"],
+            patient_id=detail_row["patient_id"],
+            patient_mrn=detail_row["patient_mrn"],
+            intubation_date=datetime.fromisoformat(detail_row["intubation_date"]),
+            extubation_date=datetime.fromisoformat(detail_row["extubation_date"]) if detail_row["extubation_date"] else None,
+            encounter_id=detail_row["encounter_id"],
+            location_code=detail_row["location_code"],
+            fhir_device_id=detail_row["fhir_device_id"],
+        )
 
-            # Parse qualifying antimicrobials JSON
-            qualifying_antimicrobials = []
-            if detail_row["qualifying_antimicrobials"]:
-                try:
-                    qualifying_antimicrobials = json.loads(detail_row["qualifying_antimicrobials"])
-                except json.JSONDecodeError:
-                    pass
-
-            # Build VAECandidate
-            return VAECandidate(
-                candidate_id=candidate_id,
-                episode=episode,
-                vac_onset_date=date.fromisoformat(detail_row["vac_onset_date"]),
-                ventilator_day_at_onset=detail_row["ventilator_day_at_onset"],
-                baseline_start_date=date.fromisoformat(detail_row["baseline_start_date"]) if detail_row["baseline_start_date"] else None,
-                baseline_end_date=date.fromisoformat(detail_row["baseline_end_date"]) if detail_row["baseline_end_date"] else None,
-                baseline_min_fio2=detail_row["baseline_min_fio2"],
-                baseline_min_peep=detail_row["baseline_min_peep"],
-                worsening_start_date=date.fromisoformat(detail_row["worsening_start_date"]) if detail_row["worsening_start_date"] else None,
-                fio2_increase=detail_row["fio2_increase"],
-                peep_increase=detail_row["peep_increase"],
-                met_fio2_criterion=bool(detail_row["met_fio2_criterion"]),
-                met_peep_criterion=bool(detail_row["met_peep_criterion"]),
-                vae_classification=detail_row["vae_classification"],
-                vae_tier=detail_row["vae_tier"],
-                temperature_criterion_met=bool(detail_row["temperature_criterion_met"]),
-                wbc_criterion_met=bool(detail_row["wbc_criterion_met"]),
-                antimicrobial_criterion_met=bool(detail_row["antimicrobial_criterion_met"]),
-                qualifying_antimicrobials=qualifying_antimicrobials,
-                purulent_secretions_met=bool(detail_row["purulent_secretions_met"]),
-                positive_culture_met=bool(detail_row["positive_culture_met"]),
-                quantitative_culture_met=bool(detail_row["quantitative_culture_met"]),
-                organism_identified=detail_row["organism_identified"],
-                specimen_type=detail_row["specimen_type"],
-            )
+        # Parse qualifying antimicrobials JSON
+        qualifying_antimicrobials = []
+        if detail_row["qualifying_antimicrobials"]:
+            try:
+                qualifying_antimicrobials = json.loads(detail_row["qualifying_antimicrobials"])
+            except json.JSONDecodeError:
+                pass
+
+        # Build VAECandidate
+        return VAECandidate(
+            candidate_id=detail_row["candidate_id"],
+            episode=episode,
+            vac_onset_date=date.fromisoformat(detail_row["vac_onset_date"]),
+            ventilator_day_at_onset=detail_row["ventilator_day_at_onset"],
+            baseline_start_date=date.fromisoformat(detail_row["baseline_start_date"]) if detail_row["baseline_start_date"] else None,
+            baseline_end_date=date.fromisoformat(detail_row["baseline_end_date"]) if detail_row["baseline_end_date"] else None,
+            baseline_min_fio2=detail_row["baseline_min_fio2"],
+            baseline_min_peep=detail_row["baseline_min_peep"],
+            worsening_start_date=date.fromisoformat(detail_row["worsening_start_date"]) if detail_row["worsening_start_date"] else None,
+            fio2_increase=detail_row["fio2_increase"],
+            peep_increase=detail_row["peep_increase"],
+            met_fio2_criterion=bool(detail_row["met_fio2_criterion"]),
+            met_peep_criterion=bool(detail_row["met_peep_criterion"]),
+            vae_classification=detail_row["vae_classification"],
+            vae_tier=detail_row["vae_tier"],
+            temperature_criterion_met=bool(detail_row["temperature_criterion_met"]),
+            wbc_criterion_met=bool(detail_row["wbc_criterion_met"]),
+            antimicrobial_criterion_met=bool(detail_row["antimicrobial_criterion_met"]),
+            qualifying_antimicrobials=qualifying_antimicrobials,
+            purulent_secretions_met=bool(detail_row["purulent_secretions_met"]),
+            positive_culture_met=bool(detail_row["positive_culture_met"]),
+            quantitative_culture_met=bool(detail_row["quantitative_culture_met"]),
+            organism_identified=detail_row["organism_identified"],
+            specimen_type=detail_row["specimen_type"],
+        )
 
     # --- CDI Data Operations ---
 
@@ -637,102 +700,143 @@ class HAIDatabase:
 
     def get_cdi_data(self, candidate_id: str) -> "CDICandidate | None":
         """Get CDI-specific data for a candidate."""
-        from .models import CDICandidate, CDITestResult, CDIEpisode
-
         with self._get_connection() as conn:
-            row = conn.execute(
-                """
-                SELECT * FROM cdi_candidate_details WHERE candidate_id = ?
+            return self._load_cdi_data_batch(conn, [candidate_id]).get(candidate_id)
+
+    def _load_cdi_data_batch(
+        self, conn: sqlite3.Connection, candidate_ids: list[str]
+    ) -> dict[str, "CDICandidate"]:
+        """Load CDI-specific data for several candidates, keyed by candidate ID."""
+        results: dict[str, "CDICandidate"] = {}
+        for chunk, placeholders in _chunks(candidate_ids):
+            rows = conn.execute(
+                f"""
+                SELECT d.*, c.culture_date AS candidate_culture_date
+                FROM cdi_candidate_details d
+                LEFT JOIN hai_candidates c ON c.id = d.candidate_id
+                WHERE d.candidate_id IN ({placeholders})
+                ORDER BY d.rowid
                 """,
-                (candidate_id,),
-            ).fetchone()
+                chunk,
+            ).fetchall()
+            for row in rows:
+                if row["candidate_id"] not in results:
+                    results[row["candidate_id"]] = self._row_to_cdi_data(row)
+        return results
 
-            if not row:
-                return None
+    def _row_to_cdi_data(self, row: sqlite3.Row) -> "CDICandidate":
+        """Convert a CDI detail row (with candidate culture date) to CDICandidate."""
+        from .models import CDICandidate, CDITestResult, CDIEpisode
 
-            # Get the main candidate for admission date
-            candidate_row = conn.execute(
-                "SELECT culture_date FROM hai_candidates WHERE id = ?",
-                (candidate_id,),
-            ).fetchone()
+        candidate_id = row["candidate_id"]
+        culture_date = row["candidate_culture_date"]
+
+        # Build CDITestResult
+        test_result = CDITestResult(
+            fhir_id=candidate_id,  # We don't store original fhir_id
+            patient_id="",
+            test_date=datetime.fromisoformat(row["test_date"]),
+            test_type=row["test_type"],
+            result="positive",
+            loinc_code=row["loinc_code"],
+        )
 
-            # Build CDITestResult
-            test_result = CDITestResult(
-                fhir_id=candidate_id,  # We don't store original fhir_id
+        # Build prior episodes if present
+        prior_episodes = []
+        if row["prior_episode_date"]:
+            prior_episodes.append(CDIEpisode(
+                id="prior",
                 patient_id="",
-                test_date=datetime.fromisoformat(row["test_date"]),
+                test_date=datetime.fromisoformat(row["prior_episode_date"]),
                 test_type=row["test_type"],
-                result="positive",
-                loinc_code=row["loinc_code"],
-            )
-
-            # Build prior episodes if present
-            prior_episodes = []
-            if row["prior_episode_date"]:
-                prior_episodes.append(CDIEpisode(
-                    id="prior",
-                    patient_id="",
-                    test_date=datetime.fromisoformat(row["prior_episode_date"]),
-                    test_type=row["test_type"],
-                    onset_type="unknown",
-                    is_recurrent=False,
-                ))
-
-            return CDICandidate(
-                candidate_id=candidate_id,
-                test_result=test_result,
-                admission_date=datetime.fromisoformat(candidate_row["culture_date"]) - timedelta(days=row["specimen_day"] - 1)
-                    if candidate_row and row["specimen_day"] else None,
-                specimen_day=row["specimen_day"],
-                onset_type=row["onset_type"],
-                prior_episodes=prior_episodes,
-                days_since_last_cdi=row["days_since_last_cdi"],
-                is_recurrent=bool(row["is_recurrent"]),
-                is_duplicate=False,
-                recent_discharge_date=datetime.fromisoformat(row["recent_discharge_date"]) if row["recent_discharge_date"] else None,
-                recent_discharge_facility=None,
-                classification=row["classification"],
-                diarrhea_documented=bool(row["diarrhea_documented"]),
-                treatment_initiated=bool(row["treatment_initiated"]),
-                treatment_type=row["treatment_type"],
-            )
+                onset_type="unknown",
+                is_recurrent=False,
+            ))
+
+        return CDICandidate(
+            candidate_id=candidate_id,
+            test_result=test_result,
+            admission_date=datetime.fromisoformat(culture_date) - timedelta(days=row["specimen_day"] - 1)
+                if culture_date and row["specimen_day"] else None,
+            specimen_day=row["specimen_day"],
+            onset_type=row["onset_type"],
+            prior_episodes=prior_episodes,
+            days_since_last_cdi=row["days_since_last_cdi"],
+            is_recurrent=bool(row["is_recurrent"]),
+            is_duplicate=False,
+            recent_discharge_date=datetime.fromisoformat(row["recent_discharge_date"]) if row["recent_discharge_date"] else None,
+            recent_discharge_facility=None,
+            classification=row["classification"],
+            diarrhea_documented=bool(row["diarrhea_documented"]),
+            treatment_initiated=bool(row["treatment_initiated"]),
+            treatment_type=row["treatment_type"],
+        )
 
     # --- Classification Operations ---
 
     def save_classification(self, classification: Classification) -> None:
         """Save an LLM classification."""
+        with self._get_connection() as conn:
+            self._insert_classification(conn, classification)
+            conn.commit()
+
+    def _insert_classification(self, conn: sqlite3.Connection, classification: Classification) -> None:
         row = classification.to_db_row()
+        conn.execute(
+            """
+            INSERT INTO hai_classifications (
+                id, candidate_id, decision, confidence, alternative_source,
+                is_mbi_lcbi, supporting_evidence, contradicting_evidence,
+                reasoning, model_used, prompt_version, tokens_used,
+                processing_time_ms, created_at,
+                extraction_data, rules_result, strictness_level
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                row["id"],
+                row["candidate_id"],
+                row["decision"],
+                row["confidence"],
+                row["alternative_source"],
+                row["is_mbi_lcbi"],
+                row["supporting_evidence"],
+                row["contradicting_evidence"],
+                row["reasoning"],
+                row["model_used"],
+                row["prompt_version"],
+                row["tokens_used"],
+                row["processing_time_ms"],
+                row["created_at"],
+                row.get("extraction_data"),
+                row.get("rules_result"),
+                row.get("strictness_level"),
+            ),
+        )
+
+    def save_classification_results(
+        self,
+        results: list[tuple[Classification, CandidateStatus, Review]],
+        watermarks: list[NoteWatermark] | None = None,
+    ) -> None:
+        """Save a batch of classifications in a single transaction.
+
+        Each entry is written the same way as save_classification(),
+        update_candidate_status(), save_review_object() and
+        supersede_old_reviews(), but the whole batch is committed at once
+        (or not at all).
+
+        Args:
+            results: (classification, new candidate status, review entry) tuples.
+            watermarks: Note watermarks for the classified candidates.
+        """
         with self._get_connection() as conn:
-            conn.execute(
-                """
-                INSERT INTO hai_classifications (
-                    id, candidate_id, decision, confidence, alternative_source,
-                    is_mbi_lcbi, supporting_evidence, contradicting_evidence,
-                    reasoning, model_used, prompt_version, tokens_used,
-                    processing_time_ms, created_at,
-                    extraction_data, rules_result, strictness_level
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    row["id"],
-                    row["candidate_id"],
-                    row["decision"],
-                    row["confidence"],
-                    row["alternative_source"],
-                    row["is_mbi_lcbi"],
-                    row["supporting_evidence"],
-                    row["contradicting_evidence"],
-                    row["reasoning"],
-                    row["model_used"],
-                    row["prompt_version"],
-                    row["tokens_used"],
-                    row["processing_time_ms"],
-                    row["created_at"],
-                    row.get("extraction_data"),
-                    row.get("rules_result"),
-                    row.get("strictness_level"),
-                ),
-            )
+            for classification, status, review in results:
+                self._insert_classification(conn, classification)
+                self._update_candidate_status(conn, classification.candidate_id, status)
+                self._insert_review(conn, review)
+                self._supersede_old_reviews(conn, review.candidate_id, review.id)
+            for watermark in watermarks or []:
+                self._upsert_note_watermark(conn, watermark)
             conn.commit()
 
     def get_classification(self, classification_id: str) -> Classification | None:
@@ -924,35 +1028,38 @@ class HAIDatabase:
 
     def save_review_object(self, review: Review) -> None:
         """Save a Review object to the database."""
-        row = review.to_db_row()
         with self._get_connection() as conn:
-            conn.execute(
-                """
-                INSERT INTO hai_reviews (
-                    id, candidate_id, classification_id, queue_type, reviewed,
-                    reviewer, reviewer_decision, reviewer_notes,
-                    llm_decision, is_override, override_reason,
-                    created_at, reviewed_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    row["id"],
-                    row["candidate_id"],
-                    row["classification_id"],
-                    row["queue_type"],
-                    row["reviewed"],
-                    row["reviewer"],
-                    row["reviewer_decision"],
-                    row["reviewer_notes"],
-                    row["llm_decision"],
-                    row["is_override"],
-                    row["override_reason"],
-                    row["created_at"],
-                    row["reviewed_at"],
-                ),
-            )
+            self._insert_review(conn, review)
             conn.commit()
 
+    def _insert_review(self, conn: sqlite3.Connection, review: Review) -> None:
+        row = review.to_db_row()
+        conn.execute(
+            """
+            INSERT INTO hai_reviews (
+                id, candidate_id, classification_id, queue_type, reviewed,
+                reviewer, reviewer_decision, reviewer_notes,
+                llm_decision, is_override, override_reason,
+                created_at, reviewed_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                row["id"],
+                row["candidate_id"],
+                row["classification_id"],
+                row["queue_type"],
+                row["reviewed"],
+                row["reviewer"],
+                row["reviewer_decision"],
+                row["reviewer_notes"],
+                row["llm_decision"],
+                row["is_override"],
+                row["override_reason"],
+                row["created_at"],
+                row["reviewed_at"],
+            ),
+        )
+
     def complete_review(
         self,
         review_id: str,
@@ -1021,24 +1128,78 @@ class HAIDatabase:
             Number of reviews that were superseded
         """
         with self._get_connection() as conn:
-            cursor = conn.execute(
-                """
-                UPDATE hai_reviews
-                SET reviewed = 1,
-                    reviewer_notes = COALESCE(reviewer_notes || ' ', '') || '[Superseded by later review]',
-                    reviewed_at = ?
-                WHERE candidate_id = ?
-                  AND reviewed = 0
-                  AND id != ?
-                """,
-                (
-                    datetime.now().isoformat(),
-                    candidate_id,
-                    superseding_review_id,
-                ),
-            )
+            count = self._supersede_old_reviews(conn, candidate_id, superseding_review_id)
             conn.commit()
-            return cursor.rowcount
+            return count
+
+    def _supersede_old_reviews(
+        self, conn: sqlite3.Connection, candidate_id: str, superseding_review_id: str
+    ) -> int:
+        cursor = conn.execute(
+            """
+            UPDATE hai_reviews
+            SET reviewed = 1,
+                reviewer_notes = COALESCE(reviewer_notes || ' ', '') || '[Superseded by later review]',
+                reviewed_at = ?
+            WHERE candidate_id = ?
+              AND reviewed = 0
+              AND id != ?
+            """,
+            (
+                datetime.now().isoformat(),
+                candidate_id,
+                superseding_review_id,
+            ),
+        )
+        return cursor.rowcount
+
+    # --- Note Watermark Operations ---
+
+    def save_note_watermark(self, watermark: NoteWatermark) -> None:
+        """Save (or replace) the note watermark for a candidate."""
+        with self._get_connection() as conn:
+            self._upsert_note_watermark(conn, watermark)
+            conn.commit()
+
+    def _upsert_note_watermark(self, conn: sqlite3.Connection, watermark: NoteWatermark) -> None:
+        row = watermark.to_db_row()
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO hai_note_watermarks (
+                candidate_id, latest_note_id, latest_note_date, content_hashes, updated_at
+            ) VALUES (?, ?, ?, ?, ?)
+            """,
+            (
+                row["candidate_id"],
+                row["latest_note_id"],
+                row["latest_note_date"],
+                row["content_hashes"],
+                row["updated_at"],
+            ),
+        )
+
+    def get_note_watermarks(self, candidate_ids: list[str]) -> dict[str, NoteWatermark]:
+        """Get note watermarks for candidates, keyed by candidate ID.
+
+        Candidates without a stored watermark are omitted.
+        """
+        watermarks: dict[str, NoteWatermark] = {}
+        with self._get_connection() as conn:
+            for chunk, placeholders in _chunks(candidate_ids):
+                rows = conn.execute(
+                    f"SELECT * FROM hai_note_watermarks WHERE candidate_id IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                for row in rows:
+                    watermarks[row["candidate_id"]] = NoteWatermark(
+                        candidate_id=row["candidate_id"],
+                        latest_note_id=row["latest_note_id"],
+                        latest_note_date=datetime.fromisoformat(row["latest_note_date"])
+                        if row["latest_note_date"] else None,
+                        content_hashes=frozenset(json.loads(row["content_hashes"])),
+                        updated_at=datetime.fromisoformat(row["updated_at"]),
+                    )
+        return watermarks
 
     # --- Audit Operations ---
 
@@ -1286,7 +1447,7 @@ class HAIDatabase:
                     (cutoff,),
                 ).fetchall()
 
-            return [self._row_to_candidate(row) for row in rows]
+            return self._rows_to_candidates(conn, rows)
 
     def get_hai_counts_by_type(
         self, days: int = 30, since_date: str | None = None
@@ -1475,7 +1636,7 @@ class HAIDatabase:
                 (from_str, to_str),
             ).fetchall()
 
-            return [self._row_to_candidate(row) for row in rows]
+            return self._rows_to_candidates(conn, rows)
 
     def mark_events_as_submitted(self, candidate_ids: list[str]) -> int:
         """Mark candidates as submitted to NHSN.
@@ -25,6 +25,9 @@ from .triage_extractor import (
     should_escalate,
 )
 
+# Extraction cache
+from .cache import ExtractionCache, get_extraction_cache
+
 # Training data collection
 from .training_collector import (
     TrainingCollector,
@@ -46,6 +49,9 @@ __all__ = [
     "TriageExtraction",
     "TriageDecision",
     "should_escalate",
+    # Extraction cache
+    "ExtractionCache",
+    "get_extraction_cache",
     # Training data
     "TrainingCollector",
     "get_collector",
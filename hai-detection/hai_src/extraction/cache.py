@@ -0,0 +1,262 @@
+"""Persistent cache for LLM extraction output.
+
+Candidates are re-extracted on reruns, manual retriggers and prompt-version
+checks, usually with exactly the same notes. The extractors look up the raw
+LLM output here before calling the model, keyed by:
+
+- normalized note content hashes
+- HAI type
+- prompt version
+- model name
+- a digest of the full (normalized) prompt, which also covers the
+  candidate context and template edits made without a version bump
+
+Entries expire after a TTL and the least recently used entries are evicted
+once the cache exceeds its size limit.
+
+Example:
+    result = get_extraction_cache().get_or_call(
+        lambda: llm_client.generate_structured(...),
+        "clabsi", "clabsi_extraction_v1", model, notes, prompt,
+    )
+"""
+
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, TypeVar
+
+from ..config import Config
+from ..models import ClinicalNote
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_WHITESPACE = re.compile(r"\s+")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS extraction_cache (
+    cache_key TEXT PRIMARY KEY,
+    hai_type TEXT NOT NULL,
+    model TEXT NOT NULL,
+    result TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_extraction_cache_accessed
+    ON extraction_cache(accessed_at);
+"""
+
+
+def _digest(text: str) -> str:
+    """SHA-256 of whitespace-normalized text."""
+    normalized = _WHITESPACE.sub(" ", text).strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class ExtractionCache:
+    """SQLite-backed cache of LLM extraction results.
+
+    Safe to share between classification worker threads: each operation
+    opens its own connection and the counters are lock-protected.
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path | None = None,
+        ttl_days: int | None = None,
+        max_entries: int | None = None,
+        enabled: bool | None = None,
+    ):
+        """Initialize the cache.
+
+        Args:
+            db_path: SQLite file. Uses Config.EXTRACTION_CACHE_PATH if None.
+            ttl_days: Entry lifetime. Uses Config.EXTRACTION_CACHE_TTL_DAYS if None.
+            max_entries: Size limit. Uses Config.EXTRACTION_CACHE_MAX_ENTRIES if None.
+            enabled: If False, every lookup is a bypass (always calls the LLM,
+                stores nothing). Uses Config.EXTRACTION_CACHE_ENABLED if None.
+        """
+        self.db_path = Path(db_path or Config.EXTRACTION_CACHE_PATH).expanduser()
+        self.ttl_seconds = (ttl_days if ttl_days is not None else Config.EXTRACTION_CACHE_TTL_DAYS) * 86400
+        self.max_entries = max_entries if max_entries is not None else Config.EXTRACTION_CACHE_MAX_ENTRIES
+        self.enabled = enabled if enabled is not None else Config.EXTRACTION_CACHE_ENABLED
+
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.evictions = 0
+
+        if self.enabled:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            with self._get_connection() as conn:
+                conn.executescript(SCHEMA)
+
+    def _get_connection(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    @staticmethod
+    def make_key(
+        hai_type: str,
+        prompt_version: str,
+        model: str,
+        notes: list[ClinicalNote],
+        prompt: str,
+    ) -> str:
+        """Build the cache key for an extraction request."""
+        parts = {
+            "hai_type": hai_type,
+            "prompt_version": prompt_version,
+            "model": model,
+            "notes": [_digest(note.content or "") for note in notes],
+            "prompt": _digest(prompt),
+        }
+        return hashlib.sha256(json.dumps(parts, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Any | None:
+        """Get a cached result, or None on a miss (expired entries are misses)."""
+        if not self.enabled:
+            return None
+
+        now = time.time()
+        try:
+            with self._get_connection() as conn:
+                row = conn.execute(
+                    "SELECT result, created_at FROM extraction_cache WHERE cache_key = ?",
+                    (key,),
+                ).fetchone()
+                if row and now - row[1] <= self.ttl_seconds:
+                    conn.execute(
+                        "UPDATE extraction_cache SET accessed_at = ? WHERE cache_key = ?",
+                        (now, key),
+                    )
+                    self._count("hits")
+                    return json.loads(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"Extraction cache read failed: {e}")
+
+        self._count("misses")
+        return None
+
+    def put(self, key: str, result: Any, hai_type: str = "", model: str = "") -> None:
+        """Store a result and evict expired / least recently used entries."""
+        if not self.enabled:
+            return
+
+        now = time.time()
+        try:
+            with self._get_connection() as conn:
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO extraction_cache
+                        (cache_key, hai_type, model, result, created_at, accessed_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    (key, hai_type, model, json.dumps(result), now, now),
+                )
+                self._evict(conn, now)
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning(f"Extraction cache write failed: {e}")
+
+    def get_or_call(
+        self,
+        call: Callable[[], T],
+        hai_type: str,
+        prompt_version: str,
+        model: str,
+        notes: list[ClinicalNote],
+        prompt: str,
+    ) -> T:
+        """Return the cached result for this request, or run call() and cache it.
+
+        Exceptions from call() propagate and nothing is cached.
+        """
+        if not self.enabled:
+            self._count("bypassed")
+            return call()
+
+        key = self.make_key(hai_type, prompt_version, model, notes, prompt)
+        cached = self.get(key)
+        if cached is not None:
+            logger.info(f"Extraction cache hit: {hai_type} ({prompt_version}, {model})")
+            return cached
+
+        result = call()
+        self.put(key, result, hai_type, model)
+        return result
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        """Delete expired entries, then the oldest-accessed beyond max_entries."""
+        evicted = conn.execute(
+            "DELETE FROM extraction_cache WHERE created_at < ?",
+            (now - self.ttl_seconds,),
+        ).rowcount
+
+        if self.max_entries > 0:
+            evicted += conn.execute(
+                """
+                DELETE FROM extraction_cache WHERE cache_key IN (
+                    SELECT cache_key FROM extraction_cache
+                    ORDER BY accessed_at DESC
+                    LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            ).rowcount
+
+        if evicted:
+            self._count("evictions", evicted)
+
+    def _count(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def clear(self) -> None:
+        """Delete all entries (counters are kept)."""
+        if not self.enabled:
+            return
+        with self._get_connection() as conn:
+            conn.execute("DELETE FROM extraction_cache")
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get hit/miss counters for this process and the current entry count."""
+        entries = 0
+        if self.enabled:
+            try:
+                with self._get_connection() as conn:
+                    entries = conn.execute("SELECT COUNT(*) FROM extraction_cache").fetchone()[0]
+            except sqlite3.Error as e:
+                logger.warning(f"Extraction cache stats failed: {e}")
+
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": entries,
+        }
+
+
+# Global instance for easy access
+_cache: ExtractionCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_extraction_cache() -> ExtractionCache:
+    """Get the global extraction cache instance."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ExtractionCache()
+    return _cache
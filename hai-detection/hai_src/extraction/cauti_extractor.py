@@ -17,6 +17,7 @@ from pathlib import Path
 
 from ..config import Config
 from ..models import HAICandidate, ClinicalNote
+from .cache import ExtractionCache, get_extraction_cache
 from ..rules.cauti_schemas import (
     CAUTIExtraction,
     UrinarySymptomExtraction,
@@ -40,15 +41,23 @@ class CAUTIExtractor:
     The extraction is then used by CAUTIRulesEngine to apply NHSN criteria.
     """
 
-    def __init__(self, llm_client=None, prompt_version: str = "v1"):
+    def __init__(
+        self,
+        llm_client=None,
+        prompt_version: str = "v1",
+        cache: ExtractionCache | None = None,
+    ):
         """Initialize the extractor.
 
         Args:
             llm_client: LLM client for extraction. Uses default if None.
             prompt_version: Version of extraction prompt to use.
+            cache: Extraction cache. Uses the shared cache if None; pass
+                ExtractionCache(enabled=False) to bypass it.
         """
         self.llm_client = llm_client
         self.prompt_version = prompt_version
+        self.cache = cache or get_extraction_cache()
         self.prompt_template = self._load_prompt_template()
 
     def _load_prompt_template(self) -> str:
@@ -153,7 +162,7 @@ Extract only what is documented. Do not infer or assume.
 
         # Call LLM
         try:
-            response = self._call_llm(prompt)
+            response = self._call_llm(prompt, notes)
             extraction = self._parse_response(response, len(notes))
             return extraction
         except Exception as e:
@@ -192,18 +201,21 @@ Extract only what is documented. Do not infer or assume.
 
         return "\n\n".join(formatted)
 
-    def _call_llm(self, prompt: str) -> str:
-        """Call LLM for extraction.
+    def _call_llm(self, prompt: str, notes: list[ClinicalNote]) -> str:
+        """Call LLM for extraction (through the extraction cache).
 
         Uses configured LLM client or falls back to default.
         """
-        if self.llm_client:
-            return self.llm_client.complete(prompt)
-
-        # Use default client from config
-        from ..llm import get_llm_client
-        client = get_llm_client()
-        return client.complete(prompt)
+        client = self.llm_client
+        if not client:
+            # Use default client from config
+            from ..llm import get_llm_client
+            client = get_llm_client()
+
+        return self.cache.get_or_call(
+            lambda: client.complete(prompt),
+            "cauti", f"cauti_extraction_{self.prompt_version}", client.model_name, notes, prompt,
+        )
 
     def _parse_response(self, response: str, notes_count: int) -> CAUTIExtraction:
         """Parse LLM response to CAUTIExtraction.
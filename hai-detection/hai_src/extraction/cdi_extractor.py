@@ -22,6 +22,7 @@ from pathlib import Path
 
 from ..models import HAICandidate, ClinicalNote
 from ..llm.factory import get_llm_client
+from .cache import ExtractionCache, get_extraction_cache
 from ..rules.schemas import ConfidenceLevel, EvidenceSource
 from ..rules.cdi_schemas import (
     CDIExtraction,
@@ -103,15 +104,19 @@ class CDIExtractor:
         self,
         llm_client=None,
         prompt_version: str = "v1",
+        cache: ExtractionCache | None = None,
     ):
         """Initialize the CDI extractor.
 
         Args:
             llm_client: LLM client for extraction. Uses factory default if None.
             prompt_version: Version of prompt template to use.
+            cache: Extraction cache. Uses the shared cache if None; pass
+                ExtractionCache(enabled=False) to bypass it.
         """
         self._llm_client = llm_client
         self.prompt_version = prompt_version
+        self.cache = cache or get_extraction_cache()
         self.prompt_template = self._load_prompt_template()
 
     @property
@@ -162,11 +167,14 @@ class CDIExtractor:
         # Call LLM
         try:
             # Use structured output for reliable JSON
-            result = self.llm_client.generate_structured(
-                prompt=prompt,
-                output_schema=CDI_EXTRACTION_SCHEMA,
-                temperature=0.0,  # Deterministic extraction
-                profile_context="cdi_extraction",
+            result = self.cache.get_or_call(
+                lambda: self.llm_client.generate_structured(
+                    prompt=prompt,
+                    output_schema=CDI_EXTRACTION_SCHEMA,
+                    temperature=0.0,  # Deterministic extraction
+                    profile_context="cdi_extraction",
+                ),
+                "cdi", f"cdi_extraction_{self.prompt_version}", self.llm_client.model_name, notes, prompt,
             )
             extraction = self._parse_response(result)
         except ValueError as e:
@@ -33,6 +33,7 @@ from ..models import HAICandidate, ClinicalNote, HAIType
 from ..llm.ollama import OllamaClient
 from ..llm.base import LLMProfile
 from ..notes.chunker import NoteChunker
+from .cache import ExtractionCache, get_extraction_cache
 
 logger = logging.getLogger(__name__)
 
@@ -254,11 +255,14 @@ class TriageExtractor:
     # Benchmarked at 119 tok/s, ~1s per triage (vs 15 tok/s for 70B)
     DEFAULT_TRIAGE_MODEL = "qwen2.5:7b"
 
+    PROMPT_VERSION = "triage_v1"
+
     def __init__(
         self,
         model: str | None = None,
         base_url: str | None = None,
         max_context_chars: int = 4000,  # Smaller context for triage
+        cache: ExtractionCache | None = None,
     ):
         """Initialize triage extractor.
 
@@ -266,11 +270,14 @@ class TriageExtractor:
             model: Model to use for triage. Defaults to 8B.
             base_url: Ollama base URL. Uses config default if None.
             max_context_chars: Maximum chars of notes to include.
+            cache: Extraction cache. Uses the shared cache if None; pass
+                ExtractionCache(enabled=False) to bypass it.
         """
         self.model = model or self.DEFAULT_TRIAGE_MODEL
         self.base_url = base_url or Config.OLLAMA_BASE_URL
         self.max_context_chars = max_context_chars
         self.chunker = NoteChunker()
+        self.cache = cache or get_extraction_cache()
 
         # Lazy-load client
         self._client: OllamaClient | None = None
@@ -313,18 +320,29 @@ class TriageExtractor:
         # Build prompt
         prompt = self._build_prompt(candidate, notes_context, hai_type)
 
-        try:
-            # Call LLM with structured output
+        # Profile of the LLM call, if one was made (None on a cache hit)
+        profiles: list[LLMProfile] = []
+
+        def call_llm() -> dict:
             result = self.client.generate_structured_with_profile(
                 prompt=prompt,
                 output_schema=TRIAGE_OUTPUT_SCHEMA,
                 temperature=0.0,
                 profile_context=f"triage_{hai_type.value}",
             )
+            profiles.append(result.profile)
+            return result.data
+
+        try:
+            # Call LLM with structured output
+            data = self.cache.get_or_call(
+                call_llm,
+                f"triage_{hai_type.value}", self.PROMPT_VERSION, self.model, notes, prompt,
+            )
 
             # Parse response
-            extraction = self._parse_response(result.data)
-            extraction.profile = result.profile
+            extraction = self._parse_response(data)
+            extraction.profile = profiles[0] if profiles else None
 
             # Make escalation decision
             extraction.decision = self._make_decision(extraction)
@@ -334,7 +352,7 @@ class TriageExtractor:
 
             logger.info(
                 f"Triage [{hai_type.value}]: decision={extraction.decision.value} "
-                f"| {result.profile.summary()}"
+                f"| {extraction.profile.summary() if extraction.profile else 'cached'}"
             )
 
             return extraction
@@ -24,6 +24,7 @@ from ..models import HAICandidate, ClinicalNote, LLMAuditEntry, VAECandidate
 from ..llm.factory import get_llm_client
 from ..notes.chunker import NoteChunker
 from ..db import HAIDatabase
+from .cache import ExtractionCache, get_extraction_cache
 from ..rules.schemas import ConfidenceLevel, EvidenceSource
 from ..rules.vae_schemas import (
     VAEExtraction,
@@ -178,15 +179,19 @@ class VAEExtractor:
         self,
         llm_client=None,
         db: HAIDatabase | None = None,
+        cache: ExtractionCache | None = None,
     ):
         """Initialize the extractor.
 
         Args:
             llm_client: LLM client instance. Uses factory default if None.
             db: Database for audit logging. Optional.
+            cache: Extraction cache. Uses the shared cache if None; pass
+                ExtractionCache(enabled=False) to bypass it.
         """
         self._llm_client = llm_client
         self.db = db
+        self.cache = cache or get_extraction_cache()
         self.chunker = NoteChunker()
         self._prompt_template = self._load_prompt_template()
 
@@ -259,11 +264,14 @@ Respond with JSON matching the VAEExtraction schema."""
 
         try:
             # Call LLM with structured output
-            result = self.llm_client.generate_structured(
-                prompt=prompt,
-                output_schema=VAE_EXTRACTION_OUTPUT_SCHEMA,
-                temperature=0.0,  # Deterministic extraction
-                profile_context="vae_extraction",
+            result = self.cache.get_or_call(
+                lambda: self.llm_client.generate_structured(
+                    prompt=prompt,
+                    output_schema=VAE_EXTRACTION_OUTPUT_SCHEMA,
+                    temperature=0.0,  # Deterministic extraction
+                    profile_context="vae_extraction",
+                ),
+                "vae", self.PROMPT_VERSION, self.llm_client.model_name, notes, prompt,
             )
 
             elapsed_ms = int((time.time() - start_time) * 1000)
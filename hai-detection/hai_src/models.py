@@ -8,7 +8,9 @@ from dataclasses import dataclass, field
 from datetime import datetime, date
 from enum import Enum
 from typing import Any
+import hashlib
 import json
+import re
 
 
 class HAIType(Enum):
@@ -297,6 +299,64 @@ class ClinicalNote:
     def __hash__(self):
         return hash(self.id)
 
+    def content_hash(self) -> str:
+        """Hash of the note ID and whitespace-normalized content."""
+        normalized = re.sub(r"\s+", " ", self.content or "").strip()
+        return hashlib.sha256(f"{self.id}\n{normalized}".encode("utf-8")).hexdigest()[:32]
+
+
+@dataclass
+class NoteWatermark:
+    """The set of notes a candidate was last classified with.
+
+    Used to re-queue a classified candidate only when new or edited notes
+    appear in its note window.
+    """
+    candidate_id: str
+    latest_note_id: str | None
+    latest_note_date: datetime | None
+    content_hashes: frozenset[str] = frozenset()
+    updated_at: datetime = field(default_factory=datetime.now)
+
+    @classmethod
+    def from_notes(
+        cls,
+        candidate_id: str,
+        notes: list[ClinicalNote],
+        fetched_at: datetime | None = None,
+    ) -> "NoteWatermark":
+        """Build a watermark from the notes used for classification.
+
+        Args:
+            candidate_id: The candidate the notes belong to.
+            notes: The notes used for classification.
+            fetched_at: When the note fetch started. Notes updated after this
+                are probed for again, so it must not be later than the fetch.
+                Defaults to now.
+        """
+        latest = max(notes, key=lambda n: n.date, default=None)
+        return cls(
+            candidate_id=candidate_id,
+            latest_note_id=latest.id if latest else None,
+            latest_note_date=latest.date if latest else None,
+            content_hashes=frozenset(note.content_hash() for note in notes),
+            updated_at=fetched_at or datetime.now(),
+        )
+
+    def has_new_notes(self, current: "NoteWatermark") -> bool:
+        """Check whether current contains notes that are new or changed since this one."""
+        return bool(current.content_hashes - self.content_hashes)
+
+    def to_db_row(self) -> dict:
+        """Convert to database row format."""
+        return {
+            "candidate_id": self.candidate_id,
+            "latest_note_id": self.latest_note_id,
+            "latest_note_date": self.latest_note_date.isoformat() if self.latest_note_date else None,
+            "content_hashes": json.dumps(sorted(self.content_hashes)),
+            "updated_at": self.updated_at.isoformat(),
+        }
+
 
 # ============================================================
 # Surgical Site Infection (SSI) Models
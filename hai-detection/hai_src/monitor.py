@@ -8,7 +8,12 @@ Main service that orchestrates:
 """
 
 import logging
+import threading
 import time
+import uuid
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import replace
 from datetime import datetime, timedelta
 
 from common.alert_store import AlertStore, AlertType
@@ -19,8 +24,13 @@ from .models import (
     HAICandidate,
     HAIType,
     CandidateStatus,
+    Classification,
     ClassificationDecision,
+    NoteWatermark,
+    Review,
+    ReviewQueueType,
 )
+from .data.base import BaseCultureSource, BaseDeviceSource
 from .candidates import CLABSICandidateDetector, SSICandidateDetector, VAECandidateDetector, CAUTICandidateDetector, CDICandidateDetector
 from .classifiers import CLABSIClassifierV2, SSIClassifierV2, VAEClassifier, CAUTIClassifier, CDIClassifier
 from .notes.retriever import NoteRetriever
@@ -59,6 +69,7 @@ class HAIMonitor:
 
         # Initialize classifiers and note retriever (lazy-loaded)
         self._classifiers: dict[HAIType, CLABSIClassifierV2 | SSIClassifierV2 | VAEClassifier] = {}
+        self._classifiers_lock = threading.Lock()
         self._note_retriever: NoteRetriever | None = None
 
         # Track processed cultures to avoid duplicates within session
@@ -67,33 +78,43 @@ class HAIMonitor:
     def get_classifier(self, hai_type: HAIType) -> CLABSIClassifierV2 | SSIClassifierV2 | VAEClassifier | CDIClassifier:
         """Get classifier for the specified HAI type (lazy-loaded).
 
+        Safe to call from classification worker threads; each classifier
+        is built once.
+
         Args:
             hai_type: Type of HAI to get classifier for.
 
         Returns:
             Appropriate classifier for the HAI type.
         """
-        if hai_type not in self._classifiers:
-            if hai_type == HAIType.CLABSI:
-                self._classifiers[hai_type] = CLABSIClassifierV2(
-                    db=self.db,
-                    use_triage=True,  # Use fast 7B model for triage, only escalate complex cases
-                    triage_model="qwen2.5:7b",
-                )
-            elif hai_type == HAIType.SSI:
-                self._classifiers[hai_type] = SSIClassifierV2(db=self.db)
-            elif hai_type == HAIType.VAE:
-                self._classifiers[hai_type] = VAEClassifier(db=self.db)
-            elif hai_type == HAIType.CAUTI:
-                self._classifiers[hai_type] = CAUTIClassifier()
-            elif hai_type == HAIType.CDI:
-                self._classifiers[hai_type] = CDIClassifier(note_retriever=self.note_retriever)
-            else:
-                # Default to CLABSI classifier for other types for now
-                logger.warning(f"No specific classifier for {hai_type}, using CLABSI")
-                self._classifiers[hai_type] = CLABSIClassifierV2(db=self.db)
+        classifier = self._classifiers.get(hai_type)
+        if classifier is not None:
+            return classifier
+
+        with self._classifiers_lock:
+            if hai_type not in self._classifiers:
+                self._classifiers[hai_type] = self._build_classifier(hai_type)
         return self._classifiers[hai_type]
 
+    def _build_classifier(self, hai_type: HAIType):
+        if hai_type == HAIType.CLABSI:
+            return CLABSIClassifierV2(
+                db=self.db,
+                use_triage=True,  # Use fast 7B model for triage, only escalate complex cases
+                triage_model="qwen2.5:7b",
+            )
+        if hai_type == HAIType.SSI:
+            return SSIClassifierV2(db=self.db)
+        if hai_type == HAIType.VAE:
+            return VAEClassifier(db=self.db)
+        if hai_type == HAIType.CAUTI:
+            return CAUTIClassifier()
+        if hai_type == HAIType.CDI:
+            return CDIClassifier(note_retriever=self.note_retriever)
+        # Default to CLABSI classifier for other types for now
+        logger.warning(f"No specific classifier for {hai_type}, using CLABSI")
+        return CLABSIClassifierV2(db=self.db)
+
     @property
     def classifier(self) -> CLABSIClassifierV2:
         """Get CLABSI classifier (legacy property for backwards compatibility)."""
@@ -141,6 +162,39 @@ class HAIMonitor:
         logger.info(f"Detection cycle complete: {total_candidates} new candidates")
         return total_candidates
 
+    def run_backfill(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        culture_source: BaseCultureSource,
+        device_source: BaseDeviceSource,
+        dry_run: bool = False,
+    ) -> int:
+        """Run CLABSI detection over a past date range from the given sources.
+
+        Used with the Bulk Data export sources (hai_src.data.bulk_export) to
+        re-run history without paging REST searches. Candidates are
+        de-duplicated and saved as in run_once.
+
+        Args:
+            start_date: Start of the backfill range.
+            end_date: End of the backfill range.
+            culture_source: Source for culture data.
+            device_source: Source for device data.
+            dry_run: If True, don't save candidates or create alerts.
+
+        Returns:
+            Number of new candidates identified.
+        """
+        logger.info(f"Starting CLABSI backfill: {start_date.date()} to {end_date.date()}")
+
+        detector = CLABSICandidateDetector(culture_source, device_source)
+        candidates = detector.detect_candidates(start_date, end_date)
+        new_count = self._process_candidates(candidates, dry_run=dry_run)
+
+        logger.info(f"Backfill complete: {len(candidates)} candidates found, {new_count} new")
+        return new_count
+
     def _process_candidates(
         self,
         candidates: list[HAICandidate],
@@ -712,17 +766,27 @@ Review in Dashboard: {Config.DASHBOARD_BASE_URL}/hai-detection/candidates/{candi
         self,
         limit: int | None = None,
         dry_run: bool = False,
+        workers: int | None = None,
     ) -> dict:
         """Classify pending candidates using LLM extraction + rules engine.
 
+        With more than one worker, note retrieval runs on its own thread pool
+        ahead of classification, up to ``workers`` LLM requests are in flight
+        at once, and results are committed in batches of
+        Config.CLASSIFY_COMMIT_BATCH.
+
         Args:
             limit: Maximum number of candidates to classify. None for all.
             dry_run: If True, don't save classifications.
+            workers: Concurrent classifications (LLM requests). Uses
+                Config.CLASSIFY_LLM_WORKERS if None; 1 classifies serially.
 
         Returns:
-            Dict with classification summary.
+            Dict with classification summary, including per-stage timing
+            in seconds under "timing".
         """
         logger.info("Starting classification of pending candidates...")
+        started = time.perf_counter()
 
         # Get pending candidates
         candidates = self.db.get_candidates_by_status(CandidateStatus.PENDING)
@@ -736,48 +800,57 @@ Review in Dashboard: {Config.DASHBOARD_BASE_URL}/hai-detection/candidates/{candi
 
         logger.info(f"Found {len(candidates)} pending candidates")
 
-        classified_count = 0
-        error_count = 0
         results = {
             "classified": 0,
             "errors": 0,
             "by_decision": {},
             "details": [],
+            "timing": {"notes": 0.0, "classify": 0.0, "save": 0.0, "total": 0.0},
         }
 
-        for candidate in candidates:
-            try:
-                # Retrieve clinical notes for this patient
-                notes = self.note_retriever.get_notes_for_candidate(candidate)
+        workers = max(1, workers or Config.CLASSIFY_LLM_WORKERS)
+        if workers > 1:
+            self._classify_parallel(candidates, dry_run, workers, results)
+        else:
+            self._classify_serial(candidates, dry_run, results)
 
-                if not notes:
-                    logger.warning(
-                        f"No notes found for candidate {candidate.id} "
-                        f"(patient {candidate.patient.mrn})"
-                    )
-                    # Still run classification - will get low confidence
-                    notes = []
+        timing = results["timing"]
+        timing["total"] = time.perf_counter() - started
+        for stage in timing:
+            timing[stage] = round(timing[stage], 3)
 
-                logger.info(
-                    f"Classifying {candidate.hai_type.value} candidate {candidate.id}: "
-                    f"patient={candidate.patient.mrn}, "
-                    f"organism={candidate.culture.organism}, "
-                    f"notes={len(notes)}"
-                )
+        logger.info(
+            f"Classification complete: {results['classified']} classified, "
+            f"{results['errors']} errors "
+            f"(notes={timing['notes']:.1f}s, classify={timing['classify']:.1f}s, "
+            f"save={timing['save']:.1f}s, total={timing['total']:.1f}s)"
+        )
+
+        return results
 
-                # Get the appropriate classifier for this HAI type
-                classifier = self.get_classifier(candidate.hai_type)
+    def _classify_serial(
+        self,
+        candidates: list[HAICandidate],
+        dry_run: bool,
+        results: dict,
+    ) -> None:
+        """Classify candidates one at a time, saving each as it completes."""
+        timing = results["timing"]
+
+        for candidate in candidates:
+            try:
+                notes, fetched_at, elapsed = self._retrieve_notes(candidate)
+                timing["notes"] += elapsed
 
-                # Run classification
-                classification = classifier.classify(candidate, notes)
+                classification, elapsed = self._run_classifier(
+                    self.get_classifier(candidate.hai_type), candidate, notes
+                )
+                timing["classify"] += elapsed
 
                 if dry_run:
-                    logger.info(
-                        f"[DRY RUN] Would classify {candidate.id} as "
-                        f"{classification.decision.value} "
-                        f"(confidence={classification.confidence:.2f})"
-                    )
+                    self._log_dry_run(candidate, classification)
                 else:
+                    t0 = time.perf_counter()
                     # Save classification
                     self.db.save_classification(classification)
 
@@ -785,43 +858,208 @@ Review in Dashboard: {Config.DASHBOARD_BASE_URL}/hai-detection/candidates/{candi
                     new_status = self._determine_status(classification)
                     self.db.update_candidate_status(candidate.id, new_status)
 
-                    # Create review entry so it appears in pending reviews queue
-                    self._create_review_entry(candidate, classification)
+                    # Create review entry so it appears in pending reviews queue,
+                    # replacing any left from an earlier classification
+                    review = self._create_review_entry(candidate, classification)
+                    self.db.supersede_old_reviews(candidate.id, review.id)
 
-                    logger.info(
-                        f"Classified {candidate.id} as {classification.decision.value} "
-                        f"(confidence={classification.confidence:.2f}, status={new_status.value})"
+                    # Remember which notes this classification saw
+                    self.db.save_note_watermark(
+                        NoteWatermark.from_notes(candidate.id, notes, fetched_at)
                     )
+                    timing["save"] += time.perf_counter() - t0
 
-                # Track results
-                decision = classification.decision.value
-                results["by_decision"][decision] = results["by_decision"].get(decision, 0) + 1
-                results["details"].append({
-                    "candidate_id": candidate.id,
-                    "patient_mrn": candidate.patient.mrn,
-                    "organism": candidate.culture.organism,
-                    "decision": decision,
-                    "confidence": classification.confidence,
-                })
+                    self._log_classified(candidate, classification, new_status)
 
-                classified_count += 1
+                self._record_result(results, candidate, classification)
 
             except Exception as e:
                 logger.error(
                     f"Error classifying candidate {candidate.id}: {e}",
                     exc_info=True
                 )
-                error_count += 1
+                results["errors"] += 1
+
+    def _classify_parallel(
+        self,
+        candidates: list[HAICandidate],
+        dry_run: bool,
+        workers: int,
+        results: dict,
+    ) -> None:
+        """Classify candidates on a worker pool, pipelining note retrieval.
+
+        Candidates enter a window of ``2 * workers`` in-flight items. Notes
+        for each are requested from the note pool as it enters, so retrieval
+        for later candidates overlaps the LLM calls for earlier ones. Results
+        are collected in candidate order on this thread, which is the only
+        one that writes to the database.
+        """
+        timing = results["timing"]
+        batch_size = max(1, Config.CLASSIFY_COMMIT_BATCH)
+        window = 2 * workers
+        note_workers = max(1, Config.CLASSIFY_NOTE_WORKERS)
+        batch: list[tuple[HAICandidate, Classification, NoteWatermark]] = []
 
-        results["classified"] = classified_count
-        results["errors"] = error_count
+        # Resolve the note retriever before any worker thread touches it.
+        # Classifiers are resolved per candidate in the workers, so one that
+        # fails to load only fails its own candidates.
+        _ = self.note_retriever
 
         logger.info(
-            f"Classification complete: {classified_count} classified, "
-            f"{error_count} errors"
+            f"Classifying with {workers} LLM workers, {note_workers} note workers, "
+            f"commit batch {batch_size}"
         )
 
-        return results
+        def classify(candidate: HAICandidate, notes_future: Future):
+            notes, fetched_at, notes_elapsed = notes_future.result()
+            classification, classify_elapsed = self._run_classifier(
+                self.get_classifier(candidate.hai_type), candidate, notes
+            )
+            watermark = NoteWatermark.from_notes(candidate.id, notes, fetched_at)
+            return classification, watermark, notes_elapsed, classify_elapsed
+
+        with ThreadPoolExecutor(max_workers=note_workers, thread_name_prefix="hai-notes") as note_pool, \
+                ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hai-classify") as llm_pool:
+            queued = iter(candidates)
+            in_flight: deque[tuple[HAICandidate, Future]] = deque()
+
+            def submit_next() -> None:
+                candidate = next(queued, None)
+                if candidate is not None:
+                    notes_future = note_pool.submit(self._retrieve_notes, candidate)
+                    in_flight.append((candidate, llm_pool.submit(classify, candidate, notes_future)))
+
+            for _ in range(window):
+                submit_next()
+
+            while in_flight:
+                candidate, future = in_flight.popleft()
+                submit_next()
+                try:
+                    classification, watermark, notes_elapsed, classify_elapsed = future.result()
+                except Exception as e:
+                    logger.error(
+                        f"Error classifying candidate {candidate.id}: {e}",
+                        exc_info=True
+                    )
+                    results["errors"] += 1
+                    continue
+
+                timing["notes"] += notes_elapsed
+                timing["classify"] += classify_elapsed
+
+                if dry_run:
+                    self._log_dry_run(candidate, classification)
+                    self._record_result(results, candidate, classification)
+                    continue
+
+                batch.append((candidate, classification, watermark))
+                if len(batch) >= batch_size:
+                    self._save_classification_batch(batch, results)
+                    batch = []
+
+        if batch:
+            self._save_classification_batch(batch, results)
+
+    def _save_classification_batch(
+        self,
+        batch: list[tuple[HAICandidate, Classification, NoteWatermark]],
+        results: dict,
+    ) -> None:
+        """Commit a batch of classifications, status updates, review entries and note watermarks."""
+        t0 = time.perf_counter()
+        entries = []
+        for candidate, classification, _ in batch:
+            new_status = self._determine_status(classification)
+            entries.append((classification, new_status, self._build_review(candidate, classification)))
+
+        try:
+            self.db.save_classification_results(
+                entries, watermarks=[watermark for _, _, watermark in batch]
+            )
+        except Exception as e:
+            logger.error(
+                f"Failed to save batch of {len(batch)} classifications: {e}",
+                exc_info=True
+            )
+            results["errors"] += len(batch)
+            return
+        finally:
+            results["timing"]["save"] += time.perf_counter() - t0
+
+        for (candidate, classification, _), (_, new_status, _) in zip(batch, entries):
+            self._log_classified(candidate, classification, new_status)
+            self._record_result(results, candidate, classification)
+
+    def _retrieve_notes(self, candidate: HAICandidate) -> tuple[list, datetime, float]:
+        """Retrieve clinical notes for a candidate, returning (notes, fetched_at, seconds).
+
+        fetched_at is taken before the fetch starts, so a note updated while
+        the fetch (or a later classification) runs is still newer than the
+        watermark built from it.
+        """
+        fetched_at = datetime.now()
+        t0 = time.perf_counter()
+        notes = self.note_retriever.get_notes_for_candidate(candidate)
+
+        if not notes:
+            logger.warning(
+                f"No notes found for candidate {candidate.id} "
+                f"(patient {candidate.patient.mrn})"
+            )
+            # Still run classification - will get low confidence
+            notes = []
+
+        return notes, fetched_at, time.perf_counter() - t0
+
+    def _run_classifier(self, classifier, candidate: HAICandidate, notes: list) -> tuple[Classification, float]:
+        """Run a classifier on a candidate, returning (classification, seconds)."""
+        logger.info(
+            f"Classifying {candidate.hai_type.value} candidate {candidate.id}: "
+            f"patient={candidate.patient.mrn}, "
+            f"organism={candidate.culture.organism}, "
+            f"notes={len(notes)}"
+        )
+        t0 = time.perf_counter()
+        classification = classifier.classify(candidate, notes)
+        return classification, time.perf_counter() - t0
+
+    def _log_dry_run(self, candidate: HAICandidate, classification: Classification) -> None:
+        logger.info(
+            f"[DRY RUN] Would classify {candidate.id} as "
+            f"{classification.decision.value} "
+            f"(confidence={classification.confidence:.2f})"
+        )
+
+    def _log_classified(
+        self,
+        candidate: HAICandidate,
+        classification: Classification,
+        new_status: CandidateStatus,
+    ) -> None:
+        logger.info(
+            f"Classified {candidate.id} as {classification.decision.value} "
+            f"(confidence={classification.confidence:.2f}, status={new_status.value})"
+        )
+
+    def _record_result(
+        self,
+        results: dict,
+        candidate: HAICandidate,
+        classification: Classification,
+    ) -> None:
+        """Add a completed classification to the summary."""
+        decision = classification.decision.value
+        results["by_decision"][decision] = results["by_decision"].get(decision, 0) + 1
+        results["details"].append({
+            "candidate_id": candidate.id,
+            "patient_mrn": candidate.patient.mrn,
+            "organism": candidate.culture.organism,
+            "decision": decision,
+            "confidence": classification.confidence,
+        })
+        results["classified"] += 1
 
     def _determine_status(self, classification) -> CandidateStatus:
         """Determine candidate status based on classification result.
@@ -832,18 +1070,24 @@ Review in Dashboard: {Config.DASHBOARD_BASE_URL}/hai-detection/candidates/{candi
         # All cases go to pending_review - IP makes the final call
         return CandidateStatus.PENDING_REVIEW
 
-    def _create_review_entry(self, candidate: HAICandidate, classification) -> None:
+    def _create_review_entry(self, candidate: HAICandidate, classification) -> Review:
         """Create a review queue entry for IP review.
 
         Args:
             candidate: The HAI candidate
             classification: The LLM classification result
+
+        Returns:
+            The saved review entry.
         """
-        import uuid
-        from datetime import datetime
-        from .models import Review, ReviewQueueType
+        review = self._build_review(candidate, classification)
+        self.db.save_review_object(review)
+        logger.debug(f"Created review entry {review.id} for candidate {candidate.id}")
+        return review
 
-        review = Review(
+    def _build_review(self, candidate: HAICandidate, classification) -> Review:
+        """Build the (unsaved) IP review queue entry for a classification."""
+        return Review(
             id=str(uuid.uuid4()),
             candidate_id=candidate.id,
             classification_id=classification.id,
@@ -851,8 +1095,113 @@ Review in Dashboard: {Config.DASHBOARD_BASE_URL}/hai-detection/candidates/{candi
             reviewed=False,
             created_at=datetime.now(),
         )
-        self.db.save_review_object(review)
-        logger.debug(f"Created review entry {review.id} for candidate {candidate.id}")
+
+    def requeue_on_new_notes(
+        self,
+        hai_type: HAIType | None = None,
+        dry_run: bool = False,
+    ) -> dict:
+        """Re-queue classified candidates whose notes have changed.
+
+        Candidates awaiting IP review are rechecked until
+        Config.NOTE_RECHECK_DAYS after their note window closes. Each one's
+        watermark (saved when it was classified) is first used to probe the
+        note source for notes added or edited since; only on a hit are the
+        notes fetched and compared with the watermark's content hashes.
+        Candidates with new or edited notes go back to pending for another
+        LLM classification. Unchanged candidates cost a probe and no LLM call.
+
+        Candidates classified before watermarks existed get a baseline
+        watermark from their current notes and are not re-queued.
+
+        Args:
+            hai_type: Filter by HAI type. All types if None.
+            dry_run: If True, report what would be re-queued without saving.
+
+        Returns:
+            Dict with counts: checked, requeued, unchanged, baselined.
+        """
+        results = {"checked": 0, "requeued": 0, "unchanged": 0, "baselined": 0}
+
+        # FHIR collection dates carry an offset, Clarity ones are naive local
+        # time; astimezone() makes both aware so they compare
+        cutoff = datetime.now().astimezone() - timedelta(days=Config.NOTE_RECHECK_DAYS)
+        candidates = [
+            c for c in self.db.get_candidates_by_status(CandidateStatus.PENDING_REVIEW, hai_type)
+            if self.note_retriever.note_window(c)[1].astimezone() >= cutoff
+        ]
+        if not candidates:
+            logger.info("No classified candidates within the note recheck window")
+            return results
+
+        watermarks = self.db.get_note_watermarks([c.id for c in candidates])
+        note_workers = max(1, Config.CLASSIFY_NOTE_WORKERS)
+
+        logger.info(f"Checking {len(candidates)} classified candidates for new notes")
+
+        with ThreadPoolExecutor(max_workers=note_workers, thread_name_prefix="hai-notes") as pool:
+            previous_marks = [watermarks.get(c.id) for c in candidates]
+            fetched = pool.map(self._recheck_notes, candidates, previous_marks)
+
+            for candidate, previous, fetch in zip(candidates, previous_marks, fetched):
+                results["checked"] += 1
+                if fetch is None:
+                    results["unchanged"] += 1
+                    continue
+
+                notes, fetched_at = fetch
+                current = NoteWatermark.from_notes(candidate.id, notes, fetched_at)
+
+                if previous is None:
+                    results["baselined"] += 1
+                    if not dry_run:
+                        self.db.save_note_watermark(current)
+                    continue
+
+                if not previous.has_new_notes(current):
+                    results["unchanged"] += 1
+                    # Move the probe point past whatever triggered the fetch
+                    # so it is not refetched every cycle
+                    if not dry_run:
+                        self.db.save_note_watermark(replace(previous, updated_at=current.updated_at))
+                    continue
+
+                results["requeued"] += 1
+                new_count = len(current.content_hashes - previous.content_hashes)
+                if dry_run:
+                    logger.info(
+                        f"[DRY RUN] Would re-queue {candidate.id}: "
+                        f"{new_count} new or changed notes"
+                    )
+                    continue
+
+                self.db.update_candidate_status(candidate.id, CandidateStatus.PENDING)
+                logger.info(
+                    f"Re-queued {candidate.id} for classification: "
+                    f"{new_count} new or changed notes"
+                )
+
+        logger.info(
+            f"Note recheck complete: {results['requeued']} re-queued, "
+            f"{results['unchanged']} unchanged, {results['baselined']} baselined"
+        )
+        return results
+
+    def _recheck_notes(
+        self,
+        candidate: HAICandidate,
+        previous: NoteWatermark | None,
+    ) -> tuple[list, datetime] | None:
+        """Fetch a candidate's notes if they may have changed since its watermark.
+
+        Returns:
+            (notes, fetched_at), or None when the probe finds no notes
+            updated since the watermark's fetch.
+        """
+        if previous is not None and not self.note_retriever.has_notes_since(candidate, previous.updated_at):
+            return None
+        notes, fetched_at, _ = self._retrieve_notes(candidate)
+        return notes, fetched_at
 
     def run_full_pipeline(self, dry_run: bool = False) -> dict:
         """Run full pipeline: detection + classification.
@@ -875,7 +1224,15 @@ Review in Dashboard: {Config.DASHBOARD_BASE_URL}/hai-detection/candidates/{candi
 
         # Step 2: Classification (only if not dry run for detection)
         if not dry_run:
-            logger.info("=== Step 2: Classification ===")
+            logger.info("=== Step 2: Note recheck ===")
+            try:
+                results["recheck"] = self.requeue_on_new_notes()
+            except Exception as e:
+                # A failed recheck must not hold up classification
+                logger.error(f"Note recheck failed: {e}", exc_info=True)
+                results["recheck"] = {"error": str(e)}
+
+            logger.info("=== Step 3: Classification ===")
             classification_results = self.classify_pending(dry_run=dry_run)
             results["classification"] = classification_results
 
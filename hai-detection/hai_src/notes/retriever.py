@@ -120,6 +120,19 @@ class NoteRetriever:
         self.max_notes = Config.MAX_NOTES_PER_PATIENT
         self.max_length = Config.MAX_NOTE_LENGTH
 
+    @staticmethod
+    def note_window(
+        candidate: HAICandidate,
+        days_before: int = 7,
+        days_after: int = 3,
+    ) -> tuple[datetime, datetime]:
+        """Get the (start, end) dates of the note window around a culture."""
+        culture_date = candidate.culture.collection_date
+        return (
+            culture_date - timedelta(days=days_before),
+            culture_date + timedelta(days=days_after),
+        )
+
     def get_notes_for_candidate(
         self,
         candidate: HAICandidate,
@@ -146,9 +159,7 @@ class NoteRetriever:
         Returns:
             List of relevant clinical notes, sorted by date
         """
-        culture_date = candidate.culture.collection_date
-        start_date = culture_date - timedelta(days=days_before)
-        end_date = culture_date + timedelta(days=days_after)
+        start_date, end_date = self.note_window(candidate, days_before, days_after)
 
         logger.info(
             f"Retrieving notes for patient {candidate.patient.mrn} "
@@ -189,6 +200,31 @@ class NoteRetriever:
             logger.error(f"Failed to retrieve notes: {e}")
             return []
 
+    def has_notes_since(
+        self,
+        candidate: HAICandidate,
+        since: datetime,
+        days_before: int = 7,
+        days_after: int = 3,
+    ) -> bool:
+        """Check whether any note in the candidate's window changed after `since`.
+
+        Returns True when the note source cannot tell or the check fails,
+        so callers fall back to a full fetch.
+        """
+        start_date, end_date = self.note_window(candidate, days_before, days_after)
+        try:
+            return self.note_source.has_notes_since(
+                patient_id=candidate.patient.fhir_id,
+                since=since,
+                start_date=start_date,
+                end_date=end_date,
+                note_types=self.RELEVANT_NOTE_TYPES,
+            )
+        except Exception as e:
+            logger.warning(f"Note probe failed for {candidate.id}, fetching notes: {e}")
+            return True
+
     def filter_by_keywords(
         self,
         notes: list[ClinicalNote],
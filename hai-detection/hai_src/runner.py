@@ -13,6 +13,15 @@ import sys
 from datetime import datetime, timedelta
 
 from .config import Config
+from .data.bulk_export import (
+    BulkExportClient,
+    BulkExportReader,
+    ExportCultureSource,
+    ExportDeviceSource,
+    LocalNDJSONExport,
+    backfill_type_filters,
+)
+from .extraction import get_extraction_cache
 from .monitor import HAIMonitor
 from .models import HAIType
 
@@ -59,6 +68,53 @@ def run_daemon(monitor: HAIMonitor, interval: int | None = None) -> None:
     monitor.run_continuous(interval_seconds=interval)
 
 
+def run_backfill(
+    monitor: HAIMonitor,
+    start_date: datetime,
+    end_date: datetime,
+    export_dir: str | None = None,
+    dry_run: bool = False,
+) -> int:
+    """Run CLABSI detection over history from a Bulk Data export.
+
+    Args:
+        monitor: The monitor instance.
+        start_date: Start of the backfill range.
+        end_date: End of the backfill range.
+        export_dir: Directory of NDJSON files from a finished export. If
+            None, an export limited to the window is run on the FHIR server
+            and deleted afterwards.
+        dry_run: If True, don't persist anything.
+
+    Returns:
+        Number of new candidates identified.
+    """
+    if export_dir:
+        export = LocalNDJSONExport(export_dir)
+    else:
+        export = BulkExportClient().export(
+            ["Patient", "DiagnosticReport", "DeviceUseStatement"],
+            type_filters=backfill_type_filters(start_date, end_date),
+        )
+
+    try:
+        reader = BulkExportReader(export)
+        culture_source = ExportCultureSource(reader, start_date, end_date)
+        device_source = ExportDeviceSource(
+            reader, start_date, end_date, patient_ids=culture_source.patient_ids
+        )
+        return monitor.run_backfill(
+            start_date,
+            end_date,
+            culture_source,
+            device_source,
+            dry_run=dry_run,
+        )
+    finally:
+        if not export_dir:
+            export.delete()
+
+
 def show_stats(monitor: HAIMonitor) -> None:
     """Display current statistics."""
     stats = monitor.get_stats()
@@ -100,6 +156,7 @@ def run_classify(
     monitor: HAIMonitor,
     limit: int | None = None,
     dry_run: bool = False,
+    workers: int | None = None,
 ) -> dict:
     """Run classification on pending candidates.
 
@@ -107,11 +164,33 @@ def run_classify(
         monitor: The monitor instance.
         limit: Maximum candidates to classify.
         dry_run: If True, don't persist classifications.
+        workers: Concurrent LLM classifications (uses config if None).
 
     Returns:
         Classification results dict.
     """
-    return monitor.classify_pending(limit=limit, dry_run=dry_run)
+    return monitor.classify_pending(limit=limit, dry_run=dry_run, workers=workers)
+
+
+def run_recheck_notes(monitor: HAIMonitor, dry_run: bool = False) -> dict:
+    """Re-queue classified candidates that have new or edited notes.
+
+    Args:
+        monitor: The monitor instance.
+        dry_run: If True, don't change candidate status.
+
+    Returns:
+        Recheck counts dict.
+    """
+    return monitor.requeue_on_new_notes(dry_run=dry_run)
+
+
+def show_recheck_results(results: dict) -> None:
+    """Display note recheck counts."""
+    print(
+        f"Note recheck: {results['checked']} checked, {results['requeued']} re-queued, "
+        f"{results['unchanged']} unchanged, {results['baselined']} baselined"
+    )
 
 
 def run_full_pipeline(monitor: HAIMonitor, dry_run: bool = False) -> dict:
@@ -127,12 +206,31 @@ def run_full_pipeline(monitor: HAIMonitor, dry_run: bool = False) -> dict:
     return monitor.run_full_pipeline(dry_run=dry_run)
 
 
+def show_extraction_cache_stats() -> None:
+    """Display extraction cache counters for this run."""
+    stats = get_extraction_cache().get_stats()
+    if not stats["enabled"]:
+        print(f"Extraction cache: bypassed ({stats['bypassed']} calls)")
+        return
+    print(
+        f"Extraction cache: {stats['hits']} hits, {stats['misses']} misses "
+        f"(hit rate {stats['hit_rate']:.0%}), {stats['entries']} entries"
+    )
+
+
 def show_classification_results(results: dict) -> None:
     """Display classification results."""
     print("\n=== Classification Results ===")
     print(f"Classified: {results['classified']}")
     print(f"Errors: {results['errors']}")
 
+    if results.get('timing'):
+        timing = results['timing']
+        print(
+            f"Timing: notes={timing['notes']:.1f}s, classify={timing['classify']:.1f}s, "
+            f"save={timing['save']:.1f}s, total={timing['total']:.1f}s"
+        )
+
     if results.get('by_decision'):
         print("\nBy Decision:")
         for decision, count in results['by_decision'].items():
@@ -151,6 +249,14 @@ def show_classification_results(results: dict) -> None:
         print("-" * 80)
 
 
+def date_arg(value: str) -> datetime:
+    """Parse a YYYY-MM-DD command line date."""
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected YYYY-MM-DD, got {value!r}")
+
+
 def main() -> int:
     """Main entry point."""
     parser = argparse.ArgumentParser(
@@ -164,6 +270,15 @@ Examples:
     # Classification only (classify pending candidates)
     python -m src.runner --classify
 
+    # Drain a classification backlog with 8 concurrent LLM requests
+    python -m src.runner --classify --workers 8
+
+    # Reclassify without using cached LLM extractions
+    python -m src.runner --classify --no-cache
+
+    # Re-queue reviewed-pending candidates with new notes, then classify
+    python -m src.runner --classify --recheck-notes
+
     # Full pipeline: detection + classification
     python -m src.runner --full
 
@@ -173,6 +288,10 @@ Examples:
     # Look back 48 hours for cultures
     python -m src.runner --once --lookback 48
 
+    # CLABSI backfill for Q1 from a Bulk Data export (or a directory of NDJSON)
+    python -m src.runner --backfill 2024-01-01 2024-03-31
+    python -m src.runner --backfill 2024-01-01 2024-03-31 --export-dir exports/q1
+
     # Continuous monitoring mode
     python -m src.runner
 
@@ -200,6 +319,22 @@ Examples:
         help="Run full pipeline: detection + classification",
     )
 
+    parser.add_argument(
+        "--backfill",
+        nargs=2,
+        metavar=("START", "END"),
+        type=date_arg,
+        default=None,
+        help="Run CLABSI detection for a past date range (YYYY-MM-DD) from a Bulk Data export",
+    )
+
+    parser.add_argument(
+        "--export-dir",
+        type=str,
+        default=None,
+        help="With --backfill, read this directory of NDJSON files instead of exporting",
+    )
+
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -213,6 +348,25 @@ Examples:
         help="Limit number of candidates to classify (for testing)",
     )
 
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help=f"Concurrent LLM classifications (default: {Config.CLASSIFY_LLM_WORKERS})",
+    )
+
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the LLM extraction cache (always call the model)",
+    )
+
+    parser.add_argument(
+        "--recheck-notes",
+        action="store_true",
+        help="With --classify, first re-queue classified candidates that have new notes",
+    )
+
     parser.add_argument(
         "--lookback",
         type=int,
@@ -264,6 +418,9 @@ Examples:
     if args.db_path:
         Config.HAI_DB_PATH = args.db_path
 
+    if args.no_cache:
+        Config.EXTRACTION_CACHE_ENABLED = False
+
     # Create monitor
     try:
         monitor = HAIMonitor(lookback_hours=args.lookback)
@@ -287,23 +444,47 @@ Examples:
         try:
             results = run_full_pipeline(monitor, dry_run=args.dry_run)
             logger.info(f"Detection: {results['detection'].get('new_candidates', 0)} new candidates")
+            if results.get('recheck'):
+                show_recheck_results(results['recheck'])
             if results.get('classification'):
                 show_classification_results(results['classification'])
+                show_extraction_cache_stats()
             return 0
         except Exception as e:
             logger.error(f"Pipeline failed: {e}", exc_info=True)
             return 1
 
+    elif args.backfill:
+        start_date, end_date = args.backfill
+        logger.info(f"Running CLABSI backfill from {start_date.date()} to {end_date.date()}...")
+        try:
+            count = run_backfill(
+                monitor,
+                start_date,
+                end_date,
+                export_dir=args.export_dir,
+                dry_run=args.dry_run,
+            )
+            logger.info(f"Completed: {count} new candidates identified")
+            return 0
+        except Exception as e:
+            logger.error(f"Backfill failed: {e}", exc_info=True)
+            return 1
+
     elif args.classify:
         # Classification only
         logger.info("Running classification on pending candidates...")
         try:
+            if args.recheck_notes:
+                show_recheck_results(run_recheck_notes(monitor, dry_run=args.dry_run))
             results = run_classify(
                 monitor,
                 limit=args.limit,
                 dry_run=args.dry_run,
+                workers=args.workers,
             )
             show_classification_results(results)
+            show_extraction_cache_stats()
             return 0
         except Exception as e:
             logger.error(f"Classification failed: {e}", exc_info=True)
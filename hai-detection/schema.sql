@@ -98,6 +98,16 @@ CREATE TABLE IF NOT EXISTS hai_llm_audit (
 CREATE INDEX IF NOT EXISTS idx_hai_llm_audit_candidate ON hai_llm_audit(candidate_id);
 CREATE INDEX IF NOT EXISTS idx_hai_llm_audit_model ON hai_llm_audit(model);
 
+-- Notes each candidate was last classified with (for incremental reclassification)
+CREATE TABLE IF NOT EXISTS hai_note_watermarks (
+    candidate_id TEXT PRIMARY KEY,
+    latest_note_id TEXT,
+    latest_note_date TIMESTAMP,
+    content_hashes TEXT NOT NULL,  -- JSON array of note content hashes
+    updated_at TIMESTAMP NOT NULL,
+    FOREIGN KEY (candidate_id) REFERENCES hai_candidates(id)
+);
+
 -- Statistics/Metrics view
 CREATE VIEW IF NOT EXISTS hai_candidate_stats AS
 SELECT
@@ -0,0 +1,382 @@
+"""Tests for Bulk Data ($export) ingestion."""
+
+import base64
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock, patch
+from urllib.parse import parse_qs
+
+import pytest
+
+from hai_src.data.bulk_export import (
+    BulkExportClient,
+    BulkExportError,
+    BulkExportReader,
+    ExportCultureSource,
+    ExportDeviceSource,
+    LocalNDJSONExport,
+    backfill_type_filters,
+    iter_ndjson,
+)
+from hai_src.candidates import CLABSICandidateDetector
+from hai_src.runner import run_backfill
+
+
+BASE_URL = "http://fhir.test/fhir"
+STATUS_URL = f"{BASE_URL}/$export-poll-status?_jobId=job1"
+
+
+def _report(
+    report_id: str,
+    patient_id: str,
+    code: str = "600-7",
+    positive: bool = True,
+    collected: str = "2024-01-15T10:00:00",
+) -> dict:
+    return {
+        "resourceType": "DiagnosticReport",
+        "id": report_id,
+        "subject": {"reference": f"Patient/{patient_id}"},
+        "code": {"coding": [{"code": code}]},
+        "effectiveDateTime": collected,
+        "conclusion": "Positive - growth" if positive else "Negative",
+    }
+
+
+def _device(
+    device_id: str,
+    patient_id: str,
+    status: str = "active",
+    period: dict | None = None,
+) -> dict:
+    return {
+        "resourceType": "DeviceUseStatement",
+        "id": device_id,
+        "status": status,
+        "subject": {"reference": f"Patient/{patient_id}"},
+        "device": {"concept": {"coding": [{"code": "52124006", "display": "Central venous catheter"}]}},
+        "timingPeriod": period or {"start": "2024-01-10T08:00:00"},
+    }
+
+
+def _note(note_id: str, patient_id: str, text: str) -> dict:
+    return {
+        "resourceType": "DocumentReference",
+        "id": note_id,
+        "subject": {"reference": f"Patient/{patient_id}"},
+        "type": {"coding": [{"display": "Progress note"}]},
+        "date": "2024-01-16T09:00:00",
+        "content": [{"attachment": {"data": base64.b64encode(text.encode()).decode()}}],
+    }
+
+
+def _patient(patient_id: str) -> dict:
+    return {
+        "resourceType": "Patient",
+        "id": patient_id,
+        "identifier": [{"type": {"coding": [{"code": "MR"}]}, "value": f"MRN-{patient_id}"}],
+        "name": [{"family": "Test", "given": [patient_id]}],
+    }
+
+
+def _write_ndjson(path, resources, extra_lines=()):
+    lines = [json.dumps(r) for r in resources] + list(extra_lines)
+    path.write_text("\n".join(lines) + "\n")
+
+
+@pytest.fixture
+def export_dir(tmp_path):
+    """A local export split across files, with a blank and a malformed line."""
+    _write_ndjson(tmp_path / "1.DiagnosticReport.ndjson", [
+        _report("r1", "p1"),
+        _report("r2", "p2", positive=False),
+    ], extra_lines=["", "{not json"])
+    _write_ndjson(tmp_path / "2.DiagnosticReport.ndjson", [
+        _report("r3", "p3"),
+        _report("cbc", "p3", code="58410-2"),
+    ])
+    _write_ndjson(tmp_path / "DeviceUseStatement.ndjson", [
+        _device("d1", "p1"),
+        _device("d2", "p2", status="entered-in-error"),
+    ])
+    _write_ndjson(tmp_path / "DocumentReference.ndjson", [_note("n1", "p1", "Fever overnight")])
+    return tmp_path
+
+
+class TestIterNDJSON:
+    """Tests for iter_ndjson."""
+
+    def test_skips_blank_and_malformed_lines(self):
+        lines = [b'{"id": "a"}', b"", b"not json", '{"id": "b"}\n']
+
+        assert [r["id"] for r in iter_ndjson(lines)] == ["a", "b"]
+
+
+class TestLocalNDJSONExport:
+    """Tests for the directory stand-in."""
+
+    def test_files_matched_by_resource_type(self, export_dir):
+        export = LocalNDJSONExport(export_dir)
+
+        names = [p.name for p in export.files_for("DiagnosticReport")]
+        assert names == ["1.DiagnosticReport.ndjson", "2.DiagnosticReport.ndjson"]
+        # "Device" must not pick up DeviceUseStatement files
+        assert export.files_for("Device") == []
+
+    def test_missing_directory(self, tmp_path):
+        with pytest.raises(BulkExportError):
+            LocalNDJSONExport(tmp_path / "missing")
+
+
+class TestBulkExportReader:
+    """Tests for streaming exports into HAI models."""
+
+    def test_iter_cultures(self, export_dir):
+        reader = BulkExportReader(LocalNDJSONExport(export_dir))
+
+        all_cultures = [(pid, c.fhir_id) for pid, c in reader.iter_cultures()]
+        positive = [c.fhir_id for _, c in reader.iter_cultures(positive_only=True)]
+
+        # The CBC panel is not a culture
+        assert all_cultures == [("p1", "r1"), ("p2", "r2"), ("p3", "r3")]
+        assert positive == ["r1", "r3"]
+
+    def test_iter_cultures_is_lazy(self, export_dir):
+        reader = BulkExportReader(LocalNDJSONExport(export_dir))
+
+        cultures = reader.iter_cultures()
+        patient_id, culture = next(cultures)
+
+        assert (patient_id, culture.fhir_id) == ("p1", "r1")
+
+    def test_iter_devices_skips_entered_in_error(self, export_dir):
+        reader = BulkExportReader(LocalNDJSONExport(export_dir))
+
+        devices = list(reader.iter_devices())
+
+        assert [(pid, d.fhir_id) for pid, d in devices] == [("p1", "d1")]
+        device = devices[0][1]
+        assert device.device_type != "unknown"
+        assert device.insertion_date is not None
+
+    def test_iter_notes(self, export_dir):
+        reader = BulkExportReader(LocalNDJSONExport(export_dir))
+
+        notes = list(reader.iter_notes())
+
+        assert len(notes) == 1
+        assert notes[0].patient_id == "p1"
+        assert notes[0].content == "Fever overnight"
+
+
+class TestExportSources:
+    """Tests for the culture and device sources built on an export."""
+
+    @pytest.fixture
+    def reader(self, export_dir):
+        # p3 has a positive culture but no exported Patient
+        _write_ndjson(export_dir / "Patient.ndjson", [_patient("p1"), _patient("p2")])
+        return BulkExportReader(LocalNDJSONExport(export_dir))
+
+    def test_positive_blood_cultures_in_range(self, reader):
+        source = ExportCultureSource(reader)
+
+        cultures = source.get_positive_blood_cultures(datetime(2024, 1, 15), datetime(2024, 1, 15))
+
+        assert [(p.fhir_id, c.fhir_id) for p, c in cultures] == [("p1", "r1")]
+        assert source.get_positive_blood_cultures(datetime(2024, 1, 16), datetime(2024, 1, 31)) == []
+
+    def test_cultures_for_patient(self, reader):
+        source = ExportCultureSource(reader)
+
+        cultures = source.get_cultures_for_patient("p2", datetime(2024, 1, 1), datetime(2024, 1, 31))
+
+        assert [c.fhir_id for c in cultures] == ["r2"]
+
+    def test_central_lines_present_at_date(self, reader):
+        source = ExportDeviceSource(reader)
+
+        assert [d.fhir_id for d in source.get_central_lines("p1", datetime(2024, 1, 15))] == ["d1"]
+        assert source.get_central_lines("p1", datetime(2024, 1, 9)) == []
+        assert source.get_central_lines("p2", datetime(2024, 1, 15)) == []
+
+    def test_window_keeps_only_its_cultures_patients_and_devices(self, export_dir):
+        """A windowed source drops cultures, Patients and devices outside the window."""
+        _write_ndjson(export_dir / "Patient.ndjson", [_patient("p1"), _patient("p2"), _patient("p4")])
+        _write_ndjson(export_dir / "3.DiagnosticReport.ndjson", [
+            _report("r-margin", "p1", collected="2024-01-12T08:00:00"),
+            _report("r-old", "p4", collected="2023-06-01T08:00:00"),
+        ])
+        _write_ndjson(export_dir / "DeviceUseStatement.ndjson", [
+            _device("d1", "p1"),
+            _device("d-removed", "p1", period={"start": "2023-05-01T00:00:00", "end": "2023-06-01T00:00:00"}),
+            _device("d-other", "p4"),
+        ])
+        reader = BulkExportReader(LocalNDJSONExport(export_dir))
+        start, end = datetime(2024, 1, 14), datetime(2024, 1, 16)
+
+        cultures = ExportCultureSource(reader, start, end)
+        devices = ExportDeviceSource(reader, start, end, patient_ids=cultures.patient_ids)
+
+        assert cultures.patient_ids == {"p1", "p2", "p3"}
+        assert set(cultures._patients) == {"p1", "p2"}
+        # The margin keeps a culture 2 days before the window for the confirmatory check
+        assert [c.fhir_id for c in cultures.get_cultures_for_patient("p1", datetime(2024, 1, 1), end)] == [
+            "r1", "r-margin",
+        ]
+        assert [d.fhir_id for d in devices.get_active_devices("p1")] == ["d1"]
+        assert devices.get_central_lines("p1", datetime(2023, 5, 15)) == []
+        assert devices.get_active_devices("p4") == []
+
+    def test_clabsi_detector_runs_on_export(self, reader):
+        detector = CLABSICandidateDetector(ExportCultureSource(reader), ExportDeviceSource(reader))
+
+        candidates = detector.detect_candidates(datetime(2024, 1, 1), datetime(2024, 1, 31))
+
+        assert [(c.patient.fhir_id, c.culture.fhir_id) for c in candidates] == [("p1", "r1")]
+        assert candidates[0].device_days_at_culture == 5
+
+
+class TestBackfill:
+    """Tests for limiting a backfill export to its window."""
+
+    def test_type_filters_cover_window_and_margin(self):
+        filters = backfill_type_filters(datetime(2024, 1, 1), datetime(2024, 3, 31))
+
+        culture_filter, device_filter = filters
+        resource_type, query = culture_filter.split("?", 1)
+        params = parse_qs(query)
+        assert resource_type == "DiagnosticReport"
+        assert params["date"] == ["ge2023-12-30", "le2024-04-02"]
+        assert "600-7" in params["code"][0].split(",")
+        assert device_filter == "DeviceUseStatement?status%3Anot=entered-in-error"
+
+    def test_server_backfill_sends_type_filters(self):
+        monitor = Mock()
+        monitor.run_backfill.return_value = 0
+        export = Mock()
+        export.iter_resources.return_value = iter([])
+
+        with patch("hai_src.runner.BulkExportClient") as client_class:
+            client_class.return_value.export.return_value = export
+            run_backfill(monitor, datetime(2024, 1, 1), datetime(2024, 3, 31))
+
+        kwargs = client_class.return_value.export.call_args.kwargs
+        assert kwargs["type_filters"] == backfill_type_filters(datetime(2024, 1, 1), datetime(2024, 3, 31))
+        export.delete.assert_called_once()
+
+
+def _http_response(status: int, payload=None, headers=None, lines=None) -> Mock:
+    response = Mock()
+    response.status_code = status
+    response.headers = headers or {}
+    response.json.return_value = payload or {}
+    response.raise_for_status.return_value = None
+    response.iter_lines.return_value = iter(lines or [])
+    response.__enter__ = Mock(return_value=response)
+    response.__exit__ = Mock(return_value=False)
+    return response
+
+
+class TestBulkExportClient:
+    """Tests for kick-off, status polling and streaming downloads."""
+
+    def _session(self, status_responses, files=None):
+        files = files or {}
+        session = Mock()
+        kick_off = _http_response(202, headers={"Content-Location": STATUS_URL})
+        status_iter = iter(status_responses)
+
+        def get(url, params=None, headers=None, timeout=None, stream=False):
+            if url.endswith("/Patient/$export"):
+                session.kick_off_params = params
+                session.kick_off_headers = headers
+                return kick_off
+            if url == STATUS_URL:
+                return next(status_iter)
+            return _http_response(200, lines=files[url])
+
+        session.get.side_effect = get
+        return session
+
+    @patch("hai_src.data.bulk_export.time.sleep")
+    def test_export_polls_until_complete_and_streams(self, mock_sleep):
+        file_url = f"{BASE_URL}/files/DiagnosticReport-1.ndjson"
+        manifest = {
+            "transactionTime": "2024-04-01T00:00:00Z",
+            "output": [
+                {"type": "DiagnosticReport", "url": file_url},
+                {"type": "Patient", "url": f"{BASE_URL}/files/Patient-1.ndjson"},
+            ],
+            "error": [],
+        }
+        session = self._session(
+            [
+                _http_response(202, headers={"Retry-After": "5", "X-Progress": "50%"}),
+                _http_response(200, payload=manifest),
+            ],
+            files={file_url: [json.dumps(_report("r1", "p1")).encode(), b""]},
+        )
+        client = BulkExportClient(BASE_URL, session=session, poll_interval=1, max_wait=60)
+
+        export = client.export(["DiagnosticReport", "Patient"])
+        reports = list(export.iter_resources("DiagnosticReport"))
+
+        assert session.kick_off_params["_type"] == "DiagnosticReport,Patient"
+        assert session.kick_off_params["_outputFormat"] == "application/fhir+ndjson"
+        assert session.kick_off_headers["Prefer"] == "respond-async"
+        mock_sleep.assert_called_once_with(5.0)
+        assert export.transaction_time == "2024-04-01T00:00:00Z"
+        assert [r["id"] for r in reports] == ["r1"]
+
+    @pytest.mark.parametrize("since, expected", [
+        (datetime(2024, 1, 1, 5, tzinfo=timezone(timedelta(hours=5))), "2024-01-01T00:00:00+00:00"),
+        (datetime(2024, 1, 1), datetime(2024, 1, 1).astimezone(timezone.utc).isoformat(timespec="seconds")),
+    ])
+    def test_since_sent_as_utc_instant(self, since, expected):
+        session = self._session([])
+        client = BulkExportClient(BASE_URL, session=session)
+
+        client.kick_off(["DiagnosticReport"], since=since)
+
+        assert session.kick_off_params["_since"] == expected
+        assert expected.endswith("+00:00")
+
+    def test_type_filters_sent_as_separate_parameters(self):
+        session = self._session([])
+        client = BulkExportClient(BASE_URL, session=session)
+        filters = backfill_type_filters(datetime(2024, 1, 1), datetime(2024, 1, 31))
+
+        client.kick_off(["DiagnosticReport", "DeviceUseStatement"], type_filters=filters)
+
+        assert session.kick_off_params["_typeFilter"] == filters
+
+    def test_kick_off_rejected(self):
+        session = Mock()
+        session.get.return_value = _http_response(
+            400, payload={"issue": [{"diagnostics": "Unsupported _type"}]},
+        )
+        client = BulkExportClient(BASE_URL, session=session)
+
+        with pytest.raises(BulkExportError, match="Unsupported _type"):
+            client.kick_off(["Foo"])
+
+    @patch("hai_src.data.bulk_export.time.sleep")
+    def test_failed_export_raises(self, mock_sleep):
+        session = self._session([
+            _http_response(500, payload={"issue": [{"diagnostics": "Export job failed"}]}),
+        ])
+        client = BulkExportClient(BASE_URL, session=session)
+
+        with pytest.raises(BulkExportError, match="Export job failed"):
+            client.export()
+
+    @patch("hai_src.data.bulk_export.time.monotonic")
+    @patch("hai_src.data.bulk_export.time.sleep")
+    def test_export_times_out(self, mock_sleep, mock_monotonic):
+        mock_monotonic.side_effect = [0.0, 30.0, 61.0]
+        session = self._session([_http_response(202), _http_response(202)])
+        client = BulkExportClient(BASE_URL, session=session, poll_interval=30, max_wait=60)
+
+        with pytest.raises(BulkExportError, match="did not complete"):
+            client.export()
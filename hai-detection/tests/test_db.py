@@ -0,0 +1,233 @@
+"""Tests for HAIDatabase candidate loading and connection pooling."""
+
+import pytest
+import sqlite3
+import threading
+from datetime import date, datetime
+
+from hai_src.db import HAIDatabase
+from common.sqlite_pool import SQLitePool
+from hai_src.models import (
+    CDICandidate,
+    CDITestResult,
+    CultureResult,
+    HAICandidate,
+    HAIType,
+    Patient,
+    SSICandidate,
+    SurgicalProcedure,
+    VAECandidate,
+    VentilationEpisode,
+)
+
+
+def _candidate(candidate_id: str, hai_type: HAIType) -> HAICandidate:
+    return HAICandidate(
+        id=candidate_id,
+        hai_type=hai_type,
+        patient=Patient(fhir_id=f"patient-{candidate_id}", mrn=f"MRN-{candidate_id}", name="Test Patient"),
+        culture=CultureResult(
+            fhir_id=f"culture-{candidate_id}",
+            collection_date=datetime(2024, 1, 15, 10, 0),
+            organism="Staphylococcus aureus",
+        ),
+    )
+
+
+def _ssi(candidate_id: str) -> HAICandidate:
+    candidate = _candidate(candidate_id, HAIType.SSI)
+    candidate._ssi_data = SSICandidate(
+        candidate_id=candidate_id,
+        procedure=SurgicalProcedure(
+            id=f"proc-{candidate_id}",
+            procedure_code="44140",
+            procedure_name="Colectomy",
+            procedure_date=datetime(2024, 1, 5, 8, 0),
+            patient_id=f"patient-{candidate_id}",
+            nhsn_category="COLO",
+        ),
+        days_post_op=10,
+        ssi_type="deep",
+    )
+    return candidate
+
+
+def _vae(candidate_id: str) -> HAICandidate:
+    candidate = _candidate(candidate_id, HAIType.VAE)
+    candidate._vae_data = VAECandidate(
+        candidate_id=candidate_id,
+        episode=VentilationEpisode(
+            id=f"episode-{candidate_id}",
+            patient_id=f"patient-{candidate_id}",
+            patient_mrn=f"MRN-{candidate_id}",
+            intubation_date=datetime(2024, 1, 8, 12, 0),
+        ),
+        vac_onset_date=date(2024, 1, 14),
+        ventilator_day_at_onset=6,
+        qualifying_antimicrobials=["vancomycin"],
+        vae_classification="ivac",
+    )
+    return candidate
+
+
+def _cdi(candidate_id: str) -> HAICandidate:
+    candidate = _candidate(candidate_id, HAIType.CDI)
+    candidate._cdi_data = CDICandidate(
+        candidate_id=candidate_id,
+        test_result=CDITestResult(
+            fhir_id=f"test-{candidate_id}",
+            patient_id=f"patient-{candidate_id}",
+            test_date=datetime(2024, 1, 15, 10, 0),
+            test_type="pcr",
+            result="positive",
+        ),
+        admission_date=datetime(2024, 1, 10, 10, 0),
+        specimen_day=6,
+        onset_type="ho",
+    )
+    return candidate
+
+
+class QueryCountingDatabase(HAIDatabase):
+    """HAIDatabase that counts SELECT statements across all its connections."""
+
+    def __init__(self, db_path):
+        self.selects = 0
+        super().__init__(db_path)
+
+    def _get_connection(self) -> sqlite3.Connection:
+        conn = super()._get_connection()
+        conn.set_trace_callback(self._trace)
+        return conn
+
+    def _trace(self, statement: str) -> None:
+        if statement.lstrip().upper().startswith("SELECT"):
+            self.selects += 1
+
+
+class TestCandidateLoading:
+    """Tests for batched loading of type-specific candidate data."""
+
+    @pytest.fixture
+    def db(self, tmp_path):
+        db = QueryCountingDatabase(tmp_path / "hai.db")
+        for i in range(5):
+            db.save_candidate(_ssi(f"ssi-{i}"))
+            db.save_candidate(_vae(f"vae-{i}"))
+            db.save_candidate(_cdi(f"cdi-{i}"))
+            db.save_candidate(_candidate(f"clabsi-{i}", HAIType.CLABSI))
+        return db
+
+    def test_list_query_count_independent_of_size(self, db):
+        """One candidate query plus one detail query per HAI type present."""
+        db.selects = 0
+        candidates = db.get_recent_candidates(limit=100)
+
+        assert len(candidates) == 20
+        assert db.selects == 4
+
+    def test_batched_details_match_single_candidate_load(self, db):
+        """List results carry the same detail data as get_candidate."""
+        for candidate in db.get_recent_candidates(limit=100):
+            single = db.get_candidate(candidate.id)
+            for attr in ("_ssi_data", "_vae_data", "_cdi_data"):
+                assert getattr(candidate, attr, None) == getattr(single, attr, None)
+
+    def test_details_attached_by_type(self, db):
+        """Each candidate gets only its own type's detail data."""
+        by_id = {c.id: c for c in db.get_recent_candidates(limit=100)}
+
+        assert by_id["ssi-3"]._ssi_data.procedure.id == "proc-ssi-3"
+        assert by_id["vae-3"]._vae_data.qualifying_antimicrobials == ["vancomycin"]
+        assert by_id["cdi-3"]._cdi_data.admission_date == datetime(2024, 1, 10, 10, 0)
+        assert not hasattr(by_id["clabsi-3"], "_ssi_data")
+        assert not hasattr(by_id["ssi-3"], "_vae_data")
+
+    def test_single_candidate_api(self, db):
+        """The per-candidate loaders still work on their own."""
+        assert db._load_ssi_data("ssi-1").days_post_op == 10
+        assert db._load_vae_data("vae-1").vae_classification == "ivac"
+        assert db.get_cdi_data("cdi-1").onset_type == "ho"
+        assert db.get_cdi_data("missing") is None
+
+
+class TestConnectionPool:
+    """Tests for the pooled connections HAIDatabase uses."""
+
+    def test_connection_reused_per_thread_with_wal(self, tmp_path):
+        """Each thread gets one WAL-mode connection that is reused across calls."""
+        db = HAIDatabase(tmp_path / "hai.db")
+        conn = db._get_connection()
+
+        assert db._get_connection() is conn
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+
+        other = []
+        thread = threading.Thread(target=lambda: other.append(db._get_connection()))
+        thread.start()
+        thread.join()
+        assert other[0] is not conn
+
+    def test_nested_blocks_commit_once(self, tmp_path):
+        """Only the outermost with block commits or rolls back."""
+        pool = SQLitePool(tmp_path / "pool.db")
+        with pool.connection() as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+
+        with pytest.raises(RuntimeError):
+            with pool.connection() as outer:
+                outer.execute("INSERT INTO t VALUES (1)")
+                with pool.connection() as inner:
+                    inner.execute("INSERT INTO t VALUES (2)")
+                raise RuntimeError("abort")
+
+        reader = sqlite3.connect(tmp_path / "pool.db")
+        assert reader.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+        pool.close_all()
+
+    def test_close_is_noop(self, tmp_path):
+        """Stores that close their connection do not break later calls."""
+        pool = SQLitePool(tmp_path / "pool.db")
+        pool.connection().close()
+
+        assert pool.connection().execute("SELECT 1").fetchone()[0] == 1
+        pool.close_all()
+
+    def test_thread_exit_closes_connection(self, tmp_path):
+        """Connections of finished threads are closed, not kept by the pool."""
+        pool = SQLitePool(tmp_path / "pool.db")
+        pool.connection()
+
+        def work():
+            with pool.connection() as conn:
+                conn.execute("SELECT 1")
+
+        for _ in range(20):
+            thread = threading.Thread(target=work)
+            thread.start()
+            thread.join()
+
+        assert len(pool._connections) == 1
+        pool.close_all()
+
+    def test_nested_commit_deferred_to_outer_block(self, tmp_path):
+        """A store's explicit commit inside an outer block does not end the transaction."""
+        pool = SQLitePool(tmp_path / "pool.db")
+        with pool.connection() as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+
+        with pytest.raises(RuntimeError):
+            with pool.connection() as outer:
+                with pool.connection() as inner:
+                    inner.execute("INSERT INTO t VALUES (1)")
+                    inner.commit()
+                raise RuntimeError("abort")
+
+        with pool.connection() as conn:
+            conn.execute("INSERT INTO t VALUES (2)")
+            conn.commit()
+
+        reader = sqlite3.connect(tmp_path / "pool.db")
+        assert [r[0] for r in reader.execute("SELECT x FROM t")] == [2]
+        pool.close_all()
@@ -0,0 +1,147 @@
+"""Tests for the LLM extraction cache."""
+
+import pytest
+import time
+from datetime import datetime
+from unittest.mock import Mock
+
+from hai_src.extraction.cache import ExtractionCache
+from hai_src.extraction import CLABSIExtractor
+from hai_src.models import ClinicalNote, CultureResult, HAICandidate, HAIType, Patient
+
+
+def _note(content: str, note_id: str = "note-1") -> ClinicalNote:
+    return ClinicalNote(
+        id=note_id,
+        patient_id="patient-123",
+        note_type="progress_note",
+        date=datetime(2024, 1, 15, 10, 0),
+        content=content,
+        source="fhir",
+    )
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ExtractionCache(db_path=tmp_path / "cache.db", ttl_days=30, max_entries=100, enabled=True)
+
+
+class TestExtractionCache:
+    """Tests for ExtractionCache."""
+
+    def test_key_ignores_whitespace_differences(self):
+        """Re-fetched notes with different line endings map to the same key."""
+        a = ExtractionCache.make_key("clabsi", "v1", "model", [_note("Fever  to 39.\r\nLine ok.")], "p")
+        b = ExtractionCache.make_key("clabsi", "v1", "model", [_note("Fever to 39.\nLine ok. ")], "p")
+        assert a == b
+
+    @pytest.mark.parametrize("field, value", [
+        ("hai_type", "ssi"),
+        ("prompt_version", "v2"),
+        ("model", "other-model"),
+        ("content", "Afebrile."),
+    ])
+    def test_key_changes_with_inputs(self, field, value):
+        """Each key component invalidates the cached result."""
+        args = {"hai_type": "clabsi", "prompt_version": "v1", "model": "model", "content": "Fever."}
+        base = ExtractionCache.make_key(
+            args["hai_type"], args["prompt_version"], args["model"], [_note(args["content"])], "p"
+        )
+        args[field] = value
+        changed = ExtractionCache.make_key(
+            args["hai_type"], args["prompt_version"], args["model"], [_note(args["content"])], "p"
+        )
+        assert base != changed
+
+    def test_get_or_call_caches_result(self, cache):
+        """The second identical request is served without calling the LLM."""
+        call = Mock(return_value={"fever": "definite"})
+        notes = [_note("Fever.")]
+
+        first = cache.get_or_call(call, "clabsi", "v1", "model", notes, "prompt")
+        second = cache.get_or_call(call, "clabsi", "v1", "model", notes, "prompt")
+
+        assert first == second == {"fever": "definite"}
+        assert call.call_count == 1
+        stats = cache.get_stats()
+        assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+        assert stats["hit_rate"] == 0.5
+
+    def test_failed_call_not_cached(self, cache):
+        """LLM errors propagate and the next request retries."""
+        call = Mock(side_effect=[RuntimeError("timeout"), {"ok": True}])
+        notes = [_note("Fever.")]
+
+        with pytest.raises(RuntimeError):
+            cache.get_or_call(call, "clabsi", "v1", "model", notes, "prompt")
+        assert cache.get_or_call(call, "clabsi", "v1", "model", notes, "prompt") == {"ok": True}
+        assert call.call_count == 2
+
+    def test_expired_entry_is_a_miss(self, cache):
+        """Entries older than the TTL are not returned."""
+        cache.put("key", {"a": 1})
+        cache.ttl_seconds = 0
+        time.sleep(0.01)
+
+        assert cache.get("key") is None
+        assert cache.misses == 1
+
+    def test_least_recently_used_evicted(self, tmp_path):
+        """Exceeding max_entries evicts the least recently read entries."""
+        cache = ExtractionCache(db_path=tmp_path / "cache.db", max_entries=2, enabled=True)
+        cache.put("a", 1)
+        time.sleep(0.01)
+        cache.put("b", 2)
+        time.sleep(0.01)
+        cache.get("a")
+        time.sleep(0.01)
+        cache.put("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.evictions == 1
+
+    def test_disabled_cache_bypasses(self, tmp_path):
+        """A disabled cache always calls the LLM and creates no database."""
+        cache = ExtractionCache(db_path=tmp_path / "cache.db", enabled=False)
+        call = Mock(return_value={"a": 1})
+
+        cache.get_or_call(call, "clabsi", "v1", "model", [], "prompt")
+        cache.get_or_call(call, "clabsi", "v1", "model", [], "prompt")
+
+        assert call.call_count == 2
+        assert cache.get_stats()["bypassed"] == 2
+        assert not (tmp_path / "cache.db").exists()
+
+
+class TestExtractorCaching:
+    """Tests for extractor use of the cache."""
+
+    def test_clabsi_reextraction_uses_cache(self, cache):
+        """Re-extracting the same candidate and notes skips the LLM."""
+        llm = Mock()
+        llm.model_name = "test-model"
+        llm.generate_structured.return_value = {
+            "clinical_context_summary": "Line infection suspected",
+            "documentation_quality": "adequate",
+        }
+        extractor = CLABSIExtractor(llm_client=llm, cache=cache)
+        candidate = HAICandidate(
+            id="cand-1",
+            hai_type=HAIType.CLABSI,
+            patient=Patient(fhir_id="patient-123", mrn="MRN001", name="Test Patient"),
+            culture=CultureResult(
+                fhir_id="culture-1",
+                collection_date=datetime(2024, 1, 15),
+                organism="Staphylococcus aureus",
+            ),
+            device_days_at_culture=5,
+        )
+        notes = [_note("Febrile overnight, PICC site erythematous.")]
+
+        first = extractor.extract(candidate, notes)
+        second = extractor.extract(candidate, notes)
+
+        assert llm.generate_structured.call_count == 1
+        assert first.clinical_context_summary == second.clinical_context_summary
@@ -0,0 +1,281 @@
+"""Tests for paginated FHIR search and FHIR data source fetching."""
+
+import base64
+import threading
+import pytest
+from datetime import datetime
+from unittest.mock import Mock
+
+import requests
+
+from hai_src.data.fhir_search import FHIRSearch
+from hai_src.data.fhir_source import FHIRCultureSource, FHIRNoteSource
+
+
+BASE_URL = "http://fhir.test/fhir"
+
+
+def _response(payload: dict) -> Mock:
+    response = Mock()
+    response.json.return_value = payload
+    response.raise_for_status.return_value = None
+    return response
+
+
+class FakeSession:
+    """Serves Bundles by URL and records every request."""
+
+    def __init__(self, pages: dict[str, dict], patients: dict[str, dict] | None = None):
+        self.pages = pages
+        self.patients = patients or {}
+        self.calls: list[tuple[str, object]] = []
+
+    def get(self, url, params=None, timeout=None):
+        self.calls.append((url, params))
+        if "/Patient/" in url:
+            patient_id = url.rsplit("/", 1)[-1]
+            if patient_id not in self.patients:
+                raise requests.HTTPError(f"404 for {url}")
+            return _response(self.patients[patient_id])
+        return _response(self.pages[url])
+
+
+def _report(report_id: str, patient_id: str, positive: bool = True) -> dict:
+    return {
+        "resourceType": "DiagnosticReport",
+        "id": report_id,
+        "subject": {"reference": f"Patient/{patient_id}"},
+        "code": {"coding": [{"code": "600-7"}]},
+        "effectiveDateTime": "2024-01-15T10:00:00",
+        "conclusion": "Positive - growth" if positive else "No growth",
+    }
+
+
+def _patient(patient_id: str, mrn: str) -> dict:
+    return {
+        "resourceType": "Patient",
+        "id": patient_id,
+        "identifier": [{"type": {"coding": [{"code": "MR"}]}, "value": mrn}],
+        "name": [{"given": ["Test"], "family": patient_id}],
+    }
+
+
+def _match(resource: dict) -> dict:
+    return {"resource": resource, "search": {"mode": "match"}}
+
+
+def _include(resource: dict) -> dict:
+    return {"resource": resource, "search": {"mode": "include"}}
+
+
+@pytest.fixture
+def paged_session():
+    """Three-page DiagnosticReport search with patients included on page one only."""
+    return FakeSession(
+        pages={
+            f"{BASE_URL}/DiagnosticReport": {
+                "entry": [
+                    _match(_report("r1", "p1")),
+                    _include(_patient("p1", "MRN001")),
+                    _include(_patient("p2", "MRN002")),
+                ],
+                "link": [{"relation": "next", "url": f"{BASE_URL}?_getpages=abc&page=2"}],
+            },
+            f"{BASE_URL}?_getpages=abc&page=2": {
+                "entry": [
+                    _match(_report("r2", "p2")),
+                    _match(_report("r3", "p3", positive=False)),
+                ],
+                "link": [{"relation": "next", "url": "?_getpages=abc&page=3"}],
+            },
+            f"{BASE_URL}/?_getpages=abc&page=3": {
+                "entry": [_match(_report("r4", "p4"))],
+                "link": [{"relation": "self", "url": "?_getpages=abc&page=3"}],
+            },
+        },
+        patients={"p4": _patient("p4", "MRN004")},
+    )
+
+
+class TestFHIRSearch:
+    """Tests for FHIRSearch."""
+
+    @pytest.mark.parametrize("max_workers", [1, 4])
+    def test_iter_resources_follows_next_links(self, paged_session, max_workers):
+        """All pages are read and only search matches are yielded."""
+        search = FHIRSearch(paged_session, BASE_URL, max_workers=max_workers)
+
+        ids = [r["id"] for r in search.iter_resources("DiagnosticReport", {"code": "600-7"})]
+
+        assert ids == ["r1", "r2", "r3", "r4"]
+
+    def test_default_page_size_applied(self, paged_session):
+        """_count defaults to the configured page size unless the caller sets it."""
+        search = FHIRSearch(paged_session, BASE_URL, page_size=25, max_workers=1)
+
+        list(search.iter_resources("DiagnosticReport", {"code": "600-7"}))
+        list(search.iter_resources("DiagnosticReport", {"code": "600-7", "_count": "5"}))
+        list(search.iter_resources("DiagnosticReport", [("code", "600-7")]))
+
+        first_page_params = [
+            params for url, params in paged_session.calls
+            if url == f"{BASE_URL}/DiagnosticReport"
+        ]
+        assert first_page_params[0]["_count"] == 25
+        assert first_page_params[1]["_count"] == "5"
+        assert ("_count", 25) in first_page_params[2]
+
+    def test_limit_stops_paging(self, paged_session):
+        """No further pages are requested once the limit is reached."""
+        search = FHIRSearch(paged_session, BASE_URL, max_workers=1)
+
+        ids = [r["id"] for r in search.iter_resources("DiagnosticReport", limit=1)]
+
+        assert ids == ["r1"]
+        assert len(paged_session.calls) == 1
+
+    def test_iter_with_patients_resolves_across_pages(self, paged_session):
+        """Patients included on earlier pages resolve later matches; others are fetched."""
+        search = FHIRSearch(paged_session, BASE_URL, max_workers=4)
+
+        pairs = list(search.iter_with_patients("DiagnosticReport"))
+
+        resolved = {report["id"]: (patient or {}).get("id") for report, patient in pairs}
+        assert resolved == {"r1": "p1", "r2": "p2", "r3": None, "r4": "p4"}
+        fetched = [url for url, _ in paged_session.calls if "/Patient/" in url]
+        assert sorted(fetched) == [f"{BASE_URL}/Patient/p3", f"{BASE_URL}/Patient/p4"]
+
+    def test_iter_with_patients_skips_fetch_for_dropped_resources(self, paged_session):
+        """Resources rejected by parse never trigger a Patient read."""
+        search = FHIRSearch(paged_session, BASE_URL, max_workers=1)
+
+        def positive_only(resource):
+            return resource if "Positive" in resource["conclusion"] else None
+
+        pairs = list(search.iter_with_patients("DiagnosticReport", parse=positive_only))
+
+        assert [report["id"] for report, _ in pairs] == ["r1", "r2", "r4"]
+        fetched = [url for url, _ in paged_session.calls if "/Patient/" in url]
+        assert fetched == [f"{BASE_URL}/Patient/p4"]
+
+    def test_repeated_next_link_stops(self):
+        """A server that keeps returning the same next link does not loop forever."""
+        session = FakeSession(
+            pages={
+                f"{BASE_URL}/Observation": {
+                    "entry": [_match({"resourceType": "Observation", "id": "o1"})],
+                    "link": [{"relation": "next", "url": f"{BASE_URL}/page2"}],
+                },
+                f"{BASE_URL}/page2": {
+                    "entry": [_match({"resourceType": "Observation", "id": "o2"})],
+                    "link": [{"relation": "next", "url": f"{BASE_URL}/page2"}],
+                },
+            }
+        )
+        search = FHIRSearch(session, BASE_URL, max_workers=1)
+
+        ids = [r["id"] for r in search.iter_resources("Observation")]
+
+        assert ids == ["o1", "o2"]
+
+
+class TestFHIRCultureSourcePaging:
+    """Tests for FHIR culture retrieval across multiple pages."""
+
+    def test_positive_blood_cultures_past_first_page(self, paged_session):
+        """Positive cultures on later pages are no longer dropped."""
+        source = FHIRCultureSource(base_url=BASE_URL, max_workers=2)
+        source.session = paged_session
+        source.search.session = paged_session
+
+        results = source.get_positive_blood_cultures(
+            datetime(2024, 1, 1), datetime(2024, 1, 31)
+        )
+
+        assert [(p.mrn, c.fhir_id) for p, c in results] == [
+            ("MRN001", "r1"),
+            ("MRN002", "r2"),
+            ("MRN004", "r4"),
+        ]
+
+
+def _document(doc_id: str, attachment: dict) -> dict:
+    return {
+        "resourceType": "DocumentReference",
+        "id": doc_id,
+        "subject": {"reference": "Patient/p1"},
+        "type": {"coding": [{"display": "Progress Note"}]},
+        "date": "2024-01-15T10:00:00",
+        "content": [{"attachment": attachment}],
+    }
+
+
+class BinarySession(FakeSession):
+    """FakeSession that also serves Binary text and records the fetching threads."""
+
+    def __init__(self, pages: dict[str, dict], binaries: dict[str, str]):
+        super().__init__(pages)
+        self.binaries = binaries
+        self.binary_threads: set[str] = set()
+
+    def get(self, url, params=None, timeout=None):
+        if "/Binary/" in url:
+            self.calls.append((url, params))
+            self.binary_threads.add(threading.current_thread().name)
+            if url not in self.binaries:
+                raise requests.HTTPError(f"404 for {url}")
+            response = Mock()
+            response.text = self.binaries[url]
+            response.raise_for_status.return_value = None
+            return response
+        return super().get(url, params, timeout)
+
+
+class TestFHIRNoteSourceContent:
+    """Tests for concurrent DocumentReference content fetching."""
+
+    @pytest.fixture
+    def note_session(self):
+        inline = base64.b64encode(b"Inline note text").decode()
+        return BinarySession(
+            pages={
+                f"{BASE_URL}/DocumentReference": {
+                    "entry": [
+                        _match(_document("d1", {"url": "Binary/b1"})),
+                        _match(_document("d2", {"data": inline})),
+                        _match(_document("d3", {"url": f"{BASE_URL}/Binary/missing"})),
+                        _match(_document("d4", {"url": "/Binary/b4"})),
+                    ],
+                },
+            },
+            binaries={
+                f"{BASE_URL}/Binary/b1": "Binary note one",
+                f"{BASE_URL}/Binary/b4": "Binary note four",
+            },
+        )
+
+    @pytest.mark.parametrize("fetch_workers", [1, 4])
+    def test_notes_keep_search_order(self, note_session, fetch_workers):
+        """Inline and fetched content land on the right notes; failed fetches are dropped."""
+        source = FHIRNoteSource(base_url=BASE_URL, max_workers=1, fetch_workers=fetch_workers)
+        source.session = note_session
+        source.search.session = note_session
+
+        notes = source.get_notes_for_patient("p1", datetime(2024, 1, 1), datetime(2024, 1, 31))
+
+        assert [(n.id, n.content) for n in notes] == [
+            ("d1", "Binary note one"),
+            ("d2", "Inline note text"),
+            ("d4", "Binary note four"),
+        ]
+
+    def test_attachments_fetched_off_main_thread(self, note_session):
+        """With fetch workers, Binary downloads run on the pool."""
+        source = FHIRNoteSource(base_url=BASE_URL, max_workers=1, fetch_workers=4)
+        source.session = note_session
+        source.search.session = note_session
+
+        source.get_notes_for_patient("p1", datetime(2024, 1, 1), datetime(2024, 1, 31))
+
+        assert note_session.binary_threads
+        assert threading.main_thread().name not in note_session.binary_threads
@@ -0,0 +1,83 @@
+"""Tests for MetricsAggregator snapshot backfills."""
+
+import sqlite3
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Repo root, for the shared common package
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from common.metrics_store import MetricsStore
+from common.metrics_store.aggregator import MetricsAggregator
+from common.metrics_store.models import DailySnapshot
+
+
+@pytest.fixture
+def outbreak_db(tmp_path):
+    """Outbreak database with two active clusters."""
+    path = tmp_path / "outbreak.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE outbreak_clusters (id TEXT, status TEXT)")
+        conn.execute("CREATE TABLE outbreak_alerts (id TEXT, created_at TEXT)")
+        conn.executemany(
+            "INSERT INTO outbreak_clusters VALUES (?, ?)",
+            [("c1", "active"), ("c2", "investigating"), ("c3", "resolved")],
+        )
+    return SimpleNamespace(db_path=str(path))
+
+
+@pytest.fixture
+def aggregator(tmp_path, outbreak_db, monkeypatch):
+    """Aggregator reading only the outbreak database."""
+    aggregator = MetricsAggregator(metrics_store=MetricsStore(str(tmp_path / "metrics.db")))
+    for getter in (
+        "_get_alert_store", "_get_hai_db", "_get_adherence_db", "_get_indication_db",
+        "_get_mdro_db", "_get_surgical_db", "_get_llm_tracker",
+    ):
+        monkeypatch.setattr(aggregator, getter, lambda: None)
+    monkeypatch.setattr(aggregator, "_get_outbreak_db", lambda: outbreak_db)
+    return aggregator
+
+
+class TestBackfillSnapshots:
+    """Tests for MetricsAggregator.backfill_snapshots."""
+
+    def test_current_counts_only_recorded_from_yesterday(self, aggregator):
+        """Active cluster counts are not stamped on past dates."""
+        yesterday = date.today() - timedelta(days=1)
+
+        snapshots = aggregator.backfill_snapshots(yesterday - timedelta(days=3))
+
+        assert [s.outbreak_clusters_active for s in snapshots] == [None, None, None, 2]
+
+    def test_backfill_keeps_existing_current_counts(self, aggregator):
+        """Backfilling over a stored snapshot keeps its historical counts."""
+        store = aggregator.metrics_store
+        past = date.today() - timedelta(days=30)
+        store.save_daily_snapshot(DailySnapshot(
+            snapshot_date=past,
+            bundle_episodes_active=7,
+            outbreak_clusters_active=5,
+            alerts_created=1,
+        ))
+
+        aggregator.backfill_snapshots(past, past + timedelta(days=1))
+
+        saved = store.get_daily_snapshot(past)
+        assert saved.outbreak_clusters_active == 5
+        assert saved.bundle_episodes_active == 7
+        assert saved.alerts_created == 0
+        assert store.get_daily_snapshot(past + timedelta(days=1)).outbreak_clusters_active is None
+
+    def test_snapshot_id_stable_on_update(self, aggregator):
+        """Re-saving a snapshot updates the existing row."""
+        store = aggregator.metrics_store
+        first = store.save_daily_snapshot(DailySnapshot(snapshot_date=date(2026, 1, 1)))
+        second = store.save_daily_snapshot(DailySnapshot(snapshot_date=date(2026, 1, 1), alerts_created=3))
+
+        assert first == second
+        assert store.get_daily_snapshot(date(2026, 1, 1)).alerts_created == 3
@@ -0,0 +1,340 @@
+"""Tests for HAIMonitor classification of pending candidates."""
+
+import pytest
+import sys
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import Mock
+
+# Repo root, for the shared common package
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from hai_src.db import HAIDatabase
+from hai_src.models import (
+    Patient,
+    CultureResult,
+    HAICandidate,
+    HAIType,
+    CandidateStatus,
+    Classification,
+    ClassificationDecision,
+    ClinicalNote,
+)
+from hai_src.monitor import HAIMonitor
+from hai_src.notes.retriever import NoteRetriever
+
+
+def _candidate(index: int, collection_date: datetime = datetime(2024, 1, 15, 10, 0)) -> HAICandidate:
+    return HAICandidate(
+        id=f"cand-{index:03d}",
+        hai_type=HAIType.CLABSI,
+        patient=Patient(fhir_id=f"patient-{index}", mrn=f"MRN{index:03d}", name="Test Patient"),
+        culture=CultureResult(
+            fhir_id=f"culture-{index}",
+            collection_date=collection_date,
+            organism="Staphylococcus aureus",
+            is_positive=True,
+        ),
+        device_days_at_culture=5,
+    )
+
+
+def _note(note_id: str, content: str) -> ClinicalNote:
+    return ClinicalNote(
+        id=note_id,
+        patient_id="patient",
+        note_type="progress_note",
+        date=datetime.now() - timedelta(days=1),
+        content=content,
+        source="fhir",
+    )
+
+
+class FakeClassifier:
+    """Classifier that records the threads it runs on."""
+
+    def __init__(self, fail_ids: set[str] | None = None):
+        self.fail_ids = fail_ids or set()
+        self.threads: set[str] = set()
+        self.lock = threading.Lock()
+
+    def classify(self, candidate, notes):
+        with self.lock:
+            self.threads.add(threading.current_thread().name)
+        if candidate.id in self.fail_ids:
+            raise RuntimeError("LLM unavailable")
+        return Classification(
+            id=str(uuid.uuid4()),
+            candidate_id=candidate.id,
+            decision=ClassificationDecision.HAI_CONFIRMED,
+            confidence=0.9,
+        )
+
+
+class TestClassifyPending:
+    """Tests for HAIMonitor.classify_pending."""
+
+    @pytest.fixture
+    def db(self, tmp_path):
+        db = HAIDatabase(tmp_path / "hai.db")
+        for i in range(7):
+            db.save_candidate(_candidate(i))
+        return db
+
+    @pytest.fixture
+    def monitor(self, db):
+        monitor = HAIMonitor(db=db, alert_store=Mock())
+        monitor._note_retriever = Mock()
+        monitor._note_retriever.get_notes_for_candidate.return_value = []
+        return monitor
+
+    @pytest.mark.parametrize("workers", [1, 3])
+    def test_classifies_and_saves_all(self, monitor, db, workers, monkeypatch):
+        """Serial and worker-pool modes save the same results."""
+        monkeypatch.setattr("hai_src.monitor.Config.CLASSIFY_COMMIT_BATCH", 3)
+        monitor._classifiers[HAIType.CLABSI] = FakeClassifier()
+        pending_order = [c.id for c in db.get_candidates_by_status(CandidateStatus.PENDING)]
+
+        results = monitor.classify_pending(workers=workers)
+
+        assert results["classified"] == 7
+        assert results["errors"] == 0
+        assert results["by_decision"] == {"hai_confirmed": 7}
+        assert [d["candidate_id"] for d in results["details"]] == pending_order
+        assert set(results["timing"]) == {"notes", "classify", "save", "total"}
+        assert db.get_candidates_by_status(CandidateStatus.PENDING) == []
+        assert len(db.get_candidates_by_status(CandidateStatus.PENDING_REVIEW)) == 7
+        assert len(db.get_pending_reviews()) == 7
+
+    def test_worker_pool_runs_classifier_off_main_thread(self, monitor):
+        """Classification runs on the classify pool when workers > 1."""
+        classifier = FakeClassifier()
+        monitor._classifiers[HAIType.CLABSI] = classifier
+
+        monitor.classify_pending(workers=2)
+
+        assert classifier.threads
+        assert all(name.startswith("hai-classify") for name in classifier.threads)
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_classifier_load_failure_only_fails_its_candidates(self, monitor, db, workers, monkeypatch):
+        """A classifier that cannot be built fails its own candidates, not the run."""
+        cdi = _candidate(7)
+        cdi.hai_type = HAIType.CDI
+        db.save_candidate(cdi)
+        monitor._classifiers[HAIType.CLABSI] = FakeClassifier()
+
+        def build(hai_type):
+            raise RuntimeError(f"no model for {hai_type.value}")
+
+        monkeypatch.setattr(monitor, "_build_classifier", build)
+
+        results = monitor.classify_pending(workers=workers)
+
+        assert results["classified"] == 7
+        assert results["errors"] == 1
+        assert [c.id for c in db.get_candidates_by_status(CandidateStatus.PENDING)] == ["cand-007"]
+
+    def test_worker_pool_counts_failures(self, monitor, db):
+        """A failed classification is counted and leaves its candidate pending."""
+        monitor._classifiers[HAIType.CLABSI] = FakeClassifier(fail_ids={"cand-002"})
+
+        results = monitor.classify_pending(workers=2)
+
+        assert results["classified"] == 6
+        assert results["errors"] == 1
+        pending = db.get_candidates_by_status(CandidateStatus.PENDING)
+        assert [c.id for c in pending] == ["cand-002"]
+
+    def test_worker_pool_dry_run_saves_nothing(self, monitor, db):
+        """Dry run classifies without writing results."""
+        monitor._classifiers[HAIType.CLABSI] = FakeClassifier()
+
+        results = monitor.classify_pending(workers=2, dry_run=True)
+
+        assert results["classified"] == 7
+        assert len(db.get_candidates_by_status(CandidateStatus.PENDING)) == 7
+        assert db.get_pending_reviews() == []
+
+
+class TestRequeueOnNewNotes:
+    """Tests for HAIMonitor.requeue_on_new_notes."""
+
+    @pytest.fixture
+    def db(self, tmp_path):
+        db = HAIDatabase(tmp_path / "hai.db")
+        recent = datetime.now() - timedelta(days=2)
+        for i in range(3):
+            db.save_candidate(_candidate(i, collection_date=recent))
+        return db
+
+    @pytest.fixture
+    def notes(self):
+        """Current notes per patient, editable by each test."""
+        return {f"patient-{i}": [_note(f"note-{i}", "Febrile, line site red.")] for i in range(3)}
+
+    @pytest.fixture
+    def monitor(self, db, notes):
+        monitor = HAIMonitor(db=db, alert_store=Mock())
+        monitor._note_retriever = Mock()
+        monitor._note_retriever.note_window.side_effect = NoteRetriever.note_window
+        monitor._note_retriever.has_notes_since.return_value = True
+        monitor._note_retriever.get_notes_for_candidate.side_effect = (
+            lambda candidate: list(notes[candidate.patient.fhir_id])
+        )
+        monitor._classifiers[HAIType.CLABSI] = FakeClassifier()
+        return monitor
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_only_candidates_with_new_notes_requeued(self, monitor, db, notes, workers):
+        """A new note re-queues its candidate; unchanged candidates stay in review."""
+        monitor.classify_pending(workers=workers)
+        notes["patient-1"].append(_note("note-1b", "Line removed, tip sent for culture."))
+
+        results = monitor.requeue_on_new_notes()
+
+        assert results == {"checked": 3, "requeued": 1, "unchanged": 2, "baselined": 0}
+        assert [c.id for c in db.get_candidates_by_status(CandidateStatus.PENDING)] == ["cand-001"]
+
+    def test_edited_note_requeued_whitespace_ignored(self, monitor, db, notes):
+        """Edited note text counts as new; reformatting alone does not."""
+        monitor.classify_pending()
+        notes["patient-0"] = [_note("note-0", "Febrile,\r\n line site red. ")]
+        notes["patient-2"] = [_note("note-2", "Afebrile, line site clean.")]
+
+        results = monitor.requeue_on_new_notes()
+
+        assert results["requeued"] == 1
+        assert [c.id for c in db.get_candidates_by_status(CandidateStatus.PENDING)] == ["cand-002"]
+
+    def test_reclassification_supersedes_old_review(self, monitor, db, notes):
+        """Reclassifying a re-queued candidate leaves one pending review and a fresh watermark."""
+        monitor.classify_pending()
+        notes["patient-0"].append(_note("note-0b", "ID consult: treat as CLABSI."))
+
+        monitor.requeue_on_new_notes()
+        monitor.classify_pending()
+
+        assert len(db.get_pending_reviews()) == 3
+        assert monitor.requeue_on_new_notes()["requeued"] == 0
+
+    def test_missing_watermark_baselined(self, monitor, db):
+        """Candidates classified before watermarks existed get a baseline, not a re-run."""
+        for i in range(3):
+            db.update_candidate_status(f"cand-{i:03d}", CandidateStatus.PENDING_REVIEW)
+
+        first = monitor.requeue_on_new_notes()
+        second = monitor.requeue_on_new_notes()
+
+        assert first["baselined"] == 3
+        assert second == {"checked": 3, "requeued": 0, "unchanged": 3, "baselined": 0}
+        assert db.get_candidates_by_status(CandidateStatus.PENDING) == []
+
+    def test_closed_windows_not_checked(self, monitor, db, monkeypatch):
+        """Candidates past the recheck period are skipped without fetching notes."""
+        monkeypatch.setattr("hai_src.monitor.Config.NOTE_RECHECK_DAYS", 0)
+        db.save_candidate(_candidate(9))
+        db.update_candidate_status("cand-009", CandidateStatus.PENDING_REVIEW)
+
+        results = monitor.requeue_on_new_notes()
+
+        assert results["checked"] == 0
+        monitor._note_retriever.get_notes_for_candidate.assert_not_called()
+
+    def test_dry_run_changes_nothing(self, monitor, db, notes):
+        """Dry run reports re-queues without changing status."""
+        monitor.classify_pending()
+        notes["patient-0"].append(_note("note-0b", "New note."))
+
+        results = monitor.requeue_on_new_notes(dry_run=True)
+
+        assert results["requeued"] == 1
+        assert db.get_candidates_by_status(CandidateStatus.PENDING) == []
+
+    def test_probe_without_changes_skips_fetch(self, monitor, db):
+        """Candidates whose probe finds nothing new are not refetched."""
+        monitor.classify_pending()
+        monitor._note_retriever.get_notes_for_candidate.reset_mock()
+        monitor._note_retriever.has_notes_since.return_value = False
+
+        results = monitor.requeue_on_new_notes()
+
+        assert results == {"checked": 3, "requeued": 0, "unchanged": 3, "baselined": 0}
+        monitor._note_retriever.get_notes_for_candidate.assert_not_called()
+        since = monitor._note_retriever.has_notes_since.call_args.args[1]
+        assert since == db.get_note_watermarks(["cand-000"])["cand-000"].updated_at
+
+    def test_unchanged_fetch_advances_watermark(self, monitor, db):
+        """A probe hit with no content change moves the watermark forward."""
+        monitor.classify_pending()
+        before = db.get_note_watermarks(["cand-000"])["cand-000"]
+
+        monitor.requeue_on_new_notes()
+
+        after = db.get_note_watermarks(["cand-000"])["cand-000"]
+        assert after.updated_at > before.updated_at
+        assert after.content_hashes == before.content_hashes
+
+    @staticmethod
+    def _edit_during_fetch(monitor, notes, updated):
+        """Make the next cand-000 fetch race a note edit that its result misses."""
+        def fetch(candidate):
+            fetched = list(notes[candidate.patient.fhir_id])
+            if candidate.id == "cand-000" and "edit" not in updated:
+                notes["patient-0"].append(_note("note-0b", "Repeat blood culture positive."))
+                updated["edit"] = updated["patient-0"] = datetime.now()
+            return fetched
+
+        monitor._note_retriever.get_notes_for_candidate.side_effect = fetch
+        monitor._note_retriever.has_notes_since.side_effect = (
+            lambda candidate, since: updated.get(candidate.patient.fhir_id, datetime.min) > since
+        )
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_note_edited_during_classify_fetch_is_probed(self, monitor, db, notes, workers):
+        """A note updated between the classify fetch and the watermark save re-queues."""
+        updated = {}
+        self._edit_during_fetch(monitor, notes, updated)
+
+        monitor.classify_pending(workers=workers)
+        results = monitor.requeue_on_new_notes()
+
+        assert db.get_note_watermarks(["cand-000"])["cand-000"].updated_at < updated["edit"]
+        assert results["requeued"] == 1
+        assert [c.id for c in db.get_candidates_by_status(CandidateStatus.PENDING)] == ["cand-000"]
+
+    def test_note_edited_during_recheck_fetch_is_probed(self, monitor, db, notes):
+        """A note updated during an unchanged recheck fetch is probed for next cycle."""
+        monitor.classify_pending()
+        # Metadata-only update: the probe fires but the content is unchanged
+        updated = {"patient-0": datetime.now()}
+        self._edit_during_fetch(monitor, notes, updated)
+
+        first = monitor.requeue_on_new_notes()
+        second = monitor.requeue_on_new_notes()
+
+        assert first["requeued"] == 0
+        assert second["requeued"] == 1
+        assert [c.id for c in db.get_candidates_by_status(CandidateStatus.PENDING)] == ["cand-000"]
+
+    def test_tz_aware_collection_date(self, monitor, db, notes):
+        """FHIR collection dates with an offset compare against the recheck cutoff."""
+        notes["patient-7"] = [_note("note-7", "Febrile.")]
+        db.save_candidate(_candidate(7, collection_date=datetime.now(timezone.utc) - timedelta(days=2)))
+        db.update_candidate_status("cand-007", CandidateStatus.PENDING_REVIEW)
+
+        results = monitor.requeue_on_new_notes()
+
+        assert results["baselined"] == 1
+
+    def test_recheck_failure_does_not_block_classification(self, monitor, db, monkeypatch):
+        """The full pipeline still classifies when the note recheck raises."""
+        monkeypatch.setattr(monitor, "run_once", Mock(return_value=0))
+        monkeypatch.setattr(monitor, "requeue_on_new_notes", Mock(side_effect=TypeError("boom")))
+
+        results = monitor.run_full_pipeline()
+
+        assert results["recheck"] == {"error": "boom"}
+        assert results["classification"]["classified"] == 3
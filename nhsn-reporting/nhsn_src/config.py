@@ -34,6 +34,14 @@ class Config:
     FHIR_BASE_URL: str = os.getenv("FHIR_BASE_URL", "http://localhost:8081/fhir")
     CLARITY_CONNECTION_STRING: str | None = os.getenv("CLARITY_CONNECTION_STRING")
 
+    # --- Clarity Extraction ---
+    # Rows per chunk when streaming Clarity extracts (0 = read whole result sets)
+    CLARITY_CHUNKSIZE: int = int(os.getenv("CLARITY_CHUNKSIZE", "0"))
+    # Directory for the Parquet cache of raw monthly extracts (unset = no cache)
+    CLARITY_CACHE_DIR: str | None = os.getenv("CLARITY_CACHE_DIR")
+    # Days after month end before a month's extract is cached
+    CLARITY_CACHE_SETTLE_DAYS: int = int(os.getenv("CLARITY_CACHE_SETTLE_DAYS", "7"))
+
     # --- AU Reporting ---
     # Default location types to include in AU reporting
     AU_LOCATION_TYPES: str = os.getenv("AU_LOCATION_TYPES", "ICU,Ward,NICU,BMT")
@@ -397,6 +397,31 @@ class ARDataExtractor:
 
         return resistance_df
 
+    @staticmethod
+    def _parse_resistance_pattern(resistance_pattern: str) -> list[list[tuple[str, str]]]:
+        """Parse a resistance pattern into OR groups of AND conditions.
+
+        OR conditions are split by ``|`` and AND conditions by ``,``, so
+        "MEM:R|ETP:R" becomes [[("MEM", "R")], [("ETP", "R")]]. Antibiotic
+        codes are upper-cased; conditions without a ``:`` are ignored.
+
+        Args:
+            resistance_pattern: Pattern defining resistance (e.g., 'OXA:R').
+
+        Returns:
+            List of OR groups, each a list of (antibiotic_code, interpretation).
+        """
+        groups = []
+        for or_cond in resistance_pattern.split("|"):
+            conditions = []
+            for cond in or_cond.split(","):
+                if ":" not in cond:
+                    continue
+                abx_code, required_interp = cond.split(":")
+                conditions.append((abx_code.strip().upper(), required_interp.strip()))
+            groups.append(conditions)
+        return groups
+
     def _check_phenotype_match(
         self,
         organism_name: str,
@@ -406,6 +431,9 @@ class ARDataExtractor:
     ) -> bool:
         """Check if an isolate matches a resistance phenotype definition.
 
+        Single-isolate reference implementation of the rules applied in bulk
+        by calculate_phenotypes().
+
         Args:
             organism_name: Name of the organism.
             susceptibilities: Susceptibility results for the isolate.
@@ -418,32 +446,20 @@ class ARDataExtractor:
         # Check organism match
         if organism_pattern:
             # Handle SQL LIKE patterns
-            regex_pattern = organism_pattern.replace("%", ".*").replace("|", "|")
+            regex_pattern = organism_pattern.replace("%", ".*")
             if not re.search(regex_pattern, organism_name, re.IGNORECASE):
                 return False
 
         # Check resistance pattern
         if resistance_pattern and not susceptibilities.empty:
-            # Parse resistance requirements (e.g., "OXA:R" or "MEM:R|ETP:R")
-            # OR conditions split by |
-            or_conditions = resistance_pattern.split("|")
+            codes = susceptibilities["antibiotic_code"].str.upper()
 
-            for or_cond in or_conditions:
-                # AND conditions split by ,
-                and_conditions = or_cond.split(",")
+            for conditions in self._parse_resistance_pattern(resistance_pattern):
                 all_met = True
 
-                for cond in and_conditions:
-                    if ":" not in cond:
-                        continue
-                    abx_code, required_interp = cond.split(":")
-                    abx_code = abx_code.strip()
-                    required_interp = required_interp.strip()
-
+                for abx_code, required_interp in conditions:
                     # Find matching susceptibility
-                    matching = susceptibilities[
-                        susceptibilities["antibiotic_code"].str.upper() == abx_code.upper()
-                    ]
+                    matching = susceptibilities[codes == abx_code]
 
                     if matching.empty:
                         all_met = False
@@ -461,6 +477,78 @@ class ARDataExtractor:
 
         return True
 
+    def _build_interpretation_matrix(self, suscept_df: pd.DataFrame) -> pd.DataFrame:
+        """Pivot susceptibility rows into an isolate x antibiotic matrix.
+
+        Args:
+            suscept_df: DataFrame from get_susceptibility_results().
+
+        Returns:
+            DataFrame indexed by isolate_id with one column per upper-cased
+            antibiotic code holding the interpretation ('S', 'I', 'R'). When an
+            isolate has several results for the same code, the first one (in
+            query order) wins, as in _check_phenotype_match().
+        """
+        if suscept_df.empty or "antibiotic_code" not in suscept_df.columns:
+            return pd.DataFrame()
+
+        df = suscept_df[["isolate_id", "antibiotic_code", "interpretation"]].copy()
+        df["antibiotic_code"] = df["antibiotic_code"].str.upper()
+        df = df.dropna(subset=["antibiotic_code"])
+        df = df.drop_duplicates(subset=["isolate_id", "antibiotic_code"], keep="first")
+
+        return df.pivot(index="isolate_id", columns="antibiotic_code", values="interpretation")
+
+    def _phenotype_masks(
+        self,
+        isolates: pd.DataFrame,
+        interpretations: pd.DataFrame,
+        has_results: pd.Series,
+        organism_pattern: str,
+        resistance_pattern: str,
+    ) -> tuple[pd.Series, pd.Series]:
+        """Evaluate one phenotype definition against all isolates at once.
+
+        Args:
+            isolates: First isolates (one row per isolate).
+            interpretations: Interpretation matrix aligned to isolates.index.
+            has_results: Boolean Series, True where the isolate has any
+                susceptibility results.
+            organism_pattern: Regex pattern for matching organism.
+            resistance_pattern: Pattern defining resistance (e.g., 'OXA:R').
+
+        Returns:
+            Tuple of (eligible, matched) boolean Series indexed like isolates.
+        """
+        organisms = isolates["organism_name"]
+
+        if organism_pattern:
+            # Compile once and test each distinct organism name only once
+            regex = re.compile(organism_pattern.replace("%", ".*"), re.IGNORECASE)
+            hits = [name for name in organisms.dropna().unique() if regex.search(name)]
+            eligible = organisms.isin(hits)
+        else:
+            eligible = pd.Series(True, index=isolates.index)
+
+        if not resistance_pattern:
+            return eligible, eligible
+
+        resistant = pd.Series(False, index=isolates.index)
+        for conditions in self._parse_resistance_pattern(resistance_pattern):
+            group = pd.Series(True, index=isolates.index)
+            for abx_code, required_interp in conditions:
+                if abx_code not in interpretations.columns:
+                    group[:] = False
+                    break
+                group &= interpretations[abx_code] == required_interp
+            resistant |= group
+
+        # Isolates without any susceptibility results are not excluded,
+        # matching _check_phenotype_match()
+        resistant |= ~has_results
+
+        return eligible, eligible & resistant
+
     def calculate_phenotypes(
         self,
         locations: list[str] | None = None,
@@ -470,6 +558,10 @@ class ARDataExtractor:
     ) -> pd.DataFrame:
         """Calculate resistance phenotype prevalence (MRSA, VRE, ESBL, CRE, etc.).
 
+        Susceptibilities are pivoted once into an isolate x antibiotic matrix
+        and each NHSN_PHENOTYPE_MAP definition is evaluated as a boolean mask
+        over all isolates, so cost is linear in the number of isolates.
+
         Args:
             locations: List of NHSN location codes.
             year: Year for quarterly reporting.
@@ -516,53 +608,57 @@ class ARDataExtractor:
             logger.error(f"Phenotype query failed: {e}")
             return pd.DataFrame()
 
+        # Align the interpretation matrix to the isolate rows once
+        matrix = self._build_interpretation_matrix(suscept_df)
+        interpretations = matrix.reindex(first_isolates["isolate_id"]).set_axis(
+            first_isolates.index
+        )
+        if suscept_df.empty or "isolate_id" not in suscept_df.columns:
+            has_results = pd.Series(False, index=first_isolates.index)
+        else:
+            has_results = first_isolates["isolate_id"].isin(suscept_df["isolate_id"])
+
+        # One boolean column per phenotype definition
+        phenotype_defs = list(phenotypes.itertuples(index=False))
+        eligible = pd.DataFrame(index=first_isolates.index)
+        matched = pd.DataFrame(index=first_isolates.index)
+        for pos, pheno in enumerate(phenotype_defs):
+            eligible[pos], matched[pos] = self._phenotype_masks(
+                first_isolates,
+                interpretations,
+                has_results,
+                pheno.organism_pattern or "",
+                pheno.resistance_pattern or "",
+            )
+
+        # Count per location (in order of first appearance)
+        location_codes = first_isolates["nhsn_location_code"]
+        eligible_counts = eligible.groupby(location_codes, sort=False).sum()
+        matched_counts = matched.groupby(location_codes, sort=False).sum()
+
+        quarter_str = f"{year}-Q{quarter}"
         results = []
 
-        # For each location and phenotype, calculate prevalence
-        for loc in first_isolates["nhsn_location_code"].unique():
-            loc_isolates = first_isolates[first_isolates["nhsn_location_code"] == loc]
-            quarter_str = f"{year}-Q{quarter}"
-
-            for _, pheno in phenotypes.iterrows():
-                phenotype_matches = 0
-                eligible_isolates = 0
-
-                for _, isolate in loc_isolates.iterrows():
-                    # Get susceptibilities for this isolate
-                    iso_suscept = suscept_df[suscept_df["isolate_id"] == isolate["isolate_id"]]
-
-                    # Check organism eligibility
-                    org_pattern = pheno["organism_pattern"] or ""
-                    if org_pattern:
-                        regex_pattern = org_pattern.replace("%", ".*")
-                        if not re.search(regex_pattern, isolate["organism_name"], re.IGNORECASE):
-                            continue
-
-                    eligible_isolates += 1
-
-                    # Check phenotype match
-                    if self._check_phenotype_match(
-                        isolate["organism_name"],
-                        iso_suscept,
-                        pheno["organism_pattern"] or "",
-                        pheno["resistance_pattern"] or "",
-                    ):
-                        phenotype_matches += 1
-
-                if eligible_isolates > 0:
-                    results.append(
-                        {
-                            "nhsn_location_code": loc,
-                            "quarter": quarter_str,
-                            "phenotype_code": pheno["phenotype_code"],
-                            "phenotype_name": pheno["phenotype_name"],
-                            "eligible_isolates": eligible_isolates,
-                            "phenotype_isolates": phenotype_matches,
-                            "percent_positive": round(
-                                phenotype_matches / eligible_isolates * 100, 1
-                            ),
-                        }
-                    )
+        for loc in eligible_counts.index:
+            for pos, pheno in enumerate(phenotype_defs):
+                eligible_isolates = int(eligible_counts.at[loc, pos])
+                if eligible_isolates == 0:
+                    continue
+
+                phenotype_matches = int(matched_counts.at[loc, pos])
+                results.append(
+                    {
+                        "nhsn_location_code": loc,
+                        "quarter": quarter_str,
+                        "phenotype_code": pheno.phenotype_code,
+                        "phenotype_name": pheno.phenotype_name,
+                        "eligible_isolates": eligible_isolates,
+                        "phenotype_isolates": phenotype_matches,
+                        "percent_positive": round(
+                            phenotype_matches / eligible_isolates * 100, 1
+                        ),
+                    }
+                )
 
         return pd.DataFrame(results)
 
@@ -8,10 +8,15 @@ NHSN AU Reporting Requirements:
 - DOT = distinct calendar days with antimicrobial administration
 - DDD = total grams administered / WHO defined daily dose
 
+With a chunksize or cache directory configured, DOT and DDD are computed
+locally from raw administrations streamed in chunks (optionally through a
+Parquet cache of closed months) instead of by aggregate SQL queries.
+
 Reference: CDC NHSN Antimicrobial Use and Resistance Module Protocol
 """
 
 import logging
+from collections.abc import Iterator
 from dataclasses import dataclass
 from datetime import date
 from typing import Any
@@ -19,9 +24,223 @@ from typing import Any
 import pandas as pd
 
 from ..config import Config
+from .clarity_io import MonthlyExtractCache, month_bounds, month_range, read_sql_chunks
 
 logger = logging.getLogger(__name__)
 
+# Cache dataset name for raw monthly administrations
+ADMINISTRATIONS_DATASET = "au_administrations"
+
+# Rows per chunk when only the cache is enabled
+DEFAULT_CHUNKSIZE = 50_000
+
+# Raw administration columns kept for local aggregation, with their dtypes
+ADMINISTRATION_COLUMNS = {
+    "patient_id": "string",
+    "nhsn_location_code": "string",
+    "medication_name": "string",
+    "nhsn_code": "string",
+    "nhsn_category": "string",
+    "ddd_value": "float64",
+    "ddd_unit": "string",
+    "route": "string",
+    "admin_time": "datetime64[ns]",
+    "admin_date": "string",
+    "month": "string",
+    "dose_given": "float64",
+    "dose_unit": "string",
+}
+
+# Group keys of the calculate_dot and calculate_ddd queries
+DOT_KEYS = ["nhsn_location_code", "month", "nhsn_code", "nhsn_category", "medication_name", "route"]
+DDD_KEYS = ["nhsn_location_code", "month", "nhsn_code", "nhsn_category", "medication_name", "ddd_value", "ddd_unit"]
+
+ORAL_ROUTES = ["PO", "ORAL"]
+
+GRAMS_PER_DOSE_UNIT = {
+    "g": 1.0, "gram": 1.0, "grams": 1.0,
+    "mg": 1e-3, "milligram": 1e-3, "milligrams": 1e-3,
+    "mcg": 1e-6, "microgram": 1e-6, "micrograms": 1e-6,
+}
+
+# Partial aggregates are compacted once this many chunks accumulate
+_COMPACT_EVERY = 8
+
+
+def _normalize_administrations(df: pd.DataFrame) -> pd.DataFrame:
+    """Select and type the columns used for local aggregation and caching."""
+    df = df.reindex(columns=list(ADMINISTRATION_COLUMNS))
+    df["admin_time"] = pd.to_datetime(df["admin_time"])
+    df["admin_date"] = pd.to_datetime(df["admin_date"]).dt.strftime("%Y-%m-%d")
+    return df.astype(ADMINISTRATION_COLUMNS)
+
+
+def _read_sql_strings(df: pd.DataFrame) -> pd.DataFrame:
+    """Give string columns the default dtype pd.read_sql would infer."""
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.StringDtype):
+            df[col] = pd.Series(df[col].to_numpy(dtype=object, na_value=None), index=df.index)
+    return df
+
+
+def combine_dot_ddd(dot_df: pd.DataFrame, ddd_df: pd.DataFrame) -> pd.DataFrame:
+    """Attach per-code DDD (summed over medications) to calculate_dot rows."""
+    if dot_df.empty:
+        return dot_df.assign(defined_daily_doses=pd.Series(dtype="float64"))
+
+    keys = ["nhsn_location_code", "month", "nhsn_code"]
+    code_ddd = (
+        ddd_df.groupby(keys, dropna=False, as_index=False)["defined_daily_doses"]
+        .sum(min_count=1)
+    )
+    return dot_df.merge(code_ddd, on=keys, how="left")
+
+
+def _rate_per_1000(count: int, patient_days: int) -> float:
+    """Rate per 1,000 patient days, rounded to 2 places (0 without patient days)."""
+    return round(count / patient_days * 1000, 2) if patient_days > 0 else 0
+
+
+def build_monthly_summary(
+    usage_df: pd.DataFrame,
+    patient_days_df: pd.DataFrame,
+    start_date: date | None = None,
+    end_date: date | None = None,
+) -> dict[str, Any]:
+    """Build the nested get_monthly_summary result.
+
+    Location and month totals come from one groupby each, and the nested
+    structure is filled in a single pass over the rows sorted by location
+    and month, so cost is linear in rows.
+
+    Args:
+        usage_df: calculate_usage output.
+        patient_days_df: DataFrame with nhsn_location_code, month and
+            patient_days.
+        start_date: Start of date range (for date_range).
+        end_date: End of date range (for date_range).
+
+    Returns:
+        Dictionary as returned by AUDataExtractor.get_monthly_summary.
+    """
+    result = {
+        "date_range": {
+            "start": str(start_date) if start_date else None,
+            "end": str(end_date) if end_date else None,
+        },
+        "locations": [],
+    }
+
+    if usage_df.empty:
+        result["overall_totals"] = {
+            "total_dot": 0,
+            "total_patient_days": 0,
+            "dot_per_1000_pd": 0,
+        }
+        return result
+
+    merged = pd.merge(
+        usage_df,
+        patient_days_df[["nhsn_location_code", "month", "patient_days"]],
+        on=["nhsn_location_code", "month"],
+        how="left",
+    )
+    merged["patient_days"] = merged["patient_days"].fillna(0).astype("int64")
+    # Stable, so antimicrobials keep their category/code order within a month
+    merged = merged.sort_values(["nhsn_location_code", "month"], kind="stable")
+
+    total_dot = int(merged["days_of_therapy"].sum())
+    total_patient_days = int(patient_days_df["patient_days"].sum())
+    result["overall_totals"] = {
+        "total_dot": total_dot,
+        "total_patient_days": total_patient_days,
+        "dot_per_1000_pd": _rate_per_1000(total_dot, total_patient_days),
+    }
+
+    # Usage whose location mapping has no NHSN code still counts in the
+    # overall totals but has no location to be listed under
+    unmapped = merged["nhsn_location_code"].isna()
+    if unmapped.any():
+        logger.warning(
+            f"Leaving {int(unmapped.sum())} usage rows with no NHSN location code "
+            f"out of the location breakdown"
+        )
+        merged = merged[~unmapped]
+
+    loc_totals = merged.groupby("nhsn_location_code").agg(
+        total_dot=("days_of_therapy", "sum"),
+        patient_days=("patient_days", "sum"),
+    )
+    loc_totals = dict(zip(
+        loc_totals.index.tolist(),
+        zip(loc_totals["total_dot"].tolist(), loc_totals["patient_days"].tolist()),
+    ))
+
+    month_totals = merged.groupby(["nhsn_location_code", "month"]).agg(
+        total_dot=("days_of_therapy", "sum"),
+        patient_days=("patient_days", "first"),
+    )
+    month_totals = dict(zip(
+        month_totals.index.tolist(),
+        zip(month_totals["total_dot"].tolist(), month_totals["patient_days"].tolist()),
+    ))
+
+    has_ddd = "defined_daily_doses" in merged.columns
+    ddd_values = merged["defined_daily_doses"].tolist() if has_ddd else [None] * len(merged)
+
+    rows = zip(
+        merged["nhsn_location_code"].tolist(),
+        merged["month"].tolist(),
+        merged["nhsn_code"].tolist(),
+        merged["nhsn_category"].tolist(),
+        merged["medication_name"].tolist(),
+        merged["route"].tolist(),
+        merged["days_of_therapy"].tolist(),
+        merged["patient_days"].tolist(),
+        ddd_values,
+    )
+
+    loc_summary = month_summary = None
+    for loc_code, month, nhsn_code, category, medication, route, dot, patient_days, ddd in rows:
+        if loc_summary is None or loc_code != loc_summary["nhsn_location_code"]:
+            loc_dot, loc_patient_days = loc_totals[loc_code]
+            loc_summary = {
+                "nhsn_location_code": loc_code,
+                "months": [],
+                "totals": {
+                    "total_dot": loc_dot,
+                    "patient_days": loc_patient_days,
+                    "dot_per_1000_pd": _rate_per_1000(loc_dot, loc_patient_days),
+                },
+            }
+            result["locations"].append(loc_summary)
+            month_summary = None
+
+        if month_summary is None or month != month_summary["month"]:
+            month_dot, month_patient_days = month_totals[(loc_code, month)]
+            month_summary = {
+                "month": month,
+                "patient_days": month_patient_days,
+                "total_dot": month_dot,
+                "antimicrobials": [],
+                "dot_per_1000_pd": _rate_per_1000(month_dot, month_patient_days),
+            }
+            loc_summary["months"].append(month_summary)
+
+        antimicrobial = {
+            "nhsn_code": nhsn_code,
+            "nhsn_category": category,
+            "medication_name": medication,
+            "route": route,
+            "days_of_therapy": dot,
+            "dot_per_1000_pd": _rate_per_1000(dot, patient_days),
+        }
+        if ddd is not None and pd.notna(ddd):
+            antimicrobial["defined_daily_doses"] = round(ddd, 2)
+        month_summary["antimicrobials"].append(antimicrobial)
+
+    return result
+
 
 @dataclass
 class AntimicrobialUsage:
@@ -71,14 +290,28 @@ class AUDataExtractor:
         )
     """
 
-    def __init__(self, connection_string: str | None = None):
+    def __init__(
+        self,
+        connection_string: str | None = None,
+        chunksize: int | None = None,
+        cache_dir: str | None = None,
+    ):
         """Initialize the extractor.
 
         Args:
             connection_string: Database connection string. If not provided,
                 uses Config.get_clarity_connection_string().
+            chunksize: Stream raw administrations in chunks of this many rows
+                and compute DOT/DDD locally. Defaults to Config.CLARITY_CHUNKSIZE
+                (0 keeps the aggregate SQL queries).
+            cache_dir: Cache raw monthly administrations as Parquet under this
+                directory (implies local aggregation). Defaults to
+                Config.CLARITY_CACHE_DIR.
         """
         self.connection_string = connection_string or Config.get_clarity_connection_string()
+        self.chunksize = chunksize if chunksize is not None else Config.CLARITY_CHUNKSIZE
+        cache_dir = cache_dir or Config.CLARITY_CACHE_DIR
+        self.cache = MonthlyExtractCache(cache_dir) if cache_dir else None
         self._engine = None
 
     def _get_engine(self):
@@ -101,6 +334,50 @@ class AUDataExtractor:
         """Check if using SQLite (mock) database."""
         return "sqlite" in (self.connection_string or "").lower()
 
+    def _aggregates_locally(self) -> bool:
+        """Check if DOT/DDD are computed from streamed administrations."""
+        return bool(self.chunksize) or self.cache is not None
+
+    def _administrations_query(self, location_filter: str = "", route_filter: str = "") -> str:
+        """Query for 'Given' administrations in [:start_date, :end_date]."""
+        if self._is_sqlite():
+            date_expr = "date(mar.TAKEN_TIME)"
+            month_expr = "strftime('%Y-%m', mar.TAKEN_TIME)"
+        else:
+            date_expr = "CONVERT(DATE, mar.TAKEN_TIME)"
+            month_expr = "FORMAT(mar.TAKEN_TIME, 'yyyy-MM')"
+
+        return f"""
+        SELECT
+            pat.PAT_MRN_ID as patient_id,
+            pe.PAT_ENC_CSN_ID as encounter_id,
+            loc.NHSN_LOCATION_CODE,
+            rx.GENERIC_NAME as medication_name,
+            nm.NHSN_CODE,
+            nm.NHSN_CATEGORY,
+            nm.DDD as ddd_value,
+            nm.DDD_UNIT as ddd_unit,
+            om.ADMIN_ROUTE as route,
+            mar.TAKEN_TIME as admin_time,
+            {date_expr} as admin_date,
+            {month_expr} as month,
+            mar.DOSE_GIVEN,
+            mar.DOSE_UNIT,
+            mar.ACTION_NAME
+        FROM MAR_ADMIN_INFO mar
+        JOIN ORDER_MED om ON mar.ORDER_MED_ID = om.ORDER_MED_ID
+        JOIN RX_MED_ONE rx ON om.MEDICATION_ID = rx.MEDICATION_ID
+        JOIN NHSN_ANTIMICROBIAL_MAP nm ON rx.MEDICATION_ID = nm.MEDICATION_ID
+        JOIN PAT_ENC pe ON om.PAT_ENC_CSN_ID = pe.PAT_ENC_CSN_ID
+        JOIN PATIENT pat ON pe.PAT_ID = pat.PAT_ID
+        JOIN NHSN_LOCATION_MAP loc ON pe.DEPARTMENT_ID = loc.EPIC_DEPT_ID
+        WHERE mar.ACTION_NAME = 'Given'
+            AND mar.TAKEN_TIME >= :start_date
+            AND mar.TAKEN_TIME <= :end_date
+            {location_filter}
+            {route_filter}
+        """
+
     def get_antimicrobial_administrations(
         self,
         locations: list[str] | None = None,
@@ -138,43 +415,7 @@ class AUDataExtractor:
         if not include_oral:
             route_filter = "AND om.ADMIN_ROUTE NOT IN ('PO', 'ORAL')"
 
-        # SQLite vs SQL Server date expressions
-        if self._is_sqlite():
-            date_expr = "date(mar.TAKEN_TIME)"
-            month_expr = "strftime('%Y-%m', mar.TAKEN_TIME)"
-        else:
-            date_expr = "CONVERT(DATE, mar.TAKEN_TIME)"
-            month_expr = "FORMAT(mar.TAKEN_TIME, 'yyyy-MM')"
-
-        query = f"""
-        SELECT
-            pat.PAT_MRN_ID as patient_id,
-            pe.PAT_ENC_CSN_ID as encounter_id,
-            loc.NHSN_LOCATION_CODE,
-            rx.GENERIC_NAME as medication_name,
-            nm.NHSN_CODE,
-            nm.NHSN_CATEGORY,
-            nm.DDD as ddd_value,
-            nm.DDD_UNIT as ddd_unit,
-            om.ADMIN_ROUTE as route,
-            mar.TAKEN_TIME as admin_time,
-            {date_expr} as admin_date,
-            {month_expr} as month,
-            mar.DOSE_GIVEN,
-            mar.DOSE_UNIT,
-            mar.ACTION_NAME
-        FROM MAR_ADMIN_INFO mar
-        JOIN ORDER_MED om ON mar.ORDER_MED_ID = om.ORDER_MED_ID
-        JOIN RX_MED_ONE rx ON om.MEDICATION_ID = rx.MEDICATION_ID
-        JOIN NHSN_ANTIMICROBIAL_MAP nm ON rx.MEDICATION_ID = nm.MEDICATION_ID
-        JOIN PAT_ENC pe ON om.PAT_ENC_CSN_ID = pe.PAT_ENC_CSN_ID
-        JOIN PATIENT pat ON pe.PAT_ID = pat.PAT_ID
-        JOIN NHSN_LOCATION_MAP loc ON pe.DEPARTMENT_ID = loc.EPIC_DEPT_ID
-        WHERE mar.ACTION_NAME = 'Given'
-            AND mar.TAKEN_TIME >= :start_date
-            AND mar.TAKEN_TIME <= :end_date
-            {location_filter}
-            {route_filter}
+        query = self._administrations_query(location_filter, route_filter) + """
         ORDER BY pat.PAT_MRN_ID, mar.TAKEN_TIME
         """
 
@@ -194,6 +435,170 @@ class AUDataExtractor:
             logger.error(f"Antimicrobial administration query failed: {e}")
             return pd.DataFrame()
 
+    def iter_administrations(
+        self,
+        locations: list[str] | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> Iterator[pd.DataFrame]:
+        """Stream 'Given' administrations (all routes) in chunks.
+
+        With a cache, each month in range is read from its Parquet file,
+        fetching the whole month from Clarity first if it is not cached;
+        the location and date filters are then applied locally. Without a
+        cache the query is streamed from Clarity with the filters in SQL.
+
+        Args:
+            locations: List of NHSN location codes.
+            start_date: Start of date range.
+            end_date: End of date range.
+
+        Yields:
+            DataFrames with the ADMINISTRATION_COLUMNS columns.
+        """
+        if start_date is None:
+            start_date = date.today().replace(day=1)
+        if end_date is None:
+            end_date = date.today()
+
+        if self.cache is None:
+            location_filter = ""
+            if locations:
+                location_list = ", ".join(f"'{loc}'" for loc in locations)
+                location_filter = f"AND loc.NHSN_LOCATION_CODE IN ({location_list})"
+
+            for chunk in read_sql_chunks(
+                self._get_engine(),
+                self._administrations_query(location_filter),
+                params={"start_date": start_date, "end_date": end_date},
+                chunksize=self.chunksize or DEFAULT_CHUNKSIZE,
+            ):
+                yield _normalize_administrations(chunk)
+            return
+
+        # Same bounds as the SQL filter: end_date compares as midnight
+        start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+        for month in month_range(start_date, end_date):
+            for chunk in self._iter_month_administrations(month):
+                mask = (chunk["admin_time"] >= start) & (chunk["admin_time"] <= end)
+                if locations:
+                    mask &= chunk["nhsn_location_code"].isin(locations)
+                yield chunk[mask]
+
+    def _iter_month_administrations(self, month: str) -> Iterator[pd.DataFrame]:
+        """Administrations for a whole month, from the cache when possible."""
+        batch_size = self.chunksize or DEFAULT_CHUNKSIZE
+
+        if not self.cache.has(ADMINISTRATIONS_DATASET, month):
+            chunks = self._fetch_month_administrations(month)
+            if not self.cache.is_cacheable(month):
+                yield from chunks
+                return
+            rows = self.cache.write_month(ADMINISTRATIONS_DATASET, month, chunks)
+            logger.info(f"Cached {rows} administrations for {month}")
+
+        yield from self.cache.iter_month(ADMINISTRATIONS_DATASET, month, batch_size=batch_size)
+
+    def _fetch_month_administrations(self, month: str) -> Iterator[pd.DataFrame]:
+        """Stream a whole month of administrations from Clarity."""
+        month_start, next_month = month_bounds(month)
+        fetched = False
+        for chunk in read_sql_chunks(
+            self._get_engine(),
+            self._administrations_query(),
+            params={"start_date": month_start, "end_date": next_month},
+            chunksize=self.chunksize or DEFAULT_CHUNKSIZE,
+        ):
+            chunk = _normalize_administrations(chunk)
+            # Rows at exactly midnight on next_month belong to the next month
+            chunk = chunk[chunk["month"] == month]
+            fetched = True
+            yield chunk
+
+        if not fetched:
+            yield _normalize_administrations(pd.DataFrame())
+
+    def _aggregate_administrations(
+        self,
+        locations: list[str] | None,
+        start_date: date,
+        end_date: date,
+        include_oral: bool,
+    ) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """Compute DOT and DDD from streamed administrations in one pass.
+
+        Each chunk is reduced to its distinct patient-drug-days (DOT) and
+        gram totals (DDD); partial results are compacted as chunks arrive,
+        so memory is bounded by the number of distinct patient-drug-days
+        rather than raw administrations.
+
+        Returns:
+            (dot_df, ddd_df) with the same columns as calculate_dot and
+            calculate_ddd.
+        """
+        dot_parts: list[pd.DataFrame] = []
+        ddd_parts: list[pd.DataFrame] = []
+
+        for chunk in self.iter_administrations(locations, start_date, end_date):
+            # DOT: distinct patient-days per group (route filter as in SQL,
+            # where NOT IN also excludes NULL routes)
+            dot_rows = chunk
+            if not include_oral:
+                dot_rows = dot_rows[dot_rows["route"].notna() & ~dot_rows["route"].isin(ORAL_ROUTES)]
+            dot_rows = dot_rows.dropna(subset=["patient_id", "admin_date"])
+            dot_parts.append(dot_rows[DOT_KEYS + ["patient_id", "admin_date"]].drop_duplicates())
+
+            # DDD: grams per group, all routes; unknown units count as 0
+            factor = chunk["dose_unit"].map(GRAMS_PER_DOSE_UNIT).fillna(0.0).astype("float64")
+            grams = (chunk["dose_given"] * factor).where(factor != 0, 0.0)
+            ddd_parts.append(
+                chunk[DDD_KEYS].assign(total_grams=grams)
+                .groupby(DDD_KEYS, dropna=False, as_index=False)["total_grams"]
+                .sum(min_count=1)
+            )
+
+            if len(dot_parts) >= _COMPACT_EVERY:
+                dot_parts = [pd.concat(dot_parts, ignore_index=True).drop_duplicates()]
+                ddd_parts = [self._sum_grams(ddd_parts)]
+
+        sort_keys = ["month", "nhsn_location_code", "nhsn_category", "nhsn_code"]
+
+        dot_columns = DOT_KEYS + ["days_of_therapy"]
+        if dot_parts:
+            distinct = pd.concat(dot_parts, ignore_index=True).drop_duplicates()
+            dot_df = (
+                distinct.groupby(DOT_KEYS, dropna=False)
+                .size()
+                .reset_index(name="days_of_therapy")
+            )
+        else:
+            dot_df = pd.DataFrame(columns=dot_columns)
+        dot_df = dot_df[dot_columns].sort_values(sort_keys, kind="stable").reset_index(drop=True)
+
+        ddd_columns = [
+            "nhsn_location_code", "month", "nhsn_code", "nhsn_category", "medication_name",
+            "ddd_standard", "ddd_unit", "total_grams", "defined_daily_doses",
+        ]
+        if ddd_parts:
+            ddd_df = self._sum_grams(ddd_parts).rename(columns={"ddd_value": "ddd_standard"})
+            ddd_df["defined_daily_doses"] = (
+                ddd_df["total_grams"] / ddd_df["ddd_standard"]
+            ).where(ddd_df["ddd_standard"] > 0)
+        else:
+            ddd_df = pd.DataFrame(columns=ddd_columns)
+        ddd_df = ddd_df[ddd_columns].sort_values(sort_keys, kind="stable").reset_index(drop=True)
+
+        return _read_sql_strings(dot_df), _read_sql_strings(ddd_df)
+
+    @staticmethod
+    def _sum_grams(parts: list[pd.DataFrame]) -> pd.DataFrame:
+        """Combine partial DDD gram totals."""
+        return (
+            pd.concat(parts, ignore_index=True)
+            .groupby(DDD_KEYS, dropna=False, as_index=False)["total_grams"]
+            .sum(min_count=1)
+        )
+
     def calculate_dot(
         self,
         locations: list[str] | None = None,
@@ -230,6 +635,16 @@ class AUDataExtractor:
         if include_oral is None:
             include_oral = Config.AU_INCLUDE_ORAL
 
+        if self._aggregates_locally():
+            try:
+                dot_df, _ = self._aggregate_administrations(
+                    locations, start_date, end_date, include_oral
+                )
+                return dot_df
+            except Exception as e:
+                logger.error(f"DOT calculation from administrations failed: {e}")
+                return pd.DataFrame()
+
         # Build filters
         location_filter = ""
         if locations:
@@ -320,6 +735,16 @@ class AUDataExtractor:
         if end_date is None:
             end_date = date.today()
 
+        if self._aggregates_locally():
+            try:
+                _, ddd_df = self._aggregate_administrations(
+                    locations, start_date, end_date, include_oral=True
+                )
+                return ddd_df
+            except Exception as e:
+                logger.error(f"DDD calculation from administrations failed: {e}")
+                return pd.DataFrame()
+
         location_filter = ""
         if locations:
             location_list = ", ".join(f"'{loc}'" for loc in locations)
@@ -386,6 +811,147 @@ class AUDataExtractor:
             logger.error(f"DDD calculation query failed: {e}")
             return pd.DataFrame()
 
+    def calculate_usage(
+        self,
+        locations: list[str] | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        include_oral: bool | None = None,
+    ) -> pd.DataFrame:
+        """Calculate DOT and DDD together in one query.
+
+        DOT is counted per location, month, antimicrobial and route as in
+        calculate_dot. DDD is per location, month and NHSN code over all
+        routes (as calculate_ddd ignores include_oral), so every route row
+        of an antimicrobial carries the same DDD.
+
+        Args:
+            locations: List of NHSN location codes.
+            start_date: Start of date range.
+            end_date: End of date range.
+            include_oral: Include oral administrations in DOT.
+
+        Returns:
+            DataFrame with the calculate_dot columns plus defined_daily_doses,
+            ordered by month, location, category and code.
+        """
+        if start_date is None:
+            start_date = date.today().replace(day=1)
+        if end_date is None:
+            end_date = date.today()
+        if include_oral is None:
+            include_oral = Config.AU_INCLUDE_ORAL
+
+        if self._aggregates_locally():
+            try:
+                dot_df, ddd_df = self._aggregate_administrations(
+                    locations, start_date, end_date, include_oral
+                )
+            except Exception as e:
+                logger.error(f"Usage calculation from administrations failed: {e}")
+                return pd.DataFrame()
+            return combine_dot_ddd(dot_df, ddd_df)
+
+        location_filter = ""
+        if locations:
+            location_list = ", ".join(f"'{loc}'" for loc in locations)
+            location_filter = f"AND loc.NHSN_LOCATION_CODE IN ({location_list})"
+
+        route_ok = "1 = 1" if include_oral else "om.ADMIN_ROUTE NOT IN ('PO', 'ORAL')"
+
+        if self._is_sqlite():
+            month_expr = "strftime('%Y-%m', mar.TAKEN_TIME)"
+            therapy_day = "pat.PAT_MRN_ID || '|' || date(mar.TAKEN_TIME)"
+        else:
+            month_expr = "FORMAT(mar.TAKEN_TIME, 'yyyy-MM')"
+            therapy_day = "CONCAT(pat.PAT_MRN_ID, '|', CONVERT(DATE, mar.TAKEN_TIME))"
+
+        # DDD goes through PATIENT as a LEFT JOIN, as calculate_ddd does not
+        # join it; DOT only counts rows with a patient
+        query = f"""
+        WITH admin AS (
+            SELECT
+                loc.NHSN_LOCATION_CODE AS nhsn_location_code,
+                {month_expr} AS month,
+                nm.NHSN_CODE AS nhsn_code,
+                nm.NHSN_CATEGORY AS nhsn_category,
+                rx.GENERIC_NAME AS medication_name,
+                om.ADMIN_ROUTE AS route,
+                nm.DDD AS ddd,
+                nm.DDD_UNIT AS ddd_unit,
+                CASE WHEN {route_ok} AND pat.PAT_MRN_ID IS NOT NULL
+                     THEN {therapy_day} END AS therapy_day,
+                CASE
+                    WHEN mar.DOSE_UNIT IN ('g', 'gram', 'grams') THEN mar.DOSE_GIVEN
+                    WHEN mar.DOSE_UNIT IN ('mg', 'milligram', 'milligrams') THEN mar.DOSE_GIVEN / 1000.0
+                    WHEN mar.DOSE_UNIT IN ('mcg', 'microgram', 'micrograms') THEN mar.DOSE_GIVEN / 1000000.0
+                    ELSE 0
+                END AS grams
+            FROM MAR_ADMIN_INFO mar
+            JOIN ORDER_MED om ON mar.ORDER_MED_ID = om.ORDER_MED_ID
+            JOIN RX_MED_ONE rx ON om.MEDICATION_ID = rx.MEDICATION_ID
+            JOIN NHSN_ANTIMICROBIAL_MAP nm ON rx.MEDICATION_ID = nm.MEDICATION_ID
+            JOIN PAT_ENC pe ON om.PAT_ENC_CSN_ID = pe.PAT_ENC_CSN_ID
+            LEFT JOIN PATIENT pat ON pe.PAT_ID = pat.PAT_ID
+            JOIN NHSN_LOCATION_MAP loc ON pe.DEPARTMENT_ID = loc.EPIC_DEPT_ID
+            WHERE mar.ACTION_NAME = 'Given'
+                AND mar.TAKEN_TIME >= :start_date
+                AND mar.TAKEN_TIME <= :end_date
+                {location_filter}
+        ),
+        dot AS (
+            SELECT
+                nhsn_location_code, month, nhsn_code, nhsn_category, medication_name, route,
+                COUNT(DISTINCT therapy_day) AS days_of_therapy
+            FROM admin
+            GROUP BY nhsn_location_code, month, nhsn_code, nhsn_category, medication_name, route
+        ),
+        medication_ddd AS (
+            SELECT
+                nhsn_location_code, month, nhsn_code,
+                CASE WHEN ddd > 0 THEN SUM(grams) / ddd END AS defined_daily_doses
+            FROM admin
+            GROUP BY nhsn_location_code, month, nhsn_code, nhsn_category, medication_name, ddd, ddd_unit
+        ),
+        ddd AS (
+            SELECT nhsn_location_code, month, nhsn_code, SUM(defined_daily_doses) AS defined_daily_doses
+            FROM medication_ddd
+            GROUP BY nhsn_location_code, month, nhsn_code
+        )
+        SELECT
+            dot.nhsn_location_code,
+            dot.month,
+            dot.nhsn_code,
+            dot.nhsn_category,
+            dot.medication_name,
+            dot.route,
+            dot.days_of_therapy,
+            ddd.defined_daily_doses
+        FROM dot
+        LEFT JOIN ddd
+            ON ddd.nhsn_location_code = dot.nhsn_location_code
+            AND ddd.month = dot.month
+            AND ddd.nhsn_code = dot.nhsn_code
+        WHERE dot.days_of_therapy > 0
+        ORDER BY dot.month, dot.nhsn_location_code, dot.nhsn_category, dot.nhsn_code
+        """
+
+        try:
+            from sqlalchemy import text
+
+            engine = self._get_engine()
+            with engine.connect() as conn:
+                df = pd.read_sql(
+                    text(query),
+                    conn,
+                    params={"start_date": start_date, "end_date": end_date},
+                )
+                df.columns = df.columns.str.lower()
+                return df
+        except Exception as e:
+            logger.error(f"Usage calculation query failed: {e}")
+            return pd.DataFrame()
+
     def get_monthly_summary(
         self,
         locations: list[str] | None = None,
@@ -395,7 +961,8 @@ class AUDataExtractor:
     ) -> dict[str, Any]:
         """Get comprehensive monthly AU summary for NHSN reporting.
 
-        Combines DOT calculations with patient days to compute rates.
+        Combines DOT and DDD (one query, see calculate_usage) with patient
+        days to compute rates.
 
         Args:
             locations: List of NHSN location codes.
@@ -411,141 +978,13 @@ class AUDataExtractor:
         """
         from .denominator import DenominatorCalculator
 
-        # Get DOT data
-        dot_df = self.calculate_dot(locations, start_date, end_date, include_oral)
-        ddd_df = self.calculate_ddd(locations, start_date, end_date)
+        usage_df = self.calculate_usage(locations, start_date, end_date, include_oral)
 
         # Get patient days for rate calculation
-        denom_calc = DenominatorCalculator(self.connection_string)
+        denom_calc = DenominatorCalculator(self.connection_string, chunksize=self.chunksize)
         patient_days_df = denom_calc.get_patient_days(locations, start_date, end_date)
 
-        if dot_df.empty:
-            return {
-                "date_range": {
-                    "start": str(start_date) if start_date else None,
-                    "end": str(end_date) if end_date else None,
-                },
-                "locations": [],
-                "overall_totals": {
-                    "total_dot": 0,
-                    "total_patient_days": 0,
-                    "dot_per_1000_pd": 0,
-                },
-            }
-
-        # Merge DOT with patient days
-        merged = pd.merge(
-            dot_df,
-            patient_days_df[["nhsn_location_code", "month", "patient_days"]],
-            on=["nhsn_location_code", "month"],
-            how="left",
-        )
-        merged["patient_days"] = merged["patient_days"].fillna(0).astype(int)
-
-        # Calculate rates
-        merged["dot_per_1000_pd"] = merged.apply(
-            lambda row: round(row["days_of_therapy"] / row["patient_days"] * 1000, 2)
-            if row["patient_days"] > 0
-            else 0,
-            axis=1,
-        )
-
-        # Merge with DDD data if available
-        if not ddd_df.empty:
-            merged = pd.merge(
-                merged,
-                ddd_df[["nhsn_location_code", "month", "nhsn_code", "defined_daily_doses"]],
-                on=["nhsn_location_code", "month", "nhsn_code"],
-                how="left",
-            )
-
-        # Build result structure
-        result = {
-            "date_range": {
-                "start": str(start_date) if start_date else None,
-                "end": str(end_date) if end_date else None,
-            },
-            "locations": [],
-            "overall_totals": {
-                "total_dot": int(merged["days_of_therapy"].sum()),
-                "total_patient_days": int(patient_days_df["patient_days"].sum()),
-            },
-        }
-
-        # Calculate overall rate
-        if result["overall_totals"]["total_patient_days"] > 0:
-            result["overall_totals"]["dot_per_1000_pd"] = round(
-                result["overall_totals"]["total_dot"]
-                / result["overall_totals"]["total_patient_days"]
-                * 1000,
-                2,
-            )
-        else:
-            result["overall_totals"]["dot_per_1000_pd"] = 0
-
-        # Group by location
-        for loc_code in sorted(merged["nhsn_location_code"].unique()):
-            loc_data = merged[merged["nhsn_location_code"] == loc_code]
-
-            loc_summary = {
-                "nhsn_location_code": loc_code,
-                "months": [],
-                "totals": {
-                    "total_dot": int(loc_data["days_of_therapy"].sum()),
-                    "patient_days": int(loc_data["patient_days"].sum()),
-                },
-            }
-
-            # Calculate location rate
-            if loc_summary["totals"]["patient_days"] > 0:
-                loc_summary["totals"]["dot_per_1000_pd"] = round(
-                    loc_summary["totals"]["total_dot"]
-                    / loc_summary["totals"]["patient_days"]
-                    * 1000,
-                    2,
-                )
-            else:
-                loc_summary["totals"]["dot_per_1000_pd"] = 0
-
-            # Group by month within location
-            for month in sorted(loc_data["month"].unique()):
-                month_data = loc_data[loc_data["month"] == month]
-                month_patient_days = int(month_data["patient_days"].iloc[0]) if len(month_data) > 0 else 0
-
-                month_summary = {
-                    "month": month,
-                    "patient_days": month_patient_days,
-                    "total_dot": int(month_data["days_of_therapy"].sum()),
-                    "antimicrobials": [],
-                }
-
-                # Calculate month rate
-                if month_patient_days > 0:
-                    month_summary["dot_per_1000_pd"] = round(
-                        month_summary["total_dot"] / month_patient_days * 1000, 2
-                    )
-                else:
-                    month_summary["dot_per_1000_pd"] = 0
-
-                # Add antimicrobial details
-                for _, row in month_data.iterrows():
-                    antimicrobial = {
-                        "nhsn_code": row["nhsn_code"],
-                        "nhsn_category": row["nhsn_category"],
-                        "medication_name": row["medication_name"],
-                        "route": row["route"],
-                        "days_of_therapy": int(row["days_of_therapy"]),
-                        "dot_per_1000_pd": row["dot_per_1000_pd"],
-                    }
-                    if "defined_daily_doses" in row and pd.notna(row["defined_daily_doses"]):
-                        antimicrobial["defined_daily_doses"] = round(row["defined_daily_doses"], 2)
-                    month_summary["antimicrobials"].append(antimicrobial)
-
-                loc_summary["months"].append(month_summary)
-
-            result["locations"].append(loc_summary)
-
-        return result
+        return build_monthly_summary(usage_df, patient_days_df, start_date, end_date)
 
     def get_usage_by_category(
         self,
@@ -603,7 +1042,7 @@ class AUDataExtractor:
         from .denominator import DenominatorCalculator
 
         dot_df = self.calculate_dot(locations, start_date, end_date)
-        denom_calc = DenominatorCalculator(self.connection_string)
+        denom_calc = DenominatorCalculator(self.connection_string, chunksize=self.chunksize)
         patient_days_df = denom_calc.get_patient_days(locations, start_date, end_date)
 
         if dot_df.empty:
@@ -0,0 +1,216 @@
+"""Streaming reads and a local monthly cache for Clarity extracts.
+
+A year of MAR_ADMIN_INFO at a large hospital is tens of millions of rows,
+too many to pull into one DataFrame. read_sql_chunks() streams a query in
+fixed-size chunks (server-side cursor where the driver supports it) so
+callers can reduce each chunk into running aggregates.
+
+MonthlyExtractCache stores raw extracts as Parquet files partitioned by
+month, so re-running a report or changing a location filter reads local
+files instead of re-querying Clarity. Only months that ended at least
+Config.CLARITY_CACHE_SETTLE_DAYS ago are cached; recent months can still
+receive late documentation and are always read from Clarity.
+"""
+
+import logging
+import os
+import shutil
+from collections.abc import Iterable, Iterator
+from datetime import date, timedelta
+from pathlib import Path
+
+import pandas as pd
+
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def read_sql_chunks(
+    engine,
+    query: str,
+    params: dict | None = None,
+    chunksize: int = 50_000,
+) -> Iterator[pd.DataFrame]:
+    """Stream a query as DataFrames of at most ``chunksize`` rows.
+
+    Column names are lowercased, matching the extractors' pd.read_sql
+    handling. The connection stays open until the iterator is exhausted
+    or closed.
+
+    Args:
+        engine: SQLAlchemy engine.
+        query: SQL text with named (``:name``) parameters.
+        params: Query parameters.
+        chunksize: Maximum rows per chunk.
+
+    Yields:
+        DataFrame chunks. A query with no rows may yield nothing.
+    """
+    from sqlalchemy import text
+
+    with engine.connect() as conn:
+        conn = conn.execution_options(stream_results=True, max_row_buffer=chunksize)
+        for chunk in pd.read_sql(text(query), conn, params=params, chunksize=chunksize):
+            chunk.columns = chunk.columns.str.lower()
+            yield chunk
+
+
+def month_range(start_date: date, end_date: date) -> list[str]:
+    """YYYY-MM strings for every month from start_date through end_date."""
+    months = pd.period_range(
+        pd.Period(start_date, freq="M"), pd.Period(end_date, freq="M"), freq="M"
+    )
+    return [str(month) for month in months]
+
+
+def month_bounds(month: str) -> tuple[date, date]:
+    """First day of ``month`` and first day of the following month."""
+    period = pd.Period(month, freq="M")
+    return period.start_time.date(), (period + 1).start_time.date()
+
+
+class MonthlyExtractCache:
+    """Parquet cache of raw Clarity extracts, one file per dataset and month.
+
+    Files live at ``<cache_dir>/<dataset>/month=YYYY-MM/data.parquet``.
+    Writes go to a temporary file that is renamed into place, so a failed
+    extract never leaves a partial month behind.
+
+    Example:
+        cache = MonthlyExtractCache("~/.aegis/clarity_cache")
+        if not cache.has("au_administrations", "2026-01"):
+            cache.write_month("au_administrations", "2026-01", chunks)
+        for chunk in cache.iter_month("au_administrations", "2026-01"):
+            ...
+    """
+
+    def __init__(self, cache_dir: str | Path, settle_days: int | None = None):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Root directory for cached extracts.
+            settle_days: Days after month end before a month may be cached.
+                Defaults to Config.CLARITY_CACHE_SETTLE_DAYS.
+        """
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.settle_days = (
+            settle_days if settle_days is not None else Config.CLARITY_CACHE_SETTLE_DAYS
+        )
+
+    def path(self, dataset: str, month: str) -> Path:
+        """Path of the Parquet file for a dataset month."""
+        return self.cache_dir / dataset / f"month={month}" / "data.parquet"
+
+    def has(self, dataset: str, month: str) -> bool:
+        """Check whether a dataset month is cached."""
+        return self.path(dataset, month).exists()
+
+    def is_cacheable(self, month: str, today: date | None = None) -> bool:
+        """Check whether a month is closed long enough to be cached."""
+        today = today or date.today()
+        _, next_month = month_bounds(month)
+        return next_month + timedelta(days=self.settle_days) <= today
+
+    def months(self, dataset: str) -> list[str]:
+        """Cached months for a dataset, oldest first."""
+        root = self.cache_dir / dataset
+        if not root.exists():
+            return []
+        return sorted(
+            p.name.split("=", 1)[1]
+            for p in root.glob("month=*")
+            if (p / "data.parquet").exists()
+        )
+
+    def write_month(
+        self,
+        dataset: str,
+        month: str,
+        chunks: Iterable[pd.DataFrame],
+    ) -> int:
+        """Write a month's extract, chunk by chunk.
+
+        All chunks must have the same columns and dtypes. An iterable with
+        no chunks writes nothing and returns 0, leaving the month uncached.
+
+        Returns:
+            Number of rows written.
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("pyarrow required for the Clarity extract cache")
+
+        target = self.path(dataset, month)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_suffix(".parquet.tmp")
+
+        writer = None
+        rows = 0
+        try:
+            for chunk in chunks:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    schema = table.schema
+                    writer = pq.ParquetWriter(tmp, schema)
+                writer.write_table(table.cast(schema))
+                rows += len(chunk)
+        except BaseException:
+            if writer is not None:
+                writer.close()
+            tmp.unlink(missing_ok=True)
+            raise
+
+        if writer is None:
+            return 0
+
+        writer.close()
+        os.replace(tmp, target)
+        logger.debug(f"Cached {rows} rows of {dataset} for {month}")
+        return rows
+
+    def iter_month(
+        self,
+        dataset: str,
+        month: str,
+        columns: list[str] | None = None,
+        batch_size: int = 50_000,
+    ) -> Iterator[pd.DataFrame]:
+        """Read a cached month back in batches.
+
+        Args:
+            dataset: Dataset name.
+            month: Month (YYYY-MM).
+            columns: Columns to read. Defaults to all.
+            batch_size: Maximum rows per batch.
+        """
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("pyarrow required for the Clarity extract cache")
+
+        parquet_file = pq.ParquetFile(self.path(dataset, month))
+        if parquet_file.metadata.num_rows == 0:
+            yield parquet_file.schema_arrow.empty_table().to_pandas()
+            return
+        for batch in parquet_file.iter_batches(batch_size=batch_size, columns=columns):
+            yield batch.to_pandas()
+
+    def clear(self, dataset: str | None = None, month: str | None = None) -> None:
+        """Remove cached extracts.
+
+        Args:
+            dataset: Dataset to clear. If None, clears every dataset.
+            month: Single month to clear. Requires dataset.
+        """
+        if month is not None:
+            if dataset is None:
+                raise ValueError("month requires dataset")
+            self.path(dataset, month).unlink(missing_ok=True)
+            return
+
+        target = self.cache_dir / dataset if dataset else self.cache_dir
+        if target.exists():
+            shutil.rmtree(target)
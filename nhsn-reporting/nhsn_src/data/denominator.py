@@ -3,6 +3,12 @@
 This module calculates device-days and patient-days from Clarity data
 for NHSN monthly summary reporting. These denominators are required
 for calculating HAI rates (infections per 1,000 device-days).
+
+By default patient days and device days are computed with interval
+arithmetic: stays and device-use runs are pulled once as [start, end]
+day intervals, split at month boundaries and summed, instead of being
+expanded into one row per day in SQL. With a chunksize the intervals
+are streamed and each chunk is reduced to location-month sums.
 """
 
 import logging
@@ -10,12 +16,115 @@ from datetime import date
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
 from ..config import Config
+from .clarity_io import read_sql_chunks
 
 logger = logging.getLogger(__name__)
 
+# Flowsheet rows that document each device as present
+DEVICE_DAY_FILTERS = {
+    "central_line": """(fd.DISP_NAME LIKE '%central%line%' OR fd.DISP_NAME LIKE '%PICC%')
+            AND fm.MEAS_VALUE NOT LIKE '%removed%'""",
+    "urinary_catheter": """(fd.DISP_NAME LIKE '%foley%'
+               OR fd.DISP_NAME LIKE '%urinary%catheter%'
+               OR fd.DISP_NAME LIKE '%indwelling%catheter%')
+            AND fm.MEAS_VALUE NOT LIKE '%removed%'
+            AND fm.MEAS_VALUE NOT LIKE '%discontinued%'""",
+    "ventilator": """(fd.DISP_NAME LIKE '%ventilator%'
+               OR fd.DISP_NAME LIKE '%mechanical%vent%'
+               OR fd.DISP_NAME LIKE '%vent%mode%'
+               OR fd.DISP_NAME LIKE '%intubat%')
+            AND fm.MEAS_VALUE NOT LIKE '%removed%'
+            AND fm.MEAS_VALUE NOT LIKE '%extubat%'
+            AND fm.MEAS_VALUE NOT LIKE '%discontinued%'""",
+}
+
+DENOMINATOR_COLUMNS = [
+    "patient_days",
+    "central_line_days",
+    "urinary_catheter_days",
+    "ventilator_days",
+]
+
+
+def split_intervals_by_month(intervals: pd.DataFrame) -> pd.DataFrame:
+    """Split inclusive day intervals at calendar month boundaries.
+
+    Each interval is repeated once per month it touches and clipped to
+    that month, so the day counts of the pieces sum to the interval length.
+    An interval whose end precedes its start counts as a single day.
+
+    Args:
+        intervals: DataFrame with columns nhsn_location_code, start_day
+            and end_day (dates, date strings or datetimes).
+
+    Returns:
+        DataFrame with one row per interval-month and columns
+        nhsn_location_code, month (YYYY-MM) and days.
+    """
+    if intervals.empty:
+        return pd.DataFrame({
+            "nhsn_location_code": pd.Series(dtype=object),
+            "month": pd.Series(dtype=object),
+            "days": pd.Series(dtype="int64"),
+        })
+
+    start = pd.to_datetime(intervals["start_day"]).to_numpy().astype("datetime64[D]")
+    end = pd.to_datetime(intervals["end_day"]).to_numpy().astype("datetime64[D]")
+    end = np.maximum(end, start)
+
+    first_month = start.astype("datetime64[M]")
+    n_months = (end.astype("datetime64[M]") - first_month).astype("int64") + 1
+
+    # Row index of each piece, and its month offset within the interval
+    row = np.repeat(np.arange(len(start)), n_months)
+    offset = np.arange(len(row)) - np.repeat(np.cumsum(n_months) - n_months, n_months)
+    month = first_month[row] + offset
+
+    piece_start = np.maximum(start[row], month.astype("datetime64[D]"))
+    piece_end = np.minimum(end[row], (month + 1).astype("datetime64[D]") - 1)
+
+    return pd.DataFrame({
+        "nhsn_location_code": intervals["nhsn_location_code"].to_numpy()[row],
+        "month": np.datetime_as_string(month, unit="M"),
+        "days": (piece_end - piece_start).astype("int64") + 1,
+    })
+
+
+def sum_interval_days(intervals: pd.DataFrame, column: str) -> pd.DataFrame:
+    """Sum interval days by location and month.
+
+    Args:
+        intervals: Intervals as accepted by split_intervals_by_month.
+        column: Name for the summed day count column.
+
+    Returns:
+        DataFrame with columns nhsn_location_code, month and ``column``,
+        ordered by month then location.
+    """
+    pieces = split_intervals_by_month(intervals)
+    summed = (
+        pieces.groupby(["nhsn_location_code", "month"], as_index=False)["days"]
+        .sum()
+        .rename(columns={"days": column})
+    )
+    return summed.sort_values(["month", "nhsn_location_code"]).reset_index(drop=True)
+
+
+def _combine_day_sums(parts: list[pd.DataFrame], column: str) -> pd.DataFrame:
+    """Add up per-chunk sum_interval_days results."""
+    if not parts:
+        return sum_interval_days(pd.DataFrame(columns=["nhsn_location_code", "start_day", "end_day"]), column)
+    combined = (
+        pd.concat(parts, ignore_index=True)
+        .groupby(["nhsn_location_code", "month"], as_index=False)[column]
+        .sum()
+    )
+    return combined.sort_values(["month", "nhsn_location_code"]).reset_index(drop=True)
+
 
 class DenominatorCalculator:
     """Calculate device-days and patient-days from Clarity data.
@@ -27,6 +136,10 @@ class DenominatorCalculator:
     - Central line days: Count of patient-days with a central line present
     - Patient days: Total patient census days per location
 
+    With use_intervals (the default), get_patient_days and
+    get_denominator_summary use the interval engine (see
+    get_denominator_days). Set it to False to use the recursive CTE.
+
     Example:
         calc = DenominatorCalculator()
         df = calc.get_central_line_days(
@@ -36,14 +149,25 @@ class DenominatorCalculator:
         )
     """
 
-    def __init__(self, connection_string: str | None = None):
+    def __init__(
+        self,
+        connection_string: str | None = None,
+        use_intervals: bool = True,
+        chunksize: int | None = None,
+    ):
         """Initialize the calculator.
 
         Args:
             connection_string: Database connection string. If not provided,
                 uses Config.get_clarity_connection_string().
+            use_intervals: Compute patient days (and the summary) from
+                stay and device intervals rather than a per-day CTE.
+            chunksize: Stream intervals in chunks of this many rows.
+                Defaults to Config.CLARITY_CHUNKSIZE (0 reads them whole).
         """
         self.connection_string = connection_string or Config.get_clarity_connection_string()
+        self.use_intervals = use_intervals
+        self.chunksize = chunksize if chunksize is not None else Config.CLARITY_CHUNKSIZE
         self._engine = None
 
     def _get_engine(self):
@@ -116,8 +240,7 @@ class DenominatorCalculator:
         JOIN PAT_ENC pe ON rec.INPATIENT_DATA_ID = pe.INPATIENT_DATA_ID
         JOIN NHSN_LOCATION_MAP loc ON pe.DEPARTMENT_ID = loc.EPIC_DEPT_ID
         JOIN IP_FLO_GP_DATA fd ON fm.FLO_MEAS_ID = fd.FLO_MEAS_ID
-        WHERE (fd.DISP_NAME LIKE '%central%line%' OR fd.DISP_NAME LIKE '%PICC%')
-            AND fm.MEAS_VALUE NOT LIKE '%removed%'
+        WHERE {DEVICE_DAY_FILTERS["central_line"]}
             AND fm.RECORDED_TIME >= :start_date
             AND fm.RECORDED_TIME <= :end_date
             {location_filter}
@@ -193,11 +316,7 @@ class DenominatorCalculator:
         JOIN PAT_ENC pe ON rec.INPATIENT_DATA_ID = pe.INPATIENT_DATA_ID
         JOIN NHSN_LOCATION_MAP loc ON pe.DEPARTMENT_ID = loc.EPIC_DEPT_ID
         JOIN IP_FLO_GP_DATA fd ON fm.FLO_MEAS_ID = fd.FLO_MEAS_ID
-        WHERE (fd.DISP_NAME LIKE '%foley%'
-               OR fd.DISP_NAME LIKE '%urinary%catheter%'
-               OR fd.DISP_NAME LIKE '%indwelling%catheter%')
-            AND fm.MEAS_VALUE NOT LIKE '%removed%'
-            AND fm.MEAS_VALUE NOT LIKE '%discontinued%'
+        WHERE {DEVICE_DAY_FILTERS["urinary_catheter"]}
             AND fm.RECORDED_TIME >= :start_date
             AND fm.RECORDED_TIME <= :end_date
             {location_filter}
@@ -273,13 +392,7 @@ class DenominatorCalculator:
         JOIN PAT_ENC pe ON rec.INPATIENT_DATA_ID = pe.INPATIENT_DATA_ID
         JOIN NHSN_LOCATION_MAP loc ON pe.DEPARTMENT_ID = loc.EPIC_DEPT_ID
         JOIN IP_FLO_GP_DATA fd ON fm.FLO_MEAS_ID = fd.FLO_MEAS_ID
-        WHERE (fd.DISP_NAME LIKE '%ventilator%'
-               OR fd.DISP_NAME LIKE '%mechanical%vent%'
-               OR fd.DISP_NAME LIKE '%vent%mode%'
-               OR fd.DISP_NAME LIKE '%intubat%')
-            AND fm.MEAS_VALUE NOT LIKE '%removed%'
-            AND fm.MEAS_VALUE NOT LIKE '%extubat%'
-            AND fm.MEAS_VALUE NOT LIKE '%discontinued%'
+        WHERE {DEVICE_DAY_FILTERS["ventilator"]}
             AND fm.RECORDED_TIME >= :start_date
             AND fm.RECORDED_TIME <= :end_date
             {location_filter}
@@ -326,6 +439,25 @@ class DenominatorCalculator:
             - month: Year-month string (YYYY-MM)
             - patient_days: Sum of patient census days
         """
+        if self.use_intervals:
+            df = self.get_denominator_days(
+                locations, start_date, end_date, include_devices=False
+            )
+            return df[["nhsn_location_code", "month", "patient_days"]]
+
+        return self._get_patient_days_cte(locations, start_date, end_date)
+
+    def _get_patient_days_cte(
+        self,
+        locations: list[str] | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> pd.DataFrame:
+        """Calculate patient days by expanding each stay into days with a recursive CTE.
+
+        The SQL Server variant is limited to stays of 366 days or fewer
+        within the range (MAXRECURSION).
+        """
         if start_date is None:
             start_date = date.today().replace(year=date.today().year - 1)
         if end_date is None:
@@ -427,6 +559,227 @@ class DenominatorCalculator:
             logger.error(f"Patient days query failed: {e}")
             return pd.DataFrame(columns=["nhsn_location_code", "month", "patient_days"])
 
+    def _stay_intervals_query(self, location_filter: str) -> str:
+        """Query for each stay's census days in range as a [start_day, end_day] interval.
+
+        Clipping matches the recursive CTE: a stay contributes every calendar
+        day from admission (or start_date) through discharge (or end_date).
+        """
+        if self._is_sqlite():
+            return f"""
+            SELECT
+                loc.NHSN_LOCATION_CODE,
+                MAX(date(pe.HOSP_ADMIT_DTTM), date(:start_date)) AS start_day,
+                MIN(date(COALESCE(pe.HOSP_DISCH_DTTM, :end_date)), date(:end_date)) AS end_day
+            FROM PAT_ENC pe
+            JOIN NHSN_LOCATION_MAP loc ON pe.DEPARTMENT_ID = loc.EPIC_DEPT_ID
+            WHERE pe.HOSP_ADMIT_DTTM <= :end_date
+                AND (pe.HOSP_DISCH_DTTM IS NULL OR pe.HOSP_DISCH_DTTM >= :start_date)
+                {location_filter}
+            """
+
+        return f"""
+        SELECT
+            loc.NHSN_LOCATION_CODE,
+            CAST(CASE WHEN pe.HOSP_ADMIT_DTTM > :start_date
+                 THEN pe.HOSP_ADMIT_DTTM ELSE :start_date END AS DATE) AS start_day,
+            CAST(CASE WHEN pe.HOSP_DISCH_DTTM IS NULL OR pe.HOSP_DISCH_DTTM > :end_date
+                 THEN :end_date ELSE pe.HOSP_DISCH_DTTM END AS DATE) AS end_day
+        FROM PAT_ENC pe
+        JOIN NHSN_LOCATION_MAP loc ON pe.DEPARTMENT_ID = loc.EPIC_DEPT_ID
+        WHERE pe.HOSP_ADMIT_DTTM <= :end_date
+            AND (pe.HOSP_DISCH_DTTM IS NULL OR pe.HOSP_DISCH_DTTM >= :start_date)
+            {location_filter}
+        """
+
+    def _device_intervals_query(self, location_filter: str) -> str:
+        """Query for device-use intervals derived from flowsheet documentation.
+
+        Distinct documented days per patient, location and device are
+        collapsed into runs of consecutive days (gaps and islands), so each
+        row is one [start_day, end_day] interval of continuous device use.
+        Summing interval lengths gives the same counts as the per-device
+        COUNT(DISTINCT patient-day) queries.
+        """
+        if self._is_sqlite():
+            day_expr = "date(fm.RECORDED_TIME)"
+            day_number = "julianday(day)"
+        else:
+            day_expr = "CONVERT(DATE, fm.RECORDED_TIME)"
+            day_number = "DATEDIFF(DAY, '19000101', day)"
+
+        device_days = "\n            UNION ALL\n".join(
+            f"""
+            SELECT DISTINCT
+                pe.PAT_ID,
+                loc.NHSN_LOCATION_CODE,
+                '{device}' AS device,
+                {day_expr} AS day
+            FROM IP_FLWSHT_MEAS fm
+            JOIN IP_FLWSHT_REC rec ON fm.FSD_ID = rec.FSD_ID
+            JOIN PAT_ENC pe ON rec.INPATIENT_DATA_ID = pe.INPATIENT_DATA_ID
+            JOIN NHSN_LOCATION_MAP loc ON pe.DEPARTMENT_ID = loc.EPIC_DEPT_ID
+            JOIN IP_FLO_GP_DATA fd ON fm.FLO_MEAS_ID = fd.FLO_MEAS_ID
+            WHERE {device_filter}
+                AND fm.RECORDED_TIME >= :start_date
+                AND fm.RECORDED_TIME <= :end_date
+                {location_filter}"""
+            for device, device_filter in DEVICE_DAY_FILTERS.items()
+        )
+
+        return f"""
+        WITH device_days AS ({device_days}
+        ),
+        islands AS (
+            SELECT
+                PAT_ID,
+                NHSN_LOCATION_CODE,
+                device,
+                day,
+                {day_number} - ROW_NUMBER() OVER (
+                    PARTITION BY PAT_ID, NHSN_LOCATION_CODE, device ORDER BY day
+                ) AS island
+            FROM device_days
+        )
+        SELECT
+            NHSN_LOCATION_CODE,
+            device,
+            MIN(day) AS start_day,
+            MAX(day) AS end_day
+        FROM islands
+        GROUP BY PAT_ID, NHSN_LOCATION_CODE, device, island
+        """
+
+    def get_denominator_days(
+        self,
+        locations: list[str] | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        include_devices: bool = True,
+    ) -> pd.DataFrame:
+        """Calculate patient days and device days by location and month in one pass.
+
+        Stay intervals (admit to discharge) and device-use intervals are
+        each pulled with a single query, split at month boundaries and
+        summed. Unlike the recursive CTE, cost does not grow with length of
+        stay and long stays are not capped.
+
+        Args:
+            locations: List of NHSN location codes. If None, includes all.
+            start_date: Start of date range. Defaults to 1 year ago.
+            end_date: End of date range. Defaults to today.
+            include_devices: Also compute central line, urinary catheter
+                and ventilator days. If False only patient days are queried.
+
+        Returns:
+            DataFrame with columns nhsn_location_code, month, patient_days,
+            central_line_days, urinary_catheter_days and ventilator_days,
+            ordered by month then location. Location-months with device
+            days but no patient days have patient_days of 0.
+        """
+        if start_date is None:
+            start_date = date.today().replace(year=date.today().year - 1)
+        if end_date is None:
+            end_date = date.today()
+
+        location_filter = ""
+        if locations:
+            location_list = ", ".join(f"'{loc}'" for loc in locations)
+            location_filter = f"AND loc.NHSN_LOCATION_CODE IN ({location_list})"
+
+        params = {"start_date": start_date, "end_date": end_date}
+        columns = ["nhsn_location_code", "month"] + DENOMINATOR_COLUMNS
+
+        stay_query = self._stay_intervals_query(location_filter)
+        device_query = self._device_intervals_query(location_filter) if include_devices else None
+
+        try:
+            if self.chunksize:
+                result, device_sums = self._sum_interval_chunks(stay_query, device_query, params)
+            else:
+                result, device_sums = self._sum_intervals(stay_query, device_query, params)
+        except Exception as e:
+            logger.error(f"Denominator interval query failed: {e}")
+            return pd.DataFrame(columns=columns)
+
+        for device_days in device_sums:
+            result = pd.merge(
+                result,
+                device_days,
+                on=["nhsn_location_code", "month"],
+                how="outer",
+            )
+
+        for col in DENOMINATOR_COLUMNS:
+            if col not in result.columns:
+                result[col] = 0
+
+        result[DENOMINATOR_COLUMNS] = result[DENOMINATOR_COLUMNS].fillna(0).astype("int64")
+        return result[columns].sort_values(["month", "nhsn_location_code"]).reset_index(drop=True)
+
+    def _sum_intervals(
+        self,
+        stay_query: str,
+        device_query: str | None,
+        params: dict,
+    ) -> tuple[pd.DataFrame, list[pd.DataFrame]]:
+        """Read all intervals at once and sum them by location and month.
+
+        Returns:
+            Patient day sums and a list of per-device day sums.
+        """
+        from sqlalchemy import text
+        engine = self._get_engine()
+        with engine.connect() as conn:
+            stays = pd.read_sql(text(stay_query), conn, params=params)
+            stays.columns = stays.columns.str.lower()
+
+            devices = None
+            if device_query:
+                devices = pd.read_sql(text(device_query), conn, params=params)
+                devices.columns = devices.columns.str.lower()
+
+        device_sums = []
+        if devices is not None:
+            for device, device_intervals in devices.groupby("device"):
+                device_sums.append(sum_interval_days(device_intervals, f"{device}_days"))
+
+        return sum_interval_days(stays, "patient_days"), device_sums
+
+    def _sum_interval_chunks(
+        self,
+        stay_query: str,
+        device_query: str | None,
+        params: dict,
+    ) -> tuple[pd.DataFrame, list[pd.DataFrame]]:
+        """Stream intervals in chunks, reducing each chunk to location-month sums.
+
+        Returns:
+            Patient day sums and a list of per-device day sums.
+        """
+        engine = self._get_engine()
+
+        stay_parts = [
+            sum_interval_days(chunk, "patient_days")
+            for chunk in read_sql_chunks(engine, stay_query, params, self.chunksize)
+        ]
+
+        device_parts: dict[str, list[pd.DataFrame]] = {}
+        if device_query:
+            for chunk in read_sql_chunks(engine, device_query, params, self.chunksize):
+                for device, device_intervals in chunk.groupby("device"):
+                    device_parts.setdefault(device, []).append(
+                        sum_interval_days(device_intervals, f"{device}_days")
+                    )
+
+        return (
+            _combine_day_sums(stay_parts, "patient_days"),
+            [
+                _combine_day_sums(parts, f"{device}_days")
+                for device, parts in sorted(device_parts.items())
+            ],
+        )
+
     def get_denominator_summary(
         self,
         locations: list[str] | None = None,
@@ -451,6 +804,13 @@ class DenominatorCalculator:
                 - months: List of monthly data with device-days and patient_days
                 - totals: Aggregate totals for the period
         """
+        if self.use_intervals:
+            return self._build_denominator_summary(
+                self.get_denominator_days(locations, start_date, end_date),
+                start_date,
+                end_date,
+            )
+
         # Fetch all denominator data
         line_days_df = self.get_central_line_days(locations, start_date, end_date)
         catheter_days_df = self.get_urinary_catheter_days(locations, start_date, end_date)
@@ -508,6 +868,15 @@ class DenominatorCalculator:
             if col not in merged.columns:
                 merged[col] = 0
 
+        return self._build_denominator_summary(merged, start_date, end_date)
+
+    def _build_denominator_summary(
+        self,
+        merged: pd.DataFrame,
+        start_date: date | None,
+        end_date: date | None,
+    ) -> dict[str, Any]:
+        """Build the summary structure from merged location-month denominators."""
         # Build summary structure
         result = {
             "date_range": {
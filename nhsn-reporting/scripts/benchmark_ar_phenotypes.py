@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""Benchmark AR phenotype calculation against the mock Clarity generator.
+
+Builds a throwaway mock Clarity database with a fixed number of first
+isolates (one positive culture per patient, all within one quarter) and
+times ARDataExtractor.calculate_phenotypes() on it.
+
+Usage:
+    python scripts/benchmark_ar_phenotypes.py                  # 10k and 100k isolates
+    python scripts/benchmark_ar_phenotypes.py --sizes 5000 20000
+    python scripts/benchmark_ar_phenotypes.py --sizes 2000 --compare
+    python scripts/benchmark_ar_phenotypes.py --keep-db /tmp/ar_bench
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import re
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pandas as pd
+
+from mock_clarity.generate_data import AR_ORGANISMS, LOCATIONS, MockClarityGenerator
+from nhsn_src.data.ar_extractor import ARDataExtractor
+
+BENCH_YEAR = 2026
+BENCH_QUARTER = 1
+BENCH_SPECIMEN_TYPES = ["Blood", "Urine", "Respiratory", "CSF"]
+
+
+def build_database(db_path: Path, isolates: int, seed: int = 42) -> None:
+    """Populate a mock Clarity database with the requested number of isolates."""
+    random.seed(seed)
+    quarter_start = datetime(BENCH_YEAR, 1, 1)
+
+    generator = MockClarityGenerator(db_path)
+    # The generator is chatty; keep benchmark output readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        generator.initialize_database()
+
+        for _ in range(isolates):
+            patient = generator.generate_patient()
+            admit = quarter_start + timedelta(days=random.randint(0, 75))
+            encounter = generator.generate_encounter(
+                patient,
+                random.choice(LOCATIONS),
+                admit,
+                admit + timedelta(days=random.randint(3, 14)),
+            )
+            generator.generate_ar_culture(
+                patient=patient,
+                encounter=encounter,
+                specimen_date=admit + timedelta(days=random.randint(0, 2)),
+                organism_data=random.choice(AR_ORGANISMS),
+                specimen_type=random.choice(BENCH_SPECIMEN_TYPES),
+            )
+
+        generator.load_to_database()
+
+
+def rowwise_phenotypes(extractor: ARDataExtractor) -> pd.DataFrame:
+    """Per-isolate reference calculation (the pre-vectorization algorithm)."""
+    start_date, end_date = extractor._get_quarter_dates(BENCH_YEAR, BENCH_QUARTER)
+    cultures_df = extractor.get_culture_results(
+        None, start_date, end_date, BENCH_SPECIMEN_TYPES
+    )
+    first_isolates = extractor.apply_first_isolate_rule(cultures_df)
+    suscept_df = extractor.get_susceptibility_results(first_isolates["isolate_id"].tolist())
+
+    from sqlalchemy import text
+
+    with extractor._get_engine().connect() as conn:
+        phenotypes = pd.read_sql(
+            text(
+                "SELECT PHENOTYPE_CODE, PHENOTYPE_NAME, ORGANISM_PATTERN, "
+                "RESISTANCE_PATTERN FROM NHSN_PHENOTYPE_MAP"
+            ),
+            conn,
+        )
+        phenotypes.columns = phenotypes.columns.str.lower()
+
+    results = []
+    for loc in first_isolates["nhsn_location_code"].unique():
+        loc_isolates = first_isolates[first_isolates["nhsn_location_code"] == loc]
+        for _, pheno in phenotypes.iterrows():
+            org_pattern = pheno["organism_pattern"] or ""
+            eligible = matches = 0
+            for _, isolate in loc_isolates.iterrows():
+                if org_pattern and not re.search(
+                    org_pattern.replace("%", ".*"), isolate["organism_name"], re.IGNORECASE
+                ):
+                    continue
+                eligible += 1
+                iso_suscept = suscept_df[suscept_df["isolate_id"] == isolate["isolate_id"]]
+                if extractor._check_phenotype_match(
+                    isolate["organism_name"],
+                    iso_suscept,
+                    org_pattern,
+                    pheno["resistance_pattern"] or "",
+                ):
+                    matches += 1
+            if eligible:
+                results.append(
+                    {
+                        "nhsn_location_code": loc,
+                        "quarter": f"{BENCH_YEAR}-Q{BENCH_QUARTER}",
+                        "phenotype_code": pheno["phenotype_code"],
+                        "phenotype_name": pheno["phenotype_name"],
+                        "eligible_isolates": eligible,
+                        "phenotype_isolates": matches,
+                        "percent_positive": round(matches / eligible * 100, 1),
+                    }
+                )
+    return pd.DataFrame(results)
+
+
+def run_size(db_dir: Path, isolates: int, repeat: int, compare: bool) -> None:
+    """Build a database of the given size and report timings."""
+    db_path = db_dir / f"ar_bench_{isolates}.db"
+    if db_path.exists():
+        db_path.unlink()
+
+    print(f"\n{isolates:,} isolates")
+    print("-" * 40)
+
+    t0 = time.perf_counter()
+    build_database(db_path, isolates)
+    print(f"  Build mock Clarity DB:   {time.perf_counter() - t0:8.2f}s")
+
+    extractor = ARDataExtractor(f"sqlite:///{db_path}")
+
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        df = extractor.calculate_phenotypes(
+            year=BENCH_YEAR,
+            quarter=BENCH_QUARTER,
+            specimen_types=BENCH_SPECIMEN_TYPES,
+        )
+        timings.append(time.perf_counter() - t0)
+
+    print(f"  calculate_phenotypes:    {min(timings):8.2f}s (best of {repeat})")
+    print(f"  Result rows:             {len(df):8d}")
+    print(f"  Eligible isolates:       {int(df['eligible_isolates'].sum()):8d}")
+
+    if compare:
+        t0 = time.perf_counter()
+        reference = rowwise_phenotypes(extractor)
+        elapsed = time.perf_counter() - t0
+        print(f"  Row-wise reference:      {elapsed:8.2f}s")
+        pd.testing.assert_frame_equal(df, reference, check_dtype=False)
+        print("  Output matches row-wise reference")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark ARDataExtractor.calculate_phenotypes on mock Clarity data"
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10_000, 100_000],
+        help="Isolate counts to benchmark (default: 10000 100000)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Timed runs per size; the best is reported (default: 3)",
+    )
+    parser.add_argument(
+        "--compare",
+        action="store_true",
+        help="Also time the row-wise reference and check outputs match (slow above ~10k)",
+    )
+    parser.add_argument(
+        "--keep-db",
+        type=Path,
+        help="Directory to write benchmark databases to (default: temporary directory)",
+    )
+
+    args = parser.parse_args()
+
+    print("AR Phenotype Benchmark")
+    print("=" * 40)
+
+    if args.keep_db:
+        args.keep_db.mkdir(parents=True, exist_ok=True)
+        for size in args.sizes:
+            run_size(args.keep_db, size, args.repeat, args.compare)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            for size in args.sizes:
+                run_size(Path(tmp), size, args.repeat, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""Benchmark the AU monthly summary on a synthetic many-location database.
+
+Builds a throwaway SQLite database from the mock Clarity schema with a
+configurable number of NHSN locations (default 500) and months (default
+12), then times AUDataExtractor.get_monthly_summary() end to end and
+build_monthly_summary() on its own.
+
+Usage:
+    python scripts/benchmark_au_summary.py                       # 500 locations x 12 months
+    python scripts/benchmark_au_summary.py --locations 100 --months 6
+    python scripts/benchmark_au_summary.py --locations 100 --compare
+    python scripts/benchmark_au_summary.py --keep-db /tmp/au_bench
+"""
+
+import argparse
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pandas as pd
+
+from nhsn_src.data.au_extractor import AUDataExtractor, build_monthly_summary
+from nhsn_src.data.clarity_io import month_bounds, month_range
+from nhsn_src.data.denominator import DenominatorCalculator
+
+SCHEMA_PATH = Path(__file__).parent.parent / "mock_clarity" / "schema.sql"
+BENCH_START = date(2025, 1, 1)
+ENCOUNTERS_PER_LOCATION_MONTH = 3
+ORAL_FRACTION = 0.1
+
+
+def build_database(db_path: Path, locations: int, months: int, seed: int = 42) -> int:
+    """Populate a database with stays and MAR administrations.
+
+    Each location gets a few stays per month, each with one or two
+    antimicrobials given twice a day for the length of stay.
+
+    Returns:
+        Number of MAR administration rows.
+    """
+    random.seed(seed)
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA_PATH.read_text())
+    medication_ids = [row[0] for row in conn.execute("SELECT MEDICATION_ID FROM NHSN_ANTIMICROBIAL_MAP")]
+
+    conn.execute("DELETE FROM NHSN_LOCATION_MAP")
+    conn.executemany(
+        "INSERT INTO NHSN_LOCATION_MAP (EPIC_DEPT_ID, NHSN_LOCATION_CODE, LOCATION_DESCRIPTION, UNIT_TYPE) "
+        "VALUES (?, ?, ?, ?)",
+        [(10_000 + i, f"LOC{i:04d}", f"Benchmark unit {i}", "Ward") for i in range(locations)],
+    )
+
+    end_date = BENCH_START + pd.DateOffset(months=months) - timedelta(days=1)
+    patients, encounters, orders, admins = [], [], [], []
+    for month in month_range(BENCH_START, end_date.date()):
+        month_start, next_month = month_bounds(month)
+        days_in_month = (next_month - month_start).days
+        for loc in range(locations):
+            for _ in range(ENCOUNTERS_PER_LOCATION_MONTH):
+                csn = len(encounters) + 1
+                patients.append((csn, f"MRN{csn:08d}"))
+                admit = datetime.combine(month_start, datetime.min.time()) + timedelta(
+                    days=random.randrange(days_in_month), hours=random.randrange(24)
+                )
+                stay = random.randint(2, 8)
+                encounters.append((csn, csn, csn, admit, admit + timedelta(days=stay), 10_000 + loc))
+
+                for medication_id in random.sample(medication_ids, random.randint(1, 2)):
+                    order_id = len(orders) + 1
+                    route = "PO" if random.random() < ORAL_FRACTION else "IV"
+                    orders.append((order_id, csn, medication_id, admit, route))
+                    for dose in range(stay * 2):
+                        admins.append((
+                            len(admins) + 1,
+                            order_id,
+                            admit + timedelta(hours=12 * dose + 1),
+                            "Given",
+                            1000.0,
+                            "mg",
+                        ))
+
+    conn.executemany("INSERT INTO PATIENT (PAT_ID, PAT_MRN_ID) VALUES (?, ?)", patients)
+    conn.executemany(
+        "INSERT INTO PAT_ENC (PAT_ENC_CSN_ID, PAT_ID, INPATIENT_DATA_ID, HOSP_ADMIT_DTTM, "
+        "HOSP_DISCH_DTTM, DEPARTMENT_ID) VALUES (?, ?, ?, ?, ?, ?)",
+        [(*e[:3], f"{e[3]:%Y-%m-%d %H:%M:%S}", f"{e[4]:%Y-%m-%d %H:%M:%S}", e[5]) for e in encounters],
+    )
+    conn.executemany(
+        "INSERT INTO ORDER_MED (ORDER_MED_ID, PAT_ENC_CSN_ID, MEDICATION_ID, ORDERING_DATE, ADMIN_ROUTE) "
+        "VALUES (?, ?, ?, ?, ?)",
+        [(*o[:3], f"{o[3]:%Y-%m-%d %H:%M:%S}", o[4]) for o in orders],
+    )
+    conn.executemany(
+        "INSERT INTO MAR_ADMIN_INFO (MAR_ADMIN_ID, ORDER_MED_ID, TAKEN_TIME, ACTION_NAME, DOSE_GIVEN, DOSE_UNIT) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        [(a[0], a[1], f"{a[2]:%Y-%m-%d %H:%M:%S}", *a[3:]) for a in admins],
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_mar_taken ON MAR_ADMIN_INFO(TAKEN_TIME)")
+    conn.commit()
+    conn.close()
+    return len(admins)
+
+
+def nested_filter_summary(
+    extractor: AUDataExtractor,
+    patient_days_df: pd.DataFrame,
+    start_date: date,
+    end_date: date,
+) -> dict:
+    """Reference summary (the pre-vectorization algorithm).
+
+    Separate DOT and DDD queries, then a boolean filter of the merged
+    frame per location and per month with iterrows() for antimicrobials.
+    """
+    dot_df = extractor.calculate_dot(None, start_date, end_date)
+    ddd_df = extractor.calculate_ddd(None, start_date, end_date)
+
+    merged = pd.merge(
+        dot_df,
+        patient_days_df[["nhsn_location_code", "month", "patient_days"]],
+        on=["nhsn_location_code", "month"],
+        how="left",
+    )
+    merged["patient_days"] = merged["patient_days"].fillna(0).astype(int)
+    merged["dot_per_1000_pd"] = merged.apply(
+        lambda row: round(row["days_of_therapy"] / row["patient_days"] * 1000, 2)
+        if row["patient_days"] > 0
+        else 0,
+        axis=1,
+    )
+    if not ddd_df.empty:
+        merged = pd.merge(
+            merged,
+            ddd_df[["nhsn_location_code", "month", "nhsn_code", "defined_daily_doses"]],
+            on=["nhsn_location_code", "month", "nhsn_code"],
+            how="left",
+        )
+
+    def rate(count, days):
+        return round(count / days * 1000, 2) if days > 0 else 0
+
+    total_dot = int(merged["days_of_therapy"].sum())
+    total_patient_days = int(patient_days_df["patient_days"].sum())
+    result = {
+        "date_range": {"start": str(start_date), "end": str(end_date)},
+        "locations": [],
+        "overall_totals": {
+            "total_dot": total_dot,
+            "total_patient_days": total_patient_days,
+            "dot_per_1000_pd": rate(total_dot, total_patient_days),
+        },
+    }
+
+    for loc_code in sorted(merged["nhsn_location_code"].unique()):
+        loc_data = merged[merged["nhsn_location_code"] == loc_code]
+        loc_dot = int(loc_data["days_of_therapy"].sum())
+        loc_patient_days = int(loc_data["patient_days"].sum())
+        loc_summary = {
+            "nhsn_location_code": loc_code,
+            "months": [],
+            "totals": {
+                "total_dot": loc_dot,
+                "patient_days": loc_patient_days,
+                "dot_per_1000_pd": rate(loc_dot, loc_patient_days),
+            },
+        }
+        for month in sorted(loc_data["month"].unique()):
+            month_data = loc_data[loc_data["month"] == month]
+            month_patient_days = int(month_data["patient_days"].iloc[0])
+            month_dot = int(month_data["days_of_therapy"].sum())
+            month_summary = {
+                "month": month,
+                "patient_days": month_patient_days,
+                "total_dot": month_dot,
+                "antimicrobials": [],
+                "dot_per_1000_pd": rate(month_dot, month_patient_days),
+            }
+            for _, row in month_data.iterrows():
+                antimicrobial = {
+                    "nhsn_code": row["nhsn_code"],
+                    "nhsn_category": row["nhsn_category"],
+                    "medication_name": row["medication_name"],
+                    "route": row["route"],
+                    "days_of_therapy": int(row["days_of_therapy"]),
+                    "dot_per_1000_pd": row["dot_per_1000_pd"],
+                }
+                if "defined_daily_doses" in row and pd.notna(row["defined_daily_doses"]):
+                    antimicrobial["defined_daily_doses"] = round(row["defined_daily_doses"], 2)
+                month_summary["antimicrobials"].append(antimicrobial)
+            loc_summary["months"].append(month_summary)
+        result["locations"].append(loc_summary)
+
+    return result
+
+
+def best_of(repeat: int, func):
+    """Run func repeat times; return its last result and the best time."""
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - t0)
+    return result, min(timings)
+
+
+def run(db_dir: Path, locations: int, months: int, repeat: int, compare: bool) -> None:
+    """Build the database and report timings."""
+    db_path = db_dir / f"au_bench_{locations}x{months}.db"
+    if db_path.exists():
+        db_path.unlink()
+
+    print(f"\n{locations:,} locations x {months} months")
+    print("-" * 40)
+
+    t0 = time.perf_counter()
+    admin_rows = build_database(db_path, locations, months)
+    print(f"  Build synthetic DB:      {time.perf_counter() - t0:8.2f}s")
+    print(f"  MAR administrations:     {admin_rows:8,d}")
+
+    connection_string = f"sqlite:///{db_path}"
+    extractor = AUDataExtractor(connection_string)
+    start_date = BENCH_START
+    end_date = (BENCH_START + pd.DateOffset(months=months) - timedelta(days=1)).date()
+
+    usage_df, elapsed = best_of(
+        repeat, lambda: extractor.calculate_usage(None, start_date, end_date)
+    )
+    print(f"  calculate_usage:         {elapsed:8.2f}s")
+    print(f"  Usage rows:              {len(usage_df):8,d}")
+
+    patient_days_df = DenominatorCalculator(connection_string).get_patient_days(
+        None, start_date, end_date
+    )
+
+    summary, elapsed = best_of(
+        repeat, lambda: build_monthly_summary(usage_df, patient_days_df, start_date, end_date)
+    )
+    print(f"  build_monthly_summary:   {elapsed:8.2f}s")
+
+    _, elapsed = best_of(
+        repeat, lambda: extractor.get_monthly_summary(None, start_date, end_date)
+    )
+    print(f"  get_monthly_summary:     {elapsed:8.2f}s (best of {repeat})")
+    print(f"  Locations in summary:    {len(summary['locations']):8,d}")
+
+    if compare:
+        t0 = time.perf_counter()
+        reference = nested_filter_summary(extractor, patient_days_df, start_date, end_date)
+        print(f"  Nested-filter reference: {time.perf_counter() - t0:8.2f}s")
+        assert summary == reference, "summary differs from nested-filter reference"
+        print("  Output matches nested-filter reference")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark AUDataExtractor.get_monthly_summary on synthetic data"
+    )
+    parser.add_argument(
+        "--locations",
+        type=int,
+        default=500,
+        help="Number of NHSN locations (default: 500)",
+    )
+    parser.add_argument(
+        "--months",
+        type=int,
+        default=12,
+        help="Number of months starting January 2025 (default: 12)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Timed runs per step; the best is reported (default: 3)",
+    )
+    parser.add_argument(
+        "--compare",
+        action="store_true",
+        help="Also time the nested-filter reference and check outputs match",
+    )
+    parser.add_argument(
+        "--keep-db",
+        type=Path,
+        help="Directory to write the benchmark database to (default: temporary directory)",
+    )
+
+    args = parser.parse_args()
+
+    print("AU Monthly Summary Benchmark")
+    print("=" * 40)
+
+    if args.keep_db:
+        args.keep_db.mkdir(parents=True, exist_ok=True)
+        run(args.keep_db, args.locations, args.months, args.repeat, args.compare)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            run(Path(tmp), args.locations, args.months, args.repeat, args.compare)
+
+
+if __name__ == "__main__":
+    main()
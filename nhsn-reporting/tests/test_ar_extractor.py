@@ -321,6 +321,48 @@ class TestARDataExtractor:
         assert len(cre_ward) == 1
         assert cre_ward.iloc[0]["percent_positive"] == 50.0
 
+    def test_calculate_phenotypes_matches_rowwise(self, extractor):
+        """Vectorized phenotype engine agrees with per-isolate matching."""
+        import re
+
+        df = extractor.calculate_phenotypes(year=2026, quarter=1)
+
+        cultures_df = extractor.get_culture_results(
+            start_date=date(2026, 1, 1),
+            end_date=date(2026, 3, 31),
+        )
+        first_isolates = extractor.apply_first_isolate_rule(cultures_df)
+        suscept_df = extractor.get_susceptibility_results()
+        phenotypes = {
+            "MRSA": ("Staphylococcus aureus", "OXA:R"),
+            "CRE": ("Escherichia%|Klebsiella%", "MEM:R|ETP:R"),
+            "VRE": ("Enterococcus%", "VAN:R"),
+        }
+
+        for _, row in df.iterrows():
+            org_pattern, res_pattern = phenotypes[row["phenotype_code"]]
+            loc_isolates = first_isolates[
+                first_isolates["nhsn_location_code"] == row["nhsn_location_code"]
+            ]
+            eligible = loc_isolates[
+                loc_isolates["organism_name"].apply(
+                    lambda name: bool(
+                        re.search(org_pattern.replace("%", ".*"), name, re.IGNORECASE)
+                    )
+                )
+            ]
+            matches = sum(
+                extractor._check_phenotype_match(
+                    iso["organism_name"],
+                    suscept_df[suscept_df["isolate_id"] == iso["isolate_id"]],
+                    org_pattern,
+                    res_pattern,
+                )
+                for _, iso in eligible.iterrows()
+            )
+            assert row["eligible_isolates"] == len(eligible)
+            assert row["phenotype_isolates"] == matches
+
     def test_get_quarterly_summary(self, extractor):
         """Test quarterly summary generation."""
         summary = extractor.get_quarterly_summary(
@@ -477,6 +519,78 @@ class TestARPhenotypeMatching:
         assert result is False
 
 
+class TestARPhenotypeEngine:
+    """Tests for the vectorized phenotype helpers."""
+
+    @pytest.fixture
+    def extractor(self):
+        """Create extractor for testing (no DB needed for these tests)."""
+        from nhsn_src.data.ar_extractor import ARDataExtractor
+
+        return ARDataExtractor("sqlite:///:memory:")
+
+    def test_parse_resistance_pattern(self, extractor):
+        """Test OR/AND pattern parsing."""
+        assert extractor._parse_resistance_pattern("MEM:R|etp:R") == [
+            [("MEM", "R")],
+            [("ETP", "R")],
+        ]
+        assert extractor._parse_resistance_pattern("CRO:R, CIP:I") == [
+            [("CRO", "R"), ("CIP", "I")],
+        ]
+
+    def test_interpretation_matrix_first_result_wins(self, extractor):
+        """Duplicate results for an antibiotic keep the first row."""
+        suscept_df = pd.DataFrame({
+            "isolate_id": [1, 1, 1, 2],
+            "antibiotic_code": ["oxa", "OXA", "VAN", "OXA"],
+            "interpretation": ["R", "S", "S", "S"],
+        })
+
+        matrix = extractor._build_interpretation_matrix(suscept_df)
+
+        assert matrix.loc[1, "OXA"] == "R"
+        assert matrix.loc[1, "VAN"] == "S"
+        assert matrix.loc[2, "OXA"] == "S"
+        assert pd.isna(matrix.loc[2, "VAN"])
+
+    def test_phenotype_masks(self, extractor):
+        """Test eligibility and match masks for a mixed set of isolates."""
+        isolates = pd.DataFrame({
+            "isolate_id": [1, 2, 3, 4],
+            "organism_name": [
+                "Klebsiella pneumoniae",
+                "Escherichia coli",
+                "Pseudomonas aeruginosa",
+                "Klebsiella oxytoca",
+            ],
+        })
+        suscept_df = pd.DataFrame({
+            "isolate_id": [1, 1, 2, 3],
+            "antibiotic_code": ["MEM", "ETP", "MEM", "MEM"],
+            "interpretation": ["S", "R", "S", "R"],
+        })
+        interpretations = (
+            extractor._build_interpretation_matrix(suscept_df)
+            .reindex(isolates["isolate_id"])
+            .set_axis(isolates.index)
+        )
+        has_results = isolates["isolate_id"].isin(suscept_df["isolate_id"])
+
+        eligible, matched = extractor._phenotype_masks(
+            isolates,
+            interpretations,
+            has_results,
+            "Escherichia%|Klebsiella%",
+            "MEM:R|ETP:R",
+        )
+
+        assert eligible.tolist() == [True, True, False, True]
+        # Isolate 4 has no susceptibility results, which (as in
+        # _check_phenotype_match) does not exclude it
+        assert matched.tolist() == [True, False, False, True]
+
+
 class TestARDataExtractorEdgeCases:
     """Edge case tests for AR extractor."""
 
@@ -262,6 +262,42 @@ class TestAUDataExtractor:
         assert "ICU-A" in location_codes
         assert "WARD-B" in location_codes
 
+    def test_calculate_usage_matches_dot_and_ddd(self, extractor):
+        """Test the combined DOT+DDD query against the separate queries."""
+        start, end = date(2026, 1, 1), date(2026, 1, 31)
+
+        usage = extractor.calculate_usage(start_date=start, end_date=end)
+        dot = extractor.calculate_dot(start_date=start, end_date=end)
+        ddd = extractor.calculate_ddd(start_date=start, end_date=end)
+
+        pd.testing.assert_frame_equal(
+            usage.drop(columns="defined_daily_doses"), dot, check_dtype=False
+        )
+        expected_ddd = ddd.set_index(["nhsn_location_code", "nhsn_code"])["defined_daily_doses"]
+        actual_ddd = usage.set_index(["nhsn_location_code", "nhsn_code"])["defined_daily_doses"]
+        pd.testing.assert_series_equal(
+            actual_ddd.sort_index(), expected_ddd.sort_index(), check_dtype=False
+        )
+
+    def test_monthly_summary_structure(self, extractor):
+        """Test nested location/month/antimicrobial values."""
+        summary = extractor.get_monthly_summary(
+            start_date=date(2026, 1, 1),
+            end_date=date(2026, 1, 31),
+        )
+
+        icu = summary["locations"][0]
+        assert icu["nhsn_location_code"] == "ICU-A"
+        assert [m["month"] for m in icu["months"]] == ["2026-01"]
+
+        month = icu["months"][0]
+        assert month["total_dot"] == 6
+        assert [a["nhsn_code"] for a in month["antimicrobials"]] == ["TZP", "VAN"]
+        van = month["antimicrobials"][1]
+        assert van["days_of_therapy"] == 4
+        assert van["defined_daily_doses"] == pytest.approx(2.75)
+        assert van["dot_per_1000_pd"] == round(4 / month["patient_days"] * 1000, 2)
+
     def test_export_for_nhsn(self, extractor):
         """Test NHSN export format."""
         df = extractor.export_for_nhsn(
@@ -394,3 +430,174 @@ class TestAUDataExtractorEdgeCases:
 
         assert summary["locations"] == []
         assert summary["overall_totals"]["total_dot"] == 0
+
+
+class TestAUDataExtractorChunked(TestAUDataExtractor):
+    """Re-run the extractor tests with DOT/DDD aggregated from streamed chunks."""
+
+    @pytest.fixture
+    def extractor(self, temp_db):
+        from nhsn_src.data.au_extractor import AUDataExtractor
+
+        return AUDataExtractor(f"sqlite:///{temp_db}", chunksize=2)
+
+    @pytest.mark.parametrize("include_oral", [True, False])
+    def test_matches_sql_aggregation(self, temp_db, extractor, include_oral):
+        import sqlite3
+        from nhsn_src.data.au_extractor import AUDataExtractor
+
+        # An oral order, a NULL route and an unknown dose unit
+        conn = sqlite3.connect(temp_db)
+        conn.execute("INSERT INTO ORDER_MED VALUES (1005, 102, 3, 'PO')")
+        conn.execute("INSERT INTO ORDER_MED VALUES (1006, 103, 1, NULL)")
+        conn.execute("INSERT INTO MAR_ADMIN_INFO VALUES (10, 1005, '2026-01-07 08:00', 'Given', 500, 'mg')")
+        conn.execute("INSERT INTO MAR_ADMIN_INFO VALUES (11, 1006, '2026-01-12 08:00', 'Given', 1, 'vial')")
+        conn.commit()
+        conn.close()
+
+        sql = AUDataExtractor(f"sqlite:///{temp_db}", chunksize=0)
+        start, end = date(2026, 1, 1), date(2026, 1, 31)
+        keys = ["nhsn_location_code", "month", "nhsn_code", "medication_name"]
+
+        expected = sql.calculate_dot(start_date=start, end_date=end, include_oral=include_oral)
+        actual = extractor.calculate_dot(start_date=start, end_date=end, include_oral=include_oral)
+        pd.testing.assert_frame_equal(
+            actual.sort_values(keys).reset_index(drop=True),
+            expected.sort_values(keys).reset_index(drop=True),
+            check_dtype=False,
+        )
+
+        expected = sql.calculate_ddd(start_date=start, end_date=end)
+        actual = extractor.calculate_ddd(start_date=start, end_date=end)
+        pd.testing.assert_frame_equal(
+            actual.sort_values(keys).reset_index(drop=True),
+            expected.sort_values(keys).reset_index(drop=True),
+            check_dtype=False,
+        )
+
+
+class TestAUDataExtractorCached(TestAUDataExtractor):
+    """Re-run the extractor tests through the monthly Parquet cache."""
+
+    @pytest.fixture
+    def extractor(self, temp_db, tmp_path):
+        pytest.importorskip("pyarrow")
+        from nhsn_src.data.au_extractor import AUDataExtractor
+
+        return AUDataExtractor(f"sqlite:///{temp_db}", cache_dir=str(tmp_path))
+
+    def test_cached_month_is_not_requeried(self, temp_db, extractor):
+        import sqlite3
+        from nhsn_src.data.au_extractor import ADMINISTRATIONS_DATASET
+
+        start, end = date(2026, 1, 1), date(2026, 1, 31)
+        first = extractor.calculate_dot(start_date=start, end_date=end)
+        assert extractor.cache.months(ADMINISTRATIONS_DATASET) == ["2026-01"]
+
+        conn = sqlite3.connect(temp_db)
+        conn.execute("DELETE FROM MAR_ADMIN_INFO")
+        conn.commit()
+        conn.close()
+
+        # Same report and a narrower location filter both come from the cache
+        again = extractor.calculate_dot(start_date=start, end_date=end)
+        ward = extractor.calculate_dot(locations=["WARD-B"], start_date=start, end_date=end)
+
+        pd.testing.assert_frame_equal(again, first)
+        assert list(ward["nhsn_code"]) == ["CRO"]
+        assert ward.iloc[0]["days_of_therapy"] == 2
+
+        # Date filters still apply within a cached month
+        partial = extractor.calculate_dot(start_date=start, end_date=date(2026, 1, 3))
+        van_icu = partial[(partial["nhsn_code"] == "VAN") & (partial["nhsn_location_code"] == "ICU-A")]
+        assert van_icu.iloc[0]["days_of_therapy"] == 1
+
+    def test_open_month_is_not_cached(self, extractor):
+        from nhsn_src.data.au_extractor import ADMINISTRATIONS_DATASET
+
+        extractor.calculate_dot(start_date=date.today().replace(day=1), end_date=date.today())
+
+        assert extractor.cache.months(ADMINISTRATIONS_DATASET) == []
+
+
+class TestBuildMonthlySummary:
+    """Tests for build_monthly_summary on in-memory frames."""
+
+    def test_totals_ordering_and_ddd(self):
+        from nhsn_src.data.au_extractor import build_monthly_summary
+
+        usage = pd.DataFrame([
+            ("ICU-A", "2026-01", "CRO", "Cephalosporins-3rd", "ceftriaxone", "IV", 3, None),
+            ("WARD-B", "2026-01", "VAN", "Glycopeptides", "vancomycin", "IV", 2, 1.5),
+            ("ICU-A", "2026-01", "VAN", "Glycopeptides", "vancomycin", "IV", 4, 2.25),
+            ("ICU-A", "2026-01", "VAN", "Glycopeptides", "vancomycin", "PO", 1, 2.25),
+            ("ICU-A", "2026-02", "VAN", "Glycopeptides", "vancomycin", "IV", 5, None),
+        ], columns=[
+            "nhsn_location_code", "month", "nhsn_code", "nhsn_category",
+            "medication_name", "route", "days_of_therapy", "defined_daily_doses",
+        ])
+        patient_days = pd.DataFrame({
+            "nhsn_location_code": ["ICU-A", "ICU-A", "WARD-B", "WARD-C"],
+            "month": ["2026-01", "2026-02", "2026-01", "2026-01"],
+            "patient_days": [400, 0, 300, 100],
+        })
+
+        summary = build_monthly_summary(usage, patient_days, date(2026, 1, 1), date(2026, 2, 28))
+
+        assert summary["date_range"] == {"start": "2026-01-01", "end": "2026-02-28"}
+        assert summary["overall_totals"] == {
+            "total_dot": 15,
+            "total_patient_days": 800,
+            "dot_per_1000_pd": round(15 / 800 * 1000, 2),
+        }
+        assert [loc["nhsn_location_code"] for loc in summary["locations"]] == ["ICU-A", "WARD-B"]
+
+        icu = summary["locations"][0]
+        assert [m["month"] for m in icu["months"]] == ["2026-01", "2026-02"]
+        jan, feb = icu["months"]
+        assert (jan["total_dot"], jan["patient_days"], jan["dot_per_1000_pd"]) == (8, 400, 20.0)
+        assert [(a["nhsn_code"], a["route"]) for a in jan["antimicrobials"]] == [
+            ("CRO", "IV"), ("VAN", "IV"), ("VAN", "PO"),
+        ]
+        assert "defined_daily_doses" not in jan["antimicrobials"][0]
+        assert jan["antimicrobials"][1]["defined_daily_doses"] == 2.25
+        assert jan["antimicrobials"][1]["dot_per_1000_pd"] == 10.0
+        # No patient days: rates are 0
+        assert feb["dot_per_1000_pd"] == 0
+        assert feb["antimicrobials"][0]["dot_per_1000_pd"] == 0
+
+    def test_empty_usage(self):
+        from nhsn_src.data.au_extractor import build_monthly_summary
+
+        summary = build_monthly_summary(
+            pd.DataFrame(),
+            pd.DataFrame(columns=["nhsn_location_code", "month", "patient_days"]),
+        )
+
+        assert summary["locations"] == []
+        assert summary["overall_totals"] == {
+            "total_dot": 0, "total_patient_days": 0, "dot_per_1000_pd": 0,
+        }
+
+    def test_null_location_left_out_of_breakdown(self, caplog):
+        from nhsn_src.data.au_extractor import build_monthly_summary
+
+        usage = pd.DataFrame([
+            (None, "2026-01", "VAN", "Glycopeptides", "vancomycin", "IV", 2),
+            ("ICU-A", "2026-01", "VAN", "Glycopeptides", "vancomycin", "IV", 4),
+        ], columns=[
+            "nhsn_location_code", "month", "nhsn_code", "nhsn_category",
+            "medication_name", "route", "days_of_therapy",
+        ])
+        patient_days = pd.DataFrame({
+            "nhsn_location_code": ["ICU-A"],
+            "month": ["2026-01"],
+            "patient_days": [400],
+        })
+
+        summary = build_monthly_summary(usage, patient_days)
+
+        assert [loc["nhsn_location_code"] for loc in summary["locations"]] == ["ICU-A"]
+        assert summary["locations"][0]["totals"]["total_dot"] == 4
+        assert summary["overall_totals"]["total_dot"] == 6
+        assert "1 usage rows with no NHSN location code" in caplog.text
@@ -0,0 +1,97 @@
+"""Tests for streaming Clarity reads and the monthly extract cache."""
+
+import sqlite3
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from nhsn_src.data.clarity_io import MonthlyExtractCache, month_bounds, month_range, read_sql_chunks
+
+
+def test_month_range_and_bounds():
+    assert month_range(date(2025, 11, 15), date(2026, 2, 1)) == [
+        "2025-11", "2025-12", "2026-01", "2026-02",
+    ]
+    assert month_bounds("2024-02") == (date(2024, 2, 1), date(2024, 3, 1))
+
+
+def test_read_sql_chunks(tmp_path):
+    from sqlalchemy import create_engine
+
+    db_path = tmp_path / "clarity.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE T (VALUE INTEGER)")
+    conn.executemany("INSERT INTO T VALUES (?)", [(i,) for i in range(5)])
+    conn.commit()
+    conn.close()
+
+    engine = create_engine(f"sqlite:///{db_path}")
+    chunks = list(read_sql_chunks(engine, "SELECT VALUE FROM T WHERE VALUE >= :low", {"low": 1}, chunksize=3))
+
+    assert [len(c) for c in chunks] == [3, 1]
+    assert list(chunks[0].columns) == ["value"]
+
+
+class TestMonthlyExtractCache:
+    """Tests for MonthlyExtractCache."""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        pytest.importorskip("pyarrow")
+        return MonthlyExtractCache(tmp_path, settle_days=7)
+
+    def test_write_and_read_in_batches(self, cache):
+        chunks = [
+            pd.DataFrame({"code": ["VAN", "CRO"], "grams": [1.0, 2.0]}),
+            pd.DataFrame({"code": ["TZP"], "grams": [4.5]}),
+        ]
+
+        rows = cache.write_month("au", "2026-01", chunks)
+        batches = list(cache.iter_month("au", "2026-01", batch_size=2))
+
+        assert rows == 3
+        assert cache.has("au", "2026-01")
+        assert not cache.has("au", "2026-02")
+        assert cache.months("au") == ["2026-01"]
+        assert [len(b) for b in batches] == [2, 1]
+        assert list(pd.concat(batches)["code"]) == ["VAN", "CRO", "TZP"]
+
+    def test_empty_month_round_trips(self, cache):
+        cache.write_month("au", "2026-01", [pd.DataFrame({"code": pd.Series(dtype="string")})])
+
+        batches = list(cache.iter_month("au", "2026-01"))
+
+        assert len(batches) == 1
+        assert batches[0].empty
+        assert list(batches[0].columns) == ["code"]
+
+    def test_no_chunks_leaves_month_uncached(self, cache):
+        assert cache.write_month("au", "2026-01", []) == 0
+        assert not cache.has("au", "2026-01")
+
+    def test_failed_write_leaves_no_file(self, cache):
+        def chunks():
+            yield pd.DataFrame({"code": ["VAN"]})
+            raise RuntimeError("connection lost")
+
+        with pytest.raises(RuntimeError):
+            cache.write_month("au", "2026-01", chunks())
+
+        assert not cache.has("au", "2026-01")
+        assert not list(cache.path("au", "2026-01").parent.iterdir())
+
+    def test_is_cacheable(self, cache):
+        assert cache.is_cacheable("2026-01", today=date(2026, 2, 8))
+        assert not cache.is_cacheable("2026-01", today=date(2026, 2, 7))
+        assert not cache.is_cacheable("2026-02", today=date(2026, 2, 8))
+
+    def test_clear(self, cache):
+        for month in ("2026-01", "2026-02"):
+            cache.write_month("au", month, [pd.DataFrame({"code": ["VAN"]})])
+
+        cache.clear("au", "2026-01")
+        assert cache.months("au") == ["2026-02"]
+
+        cache.clear()
+        assert cache.months("au") == []
@@ -0,0 +1,269 @@
+"""Tests for denominator (patient-day and device-day) calculations."""
+
+import pytest
+import tempfile
+import os
+from datetime import date
+
+import pandas as pd
+
+
+class TestSplitIntervalsByMonth:
+    """Tests for month-boundary interval splitting."""
+
+    def test_interval_within_one_month(self):
+        from nhsn_src.data.denominator import split_intervals_by_month
+
+        intervals = pd.DataFrame({
+            "nhsn_location_code": ["ICU-A"],
+            "start_day": ["2026-01-05"],
+            "end_day": ["2026-01-09"],
+        })
+
+        pieces = split_intervals_by_month(intervals)
+
+        assert pieces.to_dict("records") == [
+            {"nhsn_location_code": "ICU-A", "month": "2026-01", "days": 5},
+        ]
+
+    def test_interval_spanning_months_and_leap_february(self):
+        from nhsn_src.data.denominator import split_intervals_by_month
+
+        intervals = pd.DataFrame({
+            "nhsn_location_code": ["ICU-A", "WARD-B"],
+            "start_day": ["2024-01-30", "2024-03-01"],
+            "end_day": ["2024-03-02", "2024-03-01"],
+        })
+
+        pieces = split_intervals_by_month(intervals)
+
+        assert list(pieces["month"]) == ["2024-01", "2024-02", "2024-03", "2024-03"]
+        assert list(pieces["days"]) == [2, 29, 2, 1]
+        assert list(pieces["nhsn_location_code"]) == ["ICU-A", "ICU-A", "ICU-A", "WARD-B"]
+
+    def test_inverted_interval_counts_one_day(self):
+        from nhsn_src.data.denominator import split_intervals_by_month
+
+        intervals = pd.DataFrame({
+            "nhsn_location_code": ["ICU-A"],
+            "start_day": ["2026-02-10"],
+            "end_day": ["2026-02-08"],
+        })
+
+        assert list(split_intervals_by_month(intervals)["days"]) == [1]
+
+    def test_empty(self):
+        from nhsn_src.data.denominator import split_intervals_by_month
+
+        intervals = pd.DataFrame(columns=["nhsn_location_code", "start_day", "end_day"])
+
+        pieces = split_intervals_by_month(intervals)
+
+        assert pieces.empty
+        assert list(pieces.columns) == ["nhsn_location_code", "month", "days"]
+
+
+class TestDenominatorCalculator:
+    """Parity tests for the interval engine against the per-day queries."""
+
+    START = date(2025, 1, 1)
+    END = date(2026, 3, 31)
+
+    @pytest.fixture
+    def temp_db(self):
+        """Create a mock Clarity database with stays and device documentation."""
+        import sqlite3
+
+        fd, db_path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+
+        cursor.executescript("""
+            CREATE TABLE PAT_ENC (
+                PAT_ENC_CSN_ID INTEGER PRIMARY KEY,
+                PAT_ID INTEGER,
+                INPATIENT_DATA_ID INTEGER UNIQUE,
+                HOSP_ADMIT_DTTM DATETIME,
+                HOSP_DISCH_DTTM DATETIME,
+                DEPARTMENT_ID INTEGER
+            );
+
+            CREATE TABLE NHSN_LOCATION_MAP (
+                EPIC_DEPT_ID INTEGER PRIMARY KEY,
+                NHSN_LOCATION_CODE TEXT NOT NULL,
+                LOCATION_DESCRIPTION TEXT
+            );
+
+            CREATE TABLE IP_FLWSHT_REC (
+                FSD_ID INTEGER PRIMARY KEY,
+                INPATIENT_DATA_ID INTEGER
+            );
+
+            CREATE TABLE IP_FLWSHT_MEAS (
+                FLO_MEAS_ID INTEGER,
+                FSD_ID INTEGER,
+                RECORDED_TIME DATETIME,
+                MEAS_VALUE TEXT,
+                PRIMARY KEY (FLO_MEAS_ID, FSD_ID, RECORDED_TIME)
+            );
+
+            CREATE TABLE IP_FLO_GP_DATA (
+                FLO_MEAS_ID INTEGER PRIMARY KEY,
+                DISP_NAME TEXT
+            );
+        """)
+
+        cursor.execute("INSERT INTO NHSN_LOCATION_MAP VALUES (10, 'ICU-A', 'ICU Unit A')")
+        cursor.execute("INSERT INTO NHSN_LOCATION_MAP VALUES (20, 'WARD-B', 'Medical Ward B')")
+
+        encounters = [
+            # Crosses a month boundary
+            (101, 1, 1001, "2026-01-28 14:00", "2026-02-03 10:00", 10),
+            # Admitted before the range, long stay (> 366 days in range)
+            (102, 2, 1002, "2024-11-15 08:00", "2026-03-10 12:00", 10),
+            # Still admitted
+            (103, 3, 1003, "2026-03-20 09:00", None, 20),
+            # Same patient as 101, readmitted to another unit
+            (104, 1, 1004, "2026-02-10 00:00", "2026-02-12 00:00", 20),
+            # Discharged before the range
+            (105, 4, 1005, "2024-06-01 00:00", "2024-06-05 00:00", 20),
+            # Unmapped department
+            (106, 5, 1006, "2026-01-01 00:00", "2026-01-10 00:00", 99),
+        ]
+        cursor.executemany("INSERT INTO PAT_ENC VALUES (?, ?, ?, ?, ?, ?)", encounters)
+
+        cursor.executemany("INSERT INTO IP_FLO_GP_DATA VALUES (?, ?)", [
+            (1, "Central Line Site"),
+            (2, "Foley Catheter Status"),
+            (3, "Ventilator Mode"),
+            (4, "Heart Rate"),
+        ])
+        cursor.executemany(
+            "INSERT INTO IP_FLWSHT_REC VALUES (?, ?)",
+            [(i, i) for i in (1001, 1002, 1003, 1004)],
+        )
+
+        meas = []
+        # Central line: documented daily 2026-01-28 .. 2026-02-02, twice a day,
+        # then a gap and one more day, then removed
+        for day in pd.date_range("2026-01-28", "2026-02-02"):
+            meas.append((1, 1001, f"{day:%Y-%m-%d} 08:00", "Present"))
+            meas.append((1, 1001, f"{day:%Y-%m-%d} 20:00", "Dressing intact"))
+        meas.append((1, 1001, "2026-02-03 06:00", "Present"))
+        meas.append((1, 1001, "2026-02-03 09:00", "Line removed"))
+        meas.append((1, 1002, "2026-02-20 08:00", "Present"))
+        # Foley for the long-stay patient, with gaps
+        for day in list(pd.date_range("2025-12-25", "2026-01-05")) + list(pd.date_range("2026-01-09", "2026-01-10")):
+            meas.append((2, 1002, f"{day:%Y-%m-%d} 10:00", "Draining"))
+        meas.append((2, 1002, "2026-01-11 10:00", "Discontinued"))
+        # Ventilator across the range end date, and a non-device row
+        for day in pd.date_range("2026-03-25", "2026-04-02"):
+            meas.append((3, 1003, f"{day:%Y-%m-%d} 12:00", "SIMV"))
+        meas.append((4, 1003, "2026-03-21 12:00", "120"))
+        # Readmission: central line on the same patient
+        meas.append((1, 1004, "2026-02-11 08:00", "Present"))
+        cursor.executemany("INSERT INTO IP_FLWSHT_MEAS VALUES (?, ?, ?, ?)", meas)
+
+        conn.commit()
+        conn.close()
+
+        yield db_path
+
+        os.unlink(db_path)
+
+    @pytest.fixture
+    def calculator(self, temp_db):
+        from nhsn_src.data.denominator import DenominatorCalculator
+        return DenominatorCalculator(f"sqlite:///{temp_db}")
+
+    @pytest.fixture
+    def cte_calculator(self, temp_db):
+        from nhsn_src.data.denominator import DenominatorCalculator
+        return DenominatorCalculator(f"sqlite:///{temp_db}", use_intervals=False)
+
+    def test_patient_days_match_recursive_cte(self, calculator, cte_calculator):
+        intervals = calculator.get_patient_days(start_date=self.START, end_date=self.END)
+        cte = cte_calculator.get_patient_days(start_date=self.START, end_date=self.END)
+
+        assert not cte.empty
+        pd.testing.assert_frame_equal(intervals, cte)
+
+    def test_patient_days_values(self, calculator):
+        df = calculator.get_patient_days(start_date=self.START, end_date=self.END)
+        days = df.set_index(["nhsn_location_code", "month"])["patient_days"]
+
+        # Long stay: every day of 2025 and Jan/Feb 2026 plus March 1-10,
+        # shared in ICU-A with the month-crossing stay
+        assert days[("ICU-A", "2025-06")] == 30
+        assert days[("ICU-A", "2026-01")] == 31 + 4
+        assert days[("ICU-A", "2026-02")] == 28 + 3
+        assert days[("ICU-A", "2026-03")] == 10
+        # Readmission (3 days) and open stay clipped to end_date (12 days)
+        assert days[("WARD-B", "2026-02")] == 3
+        assert days[("WARD-B", "2026-03")] == 12
+
+    def test_patient_days_location_filter(self, calculator, cte_calculator):
+        intervals = calculator.get_patient_days(["WARD-B"], self.START, self.END)
+        cte = cte_calculator.get_patient_days(["WARD-B"], self.START, self.END)
+
+        assert set(intervals["nhsn_location_code"]) == {"WARD-B"}
+        pd.testing.assert_frame_equal(intervals, cte)
+
+    @pytest.mark.parametrize("column, method", [
+        ("central_line_days", "get_central_line_days"),
+        ("urinary_catheter_days", "get_urinary_catheter_days"),
+        ("ventilator_days", "get_ventilator_days"),
+    ])
+    def test_device_days_match_distinct_day_queries(self, calculator, column, method):
+        combined = calculator.get_denominator_days(start_date=self.START, end_date=self.END)
+        expected = getattr(calculator, method)(start_date=self.START, end_date=self.END)
+
+        actual = combined.loc[
+            combined[column] > 0, ["nhsn_location_code", "month", column]
+        ].reset_index(drop=True)
+
+        assert not expected.empty
+        pd.testing.assert_frame_equal(actual, expected)
+
+    def test_device_day_values(self, calculator):
+        df = calculator.get_denominator_days(start_date=self.START, end_date=self.END)
+        rows = df.set_index(["nhsn_location_code", "month"])
+
+        # 4 January days + 3 February days (removal day still documented present),
+        # plus one day for the long-stay patient
+        assert rows.loc[("ICU-A", "2026-01"), "central_line_days"] == 4
+        assert rows.loc[("ICU-A", "2026-02"), "central_line_days"] == 3 + 1
+        assert rows.loc[("WARD-B", "2026-02"), "central_line_days"] == 1
+        # Foley: Dec 25-31, Jan 1-5 and 9-10
+        assert rows.loc[("ICU-A", "2025-12"), "urinary_catheter_days"] == 7
+        assert rows.loc[("ICU-A", "2026-01"), "urinary_catheter_days"] == 7
+        # end_date is compared as midnight, so only Mar 25-30 fall in range
+        assert rows.loc[("WARD-B", "2026-03"), "ventilator_days"] == 6
+
+    def test_summary_matches_per_query_summary(self, calculator, cte_calculator):
+        intervals = calculator.get_denominator_summary(start_date=self.START, end_date=self.END)
+        per_query = cte_calculator.get_denominator_summary(start_date=self.START, end_date=self.END)
+
+        assert intervals["locations"]
+        assert intervals == per_query
+
+    def test_empty_range(self, calculator, cte_calculator):
+        start, end = date(2020, 1, 1), date(2020, 12, 31)
+
+        df = calculator.get_denominator_days(start_date=start, end_date=end)
+        summary = calculator.get_denominator_summary(start_date=start, end_date=end)
+
+        assert df.empty
+        assert summary == cte_calculator.get_denominator_summary(start_date=start, end_date=end)
+        assert summary["locations"] == []
+
+
+class TestDenominatorCalculatorChunked(TestDenominatorCalculator):
+    """Re-run the parity tests with intervals streamed in small chunks."""
+
+    @pytest.fixture
+    def calculator(self, temp_db):
+        from nhsn_src.data.denominator import DenominatorCalculator
+        return DenominatorCalculator(f"sqlite:///{temp_db}", chunksize=2)
@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+"""Benchmark HL7 throughput of the real-time prophylaxis service.
+
+Replays a synthetic OR day over many concurrent MLLP connections against a
+service started on localhost and reports how ACK latency holds up at the
+offered rate. Each patient in the stream follows one of the demo_patients.py
+scenarios (same MRN prefix, CPT codes, procedure and OR):
+
+    SIU^S12 (case booked) -> ORM^O01 (order) ->
+    ADT^A02 to pre-op -> ADT^A02 to OR -> ADT^A02 to PACU
+
+A patient's messages always go over the same connection, in order.
+
+Reported per message type:
+- ACK latency: send to ACK received at the client (p50/p95/p99/max)
+- Handler latency: time inside MessageHandler.handle on the server
+- Dropped: messages never ACKed within --ack-timeout, and AE/AR ACKs
+
+Usage:
+    python scripts/benchmark_hl7_throughput.py                      # 200 patients, unpaced
+    python scripts/benchmark_hl7_throughput.py --rate 500 --connections 20
+    python scripts/benchmark_hl7_throughput.py --patients 2000 --rate 2000 --workers 8
+    python scripts/benchmark_hl7_throughput.py --target listener    # framing/queue only
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import logging
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import demo_patients
+from src.database import ProphylaxisDatabase
+from src.evaluator import ProphylaxisEvaluator
+from src.models import SurgicalCase
+from src.realtime.hl7_listener import (
+    MLLP_END,
+    MLLP_START,
+    HL7ListenerConfig,
+    HL7MLLPServer,
+    MessageHandler,
+    MLLPFrameBuffer,
+)
+from src.realtime.hl7_parser import HL7Message
+from src.realtime.service import RealtimeProphylaxisService, ServiceConfig
+
+# demo_patients.py scenarios used as patient templates
+DEMO_SCENARIOS = [
+    demo_patients.create_cardiac_case_compliant,
+    demo_patients.create_orthopedic_case_mrsa,
+    demo_patients.create_appendectomy_timing_failure,
+    demo_patients.create_colorectal_wrong_agent,
+    demo_patients.create_ent_missing_prophylaxis,
+    demo_patients.create_cholecystectomy_appropriate_withhold,
+    demo_patients.create_emergency_excluded,
+    demo_patients.create_perforated_appy_postop,
+]
+
+# Location codes that match the default LocationPatterns
+PREOP_LOCATION = "PREOP"
+PACU_LOCATION = "PACU"
+
+HL7_TIME = "%Y%m%d%H%M%S"
+
+
+@dataclass
+class OutboundMessage:
+    """A message to send, keyed for ACK matching."""
+
+    control_id: str
+    message_type: str
+    payload: bytes
+
+
+@dataclass
+class Results:
+    """Client-side measurements."""
+
+    sent: int = 0
+    acked: int = 0
+    negative_acks: int = 0
+    ack_latency: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    send_seconds: float = 0.0
+
+
+def load_demo_cases() -> list[SurgicalCase]:
+    """Build the demo_patients.py cases in a throwaway database."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = ProphylaxisDatabase(str(Path(tmp) / "demo.db"))
+        evaluator = ProphylaxisEvaluator()
+        # The demo is chatty; keep benchmark output readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            case_ids = [scenario(db, evaluator) for scenario in DEMO_SCENARIOS]
+        return [db.get_case(case_id) for case_id in case_ids]
+
+
+def _msh(event: str, control_id: str, now: datetime) -> str:
+    return f"MSH|^~\\&|OR_SCHED|HOSPITAL|AEGIS|AEGIS|{now.strftime(HL7_TIME)}||{event}|{control_id}|P|2.5\r"
+
+
+def _pid(mrn: str, name: str) -> str:
+    return f"PID|||{mrn}^^^HOSPITAL^MR||{name}|||||||||||\r"
+
+
+def _pv1(location: str, visit: str, prior_location: str = "") -> str:
+    # PV1-3 current location, PV1-6 prior location, PV1-19 visit number
+    return f"PV1||I|{location}|||{prior_location}|||||||||||||{visit}\r"
+
+
+def build_patient_stream(
+    case: SurgicalCase,
+    index: int,
+    surgery_time: datetime,
+) -> list[tuple[datetime, OutboundMessage]]:
+    """Build one patient's OR-day messages from a demo case template."""
+    mrn = f"{case.patient_mrn}-{index:05d}"
+    name = f"BENCH^PATIENT{index}"
+    visit = f"V{index:07d}"
+    cpt = case.cpt_codes[0] if case.cpt_codes else ""
+    description = case.procedure_description or "Surgery"
+    or_room = case.location or "OR1"
+    start = surgery_time.strftime(HL7_TIME)
+    end = (surgery_time + timedelta(hours=2)).strftime(HL7_TIME)
+
+    events = [
+        (
+            surgery_time - timedelta(hours=20),
+            "SIU^S12",
+            f"SCH|APT{index}|APT{index}||||ROUTINE|SURGERY^Surgery|120|min|{start}^{end}\r"
+            f"AIS|1||{cpt}^{description}\r"
+            f"AIL|1||{or_room}\r",
+        ),
+        (
+            surgery_time - timedelta(hours=18),
+            "ORM^O01",
+            f"ORC|NW|ORD{index}|ORD{index}||SC||^^^{start}\r"
+            f"OBR|1|ORD{index}|ORD{index}|{cpt}^{description}" + "|" * 32 + f"{start}\r",
+        ),
+        (surgery_time - timedelta(hours=2), "ADT^A02", PREOP_LOCATION),
+        (surgery_time - timedelta(minutes=10), "ADT^A02", or_room),
+        (surgery_time + timedelta(hours=2), "ADT^A02", PACU_LOCATION),
+    ]
+
+    stream = []
+    prior = ""
+    for seq, (event_time, event, body) in enumerate(events):
+        control_id = f"BENCH{index:05d}{seq}"
+        text = _msh(event, control_id, event_time)
+        if event == "ADT^A02":
+            text += f"EVN|A02|{event_time.strftime(HL7_TIME)}\r"
+            text += _pid(mrn, name) + _pv1(body, visit, prior)
+            prior = body
+        else:
+            text += _pid(mrn, name) + _pv1(or_room, visit) + body
+        stream.append((
+            event_time,
+            OutboundMessage(
+                control_id=control_id,
+                message_type=event,
+                payload=MLLP_START + text.encode("utf-8") + MLLP_END,
+            ),
+        ))
+    return stream
+
+
+def build_connection_streams(
+    cases: list[SurgicalCase],
+    patients: int,
+    connections: int,
+) -> list[list[OutboundMessage]]:
+    """Spread patients over an OR day and assign them to connections."""
+    day_start = datetime.now().replace(hour=7, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    per_connection: list[list[tuple[datetime, OutboundMessage]]] = [[] for _ in range(connections)]
+
+    for index in range(patients):
+        case = cases[index % len(cases)]
+        # Surgeries start every few minutes across a 12-hour OR day
+        surgery_time = day_start + timedelta(minutes=(index * 7) % 720)
+        per_connection[index % connections].extend(
+            build_patient_stream(case, index, surgery_time)
+        )
+
+    # Send in event-time order; sorting is stable, so each patient stays in order
+    return [[msg for _, msg in sorted(stream, key=lambda item: item[0])] for stream in per_connection]
+
+
+async def run_connection(
+    port: int,
+    messages: list[OutboundMessage],
+    interval: float,
+    start_at: float,
+    ack_timeout: float,
+    results: Results,
+) -> None:
+    """Send one connection's messages at a fixed rate and collect ACKs."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    sent_at: dict[str, tuple[str, float]] = {}
+    all_sent = asyncio.Event()
+
+    async def receive_acks() -> None:
+        framer = MLLPFrameBuffer()
+        while sent_at or not all_sent.is_set():
+            chunk = await reader.read(65536)
+            if not chunk:
+                return
+            received = time.perf_counter()
+            for frame in framer.feed(chunk):
+                # MSA|code|control_id
+                msa = next(
+                    (seg for seg in frame.split(b"\r") if seg.startswith(b"MSA|")),
+                    b"",
+                ).decode("utf-8", errors="replace").split("|")
+                if len(msa) < 3 or msa[2] not in sent_at:
+                    continue
+                message_type, sent = sent_at.pop(msa[2])
+                results.acked += 1
+                results.ack_latency[message_type].append(received - sent)
+                if msa[1] != "AA":
+                    results.negative_acks += 1
+
+    receiver = asyncio.create_task(receive_acks())
+
+    for i, message in enumerate(messages):
+        if interval:
+            # Open-loop pacing: a slow server does not slow the offered load
+            delay = start_at + i * interval - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        sent_at[message.control_id] = (message.message_type, time.perf_counter())
+        writer.write(message.payload)
+        results.sent += 1
+        await writer.drain()
+    all_sent.set()
+    if not sent_at:
+        # Every ACK arrived before the last send finished
+        receiver.cancel()
+
+    try:
+        await asyncio.wait_for(receiver, timeout=ack_timeout)
+    except (asyncio.TimeoutError, asyncio.CancelledError):
+        pass
+    finally:
+        writer.close()
+        with contextlib.suppress(Exception):
+            await writer.wait_closed()
+
+
+def instrument_handler(handler: MessageHandler) -> dict[str, list[float]]:
+    """Record time spent in MessageHandler.handle per message type."""
+    timings: dict[str, list[float]] = defaultdict(list)
+    handle = handler.handle
+
+    async def timed_handle(message: HL7Message) -> bool:
+        t0 = time.perf_counter()
+        try:
+            return await handle(message)
+        finally:
+            timings[f"{message.message_type}^{message.message_event}"].append(
+                time.perf_counter() - t0
+            )
+
+    handler.handle = timed_handle
+    return timings
+
+
+def percentiles(samples: list[float]) -> str:
+    """Format p50/p95/p99/max in milliseconds."""
+    if not samples:
+        return f"{'-':>8} {'-':>8} {'-':>8} {'-':>8}"
+    ordered = sorted(samples)
+
+    def pct(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000
+
+    return f"{pct(0.50):8.2f} {pct(0.95):8.2f} {pct(0.99):8.2f} {ordered[-1] * 1000:8.2f}"
+
+
+def print_table(title: str, samples_by_type: dict[str, list[float]]) -> None:
+    print(f"\n{title} (ms)")
+    print(f"  {'type':10s} {'count':>7s} {'p50':>8s} {'p95':>8s} {'p99':>8s} {'max':>8s}")
+    all_samples = []
+    for message_type in sorted(samples_by_type):
+        samples = samples_by_type[message_type]
+        all_samples.extend(samples)
+        print(f"  {message_type:10s} {len(samples):7d} {percentiles(samples)}")
+    print(f"  {'all':10s} {len(all_samples):7d} {percentiles(all_samples)}")
+
+
+async def run_benchmark(args: argparse.Namespace, db_dir: Path) -> None:
+    cases = load_demo_cases()
+    streams = build_connection_streams(cases, args.patients, args.connections)
+    total = sum(len(stream) for stream in streams)
+
+    listener_config = HL7ListenerConfig(
+        host="127.0.0.1",
+        port=0,
+        workers=args.workers,
+        queue_size=args.queue_size,
+    )
+
+    service = None
+    if args.target == "service":
+        service = RealtimeProphylaxisService(
+            config=ServiceConfig(
+                hl7_host="127.0.0.1",
+                hl7_port=0,
+                teams_enabled=False,
+                db_path=str(db_dir / "surgical_prophylaxis.db"),
+                state_write_behind=not args.sync_writes,
+            ),
+        )
+        service.hl7_listener.config = listener_config
+        listener = service.hl7_listener
+        await service.start()
+    else:
+        listener = HL7MLLPServer(handler=MessageHandler(), config=listener_config)
+        await listener.start()
+
+    handler_timings = instrument_handler(listener.handler)
+    port = listener._server.sockets[0].getsockname()[1]
+
+    print(f"  Target:       {args.target} on 127.0.0.1:{port}")
+    print(f"  Patients:     {args.patients} ({len(cases)} demo scenarios)")
+    print(f"  Messages:     {total} over {args.connections} connections")
+    print(f"  Offered rate: {f'{args.rate:g} msg/s' if args.rate else 'unpaced'}")
+
+    results = Results()
+    interval = args.connections / args.rate if args.rate else 0.0
+    # Paced runs start together slightly in the future
+    start_at = time.perf_counter() + (0.1 if interval else 0.0)
+    try:
+        await asyncio.gather(*(
+            run_connection(
+                port,
+                stream,
+                interval,
+                # Stagger connections so sends are spread evenly
+                start_at + (i * interval / args.connections),
+                args.ack_timeout,
+                results,
+            )
+            for i, stream in enumerate(streams)
+        ))
+        results.send_seconds = time.perf_counter() - start_at
+        stats = listener.get_stats()
+    finally:
+        if service:
+            await service.stop()
+        else:
+            await listener.stop()
+
+    print("\nThroughput")
+    print(f"  Elapsed:             {results.send_seconds:8.2f}s")
+    print(f"  Achieved:            {results.acked / results.send_seconds:8.1f} msg/s acked")
+    print(f"  Sent / ACKed:        {results.sent} / {results.acked}")
+    print(f"  Dropped (no ACK):    {results.sent - results.acked}")
+    print(f"  Negative ACKs:       {results.negative_acks}")
+    print(f"  Backpressure waits:  {stats['backpressure_waits']}")
+    print(f"  Parse errors:        {stats['parse_errors']}")
+
+    print_table("ACK latency", results.ack_latency)
+    print_table("Handler latency", handler_timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark HL7 MLLP throughput of the real-time prophylaxis service"
+    )
+    parser.add_argument(
+        "--target",
+        choices=["service", "listener"],
+        default="service",
+        help="Full RealtimeProphylaxisService, or the listener with no-op handlers (default: service)",
+    )
+    parser.add_argument(
+        "--patients",
+        type=int,
+        default=200,
+        help="Patients in the OR-day stream, 5 messages each (default: 200)",
+    )
+    parser.add_argument(
+        "--connections",
+        type=int,
+        default=10,
+        help="Concurrent MLLP connections (default: 10)",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=0,
+        help="Offered load in messages/second across all connections (default: unpaced)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Listener handler workers (default: 4)",
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=1000,
+        help="Listener message queue size (default: 1000)",
+    )
+    parser.add_argument(
+        "--ack-timeout",
+        type=float,
+        default=30.0,
+        help="Seconds to wait for outstanding ACKs after sending (default: 30)",
+    )
+    parser.add_argument(
+        "--sync-writes",
+        action="store_true",
+        help="Disable StateManager write-behind (service target only)",
+    )
+    parser.add_argument(
+        "--debug",
+        action="store_true",
+        help="Show service logging",
+    )
+
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.CRITICAL)
+
+    print("HL7 Throughput Benchmark")
+    print("=" * 40)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(run_benchmark(args, Path(tmp)))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,10 +5,16 @@ Database operations for surgical prophylaxis module.
 import json
 import os
 import sqlite3
+import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+# Repo root, for the shared common package
+sys.path.insert(0, str(__file__).rsplit("/", 3)[0])
+
+from common.sqlite_pool import PooledConnection, get_connection
+
 from .models import (
     ComplianceStatus,
     MedicationAdministration,
@@ -38,14 +44,12 @@ class ProphylaxisDatabase:
         if schema_path.exists():
             with open(schema_path) as f:
                 schema = f.read()
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_conn() as conn:
                 conn.executescript(schema)
 
-    def _get_conn(self) -> sqlite3.Connection:
-        """Get database connection with row factory."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+    def _get_conn(self) -> PooledConnection:
+        """Get this thread's pooled database connection."""
+        return get_connection(self.db_path)
 
     # --- Surgical Cases ---
 
@@ -463,7 +467,7 @@ class ProphylaxisDatabase:
         if schema_path.exists():
             with open(schema_path) as f:
                 schema = f.read()
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_conn() as conn:
                 conn.executescript(schema)
 
     def save_journey(
@@ -773,20 +777,22 @@ class ProphylaxisDatabase:
         recipient_id: Optional[str] = None,
         recipient_name: Optional[str] = None,
         next_escalation_at: Optional[datetime] = None,
+        escalation_level: int = 1,
     ) -> int:
         """Save an escalation record. Returns escalation_id."""
         with self._get_conn() as conn:
             cursor = conn.execute(
                 """
                 INSERT INTO alert_escalations (
-                    alert_id, journey_id, trigger_type, recipient_role,
-                    recipient_id, recipient_name, delivery_channel,
+                    alert_id, journey_id, escalation_level, trigger_type,
+                    recipient_role, recipient_id, recipient_name, delivery_channel,
                     sent_at, next_escalation_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, datetime('now'), ?)
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, datetime('now'), ?)
                 """,
                 (
                     alert_id,
                     journey_id,
+                    escalation_level,
                     trigger_type,
                     recipient_role,
                     recipient_id,
@@ -813,6 +819,21 @@ class ProphylaxisDatabase:
 
         return [dict(row) for row in rows]
 
+    def get_scheduled_escalations(self) -> list[dict]:
+        """Get unanswered escalations with a future or overdue escalation time."""
+        with self._get_conn() as conn:
+            rows = conn.execute(
+                """
+                SELECT * FROM alert_escalations
+                WHERE response_at IS NULL
+                AND escalated = 0
+                AND next_escalation_at IS NOT NULL
+                ORDER BY next_escalation_at
+                """
+            ).fetchall()
+
+        return [dict(row) for row in rows]
+
     def update_escalation_response(
         self,
         escalation_id: int,
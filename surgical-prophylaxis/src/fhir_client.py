@@ -24,6 +24,36 @@ from .models import (
     SurgicalCase,
 )
 
+# Antibiotics commonly used for surgical prophylaxis
+PROPHYLAXIS_MEDICATIONS = [
+    "cefazolin", "vancomycin", "clindamycin", "metronidazole",
+    "gentamicin", "cefoxitin", "ampicillin", "piperacillin",
+]
+
+
+def get_medication_name(resource: dict) -> str:
+    """Extract medication name from a MedicationRequest or MedicationAdministration."""
+    # Try medicationCodeableConcept first
+    med_cc = resource.get("medicationCodeableConcept", {})
+    for coding in med_cc.get("coding", []):
+        if coding.get("display"):
+            return coding["display"]
+    if med_cc.get("text"):
+        return med_cc["text"]
+
+    # Try medicationReference
+    med_ref = resource.get("medicationReference", {})
+    if med_ref.get("display"):
+        return med_ref["display"]
+
+    return ""
+
+
+def is_prophylaxis_medication(resource: dict) -> bool:
+    """Check whether a medication resource names a common prophylaxis antibiotic."""
+    name = get_medication_name(resource).lower()
+    return any(med in name for med in PROPHYLAXIS_MEDICATIONS)
+
 
 class FHIRClient:
     """Client for querying FHIR resources related to surgical prophylaxis."""
@@ -132,17 +162,7 @@ class FHIRClient:
 
         if prophylaxis_only:
             # Filter to antibiotics commonly used for prophylaxis
-            prophylaxis_meds = [
-                "cefazolin", "vancomycin", "clindamycin", "metronidazole",
-                "gentamicin", "cefoxitin", "ampicillin", "piperacillin",
-            ]
-            orders = [
-                o for o in orders
-                if any(
-                    med in self._get_medication_name(o).lower()
-                    for med in prophylaxis_meds
-                )
-            ]
+            orders = [o for o in orders if is_prophylaxis_medication(o)]
 
         return orders
 
@@ -174,17 +194,7 @@ class FHIRClient:
         admins = self._get_all_pages("MedicationAdministration", params)
 
         if prophylaxis_only:
-            prophylaxis_meds = [
-                "cefazolin", "vancomycin", "clindamycin", "metronidazole",
-                "gentamicin", "cefoxitin", "ampicillin", "piperacillin",
-            ]
-            admins = [
-                a for a in admins
-                if any(
-                    med in self._get_admin_medication_name(a).lower()
-                    for med in prophylaxis_meds
-                )
-            ]
+            admins = [a for a in admins if is_prophylaxis_medication(a)]
 
         return admins
 
@@ -358,35 +368,11 @@ class FHIRClient:
 
     def _get_medication_name(self, order: dict) -> str:
         """Extract medication name from MedicationRequest."""
-        # Try medicationCodeableConcept first
-        med_cc = order.get("medicationCodeableConcept", {})
-        for coding in med_cc.get("coding", []):
-            if coding.get("display"):
-                return coding["display"]
-        if med_cc.get("text"):
-            return med_cc["text"]
-
-        # Try medicationReference
-        med_ref = order.get("medicationReference", {})
-        if med_ref.get("display"):
-            return med_ref["display"]
-
-        return ""
+        return get_medication_name(order)
 
     def _get_admin_medication_name(self, admin: dict) -> str:
         """Extract medication name from MedicationAdministration."""
-        med_cc = admin.get("medicationCodeableConcept", {})
-        for coding in med_cc.get("coding", []):
-            if coding.get("display"):
-                return coding["display"]
-        if med_cc.get("text"):
-            return med_cc["text"]
-
-        med_ref = admin.get("medicationReference", {})
-        if med_ref.get("display"):
-            return med_ref["display"]
-
-        return ""
+        return get_medication_name(admin)
 
     def _get_mrn(self, patient_id: str) -> str:
         """Get MRN from patient identifiers."""
@@ -9,6 +9,7 @@ Components:
 - HL7 Listener: MLLP server for ADT/ORM messages
 - Location Tracker: Patient surgical journey state machine
 - Schedule Monitor: FHIR Appointment polling for upcoming surgeries
+- Async FHIR Client: Non-blocking FHIR access for the event loop
 - Pre-Op Checker: Real-time compliance checking
 - Escalation Engine: Time-based alert routing with automatic escalation
 - Epic Secure Chat: Epic integration for secure messaging
@@ -19,6 +20,7 @@ Components:
 from .hl7_parser import HL7Message, HL7Segment, parse_hl7_message
 from .location_tracker import LocationState, LocationTracker, PatientLocationUpdate
 from .schedule_monitor import ScheduledSurgery, ScheduleMonitor
+from .async_fhir_client import AsyncFHIRClient
 from .preop_checker import PreOpCheckResult, PreOpChecker
 from .escalation_engine import EscalationRule, EscalationEngine, AlertTrigger
 from .state_manager import StateManager, SurgicalJourney
@@ -38,6 +40,8 @@ __all__ = [
     # Schedule Monitoring
     "ScheduledSurgery",
     "ScheduleMonitor",
+    # FHIR Access
+    "AsyncFHIRClient",
     # Pre-Op Checking
     "PreOpCheckResult",
     "PreOpChecker",
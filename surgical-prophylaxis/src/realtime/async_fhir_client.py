@@ -0,0 +1,201 @@
+"""
+Async FHIR client for the real-time prophylaxis service.
+
+The real-time service shares one event loop between the HL7 MLLP listener
+and the FHIR lookups made by the pre-op checker and schedule monitor. The
+batch FHIRClient uses blocking requests calls, so a slow FHIR server would
+stall HL7 ingestion (including ACKs). This client uses a pooled HTTP/1.1
+keep-alive transport (httpx) with per-request timeouts and a cap on
+in-flight requests, so FHIR latency only delays the coroutine waiting on it.
+"""
+
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+
+try:
+    import httpx
+    HAS_HTTPX = True
+except ImportError:
+    HAS_HTTPX = False
+
+from ..config import FHIR_BASE_URL
+from ..fhir_client import is_prophylaxis_medication
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncFHIRClient:
+    """
+    Non-blocking FHIR client for the real-time service.
+
+    The underlying httpx.AsyncClient is created lazily on first use so it is
+    bound to the running event loop. Call aclose() (or use the client as an
+    async context manager) to release pooled connections.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        timeout: float = 10.0,
+        connect_timeout: float = 5.0,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        max_concurrency: int = 10,
+    ):
+        if not HAS_HTTPX:
+            raise ImportError("httpx is required for AsyncFHIRClient: pip install httpx")
+
+        self.base_url = (base_url or FHIR_BASE_URL).rstrip("/") + "/"
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.max_concurrency = max_concurrency
+
+        self.headers = {"Accept": "application/fhir+json"}
+        auth_token = os.getenv("FHIR_AUTH_TOKEN")
+        if auth_token:
+            self.headers["Authorization"] = f"Bearer {auth_token}"
+
+        self._client: Optional["httpx.AsyncClient"] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> "AsyncFHIRClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+
+    def _get_client(self) -> "httpx.AsyncClient":
+        """Get the pooled HTTP client, creating it on first use."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self.headers,
+                timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                    keepalive_expiry=self.keepalive_expiry,
+                ),
+                http2=False,
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._semaphore = None
+
+    async def _get(self, url: str, params: Optional[dict] = None) -> dict:
+        """Make a GET request, waiting for a concurrency slot first."""
+        client = self._get_client()
+        async with self._semaphore:
+            response = await client.get(url, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    async def search(self, resource_type: str, params: Optional[dict] = None) -> list[dict]:
+        """
+        Search a resource type and follow next links.
+
+        Args:
+            resource_type: FHIR resource type (e.g., "Appointment")
+            params: Search parameters
+
+        Returns:
+            List of resources from all pages (including _include matches)
+        """
+        results = []
+        bundle = await self._get(resource_type, params)
+
+        while True:
+            results.extend(e.get("resource", {}) for e in bundle.get("entry", []))
+
+            next_link = next(
+                (link for link in bundle.get("link", []) if link.get("relation") == "next"),
+                None,
+            )
+            if not next_link:
+                break
+
+            # Next links are absolute and already carry the search parameters
+            bundle = await self._get(next_link["url"])
+
+        return results
+
+    async def get_medication_orders(
+        self,
+        patient_id: str,
+        since_hours: int = 48,
+        prophylaxis_only: bool = True,
+    ) -> list[dict]:
+        """
+        Get medication orders (MedicationRequest) for a patient.
+
+        Mirrors FHIRClient.get_medication_orders.
+        """
+        cutoff = datetime.now() - timedelta(hours=since_hours)
+        params = {
+            "subject": f"Patient/{patient_id}",
+            "authoredon": f"ge{cutoff.isoformat()}",
+            "status": "active,completed",
+            "_count": 50,
+        }
+
+        orders = await self.search("MedicationRequest", params)
+
+        if prophylaxis_only:
+            orders = [o for o in orders if is_prophylaxis_medication(o)]
+
+        return orders
+
+    async def get_medication_administrations(
+        self,
+        patient_id: str,
+        since_hours: int = 48,
+        prophylaxis_only: bool = True,
+    ) -> list[dict]:
+        """
+        Get medication administrations (MAR) for a patient.
+
+        Mirrors FHIRClient.get_medication_administrations.
+        """
+        cutoff = datetime.now() - timedelta(hours=since_hours)
+        params = {
+            "subject": f"Patient/{patient_id}",
+            "effective-time": f"ge{cutoff.isoformat()}",
+            "status": "completed",
+            "_count": 100,
+        }
+
+        admins = await self.search("MedicationAdministration", params)
+
+        if prophylaxis_only:
+            admins = [a for a in admins if is_prophylaxis_medication(a)]
+
+        return admins
+
+
+def create_async_fhir_client(
+    base_url: Optional[str] = None,
+    timeout: float = 10.0,
+    max_concurrency: int = 10,
+) -> Optional[AsyncFHIRClient]:
+    """Create an AsyncFHIRClient, or None if httpx is not installed."""
+    if not HAS_HTTPX:
+        logger.warning("httpx not installed, async FHIR client unavailable")
+        return None
+    return AsyncFHIRClient(
+        base_url=base_url,
+        timeout=timeout,
+        max_concurrency=max_concurrency,
+    )
@@ -6,7 +6,10 @@ handles automatic escalation after timeout, and tracks responses.
 """
 
 import asyncio
+import heapq
+import itertools
 import logging
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
@@ -163,19 +166,47 @@ class EscalationEngine:
     - Track acknowledgments and responses
     - Automatically escalate after timeout
     - Manage multiple delivery channels
+
+    Pending escalations are kept in a heap ordered by next_escalation_at.
+    The monitor sleeps until the earliest deadline and is woken early when
+    a sooner deadline is scheduled, so escalations fire on time and idle
+    alerts cost nothing. Acknowledged or answered alerts leave stale heap
+    entries that are skipped when popped.
+
+    With an ``escalation_store`` (ProphylaxisDatabase), each escalation
+    level is recorded in alert_escalations and unanswered deadlines are
+    restored when the monitor starts. Store calls are blocking SQLite
+    writes, so they run on a single worker thread: off the event loop, and
+    in the order they were made, so a response is never written before the
+    level it answers.
     """
 
     def __init__(
         self,
         rules: Optional[dict[AlertTrigger, EscalationRule]] = None,
         alert_store: Optional[Any] = None,
+        escalation_store: Optional[Any] = None,
     ):
         self.rules = rules or DEFAULT_ESCALATION_RULES.copy()
         self.alert_store = alert_store
+        self.escalation_store = escalation_store
 
         # Active escalations (alert_id -> EscalationRecord)
         self._active_escalations: dict[str, EscalationRecord] = {}
 
+        # Deadline heap of (next_escalation_at, seq, alert_id)
+        self._escalation_heap: list[tuple[datetime, int, str]] = []
+        self._heap_seq = itertools.count()
+        self._wakeup = asyncio.Event()
+
+        # alert_id -> alert_escalations row for the current level
+        self._escalation_row_ids: dict[str, int] = {}
+        self._store_executor: Optional[ThreadPoolExecutor] = None
+        if escalation_store:
+            self._store_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="escalation-store"
+            )
+
         # Channel senders (channel -> async function)
         self._channel_senders: dict[DeliveryChannel, ChannelSender] = {}
 
@@ -268,6 +299,8 @@ class EscalationEngine:
 
         # Track active escalation
         self._active_escalations[alert_id] = record
+        self._persist_level(record)
+        self._schedule(record)
 
         logger.info(
             f"Alert {alert_id} sent to {record.current_role.value} "
@@ -394,6 +427,8 @@ class EscalationEngine:
         record.response_action = "acknowledged"
         record.response_by = acknowledged_by
         record.next_escalation_at = None  # Cancel escalation
+        self._persist_response(record)
+        self._wakeup.set()
 
         # Update alert store
         if self.alert_store:
@@ -433,6 +468,8 @@ class EscalationEngine:
         record.response_action = action
         record.response_by = responded_by
         record.next_escalation_at = None  # Cancel escalation
+        self._persist_response(record)
+        self._wakeup.set()
 
         # Update alert store
         if self.alert_store:
@@ -460,8 +497,9 @@ class EscalationEngine:
             return
 
         self._running = True
+        restored = await self.restore_pending_escalations()
         self._escalation_task = asyncio.create_task(self._escalation_loop())
-        logger.info("Escalation monitor started")
+        logger.info(f"Escalation monitor started ({restored} pending escalations restored)")
 
     async def stop_escalation_monitor(self) -> None:
         """Stop the escalation monitor."""
@@ -472,29 +510,213 @@ class EscalationEngine:
                 await self._escalation_task
             except asyncio.CancelledError:
                 pass
+        await self.flush_store()
         logger.info("Escalation monitor stopped")
 
     async def _escalation_loop(self) -> None:
-        """Background loop to check for escalations."""
+        """Background loop that sleeps until the next escalation is due."""
         while self._running:
+            # Clear before computing the delay so a deadline scheduled
+            # while we wait still wakes us
+            self._wakeup.clear()
+            delay = self._seconds_until_next_escalation()
+
+            if delay is None or delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+
             try:
                 await self._process_pending_escalations()
             except Exception as e:
                 logger.error(f"Error in escalation loop: {e}")
 
-            # Check every minute
-            await asyncio.sleep(60)
-
     async def _process_pending_escalations(self) -> None:
-        """Process any alerts that need escalation."""
+        """Escalate every alert whose deadline has passed."""
         now = datetime.now()
 
-        for alert_id, record in list(self._active_escalations.items()):
-            if record.acknowledged or record.escalated:
+        while self._escalation_heap and self._escalation_heap[0][0] <= now:
+            entry = heapq.heappop(self._escalation_heap)
+            if self._is_current(entry):
+                await self._escalate_alert(self._active_escalations[entry[2]])
+
+    def _schedule(self, record: EscalationRecord) -> None:
+        """Add a record's next escalation deadline to the heap."""
+        if record.next_escalation_at is None:
+            return
+
+        seq = next(self._heap_seq)
+        heapq.heappush(
+            self._escalation_heap,
+            (record.next_escalation_at, seq, record.alert_id),
+        )
+
+        # Stale entries are normally skipped lazily; rebuild if they pile up
+        if len(self._escalation_heap) > 2 * len(self._active_escalations) + 64:
+            self._escalation_heap = [
+                entry for entry in self._escalation_heap if self._is_current(entry)
+            ]
+            heapq.heapify(self._escalation_heap)
+
+        # Wake the monitor if this is now the earliest deadline
+        if self._escalation_heap and self._escalation_heap[0][1] == seq:
+            self._wakeup.set()
+
+    def _is_current(self, entry: tuple[datetime, int, str]) -> bool:
+        """Check a heap entry still matches its record's pending deadline."""
+        deadline, _, alert_id = entry
+        record = self._active_escalations.get(alert_id)
+        return bool(
+            record
+            and not record.acknowledged
+            and not record.escalated
+            and record.next_escalation_at == deadline
+        )
+
+    def _seconds_until_next_escalation(self) -> Optional[float]:
+        """Seconds until the earliest pending deadline, or None if there is none."""
+        while self._escalation_heap and not self._is_current(self._escalation_heap[0]):
+            heapq.heappop(self._escalation_heap)
+
+        if not self._escalation_heap:
+            return None
+
+        return max(0.0, (self._escalation_heap[0][0] - datetime.now()).total_seconds())
+
+    def get_next_escalation_time(self) -> Optional[datetime]:
+        """Get the earliest pending escalation deadline."""
+        if self._seconds_until_next_escalation() is None:
+            return None
+        return self._escalation_heap[0][0]
+
+    # Persistence
+
+    def _submit_store_call(self, func: Callable[[], Any]) -> Optional[Future]:
+        """Queue a store call on the store thread."""
+        if not self._store_executor:
+            return None
+        return self._store_executor.submit(func)
+
+    async def flush_store(self) -> None:
+        """Wait until every queued store call has finished."""
+        future = self._submit_store_call(lambda: None)
+        if future:
+            await asyncio.wrap_future(future)
+
+    def _persist_level(self, record: EscalationRecord) -> None:
+        """Record the record's current escalation level in the store."""
+        alert_id = record.alert_id
+        # Capture the level now; the record keeps changing on the event loop
+        values = dict(
+            alert_id=alert_id,
+            journey_id=record.journey_id,
+            trigger_type=record.trigger.value,
+            recipient_role=record.current_role.value,
+            delivery_channel=",".join(c.value for c in record.channels_sent) or "none",
+            recipient_id=record.current_recipient_id,
+            recipient_name=record.current_recipient_name,
+            next_escalation_at=record.next_escalation_at,
+            escalation_level=record.current_level,
+        )
+
+        def save() -> None:
+            try:
+                self._escalation_row_ids[alert_id] = self.escalation_store.save_escalation(**values)
+            except Exception as e:
+                logger.error(f"Error saving escalation {alert_id}: {e}")
+
+        self._submit_store_call(save)
+
+    def _persist_escalated(self, record: EscalationRecord) -> None:
+        """Mark the record's current level as escalated (no longer pending)."""
+        alert_id = record.alert_id
+
+        def mark() -> None:
+            row_id = self._escalation_row_ids.get(alert_id)
+            if row_id is None:
+                return
+            try:
+                self.escalation_store.mark_escalation_escalated(row_id)
+            except Exception as e:
+                logger.error(f"Error updating escalation {alert_id}: {e}")
+
+        self._submit_store_call(mark)
+
+    def _persist_response(self, record: EscalationRecord) -> None:
+        """Record an acknowledgment or response so the deadline is not restored."""
+        alert_id = record.alert_id
+        action, responded_by = record.response_action, record.response_by
+
+        def update() -> None:
+            row_id = self._escalation_row_ids.get(alert_id)
+            if row_id is None:
+                return
+            try:
+                self.escalation_store.update_escalation_response(row_id, action, responded_by)
+            except Exception as e:
+                logger.error(f"Error saving escalation response {alert_id}: {e}")
+
+        self._submit_store_call(update)
+
+    async def restore_pending_escalations(self) -> int:
+        """
+        Reload unanswered escalations from the store and re-arm their deadlines.
+
+        Deadlines that passed while the service was down fire as soon as the
+        monitor runs.
+
+        Returns:
+            Number of escalations restored
+        """
+        if not self.escalation_store:
+            return 0
+
+        try:
+            rows = await asyncio.wrap_future(
+                self._submit_store_call(self.escalation_store.get_scheduled_escalations)
+            )
+        except Exception as e:
+            logger.error(f"Error loading pending escalations: {e}")
+            return 0
+
+        channel_values = {c.value for c in DeliveryChannel}
+        restored = 0
+
+        for row in rows:
+            alert_id = row["alert_id"]
+            if alert_id in self._active_escalations:
                 continue
 
-            if record.next_escalation_at and record.next_escalation_at <= now:
-                await self._escalate_alert(record)
+            try:
+                record = EscalationRecord(
+                    escalation_id=f"esc-{alert_id}",
+                    alert_id=alert_id,
+                    journey_id=row["journey_id"],
+                    trigger=AlertTrigger(row["trigger_type"]),
+                    current_level=row["escalation_level"] or 1,
+                    current_role=RecipientRole(row["recipient_role"]),
+                    current_recipient_id=row["recipient_id"],
+                    current_recipient_name=row["recipient_name"],
+                    sent_at=datetime.fromisoformat(row["sent_at"]) if row["sent_at"] else None,
+                    next_escalation_at=datetime.fromisoformat(row["next_escalation_at"]),
+                    channels_sent=[
+                        DeliveryChannel(value)
+                        for value in (row["delivery_channel"] or "").split(",")
+                        if value in channel_values
+                    ],
+                    delivery_status=row["delivery_status"] or "sent",
+                )
+            except ValueError as e:
+                logger.error(f"Skipping unreadable escalation {alert_id}: {e}")
+                continue
+
+            self._active_escalations[alert_id] = record
+            self._escalation_row_ids[alert_id] = row["escalation_id"]
+            self._schedule(record)
+            restored += 1
+
+        return restored
 
     async def _escalate_alert(self, record: EscalationRecord) -> None:
         """Escalate an alert to the next level."""
@@ -514,8 +736,12 @@ class EscalationEngine:
         else:
             # No further escalation
             record.escalated = True
+            self._persist_escalated(record)
             return
 
+        # The level being left is no longer pending
+        self._persist_escalated(record)
+
         # Update record
         record.current_level += 1
         record.current_role = next_role
@@ -547,6 +773,9 @@ class EscalationEngine:
             record.next_escalation_at = None
             record.escalated = True
 
+        self._persist_level(record)
+        self._schedule(record)
+
     def get_active_escalations(self) -> list[EscalationRecord]:
         """Get all active (non-acknowledged, non-escalated) escalations."""
         return [
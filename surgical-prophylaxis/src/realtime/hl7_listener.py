@@ -7,6 +7,8 @@ via TCP socket using MLLP framing.
 
 import asyncio
 import logging
+import time
+import zlib
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Callable, Optional, Awaitable, Any
@@ -19,6 +21,9 @@ logger = logging.getLogger(__name__)
 MLLP_START = b"\x0b"  # VT (vertical tab)
 MLLP_END = b"\x1c\r"  # FS CR (file separator + carriage return)
 
+# Bytes requested per socket read
+READ_SIZE = 64 * 1024
+
 
 @dataclass
 class HL7ListenerConfig:
@@ -30,6 +35,10 @@ class HL7ListenerConfig:
     max_connections: int = 10
     receive_timeout: float = 30.0
     send_ack: bool = True
+    workers: int = 4  # Handler workers draining the message queue
+    queue_size: int = 1000  # Messages queued before connections stop reading
+    max_message_bytes: int = 1024 * 1024
+    drain_timeout: float = 10.0  # Seconds to finish queued messages on stop
 
     @classmethod
     def from_env(cls) -> "HL7ListenerConfig":
@@ -43,6 +52,8 @@ class HL7ListenerConfig:
             max_connections=int(os.getenv("HL7_MAX_CONNECTIONS", "10")),
             receive_timeout=float(os.getenv("HL7_RECEIVE_TIMEOUT", "30.0")),
             send_ack=os.getenv("HL7_SEND_ACK", "true").lower() == "true",
+            workers=int(os.getenv("HL7_WORKERS", "4")),
+            queue_size=int(os.getenv("HL7_QUEUE_SIZE", "1000")),
         )
 
 
@@ -121,10 +132,104 @@ class MessageHandler:
         }
 
 
+class MLLPFrameBuffer:
+    """
+    Per-connection MLLP de-framer.
+
+    Bytes from each read are appended to one bytearray and scanned for
+    complete <VT>message<FS><CR> frames, so a single read can yield several
+    pipelined messages and a frame split across reads is completed by a
+    later one. The search for the end block resumes where the previous
+    search stopped instead of rescanning the partial frame.
+
+    Bytes outside a frame are discarded, as is any frame larger than
+    ``max_message_bytes`` (the buffer then resyncs on the next start byte).
+    """
+
+    def __init__(self, max_message_bytes: int = 1024 * 1024):
+        self.max_message_bytes = max_message_bytes
+        self._buffer = bytearray()
+        # Offset to resume the end-block search from (buffer starts with VT)
+        self._scan_from = 1
+
+        self.bytes_discarded = 0
+        self.oversized_messages = 0
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def feed(self, data: bytes) -> list[bytes]:
+        """
+        Add received bytes and return every complete message payload.
+
+        Args:
+            data: Bytes from one socket read
+
+        Returns:
+            Message payloads (without framing) in arrival order
+        """
+        buf = self._buffer
+        buf += data
+        frames = []
+
+        while buf:
+            # Keep the buffer anchored on a start byte
+            if buf[0] != MLLP_START[0]:
+                start = buf.find(MLLP_START)
+                if start < 0:
+                    self.bytes_discarded += len(buf)
+                    buf.clear()
+                    break
+                self.bytes_discarded += start
+                del buf[:start]
+                self._scan_from = 1
+
+            end = buf.find(MLLP_END, self._scan_from)
+            if end < 0:
+                if len(buf) - 1 > self.max_message_bytes:
+                    logger.error("Message too large, discarding")
+                    self.oversized_messages += 1
+                    self.bytes_discarded += len(buf)
+                    buf.clear()
+                else:
+                    # FS may be the last byte, still waiting for its CR
+                    self._scan_from = max(1, len(buf) - 1)
+                break
+
+            if end - 1 > self.max_message_bytes:
+                logger.error("Message too large, discarding")
+                self.oversized_messages += 1
+                self.bytes_discarded += end + len(MLLP_END)
+            elif end > 1:
+                with memoryview(buf) as view:
+                    frames.append(bytes(view[1:end]))
+
+            del buf[:end + len(MLLP_END)]
+            self._scan_from = 1
+
+        return frames
+
+
+@dataclass
+class _QueuedMessage:
+    """A parsed message waiting for a handler worker."""
+
+    message: HL7Message
+    received_at: float
+    ack: asyncio.Future
+
+
 class HL7MLLPServer:
     """
     Async MLLP server for receiving HL7 messages.
 
+    Connections only de-frame, parse and enqueue; a pool of handler workers
+    drains bounded queues. Messages are partitioned across workers by
+    patient MRN, so each patient's events are handled in arrival order while
+    different patients are handled concurrently. When the queues are full
+    the connection stops reading, which pushes back on the sender through
+    TCP flow control. ACKs are written in message order on each connection.
+
     Usage:
         handler = MessageHandler()
         handler.on_adt = my_adt_handler
@@ -148,9 +253,21 @@ class HL7MLLPServer:
         self._running = False
         self._connections: set[asyncio.Task] = set()
 
+        # Handler workers, one queue per worker
+        self._queues: list[asyncio.Queue] = []
+        self._workers: list[asyncio.Task] = []
+        self._next_queue = 0
+
         # Statistics
         self.connections_total = 0
         self.connections_active = 0
+        self.messages_queued = 0
+        self.backpressure_waits = 0
+        self.parse_errors = 0
+        self.bytes_discarded = 0
+        self.oversized_messages = 0
+        # "ADT^A02" -> {"count", "total", "max"} seconds from receipt to handled
+        self._latency: dict[str, dict[str, float]] = {}
 
     @property
     def is_running(self) -> bool:
@@ -167,6 +284,13 @@ class HL7MLLPServer:
             logger.warning("HL7 server already running")
             return
 
+        workers = max(1, self.config.workers)
+        queue_size = max(1, self.config.queue_size // workers)
+        self._queues = [asyncio.Queue(maxsize=queue_size) for _ in range(workers)]
+        self._workers = [
+            asyncio.create_task(self._worker(queue)) for queue in self._queues
+        ]
+
         self._server = await asyncio.start_server(
             self._handle_client,
             self.config.host,
@@ -177,7 +301,10 @@ class HL7MLLPServer:
         self._running = True
 
         addr = self._server.sockets[0].getsockname()
-        logger.info(f"HL7 MLLP server listening on {addr[0]}:{addr[1]}")
+        logger.info(
+            f"HL7 MLLP server listening on {addr[0]}:{addr[1]} "
+            f"({workers} workers, queue size {queue_size * workers})"
+        )
 
         # Start serving in background
         asyncio.create_task(self._serve())
@@ -207,8 +334,31 @@ class HL7MLLPServer:
             self._server.close()
             await self._server.wait_closed()
 
+        # Let workers finish messages already queued, then stop them
+        if self._queues:
+            try:
+                await asyncio.wait_for(
+                    asyncio.gather(*(queue.join() for queue in self._queues)),
+                    timeout=self.config.drain_timeout,
+                )
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"{self.queue_depth} HL7 messages still queued at shutdown"
+                )
+        for task in self._workers:
+            task.cancel()
+        if self._workers:
+            await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+        self._queues.clear()
+
         logger.info("HL7 MLLP server stopped")
 
+    @property
+    def queue_depth(self) -> int:
+        """Messages waiting for a handler worker."""
+        return sum(queue.qsize() for queue in self._queues)
+
     async def _handle_client(
         self,
         reader: asyncio.StreamReader,
@@ -225,52 +375,42 @@ class HL7MLLPServer:
         task = asyncio.current_task()
         self._connections.add(task)
 
+        framer = MLLPFrameBuffer(self.config.max_message_bytes)
+        pending_acks: asyncio.Queue = asyncio.Queue()
+        ack_task = asyncio.create_task(self._write_acks(writer, pending_acks, peer))
+
         try:
             while self._running:
-                # Read message with MLLP framing
-                message_bytes = await self._read_mllp_message(reader)
-
-                if not message_bytes:
-                    break  # Connection closed
-
-                # Parse message
                 try:
-                    message_str = message_bytes.decode("utf-8", errors="replace")
-                    message = parse_hl7_message(message_str)
-
-                    logger.debug(
-                        f"Received {message.message_type}^{message.message_event} "
-                        f"from {peer}"
+                    chunk = await asyncio.wait_for(
+                        reader.read(READ_SIZE),
+                        timeout=self.config.receive_timeout,
                     )
+                except asyncio.TimeoutError:
+                    break
 
-                    # Handle message
-                    success = await self.handler.handle(message)
-
-                    # Send ACK if configured
-                    if self.config.send_ack:
-                        ack_code = "AA" if success else "AE"
-                        ack = build_ack_message(message, ack_code)
-                        await self._send_mllp_message(writer, ack)
+                if not chunk:
+                    break  # Connection closed
 
-                except Exception as e:
-                    logger.error(f"Error processing message from {peer}: {e}")
+                for frame in framer.feed(chunk):
+                    ack = await self._enqueue(frame, peer)
+                    if ack is not None:
+                        await pending_acks.put(ack)
 
-                    # Send error ACK
-                    if self.config.send_ack:
-                        try:
-                            message = parse_hl7_message(message_bytes.decode("utf-8", errors="replace"))
-                            ack = build_ack_message(message, "AE", str(e))
-                            await self._send_mllp_message(writer, ack)
-                        except Exception:
-                            pass
+            # Send ACKs for everything already accepted before closing
+            await pending_acks.put(None)
+            await ack_task
 
         except asyncio.CancelledError:
             pass
         except Exception as e:
             logger.error(f"Connection error from {peer}: {e}")
         finally:
+            ack_task.cancel()
             self.connections_active -= 1
             self._connections.discard(task)
+            self.bytes_discarded += framer.bytes_discarded
+            self.oversized_messages += framer.oversized_messages
 
             try:
                 writer.close()
@@ -280,51 +420,98 @@ class HL7MLLPServer:
 
             logger.debug(f"HL7 connection closed from {peer}")
 
-    async def _read_mllp_message(
-        self,
-        reader: asyncio.StreamReader,
-    ) -> Optional[bytes]:
-        """Read a single MLLP-framed message."""
-        try:
-            # Read until we find the start byte
-            while True:
-                byte = await asyncio.wait_for(
-                    reader.read(1),
-                    timeout=self.config.receive_timeout,
-                )
-
-                if not byte:
-                    return None  # Connection closed
-
-                if byte == MLLP_START:
-                    break
-
-            # Read until end frame
-            data = b""
-            while True:
-                chunk = await asyncio.wait_for(
-                    reader.read(4096),
-                    timeout=self.config.receive_timeout,
-                )
+    async def _enqueue(self, frame: bytes, peer: Any) -> Optional[asyncio.Future]:
+        """
+        Parse a frame and queue it for its patient's worker.
 
-                if not chunk:
-                    return None
+        Waits while that worker's queue is full (backpressure).
 
-                data += chunk
+        Returns:
+            Future resolving to the ACK text (None when ACKs are disabled),
+            or None if the frame could not be parsed
+        """
+        received_at = time.perf_counter()
+        try:
+            message = parse_hl7_message(frame.decode("utf-8", errors="replace"))
+        except Exception as e:
+            self.parse_errors += 1
+            logger.error(f"Error parsing message from {peer}: {e}")
+            return None
 
-                # Check for end frame
-                if MLLP_END in data:
-                    # Extract message (remove end frame)
-                    end_pos = data.index(MLLP_END)
-                    return data[:end_pos]
+        logger.debug(
+            f"Received {message.message_type}^{message.message_event} from {peer}"
+        )
 
-                # Prevent unbounded growth
-                if len(data) > 1024 * 1024:  # 1MB limit
-                    logger.error("Message too large, discarding")
-                    return None
+        ack = asyncio.get_running_loop().create_future()
+        queue = self._queue_for(message)
+        if queue.full():
+            self.backpressure_waits += 1
+        await queue.put(_QueuedMessage(message=message, received_at=received_at, ack=ack))
+        self.messages_queued += 1
+        return ack
 
-        except asyncio.TimeoutError:
-            return None
+    def _queue_for(self, message: HL7Message) -> asyncio.Queue:
+        """Pick the worker queue for a message (same patient, same worker)."""
+        try:
+            key = message.patient_mrn
+        except Exception:
+            key = ""
+        if key:
+            return self._queues[zlib.crc32(key.encode()) % len(self._queues)]
+        self._next_queue = (self._next_queue + 1) % len(self._queues)
+        return self._queues[self._next_queue]
+
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        """Handler worker: drain one queue in order."""
+        while True:
+            item: _QueuedMessage = await queue.get()
+            message = item.message
+            ack = None
+            try:
+                success = await self.handler.handle(message)
+                if self.config.send_ack:
+                    ack = build_ack_message(message, "AA" if success else "AE")
+            except Exception as e:
+                logger.error(f"Error processing {message.message_type} message: {e}")
+                if self.config.send_ack:
+                    try:
+                        ack = build_ack_message(message, "AE", str(e))
+                    except Exception:
+                        ack = None
+            finally:
+                queue.task_done()
+                self._record_latency(message, time.perf_counter() - item.received_at)
+                if not item.ack.done():
+                    item.ack.set_result(ack)
+
+    async def _write_acks(
+        self,
+        writer: asyncio.StreamWriter,
+        pending_acks: asyncio.Queue,
+        peer: Any,
+    ) -> None:
+        """Write ACKs for one connection in the order messages arrived."""
+        while True:
+            ack_future = await pending_acks.get()
+            if ack_future is None:
+                return
+            ack = await ack_future
+            if ack:
+                try:
+                    await self._send_mllp_message(writer, ack)
+                except Exception as e:
+                    logger.error(f"Error sending ACK to {peer}: {e}")
+                    return
+
+    def _record_latency(self, message: HL7Message, seconds: float) -> None:
+        """Track receipt-to-handled latency by message type."""
+        key = f"{message.message_type}^{message.message_event}"
+        stats = self._latency.get(key)
+        if stats is None:
+            stats = self._latency[key] = {"count": 0, "total": 0.0, "max": 0.0}
+        stats["count"] += 1
+        stats["total"] += seconds
+        stats["max"] = max(stats["max"], seconds)
 
     async def _send_mllp_message(
         self,
@@ -344,6 +531,22 @@ class HL7MLLPServer:
             "port": self.config.port,
             "connections_total": self.connections_total,
             "connections_active": self.connections_active,
+            "workers": len(self._workers),
+            "queue_depth": self.queue_depth,
+            "queue_capacity": sum(queue.maxsize for queue in self._queues),
+            "messages_queued": self.messages_queued,
+            "backpressure_waits": self.backpressure_waits,
+            "parse_errors": self.parse_errors,
+            "bytes_discarded": self.bytes_discarded,
+            "oversized_messages": self.oversized_messages,
+            "latency_by_type": {
+                key: {
+                    "count": int(stats["count"]),
+                    "avg_ms": round(stats["total"] / stats["count"] * 1000, 2),
+                    "max_ms": round(stats["max"] * 1000, 2),
+                }
+                for key, stats in self._latency.items()
+            },
             "handler_stats": self.handler.get_stats(),
         }
 
@@ -8,6 +8,9 @@ Checks prophylaxis status at key trigger points:
 - T-0: Entering OR (critical)
 """
 
+import asyncio
+import functools
+import inspect
 import logging
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -304,14 +307,15 @@ class PreOpChecker:
         # Optionally refresh from FHIR
         if self.fhir_client and not result.order_exists:
             try:
-                # Check for recent prophylaxis orders
-                orders = await self._get_prophylaxis_orders(surgery.patient_mrn)
+                # Check for recent prophylaxis orders and administrations
+                orders, admins = await asyncio.gather(
+                    self._get_prophylaxis_orders(surgery.patient_mrn),
+                    self._get_prophylaxis_administrations(surgery.patient_mrn),
+                )
                 if orders:
                     result.order_exists = True
                     surgery.prophylaxis_order_exists = True
 
-                # Check for administrations
-                admins = await self._get_prophylaxis_administrations(surgery.patient_mrn)
                 if admins:
                     result.administered = True
                     surgery.prophylaxis_administered = True
@@ -334,6 +338,21 @@ class PreOpChecker:
             logger.error(f"Error checking therapeutic antibiotics: {e}")
             return False
 
+    async def _call_fhir(self, method, *args, **kwargs):
+        """
+        Call a FHIR client method without blocking the event loop.
+
+        Coroutine methods (AsyncFHIRClient) are awaited directly; blocking
+        methods (the requests-based FHIRClient) run in the default executor
+        so HL7 handling continues while the request is in flight.
+        """
+        if inspect.iscoroutinefunction(method):
+            return await method(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, functools.partial(method, *args, **kwargs)
+        )
+
     async def _get_prophylaxis_orders(self, patient_mrn: str) -> list[dict]:
         """Get prophylaxis medication orders for patient."""
         if not self.fhir_client:
@@ -341,7 +360,8 @@ class PreOpChecker:
 
         try:
             if hasattr(self.fhir_client, "get_medication_orders"):
-                return self.fhir_client.get_medication_orders(
+                return await self._call_fhir(
+                    self.fhir_client.get_medication_orders,
                     patient_mrn,
                     since_hours=24,
                     prophylaxis_only=True,
@@ -358,7 +378,8 @@ class PreOpChecker:
 
         try:
             if hasattr(self.fhir_client, "get_medication_administrations"):
-                return self.fhir_client.get_medication_administrations(
+                return await self._call_fhir(
+                    self.fhir_client.get_medication_administrations,
                     patient_mrn,
                     since_hours=4,  # Prophylaxis given within 4 hours
                     prophylaxis_only=True,
@@ -6,6 +6,7 @@ to maintain a list of upcoming surgeries that need prophylaxis monitoring.
 """
 
 import asyncio
+import inspect
 import logging
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
@@ -231,7 +232,9 @@ class ScheduleMonitor:
         """
         Fetch FHIR Appointment resources.
 
-        Override this method to use your FHIR client implementation.
+        Uses AsyncFHIRClient.search when available; a synchronous FHIRClient
+        is run in the default executor so polling never blocks the event loop.
+        Override this method to use another FHIR client implementation.
         """
         # This is a placeholder - actual implementation depends on FHIR client
         # Expected return: list of FHIR Appointment resources
@@ -247,12 +250,13 @@ class ScheduleMonitor:
         }
 
         # Use FHIR client to fetch appointments
-        if hasattr(self.fhir_client, "get_appointments"):
-            return await self.fhir_client.get_appointments(params)
+        search = getattr(self.fhir_client, "search", None)
+        if search is not None and inspect.iscoroutinefunction(search):
+            # Async client - requests run on the pooled transport
+            return await search("Appointment", params)
         elif hasattr(self.fhir_client, "_get_all_pages"):
             # Synchronous client - wrap in executor
-            import asyncio
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             return await loop.run_in_executor(
                 None,
                 lambda: self.fhir_client._get_all_pages("Appointment", params)
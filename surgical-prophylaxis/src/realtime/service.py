@@ -15,11 +15,12 @@ import asyncio
 import logging
 import os
 import signal
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Optional
 
+from ..database import ProphylaxisDatabase
 from .hl7_parser import HL7Message
 from .hl7_listener import HL7MLLPServer, MessageHandler, HL7ListenerConfig
 from .location_tracker import LocationTracker, LocationPatterns, PatientLocationUpdate, LocationState
@@ -28,6 +29,7 @@ from .preop_checker import PreOpChecker, PreOpCheckResult, AlertTrigger, AlertSe
 from .escalation_engine import EscalationEngine, EscalationRecord, DeliveryChannel, RecipientRole
 from .state_manager import StateManager, SurgicalJourney
 from .epic_chat import EpicSecureChat, EpicChatConfig, ChatMessage
+from .async_fhir_client import create_async_fhir_client
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +47,8 @@ class ServiceConfig:
     fhir_schedule_poll_interval: int = 15  # minutes
     fhir_prophylaxis_poll_interval: int = 5  # minutes
     fhir_lookahead_hours: int = 48
+    fhir_timeout_seconds: float = 10.0
+    fhir_max_concurrency: int = 10  # In-flight FHIR requests
 
     # Alert settings
     alert_t24_enabled: bool = True
@@ -59,6 +63,8 @@ class ServiceConfig:
 
     # Database
     db_path: Optional[str] = None
+    state_write_behind: bool = True
+    state_flush_interval: float = 0.5  # seconds
 
     @classmethod
     def from_env(cls) -> "ServiceConfig":
@@ -73,6 +79,8 @@ class ServiceConfig:
             fhir_schedule_poll_interval=int(os.getenv("FHIR_SCHEDULE_POLL_INTERVAL", "15")),
             fhir_prophylaxis_poll_interval=int(os.getenv("FHIR_PROPHYLAXIS_POLL_INTERVAL", "5")),
             fhir_lookahead_hours=int(os.getenv("FHIR_LOOKAHEAD_HOURS", "48")),
+            fhir_timeout_seconds=float(os.getenv("FHIR_TIMEOUT_SECONDS", "10")),
+            fhir_max_concurrency=int(os.getenv("FHIR_MAX_CONCURRENCY", "10")),
             alert_t24_enabled=os.getenv("ALERT_T24_ENABLED", "true").lower() == "true",
             alert_t2_enabled=os.getenv("ALERT_T2_ENABLED", "true").lower() == "true",
             alert_t60_enabled=os.getenv("ALERT_T60_ENABLED", "true").lower() == "true",
@@ -81,6 +89,8 @@ class ServiceConfig:
             teams_enabled=os.getenv("TEAMS_FALLBACK_ENABLED", "true").lower() == "true",
             teams_webhook_url=os.getenv("TEAMS_SURGICAL_PROPHYLAXIS_WEBHOOK", ""),
             db_path=str(aegis_dir / "surgical_prophylaxis.db"),
+            state_write_behind=os.getenv("STATE_WRITE_BEHIND", "true").lower() == "true",
+            state_flush_interval=float(os.getenv("STATE_FLUSH_INTERVAL", "0.5")),
         )
 
 
@@ -115,7 +125,11 @@ class RealtimeProphylaxisService:
     def _init_components(self) -> None:
         """Initialize all service components."""
         # State manager (must be first as others depend on it)
-        self.state_manager = StateManager(db_path=self.config.db_path)
+        self.state_manager = StateManager(
+            db_path=self.config.db_path,
+            write_behind=self.config.state_write_behind,
+            flush_interval=self.config.state_flush_interval,
+        )
 
         # Location tracker
         self.location_tracker = LocationTracker()
@@ -139,7 +153,10 @@ class RealtimeProphylaxisService:
         )
 
         # Escalation engine
-        self.escalation_engine = EscalationEngine(alert_store=self.alert_store)
+        self.escalation_engine = EscalationEngine(
+            alert_store=self.alert_store,
+            escalation_store=ProphylaxisDatabase(self.config.db_path),
+        )
         self._register_channel_senders()
 
         # Epic Secure Chat
@@ -149,7 +166,8 @@ class RealtimeProphylaxisService:
 
         # HL7 Listener
         if self.config.hl7_enabled:
-            hl7_config = HL7ListenerConfig(
+            hl7_config = replace(
+                HL7ListenerConfig.from_env(),
                 host=self.config.hl7_host,
                 port=self.config.hl7_port,
                 enabled=self.config.hl7_enabled,
@@ -314,6 +332,13 @@ class RealtimeProphylaxisService:
         if self.hl7_listener:
             await self.hl7_listener.stop()
 
+        # Flush queued journey writes to disk
+        self.state_manager.close()
+
+        # Release pooled FHIR connections
+        if hasattr(self.fhir_client, "aclose"):
+            await self.fhir_client.aclose()
+
         logger.info("Real-time Surgical Prophylaxis Service stopped")
 
     async def run(self) -> None:
@@ -507,11 +532,13 @@ class RealtimeProphylaxisService:
                     for journey in self.state_manager.get_active_journeys():
                         if journey.prophylaxis_indicated and not journey.administered:
                             # Check for new orders/administrations
-                            orders = await self.preop_checker._get_prophylaxis_orders(
-                                journey.patient_mrn
-                            )
-                            admins = await self.preop_checker._get_prophylaxis_administrations(
-                                journey.patient_mrn
+                            orders, admins = await asyncio.gather(
+                                self.preop_checker._get_prophylaxis_orders(
+                                    journey.patient_mrn
+                                ),
+                                self.preop_checker._get_prophylaxis_administrations(
+                                    journey.patient_mrn
+                                ),
                             )
 
                             self.state_manager.update_prophylaxis_status(
@@ -539,6 +566,7 @@ class RealtimeProphylaxisService:
             },
             "state_manager": {
                 "active_journeys": len(self.state_manager.get_active_journeys()),
+                **self.state_manager.get_persistence_stats(),
             },
             "escalation_engine": {
                 "active_escalations": len(self.escalation_engine.get_active_escalations()),
@@ -572,7 +600,14 @@ def main():
     )
 
     # Create and run service
-    service = RealtimeProphylaxisService()
+    config = ServiceConfig.from_env()
+    fhir_client = None
+    if os.getenv("FHIR_BASE_URL"):
+        fhir_client = create_async_fhir_client(
+            timeout=config.fhir_timeout_seconds,
+            max_concurrency=config.fhir_max_concurrency,
+        )
+    service = RealtimeProphylaxisService(config=config, fhir_client=fhir_client)
 
     try:
         asyncio.run(service.run())
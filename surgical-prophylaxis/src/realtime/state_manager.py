@@ -7,13 +7,22 @@ to maintain the complete patient journey through the surgical workflow.
 
 import json
 import logging
+import queue
 import sqlite3
+import sys
+import threading
+import time
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Any
 
+# Repo root, for the shared common package
+sys.path.insert(0, str(__file__).rsplit("/", 4)[0])
+
+from common.sqlite_pool import PooledConnection, get_connection
+
 from .location_tracker import LocationState, PatientLocationUpdate
 from .schedule_monitor import ScheduledSurgery
 from .preop_checker import PreOpCheckResult, AlertTrigger
@@ -101,6 +110,206 @@ class SurgicalJourney:
         return not self.order_exists
 
 
+_STOP = object()
+
+
+class WriteBehindWriter:
+    """
+    Background writer that persists queued statements in batched transactions.
+
+    StateManager mutations run inside async HL7 handlers. In write-behind
+    mode they only update the in-memory journey index and submit their SQL
+    here; a dedicated thread commits everything queued within
+    ``flush_interval`` seconds (or ``max_batch`` statements) as one
+    transaction on its own pooled connection.
+
+    Statements submitted with a ``key`` are upserts of the same row, so only
+    the latest submission per key is written in each batch. Keyed objects
+    stay visible through pending() until their latest write is committed,
+    so reads that miss the in-memory cache never see a stale row.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        flush_interval: float = 0.5,
+        max_batch: int = 500,
+    ):
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+
+        self._queue: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._seq = 0
+        # key -> (seq of latest submission, object)
+        self._pending: dict[str, tuple[int, Any]] = {}
+
+        self.batches_written = 0
+        self.statements_written = 0
+        self.statements_coalesced = 0
+        self.write_errors = 0
+
+        self._thread = threading.Thread(
+            target=self._run, name="state-write-behind", daemon=True
+        )
+        self._closed = False
+        self._thread.start()
+
+    def submit(
+        self,
+        sql: str,
+        params: tuple,
+        key: Optional[str] = None,
+        obj: Any = None,
+    ) -> None:
+        """Queue a statement for the writer thread."""
+        if self._closed:
+            raise RuntimeError("WriteBehindWriter is closed")
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+            if key is not None:
+                self._pending[key] = (seq, obj)
+        self._queue.put((seq, key, sql, params))
+
+    def pending(self, key: str) -> Any:
+        """Get the object for a key whose latest write is not yet committed."""
+        with self._lock:
+            entry = self._pending.get(key)
+        return entry[1] if entry else None
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of statements waiting for the writer thread."""
+        return self._queue.qsize()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until everything submitted so far is committed.
+
+        Returns:
+            True if the flush completed within the timeout
+        """
+        if self._closed:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 30.0) -> None:
+        """Flush all queued writes, checkpoint the WAL and stop the thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.error(
+                f"Write-behind flush did not finish in {timeout}s, "
+                f"{self.queue_depth} statements unwritten"
+            )
+
+    def _run(self) -> None:
+        """Writer thread loop."""
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            batch = []
+            waiters = []
+
+            # Collect until the first item is flush_interval old or the
+            # batch is full; flush requests and shutdown cut the wait short
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is _STOP:
+                    stopping = True
+                    break
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                    break
+                batch.append(item)
+                if len(batch) >= self.max_batch:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            if stopping:
+                # Drain anything still queued behind the stop marker
+                while True:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if isinstance(item, threading.Event):
+                        waiters.append(item)
+                    elif item is not _STOP:
+                        batch.append(item)
+
+            if batch:
+                self._write_batch(batch)
+            if stopping:
+                self._checkpoint()
+            for waiter in waiters:
+                waiter.set()
+
+    def _write_batch(self, batch: list[tuple]) -> None:
+        """Commit a batch in one transaction, coalescing keyed upserts."""
+        latest: dict[str, tuple] = {}
+        for entry in batch:
+            if entry[1] is not None:
+                latest[entry[1]] = entry
+
+        # Each keyed row is written once, at its first position, with its
+        # latest values, so rows that reference it still follow it
+        statements = []
+        written_keys = set()
+        for seq, key, sql, params in batch:
+            if key is None:
+                statements.append((sql, params))
+            elif key not in written_keys:
+                written_keys.add(key)
+                statements.append(latest[key][2:])
+
+        conn = get_connection(self.db_path)
+        try:
+            with conn:
+                for sql, params in statements:
+                    conn.execute(sql, params)
+        except sqlite3.Error as e:
+            logger.error(f"Write-behind batch of {len(statements)} failed, retrying singly: {e}")
+            for sql, params in statements:
+                try:
+                    with conn:
+                        conn.execute(sql, params)
+                except sqlite3.Error as e:
+                    self.write_errors += 1
+                    logger.error(f"Write-behind statement failed: {e}")
+
+        self.batches_written += 1
+        self.statements_written += len(statements)
+        self.statements_coalesced += len(batch) - len(statements)
+
+        with self._lock:
+            for key, entry in latest.items():
+                current = self._pending.get(key)
+                if current and current[0] == entry[0]:
+                    del self._pending[key]
+
+    def _checkpoint(self) -> None:
+        """Fold the WAL into the database file so shutdown writes are durable."""
+        try:
+            conn = get_connection(self.db_path)
+            conn.execute("PRAGMA wal_checkpoint(FULL)")
+        except sqlite3.Error as e:
+            logger.warning(f"WAL checkpoint on shutdown failed: {e}")
+
+
 class StateManager:
     """
     Manages surgical journey state across all tracking components.
@@ -110,9 +319,20 @@ class StateManager:
     - Coordinate state updates from multiple sources
     - Persist journey state to database
     - Provide journey lookup for alerts
+
+    With ``write_behind=True`` persistence is handed to a WriteBehindWriter:
+    mutations update the in-memory index immediately and are committed in
+    batches within ``flush_interval`` seconds. Call close() on shutdown to
+    flush outstanding writes.
     """
 
-    def __init__(self, db_path: Optional[str] = None):
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        write_behind: bool = False,
+        flush_interval: float = 0.5,
+        max_batch: int = 500,
+    ):
         if db_path is None:
             aegis_dir = Path.home() / ".aegis"
             aegis_dir.mkdir(exist_ok=True)
@@ -121,6 +341,14 @@ class StateManager:
         self.db_path = db_path
         self._init_db()
 
+        self._writer: Optional[WriteBehindWriter] = None
+        if write_behind:
+            self._writer = WriteBehindWriter(
+                db_path,
+                flush_interval=flush_interval,
+                max_batch=max_batch,
+            )
+
         # In-memory cache of active journeys (patient_mrn -> journey)
         self._active_journeys: dict[str, SurgicalJourney] = {}
 
@@ -133,14 +361,62 @@ class StateManager:
         if schema_path.exists():
             with open(schema_path) as f:
                 schema = f.read()
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_conn() as conn:
                 conn.executescript(schema)
 
-    def _get_conn(self) -> sqlite3.Connection:
-        """Get database connection with row factory."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+    def _get_conn(self) -> PooledConnection:
+        """Get this thread's pooled database connection."""
+        return get_connection(self.db_path)
+
+    def _execute(
+        self,
+        sql: str,
+        params: tuple,
+        journey: Optional[SurgicalJourney] = None,
+    ) -> None:
+        """
+        Run a write statement, or queue it in write-behind mode.
+
+        Pass ``journey`` for journey upserts so the write can be coalesced
+        and the journey stays readable until it is committed.
+        """
+        if self._writer:
+            key = journey.journey_id if journey else None
+            self._writer.submit(sql, params, key=key, obj=journey)
+            return
+
+        with self._get_conn() as conn:
+            conn.execute(sql, params)
+
+    def _pending_journey(self, journey_id: str) -> Optional[SurgicalJourney]:
+        """Get a journey whose latest state is still waiting to be written."""
+        if not self._writer:
+            return None
+        return self._writer.pending(journey_id)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until queued writes are committed (no-op without write-behind)."""
+        if not self._writer:
+            return True
+        return self._writer.flush(timeout)
+
+    def close(self) -> None:
+        """Flush outstanding writes and stop the write-behind thread."""
+        if self._writer:
+            self._writer.close()
+
+    def get_persistence_stats(self) -> dict:
+        """Get write-behind queue statistics."""
+        if not self._writer:
+            return {"write_behind": False}
+        return {
+            "write_behind": True,
+            "queue_depth": self._writer.queue_depth,
+            "batches_written": self._writer.batches_written,
+            "statements_written": self._writer.statements_written,
+            "statements_coalesced": self._writer.statements_coalesced,
+            "write_errors": self._writer.write_errors,
+        }
 
     def create_journey(self, surgery: ScheduledSurgery) -> SurgicalJourney:
         """
@@ -308,34 +584,32 @@ class StateManager:
         alert_id: Optional[str] = None,
     ) -> None:
         """Record a pre-op check result in the database."""
-        with self._get_conn() as conn:
-            conn.execute(
-                """
-                INSERT INTO preop_checks (
-                    journey_id, trigger_type, trigger_time,
-                    prophylaxis_indicated, order_exists, administered,
-                    minutes_to_or, alert_required, alert_severity,
-                    recommendation, alert_id, therapeutic_abx_active,
-                    check_details
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    journey_id,
-                    result.trigger.value,
-                    result.trigger_time.isoformat(),
-                    result.prophylaxis_indicated,
-                    result.order_exists,
-                    result.administered,
-                    result.minutes_to_or,
-                    result.alert_required,
-                    result.alert_severity.value if result.alert_required else None,
-                    result.recommendation,
-                    alert_id,
-                    result.therapeutic_abx_active,
-                    json.dumps(result.check_details),
-                ),
-            )
-            conn.commit()
+        self._execute(
+            """
+            INSERT INTO preop_checks (
+                journey_id, trigger_type, trigger_time,
+                prophylaxis_indicated, order_exists, administered,
+                minutes_to_or, alert_required, alert_severity,
+                recommendation, alert_id, therapeutic_abx_active,
+                check_details
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                journey_id,
+                result.trigger.value,
+                result.trigger_time.isoformat(),
+                result.prophylaxis_indicated,
+                result.order_exists,
+                result.administered,
+                result.minutes_to_or,
+                result.alert_required,
+                result.alert_severity.value if result.alert_required else None,
+                result.recommendation,
+                alert_id,
+                result.therapeutic_abx_active,
+                json.dumps(result.check_details),
+            ),
+        )
 
     def complete_journey(
         self,
@@ -416,53 +690,52 @@ class StateManager:
 
     def _save_journey(self, journey: SurgicalJourney) -> None:
         """Save or update a journey in the database."""
-        with self._get_conn() as conn:
-            conn.execute(
-                """
-                INSERT OR REPLACE INTO surgical_journeys (
-                    journey_id, case_id, patient_mrn, patient_name,
-                    procedure_description, procedure_cpt_codes, scheduled_time,
-                    current_state, prophylaxis_indicated, order_exists, administered,
-                    alert_t24_sent, alert_t24_time, alert_t2_sent, alert_t2_time,
-                    alert_t60_sent, alert_t60_time, alert_t0_sent, alert_t0_time,
-                    is_emergency, already_on_therapeutic_abx, excluded, exclusion_reason,
-                    created_at, updated_at, completed_at,
-                    fhir_appointment_id, fhir_encounter_id, hl7_visit_number
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    journey.journey_id,
-                    journey.case_id,
-                    journey.patient_mrn,
-                    journey.patient_name,
-                    journey.procedure_description,
-                    json.dumps(journey.procedure_cpt_codes),
-                    journey.scheduled_time.isoformat() if journey.scheduled_time else None,
-                    journey.current_state.value,
-                    journey.prophylaxis_indicated,
-                    journey.order_exists,
-                    journey.administered,
-                    journey.alert_t24_sent,
-                    journey.alert_t24_time.isoformat() if journey.alert_t24_time else None,
-                    journey.alert_t2_sent,
-                    journey.alert_t2_time.isoformat() if journey.alert_t2_time else None,
-                    journey.alert_t60_sent,
-                    journey.alert_t60_time.isoformat() if journey.alert_t60_time else None,
-                    journey.alert_t0_sent,
-                    journey.alert_t0_time.isoformat() if journey.alert_t0_time else None,
-                    journey.is_emergency,
-                    journey.already_on_therapeutic_abx,
-                    journey.excluded,
-                    journey.exclusion_reason,
-                    journey.created_at.isoformat(),
-                    journey.updated_at.isoformat(),
-                    journey.completed_at.isoformat() if journey.completed_at else None,
-                    journey.fhir_appointment_id,
-                    journey.fhir_encounter_id,
-                    journey.hl7_visit_number,
-                ),
-            )
-            conn.commit()
+        self._execute(
+            """
+            INSERT OR REPLACE INTO surgical_journeys (
+                journey_id, case_id, patient_mrn, patient_name,
+                procedure_description, procedure_cpt_codes, scheduled_time,
+                current_state, prophylaxis_indicated, order_exists, administered,
+                alert_t24_sent, alert_t24_time, alert_t2_sent, alert_t2_time,
+                alert_t60_sent, alert_t60_time, alert_t0_sent, alert_t0_time,
+                is_emergency, already_on_therapeutic_abx, excluded, exclusion_reason,
+                created_at, updated_at, completed_at,
+                fhir_appointment_id, fhir_encounter_id, hl7_visit_number
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                journey.journey_id,
+                journey.case_id,
+                journey.patient_mrn,
+                journey.patient_name,
+                journey.procedure_description,
+                json.dumps(journey.procedure_cpt_codes),
+                journey.scheduled_time.isoformat() if journey.scheduled_time else None,
+                journey.current_state.value,
+                journey.prophylaxis_indicated,
+                journey.order_exists,
+                journey.administered,
+                journey.alert_t24_sent,
+                journey.alert_t24_time.isoformat() if journey.alert_t24_time else None,
+                journey.alert_t2_sent,
+                journey.alert_t2_time.isoformat() if journey.alert_t2_time else None,
+                journey.alert_t60_sent,
+                journey.alert_t60_time.isoformat() if journey.alert_t60_time else None,
+                journey.alert_t0_sent,
+                journey.alert_t0_time.isoformat() if journey.alert_t0_time else None,
+                journey.is_emergency,
+                journey.already_on_therapeutic_abx,
+                journey.excluded,
+                journey.exclusion_reason,
+                journey.created_at.isoformat(),
+                journey.updated_at.isoformat(),
+                journey.completed_at.isoformat() if journey.completed_at else None,
+                journey.fhir_appointment_id,
+                journey.fhir_encounter_id,
+                journey.hl7_visit_number,
+            ),
+            journey=journey,
+        )
 
     def _save_location_history(
         self,
@@ -470,30 +743,32 @@ class StateManager:
         update: PatientLocationUpdate,
     ) -> None:
         """Save a location change to history."""
-        with self._get_conn() as conn:
-            conn.execute(
-                """
-                INSERT INTO patient_locations (
-                    patient_mrn, journey_id, location_code,
-                    location_description, location_state,
-                    event_time, message_time, hl7_message_id
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    update.patient_mrn,
-                    journey_id,
-                    update.new_location_code,
-                    None,  # description
-                    update.new_location_state.value,
-                    update.event_time.isoformat() if update.event_time else datetime.now().isoformat(),
-                    datetime.now().isoformat(),
-                    update.message_control_id,
-                ),
-            )
-            conn.commit()
+        self._execute(
+            """
+            INSERT INTO patient_locations (
+                patient_mrn, journey_id, location_code,
+                location_description, location_state,
+                event_time, message_time, hl7_message_id
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                update.patient_mrn,
+                journey_id,
+                update.new_location_code,
+                None,  # description
+                update.new_location_state.value,
+                update.event_time.isoformat() if update.event_time else datetime.now().isoformat(),
+                datetime.now().isoformat(),
+                update.message_control_id,
+            ),
+        )
 
     def _load_journey(self, journey_id: str) -> Optional[SurgicalJourney]:
         """Load a journey from database by ID."""
+        pending = self._pending_journey(journey_id)
+        if pending:
+            return pending
+
         with self._get_conn() as conn:
             row = conn.execute(
                 "SELECT * FROM surgical_journeys WHERE journey_id = ?",
@@ -521,7 +796,10 @@ class StateManager:
         if not row:
             return None
 
-        journey = self._row_to_journey(dict(row))
+        journey = self._pending_journey(row["journey_id"]) or self._row_to_journey(dict(row))
+        if not journey.is_active:
+            # Completed, but the completion is not written yet
+            return None
 
         # Add to cache
         self._active_journeys[patient_mrn] = journey
@@ -540,7 +818,7 @@ class StateManager:
         if not row:
             return None
 
-        return self._row_to_journey(dict(row))
+        return self._pending_journey(row["journey_id"]) or self._row_to_journey(dict(row))
 
     def _row_to_journey(self, row: dict) -> SurgicalJourney:
         """Convert a database row to SurgicalJourney."""